@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+AI分析結果の永続キャッシュ
+正規化した本文のハッシュ + プロンプトのバージョンをキーに、分析結果をローカルのSQLiteファイルへ保存する
+（記事ID・分析器インスタンス・再起動をまたいで再利用、LRU + 有効期限で破棄）
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 破棄判定を行う登録間隔（件）
+EVICTION_INTERVAL = 100
+
+
+def compute_content_hash(text: str, prompt_version: str) -> str:
+    """
+    キャッシュキーを計算
+
+    Args:
+        text: 分析対象の本文（HTML除去・空白正規化済み）
+        prompt_version: プロンプト・モデルのバージョン
+
+    Returns:
+        大文字小文字・空白の違いを無視した本文とバージョンのSHA-256ハッシュ
+    """
+    normalized_text = " ".join(str(text or "").split()).lower()
+    return hashlib.sha256(f"{prompt_version}\x1f{normalized_text}".encode("utf-8")).hexdigest()
+
+
+class PersistentAnalysisCache:
+    """分析結果の永続キャッシュ（スレッドセーフ、同じファイルを複数プロセスで共有可能）"""
+
+    def __init__(self, cache_path: str, max_entries: int = 20000, ttl_seconds: Optional[float] = None):
+        """
+        初期化
+
+        Args:
+            cache_path: キャッシュファイル（SQLite）のパス
+            max_entries: 最大エントリ数（超過時は最も古く参照されたエントリを破棄）
+            ttl_seconds: エントリの最大有効期間（秒、Noneの場合は無期限）
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._sets_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                cache_key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                result_json TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache(last_used_at)")
+        self.evict()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """有効期限内の分析結果を取得（期限切れ・未登録はNone）"""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result_json, created_at FROM analysis_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds and now - row[1] >= self.ttl_seconds:
+                self._connection.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (cache_key,))
+                self.evictions += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            # LRU判定用に参照日時を更新
+            self._connection.execute("UPDATE analysis_cache SET last_used_at = ? WHERE cache_key = ?", (now, cache_key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, cache_key: str, prompt_version: str, value: Dict[str, Any]):
+        """分析結果を登録"""
+        now = time.time()
+        with self._lock:
+            self._connection.execute("""
+                INSERT OR REPLACE INTO analysis_cache (cache_key, prompt_version, result_json, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (cache_key, prompt_version, json.dumps(value, ensure_ascii=False, default=str), now, now))
+            self._sets_since_eviction += 1
+            run_eviction = self._sets_since_eviction >= EVICTION_INTERVAL
+
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        期限切れと最大エントリ数を超えた分を破棄
+
+        Returns:
+            int: 破棄したエントリ数
+        """
+        with self._lock:
+            self._sets_since_eviction = 0
+            removed = 0
+
+            if self.ttl_seconds:
+                cursor = self._connection.execute(
+                    "DELETE FROM analysis_cache WHERE created_at <= ?", (time.time() - self.ttl_seconds,)
+                )
+                removed += cursor.rowcount
+
+            overflow = self._connection.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor = self._connection.execute("""
+                    DELETE FROM analysis_cache WHERE cache_key IN (
+                        SELECT cache_key FROM analysis_cache ORDER BY last_used_at, rowid LIMIT ?
+                    )
+                """, (overflow,))
+                removed += cursor.rowcount
+
+            self.evictions += removed
+            return removed
+
+    def clear(self):
+        """全エントリを破棄"""
+        with self._lock:
+            self._connection.execute("DELETE FROM analysis_cache")
+
+    def close(self):
+        """キャッシュファイルを閉じる"""
+        with self._lock:
+            self._connection.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ヒット率などの統計情報"""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups > 0 else 0.0
+            }
@@ -8,7 +8,7 @@ import eel
 import threading
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional
 import json
 import sys
@@ -18,6 +18,10 @@ from pathlib import Path
 # モジュールインポート
 from models_spec import NewsArticle, NewsSearchFilter, validate_manual_news_input, extract_related_metals
 from database_spec import SpecDatabaseManager
+from db_executor import DatabaseExecutor, DatabaseQueryCancelled, DatabaseQueryTimeout
+from archive_manager import NewsArchiveManager
+from news_exporter import NewsExporter, NewsExportCancelled, EXPORT_FORMATS
+from change_notifier import DatabaseChangeNotifier
 from news_collector_spec import RefinitivNewsCollector, NewsPollingService
 from database_detector import DatabaseDetector
 from refinitiv_detector import RefinitivDetector, ApplicationModeManager
@@ -36,6 +40,28 @@ class NewsWatcherApp:
         # データベース自動検出
         self.db_manager = self._setup_database()
         
+        # UIハンドラーのクエリはワーカースレッドで実行（遅いクエリで他のUIリクエストを止めない）
+        ui_config = self.config.get("ui_settings", {})
+        self.db_executor = DatabaseExecutor(
+            self.db_manager,
+            max_workers=ui_config.get("db_executor_workers", 4),
+            default_timeout=ui_config.get("db_query_timeout_seconds", 30)
+        )
+        
+        # 保持期間を過ぎた記事のアーカイブ出力・削除（backup設定）
+        self.archive_manager = NewsArchiveManager(self.db_manager, self.config)
+        self.archive_thread = None
+        self.is_archive_active = False
+        
+        # 検索結果のエクスポート（export設定、バックグラウンドで実行しUIへ進捗を通知）
+        self.news_exporter = NewsExporter(self.db_manager, self.config)
+        self.export_jobs = {}
+        self._export_lock = threading.Lock()
+        
+        # データベース変更のプッシュ通知（パッシブモードの更新監視）
+        self.change_notifier = DatabaseChangeNotifier(self.db_manager, self.config)
+        self.change_notifier.add_listener(self._on_database_change)
+        
         # Refinitiv接続検出とモード管理
         self.refinitiv_detector = RefinitivDetector(self.config["eikon_api_key"])
         self.mode_manager = ApplicationModeManager(self.refinitiv_detector)
@@ -116,16 +142,15 @@ class NewsWatcherApp:
                 cursor.execute("SELECT COUNT(*) FROM news_table WHERE source = 'Manual Entry'")
                 old_count = cursor.fetchone()[0]
                 
-                if old_count > 0:
-                    print(f"古い 'Manual Entry' データを修正中... ({old_count}件)")
-                    
-                    # 'Manual Entry' を '手動登録' に更新
-                    cursor.execute("UPDATE news_table SET source = '手動登録' WHERE source = 'Manual Entry'")
-                    updated_count = cursor.rowcount
-                    
-                    print(f"✓ ソース名更新完了: 'Manual Entry' → '手動登録' ({updated_count}件)")
-                    self.logger.info(f"起動時ソース名修正: 'Manual Entry' → '手動登録' ({updated_count}件)")
-                    
+            if old_count > 0:
+                print(f"古い 'Manual Entry' データを修正中... ({old_count}件)")
+                
+                # 'Manual Entry' を '手動登録' に更新（重複判定キーも再計算）
+                updated_count = db_manager.update_source_name('Manual Entry', '手動登録')
+                
+                print(f"✓ ソース名更新完了: 'Manual Entry' → '手動登録' ({updated_count}件)")
+                self.logger.info(f"起動時ソース名修正: 'Manual Entry' → '手動登録' ({updated_count}件)")
+                
         except Exception as e:
             print(f"⚠️ ソース名修正エラー: {e}")
             self.logger.warning(f"起動時ソース名修正エラー: {e}")
@@ -180,10 +205,24 @@ class NewsWatcherApp:
                 time.sleep(60)  # エラー時は1分待機
 
     def start_passive_mode_polling(self):
-        """パッシブモード用のデータベース更新ポーリング開始"""
+        """
+        パッシブモード用のデータベース更新監視開始
+        プッシュ通知（PostgreSQLのLISTEN/NOTIFY、SQL Server/SQLiteは変更フィード位置の確認）を使用し、
+        使用できない場合は定期ポーリング
+        """
+        if self.change_notifier.is_active:
+            return  # 既に実行中
         if hasattr(self, 'passive_polling_thread') and self.passive_polling_thread and self.passive_polling_thread.is_alive():
             return  # 既に実行中
         
+        # 変更フィードのカーソルを現在位置で初期化
+        self._check_database_updates()
+        self._check_high_importance_news()
+        
+        if self.change_notifier.start():
+            self.logger.info("パッシブモード: データベース更新のプッシュ通知で監視")
+            return
+        
         self.passive_polling_active = True
         self.passive_polling_thread = threading.Thread(
             target=self._passive_polling_worker,
@@ -214,35 +253,50 @@ class NewsWatcherApp:
                 time.sleep(60)  # エラー時は1分待機
     
     def _check_database_updates(self):
-        """データベースの更新をチェックして通知"""
+        """データベースの更新をチェックして通知（変更フィードで前回チェック以降の挿入・更新を取得）"""
         try:
-            # 最後のチェック時間以降の新しいニュースを取得
-            if not hasattr(self, '_last_passive_check'):
-                self._last_passive_check = datetime.now() - timedelta(minutes=5)
-            
-            from models_spec import NewsSearchFilter
-            search_filter = NewsSearchFilter()
-            search_filter.start_date = self._last_passive_check
-            search_filter.limit = 50
+            # 初回は現在位置から開始
+            if not hasattr(self, '_change_cursor'):
+                self._change_cursor = self.db_manager.get_latest_change_seq()
+                return
             
-            new_news = self.db_manager.search_news(search_filter)
+            # 取得しきれない場合は続きも読み、まとめて1回通知（次の変更通知まで残りを持ち越さない）
+            changed_count = 0
+            new_count = 0
+            while True:
+                feed = self.db_manager.get_changes_since(self._change_cursor, limit=500)
+                changes = feed['changes']
+                self._change_cursor = feed['next_seq']
+                changed_count += len(changes)
+                # 未読の代表記事を新着として通知（既読・レーティングのみの変更は一覧の再読み込みのみ）
+                new_count += sum(1 for news in changes if news['is_canonical'] and not news['is_read'])
+                if not feed['has_more']:
+                    break
             
-            if new_news:
-                self.logger.info(f"パッシブモード: {len(new_news)}件の新しいニュースを検出")
+            if changed_count:
+                self.logger.info(f"パッシブモード: {changed_count}件の変更を検出（新着{new_count}件）")
+                # 別プロセスで追加・更新された記事のため検索結果キャッシュを無効化
+                self.db_manager.invalidate_result_cache()
                 # WebUIに更新通知を送信
                 eel.notify_database_update({
                     'type': 'database_update',
-                    'new_count': len(new_news),
+                    'new_count': new_count,
+                    'changed_count': changed_count,
+                    'change_seq': self._change_cursor,
                     'timestamp': datetime.now().isoformat()
                 })
             
-            self._last_passive_check = datetime.now()
-            
         except Exception as e:
             self.logger.error(f"データベース更新チェックエラー: {e}")
     
+    def _on_database_change(self, latest_seq: int):
+        """プッシュ通知で変更を検知した場合の処理（通知スレッドで実行）"""
+        self._check_database_updates()
+        self._check_high_importance_news()
+    
     def stop_passive_mode_polling(self):
         """パッシブモードポーリング停止"""
+        self.change_notifier.stop()
         self.passive_polling_active = False
         if hasattr(self, 'passive_polling_thread') and self.passive_polling_thread and self.passive_polling_thread.is_alive():
             self.passive_polling_thread.join(timeout=5)
@@ -251,21 +305,21 @@ class NewsWatcherApp:
     def _check_high_importance_news(self):
         """高評価ニュースの通知チェック"""
         try:
-            # 過去5分間の高評価ニュース（importance_score >= 8）を取得
-            from models_spec import NewsSearchFilter
-            
-            search_filter = NewsSearchFilter()
-            search_filter.start_date = datetime.now() - timedelta(minutes=5)
-            search_filter.min_importance_score = 8
-            search_filter.limit = 10
+            # 前回チェック以降に追加・更新された高評価ニュース（importance_score >= 8）を変更フィードから取得
+            # 初回は現在位置から開始
+            if not hasattr(self, '_importance_cursor'):
+                self._importance_cursor = self.db_manager.get_latest_change_seq()
+                return
             
-            high_importance_news = self.db_manager.search_news(search_filter)
+            feed = self.db_manager.get_changes_since(self._importance_cursor, limit=10, min_importance_score=8)
             
-            for news in high_importance_news:
-                # 未通知のニュースのみ通知
+            for news in feed['changes']:
+                # 未通知のニュースのみ通知（分析結果の更新などで再度取得されるため）
                 if not self._is_already_notified(news['news_id']):
                     self._send_high_importance_notification(news)
                     self._mark_as_notified(news['news_id'])
+            
+            self._importance_cursor = feed['next_seq']
                     
         except Exception as e:
             self.logger.error(f"高評価ニュース通知チェックエラー: {e}")
@@ -315,6 +369,42 @@ class NewsWatcherApp:
             self.polling_thread.join(timeout=5)
         self.logger.info("バックグラウンドポーリング停止")
     
+    def start_archive_maintenance(self):
+        """アーカイブ処理の定期実行開始（enable_auto_backupが有効な場合のみ）"""
+        if not self.archive_manager.enabled or self.is_archive_active:
+            return
+        
+        self.is_archive_active = True
+        self.archive_thread = threading.Thread(
+            target=self._archive_worker,
+            daemon=True
+        )
+        self.archive_thread.start()
+        self.logger.info(f"アーカイブ処理の定期実行開始（{self.archive_manager.interval_days}日ごと）")
+    
+    def _archive_worker(self):
+        """アーカイブ処理ワーカー（前回実行からbackup_interval_days経過していれば実行）"""
+        while self.is_archive_active:
+            try:
+                if self.archive_manager.is_due():
+                    result = self.archive_manager.run()
+                    if result['archived_rows']:
+                        self.db_manager.invalidate_result_cache()
+            except Exception as e:
+                self.logger.error(f"アーカイブ処理エラー: {e}")
+            
+            # 1時間ごとに実行時期を確認
+            for i in range(3600):
+                if not self.is_archive_active:
+                    break
+                time.sleep(1)
+    
+    def stop_archive_maintenance(self):
+        """アーカイブ処理の定期実行停止"""
+        self.is_archive_active = False
+        if self.archive_thread and self.archive_thread.is_alive():
+            self.archive_thread.join(timeout=5)
+    
     def _on_refinitiv_status_change(self, status_change: Dict):
         """Refinitiv接続状態変更時のコールバック"""
         self.logger.info(f"Refinitiv状態変更: {status_change}")
@@ -357,6 +447,8 @@ class NewsWatcherApp:
             if self.current_mode == "active":
                 # バックグラウンドポーリング開始
                 self.start_background_polling()
+                # アーカイブ処理は収集を行うActiveモードのインスタンスのみで実行
+                self.start_archive_maintenance()
                 # Refinitiv状態の定期チェック開始
                 self.refinitiv_detector.start_periodic_check(self._on_refinitiv_status_change)
             else:
@@ -372,8 +464,11 @@ class NewsWatcherApp:
             self.logger.error(f"アプリケーション実行エラー: {e}")
         finally:
             self.stop_background_polling()
+            self.stop_archive_maintenance()
             if hasattr(self, 'stop_passive_mode_polling'):
                 self.stop_passive_mode_polling()
+            # 未反映の既読・レーティング更新を反映
+            self.db_manager.state_buffer.close()
 
 # Global app instance
 app = None
@@ -387,19 +482,22 @@ def init_app():
 
 # EEL公開関数
 
+def _cancelled_response(error: Exception) -> Dict:
+    """キャンセル・タイムアウト時の応答（キャンセルはUI側で無視される）"""
+    return {
+        'success': False,
+        'cancelled': isinstance(error, DatabaseQueryCancelled),
+        'timed_out': isinstance(error, DatabaseQueryTimeout),
+        'error': str(error)
+    }
+
 def _convert_datetime_to_iso(news_list: List[Dict]) -> List[Dict]:
-    """日時をISO形式文字列に変換"""
-    converted_news = []
+    """日時をISO形式文字列に変換（検索結果の辞書はクエリごとに生成されるためコピーせず書き換え）"""
     for news in news_list:
-        news_copy = news.copy()
-        if 'publish_time' in news_copy and news_copy['publish_time']:
-            if isinstance(news_copy['publish_time'], datetime):
-                news_copy['publish_time'] = news_copy['publish_time'].isoformat()
-        if 'acquire_time' in news_copy and news_copy['acquire_time']:
-            if isinstance(news_copy['acquire_time'], datetime):
-                news_copy['acquire_time'] = news_copy['acquire_time'].isoformat()
-        converted_news.append(news_copy)
-    return converted_news
+        for key in ('publish_time', 'acquire_time', 'read_at'):
+            if isinstance(news.get(key), datetime):
+                news[key] = news[key].isoformat()
+    return news_list
 
 @eel.expose
 def get_latest_news(limit: int = 50, offset: int = 0) -> Dict:
@@ -415,16 +513,21 @@ def get_latest_news(limit: int = 50, offset: int = 0) -> Dict:
         search_filter.limit = limit
         search_filter.offset = offset
         
-        news_list = app.db_manager.search_news(search_filter)
-        news_list = _convert_datetime_to_iso(news_list)
-        total_count = app.db_manager.get_news_count()
+        # ページと総件数を1回のクエリで取得（一覧と同じ重複除去・フィルター条件）
+        # 同じ一覧への後続リクエストがあれば実行中の取得はキャンセル
+        page_result = app.db_executor.run(app.db_manager.search_news_page, search_filter,
+                                          group='news_list', supersede=True)
+        news_list = _convert_datetime_to_iso(page_result['news'])
         
         return {
             'success': True,
             'news': news_list,
-            'total_count': total_count,
+            'total_count': page_result['total_count'],
+            'total_is_estimate': page_result['count_is_estimate'],
             'current_page': (offset // limit) + 1
         }
+    except (DatabaseQueryCancelled, DatabaseQueryTimeout) as e:
+        return _cancelled_response(e)
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
@@ -444,7 +547,9 @@ def search_news(search_params: Dict) -> Dict:
         if search_params.get('keyword'):
             search_filter.keyword = search_params['keyword']
         if search_params.get('source'):
+            # ソース選択は一覧の値そのものを渡すため完全一致（source + publish_timeのインデックスを使用）
             search_filter.source = search_params['source']
+            search_filter.source_exact = True
             app.logger.info(f"ソースフィルター適用: '{search_params['source']}'")
         else:
             app.logger.info("ソースフィルターなし")
@@ -482,16 +587,19 @@ def search_news(search_params: Dict) -> Dict:
         search_filter.limit = per_page
         search_filter.offset = (page - 1) * per_page
         
-        news_list = app.db_manager.search_news(search_filter)
-        news_list = _convert_datetime_to_iso(news_list)
-        total_count = app.db_manager.get_news_count(search_filter)
+        page_result = app.db_executor.run(app.db_manager.search_news_page, search_filter,
+                                          group='news_list', supersede=True)
+        news_list = _convert_datetime_to_iso(page_result['news'])
         
         return {
             'success': True,
             'news': news_list,
-            'total_count': total_count,
+            'total_count': page_result['total_count'],
+            'total_is_estimate': page_result['count_is_estimate'],
             'current_page': page
         }
+    except (DatabaseQueryCancelled, DatabaseQueryTimeout) as e:
+        return _cancelled_response(e)
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
@@ -507,6 +615,8 @@ def search_archive(search_params: Dict) -> Dict:
         app.logger.info(f"📄 アーカイブ検索: page={page}, per_page={per_page}, 期間={search_params.get('start_date')}〜{search_params.get('end_date')}")
         
         search_filter = NewsSearchFilter()
+        # 期間がアーカイブ層にかかる場合のみアーカイブテーブルも対象（期間指定でパーティションを絞り込み）
+        search_filter.include_archive = True
         
         if search_params.get('start_date'):
             search_filter.start_date = datetime.fromisoformat(search_params['start_date'])
@@ -525,9 +635,23 @@ def search_archive(search_params: Dict) -> Dict:
         search_filter.limit = per_page
         search_filter.offset = (page - 1) * per_page
         
-        news_list = app.db_manager.search_news(search_filter)
-        news_list = _convert_datetime_to_iso(news_list)
-        total_count = app.db_manager.get_news_count(search_filter)
+        # 削除済みの古い記事はアーカイブファイルからも検索（設定で有効な場合）
+        archived = []
+        max_archived = app.config.get("ui_settings", {}).get("max_search_results", 1000)
+        include_files = search_params.get('include_archive_files', app.archive_manager.search_archive_files)
+        if include_files:
+            archived = app.db_executor.run(
+                app.archive_manager.search_archived, search_filter.start_date, search_filter.end_date,
+                search_filter.keyword, max_archived, search_filter.sort_by == 'time_asc', group='news_list'
+            )
+        
+        if archived:
+            page_result = _search_with_archived_files(app, search_filter, archived, len(archived) >= max_archived)
+        else:
+            page_result = app.db_executor.run(app.db_manager.search_news_page, search_filter,
+                                              group='news_list', supersede=True)
+        news_list = _convert_datetime_to_iso(page_result['news'])
+        total_count = page_result['total_count']
         
         app.logger.info(f"📄 アーカイブ検索結果: {len(news_list)}件取得, 総件数={total_count}")
         
@@ -535,17 +659,189 @@ def search_archive(search_params: Dict) -> Dict:
             'success': True,
             'news': news_list,
             'total_count': total_count,
+            'total_is_estimate': page_result['count_is_estimate'],
+            'total_is_capped': page_result.get('count_is_capped', False),
             'current_page': page
         }
+    except (DatabaseQueryCancelled, DatabaseQueryTimeout) as e:
+        return _cancelled_response(e)
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def _search_with_archived_files(app, search_filter: NewsSearchFilter, archived: List[Dict],
+                                archived_capped: bool = False) -> Dict:
+    """
+    データベースの検索結果とアーカイブファイルの検索結果を1つの一覧としてページング
+    アーカイブファイルの記事は保持期限より古いため、古い順ソートでは先頭、それ以外は末尾に並べる
+    アーカイブファイル側の位置はデータベースの件数から求めるため、総件数は概算せず正確に数える
+    """
+    offset, limit = search_filter.offset, search_filter.limit
+    
+    if search_filter.sort_by == 'time_asc':
+        file_page = archived[offset:offset + limit]
+        search_filter.offset = max(0, offset - len(archived))
+        search_filter.limit = limit - len(file_page)
+        if search_filter.limit > 0:
+            db_result = app.db_executor.run(app.db_manager.search_news_page, search_filter, estimate_count=False,
+                                            group='news_list', supersede=True)
+        else:
+            db_result = {'news': [], 'count_is_estimate': False,
+                         'total_count': app.db_executor.run(app.db_manager.get_news_count, search_filter,
+                                                            group='news_list')}
+        news = file_page + db_result['news']
+    else:
+        db_result = app.db_executor.run(app.db_manager.search_news_page, search_filter, estimate_count=False,
+                                        group='news_list', supersede=True)
+        news = db_result['news']
+        if len(news) < limit:
+            file_start = max(0, offset - db_result['total_count'])
+            news = news + archived[file_start:file_start + limit - len(news)]
+    
+    # アーカイブファイルの検索結果が上限に達した場合、総件数は下限（それ以上ある）
+    return {
+        'news': news,
+        'total_count': db_result['total_count'] + len(archived),
+        'count_is_estimate': db_result['count_is_estimate'],
+        'count_is_capped': archived_capped
+    }
+
+def _build_export_filter(search_params: Dict) -> NewsSearchFilter:
+    """エクスポート用の検索条件（ニュース一覧・アーカイブ検索と同じ条件、ページングなしで全件）"""
+    search_filter = NewsSearchFilter()
+    # 数年分の出力に対応するためアーカイブ層も対象（期間指定でパーティションを絞り込み）
+    search_filter.include_archive = True
+    
+    if search_params.get('start_date'):
+        search_filter.start_date = datetime.fromisoformat(search_params['start_date'])
+    if search_params.get('end_date'):
+        search_filter.end_date = datetime.fromisoformat(search_params['end_date'] + 'T23:59:59')
+    if search_params.get('keyword'):
+        search_filter.keyword = search_params['keyword']
+    if search_params.get('source'):
+        search_filter.source = search_params['source']
+        search_filter.source_exact = True
+    if search_params.get('metal'):
+        search_filter.related_metals = [search_params['metal']]
+    if search_params.get('is_manual'):
+        search_filter.is_manual = search_params['is_manual'] == 'true'
+    if search_params.get('is_read'):
+        search_filter.is_read = search_params['is_read'] == 'true'
+    if search_params.get('rating'):
+        try:
+            rating_value = int(search_params['rating'])
+            if 1 <= rating_value <= 3:
+                search_filter.rating = rating_value
+        except (ValueError, TypeError):
+            pass  # 無効なレーティング値は無視
+    
+    sort_by = search_params.get('sort_by')
+    if sort_by in ['smart', 'rating_priority', 'time_desc', 'time_asc', 'rating_desc', 'rating_asc', 'relevance']:
+        search_filter.sort_by = sort_by
+    else:
+        search_filter.sort_by = 'time_desc'
+    return search_filter
+
+def _run_export_job(app, export_id: str, search_filter: NewsSearchFilter, output_path: str, export_format: str):
+    """エクスポートジョブ本体（バックグラウンドスレッドで実行）"""
+    job = app.export_jobs[export_id]
+    
+    def on_progress(exported: int, total: int):
+        job['exported'] = exported
+        job['total'] = total
+        try:
+            eel.notify_export_progress({'export_id': export_id, 'status': 'running',
+                                        'exported': exported, 'total': total})
+        except Exception:
+            pass  # UI未接続時は通知しない
+    
+    try:
+        result = app.news_exporter.export(search_filter, output_path, export_format,
+                                          progress_callback=on_progress, cancel_event=job['cancel_event'])
+        job.update({'status': 'completed', 'result': result})
+    except NewsExportCancelled as e:
+        app.logger.info(str(e))
+        job['status'] = 'cancelled'
+    except Exception as e:
+        app.logger.error(f"エクスポートエラー: {e}")
+        job.update({'status': 'failed', 'error': str(e)})
+    
+    try:
+        eel.notify_export_progress(_export_job_status(export_id, job))
+    except Exception:
+        pass
+
+def _export_job_status(export_id: str, job: Dict) -> Dict:
+    status = {
+        'export_id': export_id,
+        'status': job['status'],
+        'format': job['format'],
+        'exported': job['exported'],
+        'total': job['total']
+    }
+    if job.get('result'):
+        status['path'] = job['result']['path']
+        status['bytes'] = job['result']['bytes']
+    if job.get('error'):
+        status['error'] = job['error']
+    return status
+
+@eel.expose
+def start_news_export(search_params: Dict, export_format: str = 'csv') -> Dict:
+    """検索結果のエクスポート開始（進捗はnotify_export_progressで通知）"""
+    try:
+        app = init_app()
+        if export_format not in EXPORT_FORMATS:
+            return {'success': False, 'error': f'未対応のエクスポート形式: {export_format}'}
+        
+        search_filter = _build_export_filter(search_params or {})
+        output_path = app.news_exporter.build_output_path(export_format)
+        export_id = f"export_{int(time.time() * 1000)}"
+        
+        with app._export_lock:
+            if any(job['status'] == 'running' for job in app.export_jobs.values()):
+                return {'success': False, 'error': 'エクスポートを実行中です'}
+            app.export_jobs[export_id] = {
+                'status': 'running', 'format': export_format, 'exported': 0, 'total': 0,
+                'cancel_event': threading.Event()
+            }
+        
+        app.logger.info(f"エクスポート開始: {export_id} → {output_path}")
+        threading.Thread(target=_run_export_job, args=(app, export_id, search_filter, output_path, export_format),
+                         daemon=True).start()
+        return {'success': True, 'export_id': export_id, 'path': os.path.abspath(output_path)}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+@eel.expose
+def get_export_status(export_id: str) -> Dict:
+    """エクスポートの進捗取得"""
+    app = init_app()
+    job = app.export_jobs.get(export_id)
+    if job is None:
+        return {'success': False, 'error': 'エクスポートが見つかりません'}
+    return {'success': True, **_export_job_status(export_id, job)}
+
+@eel.expose
+def cancel_news_export(export_id: str) -> Dict:
+    """エクスポートのキャンセル（次のバッチの区切りで中断し、出力途中のファイルは削除）"""
+    app = init_app()
+    job = app.export_jobs.get(export_id)
+    if job is None:
+        return {'success': False, 'error': 'エクスポートが見つかりません'}
+    job['cancel_event'].set()
+    return {'success': True}
+
 @eel.expose
 def get_news_detail(news_id: str) -> Dict:
     """ニュース詳細取得"""
     try:
         app = init_app()
-        news = app.db_manager.get_news_by_id(news_id)
+        news = app.db_executor.run(app.db_manager.get_news_by_id, news_id,
+                                   group='news_detail', supersede=True)
+        if not news and app.archive_manager.search_archive_files:
+            # アーカイブ検索で表示した削除済みの記事
+            news = app.db_executor.run(app.archive_manager.get_archived_by_id, news_id,
+                                       group='news_detail', supersede=True)
         
         if news:
             # 日時をISO形式に変換
@@ -553,6 +849,8 @@ def get_news_detail(news_id: str) -> Dict:
             return {'success': True, **news_converted}
         else:
             return {'success': False, 'error': 'ニュースが見つかりません'}
+    except (DatabaseQueryCancelled, DatabaseQueryTimeout) as e:
+        return _cancelled_response(e)
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
@@ -641,7 +939,7 @@ def get_sources_list() -> List[str]:
     """ソース一覧取得"""
     try:
         app = init_app()
-        sources = app.db_manager.get_sources_list()
+        sources = app.db_executor.run(app.db_manager.get_sources_list, group='filters')
         app.logger.info(f"利用可能ソース一覧: {sources}")
         
         
@@ -650,12 +948,25 @@ def get_sources_list() -> List[str]:
         app.logger.error(f"ソース一覧取得エラー: {e}")
         return []
 
+@eel.expose
+def get_filter_counts() -> Dict:
+    """フィルター選択肢ごとの記事件数取得"""
+    try:
+        app = init_app()
+        return {
+            'sources': app.db_executor.run(app.db_manager.get_sources_with_counts, group='filters'),
+            'metals': app.db_executor.run(app.db_manager.get_related_metals_with_counts, group='filters')
+        }
+    except Exception as e:
+        app.logger.error(f"フィルター件数取得エラー: {e}")
+        return {'sources': [], 'metals': []}
+
 @eel.expose
 def get_metals_list() -> List[str]:
     """金属一覧取得"""
     try:
         app = init_app()
-        return app.db_manager.get_related_metals_list()
+        return app.db_executor.run(app.db_manager.get_related_metals_list, group='filters')
     except Exception as e:
         app.logger.error(f"金属一覧取得エラー: {e}")
         return []
@@ -666,35 +977,17 @@ def get_system_stats() -> Dict:
     try:
         app = init_app()
         
-        # 基本統計
-        total_news = app.db_manager.get_news_count()
-        
-        # 今日のニュース
-        today_filter = NewsSearchFilter()
-        today_filter.start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_news = app.db_manager.get_news_count(today_filter)
-        
-        # Refinitivニュース
-        refinitiv_filter = NewsSearchFilter()
-        refinitiv_filter.is_manual = False
-        refinitiv_news = app.db_manager.get_news_count(refinitiv_filter)
-        
-        # 手動登録ニュース
-        manual_filter = NewsSearchFilter()
-        manual_filter.is_manual = True
-        manual_news = app.db_manager.get_news_count(manual_filter)
-        
-        # システム統計
-        system_stats = app.db_manager.get_system_stats_summary(30)
+        # 日別集計から1クエリで取得（TTLキャッシュ経由）
+        stats = app.db_executor.run(app.db_manager.get_dashboard_stats, 30, group='stats', supersede=True)
         
         return {
-            'total_news': total_news,
-            'today_news': today_news,
-            'refinitiv_news': refinitiv_news,
-            'manual_news': manual_news,
+            'total_news': stats.get('total_news', 0),
+            'today_news': stats.get('today_news', 0),
+            'refinitiv_news': stats.get('refinitiv_news', 0),
+            'manual_news': stats.get('manual_news', 0),
             'last_update': datetime.now().isoformat(),
-            'collection_runs': system_stats.get('total_runs', 0),
-            'avg_execution_time': system_stats.get('avg_execution_time', 0)
+            'collection_runs': stats.get('collection_runs', 0),
+            'avg_execution_time': stats.get('avg_execution_time', 0)
         }
     except Exception as e:
         app.logger.error(f"統計取得エラー: {e}")
@@ -725,6 +1018,16 @@ def manual_collect_news() -> Dict:
         app.logger.error(f"手動収集エラー: {e}")
         return {'success': False, 'error': str(e)}
 
+@eel.expose
+def cancel_database_requests(group: Optional[str] = None) -> Dict:
+    """画面遷移時に実行中のデータベース処理をキャンセル（group省略時は全画面分）"""
+    try:
+        app = init_app()
+        cancelled_count = app.db_executor.cancel_group(group)
+        return {'success': True, 'cancelled_count': cancelled_count}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
 @eel.expose
 def get_app_status() -> Dict:
     """アプリケーション状態取得"""
@@ -743,6 +1046,10 @@ def get_app_status() -> Dict:
             'refinitiv_available': refinitiv_status['is_available'],
             'refinitiv_status': refinitiv_status['status'],
             'features_available': mode_info['features_available'],
+            'search_cache': app.db_manager.get_cache_stats(),
+            'db_executor': app.db_executor.get_stats(),
+            'change_notifier': app.change_notifier.get_stats(),
+            'state_buffer': app.db_manager.state_buffer.get_stats(),
             'last_update': datetime.now().isoformat()
         }
     except Exception as e:
@@ -945,18 +1252,27 @@ def get_duplicate_stats() -> Dict:
     """重複ニュース統計を取得"""
     try:
         app = init_app()
-        duplicate_stats = app.db_manager.get_duplicate_stats()
+        duplicate_stats = app.db_executor.run(app.db_manager.get_duplicate_stats, group='stats')
         return {'success': True, **duplicate_stats}
     except Exception as e:
         app.logger.error(f"重複統計取得エラー: {e}")
         return {'success': False, 'error': str(e)}
 
 @eel.expose
-def remove_duplicate_news(keep_latest: bool = True) -> Dict:
-    """重複ニュースを削除"""
+def remove_duplicate_news(keep_latest: bool = True, dry_run: bool = False) -> Dict:
+    """重複ニュースを削除（dry_run時は削除対象件数のみ取得）"""
     try:
         app = init_app()
-        deleted_count = app.db_manager.remove_duplicate_news(keep_latest)
+        deleted_count = app.db_manager.remove_duplicate_news(keep_latest, dry_run=dry_run)
+        
+        if dry_run:
+            return {
+                'success': True,
+                'dry_run': True,
+                'deleted_count': deleted_count,
+                'message': f'{deleted_count}件の重複ニュースが削除対象です'
+            }
+        
         app.logger.info(f"重複ニュース削除: {deleted_count}件")
         return {
             'success': True, 
@@ -972,7 +1288,7 @@ def find_duplicate_news() -> Dict:
     """重複ニュースを検索"""
     try:
         app = init_app()
-        duplicates = app.db_manager.find_duplicate_news()
+        duplicates = app.db_executor.run(app.db_manager.find_duplicate_news, group='stats')
         return {'success': True, 'duplicates': duplicates}
     except Exception as e:
         app.logger.error(f"重複ニュース検索エラー: {e}")
@@ -1028,7 +1344,7 @@ def update_news_rating(news_id: str, rating: int) -> Dict:
         if not isinstance(rating, int) or rating < 1 or rating > 3:
             return {'success': False, 'error': 'レーティングは1-3の整数で指定してください'}
         
-        success = app.db_manager.update_news_rating(news_id, rating)
+        success = app.db_executor.run(app.db_manager.queue_news_rating, news_id, rating)
         
         if success:
             return {'success': True, 'message': f'レーティングを{rating}星に設定しました'}
@@ -1044,7 +1360,7 @@ def clear_news_rating(news_id: str) -> Dict:
     try:
         app = init_app()
         
-        success = app.db_manager.update_news_rating(news_id, None)
+        success = app.db_executor.run(app.db_manager.queue_news_rating, news_id, None)
         
         if success:
             return {'success': True, 'message': 'レーティングをクリアしました'}
@@ -1060,7 +1376,7 @@ def mark_news_as_read(news_id: str) -> Dict:
     try:
         app = init_app()
         
-        success = app.db_manager.mark_news_as_read(news_id)
+        success = app.db_executor.run(app.db_manager.queue_read_state, news_id, True)
         
         if success:
             return {'success': True, 'message': 'ニュースを既読にマークしました'}
@@ -1076,7 +1392,7 @@ def mark_news_as_unread(news_id: str) -> Dict:
     try:
         app = init_app()
         
-        success = app.db_manager.mark_news_as_unread(news_id)
+        success = app.db_executor.run(app.db_manager.queue_read_state, news_id, False)
         
         if success:
             return {'success': True, 'message': 'ニュースを未読にマークしました'}
@@ -1086,13 +1402,38 @@ def mark_news_as_unread(news_id: str) -> Dict:
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+@eel.expose
+def get_news_changes(since_seq: Optional[int] = None) -> Dict:
+    """
+    前回取得以降の変更有無（UIの自動更新で一覧の再読み込みが必要か判定）
+    since_seq省略時は現在位置のみ返す
+    """
+    try:
+        app = init_app()
+        
+        if since_seq is None:
+            latest_seq = app.db_executor.run(app.db_manager.get_latest_change_seq)
+            return {'success': True, 'latest_seq': latest_seq, 'changed_count': 0}
+        
+        feed = app.db_executor.run(app.db_manager.get_changes_since, since_seq, 100)
+        return {
+            'success': True,
+            'latest_seq': feed['next_seq'],
+            'changed_count': len(feed['changes']),
+            'has_more': feed['has_more']
+        }
+    except (DatabaseQueryCancelled, DatabaseQueryTimeout) as e:
+        return _cancelled_response(e)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
 @eel.expose
 def mark_all_as_read(filter_conditions: Dict = None) -> Dict:
     """表示中のニュースを一括既読にマーク"""
     try:
         app = init_app()
         
-        affected_count = app.db_manager.mark_all_as_read(filter_conditions)
+        affected_count = app.db_executor.run(app.db_manager.mark_all_as_read, filter_conditions)
         
         return {
             'success': True, 
@@ -1197,19 +1538,16 @@ def fix_manual_entry_source() -> Dict:
                     'updated_count': 0
                 }
             
-            # 'Manual Entry' を '手動登録' に更新
-            cursor.execute("UPDATE news_table SET source = '手動登録' WHERE source = 'Manual Entry'")
-            
-            updated_count = cursor.rowcount
-            conn.commit()
-            
-            app.logger.info(f"ソース名更新完了: 'Manual Entry' → '手動登録' ({updated_count}件)")
-            
-            return {
-                'success': True,
-                'message': f'「Manual Entry」を「手動登録」に更新しました',
-                'updated_count': updated_count
-            }
+        # 'Manual Entry' を '手動登録' に更新（重複判定キーも再計算）
+        updated_count = app.db_manager.update_source_name('Manual Entry', '手動登録')
+        
+        app.logger.info(f"ソース名更新完了: 'Manual Entry' → '手動登録' ({updated_count}件)")
+        
+        return {
+            'success': True,
+            'message': f'「Manual Entry」を「手動登録」に更新しました',
+            'updated_count': updated_count
+        }
             
     except Exception as e:
         app.logger.error(f"ソース名更新エラー: {e}")
@@ -1345,6 +1683,9 @@ def fix_manual_filter_inconsistency() -> Dict:
                     cursor.execute("UPDATE news_table SET is_manual = 1 WHERE source = '手動登録' AND is_manual = 0")
                     updated_count = cursor.rowcount
                     
+                    # 手動フラグ別の日別集計を再構築
+                    app.db_manager.rebuild_aggregates(cursor)
+                    
                     app.logger.info(f"手動登録フラグ修正: {updated_count}件更新")
                     
                     return {
@@ -1367,6 +1708,9 @@ def fix_manual_filter_inconsistency() -> Dict:
                     cursor.execute("UPDATE news_table SET is_manual = TRUE WHERE source = '手動登録' AND is_manual = FALSE")
                     updated_count = cursor.rowcount
                     
+                    # 手動フラグ別の日別集計を再構築
+                    app.db_manager.rebuild_aggregates(cursor)
+                    
                     app.logger.info(f"手動登録フラグ修正: {updated_count}件更新")
                     
                     return {
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+保持期間を過ぎたニュースのアーカイブ出力・削除モジュール
+古い記事を圧縮ファイル（gzip NDJSON / Parquet）へ一定件数ずつ書き出し、
+小さなバッチで削除する。書き出したファイルはマニフェストに記録し、アーカイブ検索から参照できる
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from db_sync import NEWS_SYNC_COLUMNS
+
+# Parquet出力は任意（pyarrow未インストール時はNDJSONで出力）
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+ARCHIVE_COLUMNS = NEWS_SYNC_COLUMNS
+ARCHIVE_SUBDIRECTORY = "news_archive"
+MANIFEST_FILE = "archive_manifest.json"
+
+
+def _to_json_value(value):
+    """NDJSON出力用の値変換"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class NewsArchiveManager:
+    """保持期間を過ぎたニュースのアーカイブ出力・削除クラス"""
+
+    def __init__(self, db_manager, config: Dict):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            config: 全体設定（backup設定を使用）
+        """
+        self.db_manager = db_manager
+        self.db_type = db_manager.db_type
+        self.logger = logging.getLogger(__name__)
+
+        backup_config = config.get("backup", {})
+        self.enabled = backup_config.get("enable_auto_backup", False)
+        self.interval_days = backup_config.get("backup_interval_days", 7)
+        self.retention_days = backup_config.get("backup_retention_days", 30)
+        self.chunk_rows = backup_config.get("archive_chunk_rows", 10000)
+        self.purge_batch_size = backup_config.get("purge_batch_size", 500)
+        self.purge_batch_pause = backup_config.get("purge_batch_pause_seconds", 0.1)
+        self.search_archive_files = backup_config.get("search_archive_files", False)
+
+        self.archive_format = backup_config.get("archive_format", "ndjson")
+        if self.archive_format == "parquet" and not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrowがインストールされていないため、NDJSON形式でアーカイブします")
+            self.archive_format = "ndjson"
+
+        self.archive_directory = os.path.join(backup_config.get("backup_directory", "backups"), ARCHIVE_SUBDIRECTORY)
+        self.manifest_path = os.path.join(self.archive_directory, MANIFEST_FILE)
+
+    # ------------------------------------------------------------------
+    # マニフェスト
+    # ------------------------------------------------------------------
+
+    def load_manifest(self) -> Dict:
+        """マニフェスト読み込み（アーカイブ済みファイルの一覧と最終実行日時）"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'version': 1, 'last_run': None, 'chunks': []}
+
+    def _save_manifest(self, manifest: Dict):
+        """マニフェスト保存（書き込み途中で中断しても壊れないよう置き換えで保存）"""
+        os.makedirs(self.archive_directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def is_due(self) -> bool:
+        """前回実行からbackup_interval_days以上経過しているか"""
+        last_run = self.load_manifest().get('last_run')
+        if not last_run:
+            return True
+        return datetime.now() - datetime.fromisoformat(last_run) >= timedelta(days=self.interval_days)
+
+    # ------------------------------------------------------------------
+    # アーカイブ出力・削除
+    # ------------------------------------------------------------------
+
+    def run(self, max_chunks: Optional[int] = None) -> Dict:
+        """
+        保持期間を過ぎた記事をアーカイブ出力して削除
+
+        Args:
+            max_chunks: 1回の実行で処理するチャンク数の上限（Noneの場合は全件）
+
+        Returns:
+            Dict: archived_rows, chunks, files, cutoff
+        """
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        result = {'archived_rows': 0, 'chunks': 0, 'files': [], 'cutoff': cutoff.isoformat()}
+        manifest = self.load_manifest()
+
+        # 前回削除途中で中断したチャンクの削除を完了させる（再出力による重複を防ぐ）
+        for entry in manifest['chunks']:
+            if not entry.get('purged'):
+                self.logger.info(f"未完了のアーカイブ削除を再開: {entry['file']}")
+                self._purge([row['news_id'] for row in self._read_archive_file(entry)])
+                entry['purged'] = True
+                self._save_manifest(manifest)
+
+        while max_chunks is None or result['chunks'] < max_chunks:
+            entry = self._export_chunk(cutoff, len(manifest['chunks']))
+            if entry is None:
+                break
+
+            # 削除前にマニフェストへ記録（削除中に中断しても次回再開できる）
+            news_ids = entry.pop('_news_ids')
+            manifest['chunks'].append(entry)
+            self._save_manifest(manifest)
+
+            self._purge(news_ids)
+            entry['purged'] = True
+            self._save_manifest(manifest)
+
+            result['archived_rows'] += entry['rows']
+            result['chunks'] += 1
+            result['files'].append(entry['file'])
+            self.logger.info(f"アーカイブ出力: {entry['file']} ({entry['rows']}件)")
+
+            if entry['rows'] < self.chunk_rows:
+                break
+
+        if result['archived_rows']:
+            self.db_manager.rebuild_aggregates()
+            self.db_manager.update_statistics()
+
+        manifest['last_run'] = datetime.now().isoformat()
+        self._save_manifest(manifest)
+        self.logger.info(f"アーカイブ処理完了: {result['archived_rows']}件, {result['chunks']}ファイル "
+                         f"(保持期限: {cutoff:%Y-%m-%d})")
+        return result
+
+    def _select_expired_sql(self) -> str:
+        """保持期間を過ぎた記事を古い順にchunk_rows件取得するSQL"""
+        columns = ", ".join(ARCHIVE_COLUMNS)
+        if self.db_type == "postgresql":
+            return f"""
+                SELECT {columns} FROM news_table WHERE publish_time < %s
+                ORDER BY publish_time, news_id LIMIT {int(self.chunk_rows)}
+            """
+        elif self.db_type == "sqlite":
+            return f"""
+                SELECT {columns} FROM news_table WHERE publish_time < ?
+                ORDER BY publish_time, news_id LIMIT {int(self.chunk_rows)}
+            """
+        else:
+            return f"""
+                SELECT TOP ({int(self.chunk_rows)}) {columns} FROM news_table WHERE publish_time < ?
+                ORDER BY publish_time, news_id
+            """
+
+    def _export_chunk(self, cutoff: datetime, sequence: int) -> Optional[Dict]:
+        """
+        1チャンク分をファイルへ書き出す（一時ファイルに書いてから置き換え）
+
+        Returns:
+            マニフェストのエントリ（削除対象のnews_idを_news_idsに含む）。対象がなければNone
+        """
+        os.makedirs(self.archive_directory, exist_ok=True)
+        created_at = datetime.now()
+        extension = "parquet" if self.archive_format == "parquet" else "ndjson.gz"
+        file_name = f"news_{created_at:%Y%m%d%H%M%S}_{sequence:05d}.{extension}"
+        path = os.path.join(self.archive_directory, file_name)
+        temp_path = f"{path}.tmp"
+
+        publish_index = ARCHIVE_COLUMNS.index('publish_time')
+        news_ids: List[str] = []
+        min_time = max_time = None
+        batches = self.db_manager.iter_query_batches(
+            self._select_expired_sql(), (cutoff,), min(self.chunk_rows, 1000), "news_archive_export"
+        )
+
+        if self.archive_format == "parquet":
+            columns: Dict[str, list] = {column: [] for column in ARCHIVE_COLUMNS}
+            for rows in batches:
+                for row in rows:
+                    for column, value in zip(ARCHIVE_COLUMNS, row):
+                        columns[column].append(value)
+                    news_ids.append(row[0])
+            if news_ids:
+                pq.write_table(pyarrow.table(columns), temp_path, compression='zstd')
+                min_time, max_time = min(columns['publish_time']), max(columns['publish_time'])
+        else:
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                for rows in batches:
+                    for row in rows:
+                        record = {column: _to_json_value(value) for column, value in zip(ARCHIVE_COLUMNS, row)}
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        news_ids.append(row[0])
+                        publish_time = row[publish_index]
+                        min_time = publish_time if min_time is None else min(min_time, publish_time)
+                        max_time = publish_time if max_time is None else max(max_time, publish_time)
+
+        if not news_ids:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+        os.replace(temp_path, path)
+        return {
+            'file': file_name,
+            'format': self.archive_format,
+            'rows': len(news_ids),
+            'min_publish_time': min_time.isoformat(),
+            'max_publish_time': max_time.isoformat(),
+            'cutoff': cutoff.isoformat(),
+            'created_at': created_at.isoformat(),
+            'sha256': self._file_sha256(path),
+            'purged': False,
+            '_news_ids': news_ids
+        }
+
+    def _file_sha256(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _purge(self, news_ids: List[str]):
+        """
+        アーカイブ済みの記事を小さなバッチで削除（バッチごとにコミットし、ロック時間とログ増加を抑える）
+        """
+        placeholder = "%s" if self.db_type == "postgresql" else "?"
+        for start in range(0, len(news_ids), self.purge_batch_size):
+            batch = news_ids[start:start + self.purge_batch_size]
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"DELETE FROM news_table WHERE news_id IN ({', '.join(placeholder for _ in batch)})",
+                    batch
+                )
+                self.db_manager._mark_data_changed(conn)
+
+            if self.purge_batch_pause and start + self.purge_batch_size < len(news_ids):
+                time.sleep(self.purge_batch_pause)
+
+    # ------------------------------------------------------------------
+    # アーカイブファイルの検索
+    # ------------------------------------------------------------------
+
+    def _read_archive_file(self, entry: Dict) -> Iterator[Dict]:
+        """アーカイブファイルの行を順に読み出す（日時はdatetimeに戻す）"""
+        path = os.path.join(self.archive_directory, entry['file'])
+
+        if entry.get('format') == "parquet":
+            if not PYARROW_AVAILABLE:
+                self.logger.warning(f"pyarrow未インストールのためParquetアーカイブを読めません: {entry['file']}")
+                return
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=1000):
+                yield from batch.to_pylist()
+        else:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    for column in ('publish_time', 'acquire_time', 'read_at'):
+                        if record.get(column):
+                            record[column] = datetime.fromisoformat(record[column])
+                    yield record
+
+    def search_archived(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        keyword: Optional[str] = None, limit: int = 1000, ascending: bool = False) -> List[Dict]:
+        """
+        アーカイブファイルから期間・キーワードで検索（期間が重なるファイルのみ読み出す）
+
+        Args:
+            start_date: 開始日時
+            end_date: 終了日時
+            keyword: タイトル・本文のキーワード（大文字小文字を区別しない部分一致）
+            limit: 最大件数
+            ascending: Trueの場合は公開日時の古い順
+
+        Returns:
+            一覧表示用の代表記事（snippet, body_length付き、archived=True）
+        """
+        keyword_lower = keyword.lower() if keyword else None
+        snippet_length = int(self.db_manager.snippet_length)
+        matches = []
+
+        for entry in self.load_manifest()['chunks']:
+            if not entry.get('purged'):
+                continue
+            if start_date and datetime.fromisoformat(entry['max_publish_time']) < start_date:
+                continue
+            if end_date and datetime.fromisoformat(entry['min_publish_time']) > end_date:
+                continue
+
+            for record in self._read_archive_file(entry):
+                # データベースの一覧と同じく重複グループの代表記事のみ
+                if not record.get('is_canonical', True):
+                    continue
+                publish_time = record['publish_time']
+                if (start_date and publish_time < start_date) or (end_date and publish_time > end_date):
+                    continue
+                body = record.get('body') or ''
+                if keyword_lower and keyword_lower not in (record.get('title') or '').lower() \
+                        and keyword_lower not in body.lower():
+                    continue
+
+                record = dict(record, snippet=body[:snippet_length], body_length=len(body), archived=True)
+                record.pop('body', None)
+                record.pop('translation', None)
+                matches.append(record)
+
+        matches.sort(key=lambda item: (item['publish_time'], item['news_id']), reverse=not ascending)
+        return matches[:limit]
+
+    def get_archived_by_id(self, news_id: str) -> Optional[Dict]:
+        """アーカイブファイルから記事を取得（詳細表示用、全カラム）"""
+        for entry in self.load_manifest()['chunks']:
+            if not entry.get('purged'):
+                continue
+            for record in self._read_archive_file(entry):
+                if record['news_id'] == news_id:
+                    return dict(record, archived=True)
+        return None
+
+
+if __name__ == "__main__":
+    # アーカイブ処理の手動実行
+    from database_spec import SpecDatabaseManager
+
+    logging.basicConfig(level=logging.INFO)
+
+    with open("config_spec.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    manager = NewsArchiveManager(SpecDatabaseManager(config), config)
+    print(manager.run())
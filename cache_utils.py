@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+キャッシュユーティリティ
+ダッシュボード統計・検索結果などのプロセス内キャッシュ
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Hashable
+
+
+class TTLCache:
+    """有効期限付きプロセス内キャッシュ（スレッドセーフ）"""
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        """
+        初期化
+
+        Args:
+            ttl_seconds: エントリの有効期間（秒）
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """有効期限内の値を取得（期限切れ・未登録はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """値を登録"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """指定キー（省略時は全エントリ）を無効化"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class VersionedLRUCache:
+    """
+    データバージョン付きLRUキャッシュ（スレッドセーフ）
+    登録時と異なるデータバージョンで参照されたエントリは無効として扱う
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        """
+        初期化
+
+        Args:
+            max_entries: 最大エントリ数（超過時は最も古く参照されたエントリを破棄）
+            ttl_seconds: エントリの最大有効期間（秒、Noneの場合は無期限）
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """現在のデータバージョンで有効な値を取得（無効・未登録はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and (expires_at is None or time.monotonic() < expires_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, version: int, value: Any):
+        """値をデータバージョンとともに登録"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (version, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """全エントリを破棄"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ヒット率などの統計情報"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups > 0 else 0.0
+            }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+データベース変更のプッシュ通知
+PostgreSQLはトリガーのNOTIFYをLISTENで受信、SQL Server/SQLiteは変更フィードの位置のみを短い間隔で確認し、
+変更があれば登録されたリスナーを呼び出す
+"""
+
+import logging
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import psycopg2
+    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# news_tableの挿入・更新時にトリガーが通知するチャネル（models_spec.SPEC_DATABASE_SCHEMAのchange_feed）
+CHANGE_NOTIFY_CHANNEL = "news_changes"
+
+
+class DatabaseChangeNotifier:
+    """データベース変更の通知スレッド（変更フィードの位置が進んだときのみリスナーを呼び出す）"""
+
+    def __init__(self, db_manager, config: Dict):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            config: 全体設定（passive_mode設定を使用）
+        """
+        self.db_manager = db_manager
+        self.db_type = db_manager.db_type
+        self.logger = logging.getLogger(__name__)
+
+        passive_config = config.get("passive_mode", {})
+        self.enabled = passive_config.get("push_notifications", True)
+        # SQL Server/SQLiteで変更フィードの位置を確認する間隔（1秒以内に通知するため1秒未満）
+        self.poll_interval = passive_config.get("change_poll_interval_seconds", 0.5)
+        # PostgreSQLのLISTEN接続が切断された場合の再接続待ち
+        self.reconnect_seconds = passive_config.get("listen_reconnect_seconds", 5)
+
+        self._listeners: List[Callable[[int], None]] = []
+        self._latest_seq: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._active = False
+        self._stats = {'wakeups': 0, 'changes': 0, 'errors': 0}
+
+    def add_listener(self, callback: Callable[[int], None]):
+        """変更時に呼び出す関数を登録（引数は最新の変更シーケンス、通知スレッドで実行）"""
+        self._listeners.append(callback)
+
+    def start(self) -> bool:
+        """通知スレッド開始（無効設定・PostgreSQLドライバーなしの場合はFalse）"""
+        if not self.enabled:
+            return False
+        if self.db_type == "postgresql" and not PSYCOPG2_AVAILABLE:
+            self.logger.warning("psycopg2がないためデータベース変更のプッシュ通知は使用できません")
+            return False
+        if self._active:
+            return True
+
+        self._latest_seq = self.db_manager.get_latest_change_seq()
+        self._active = True
+        target = self._listen_postgresql if self.db_type == "postgresql" else self._poll_change_seq
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        self.logger.info(f"データベース変更のプッシュ通知開始（{self.db_type}）")
+        return True
+
+    def stop(self):
+        """通知スレッド停止"""
+        self._active = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    def _check_latest(self):
+        """変更フィードの位置を確認し、進んでいればリスナーを呼び出す"""
+        self._stats['wakeups'] += 1
+        latest_seq = self.db_manager.get_latest_change_seq()
+        if self._latest_seq is not None and latest_seq <= self._latest_seq:
+            return
+        self._latest_seq = latest_seq
+
+        self._stats['changes'] += 1
+        for callback in self._listeners:
+            try:
+                callback(latest_seq)
+            except Exception as e:
+                self.logger.error(f"データベース変更通知の処理エラー: {e}")
+
+    def _listen_postgresql(self):
+        """PostgreSQL: LISTENで挿入・更新トリガーのNOTIFYを待機"""
+        while self._active:
+            connection = None
+            try:
+                connection = psycopg2.connect(**self.db_manager.connection_params)
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                connection.cursor().execute(f"LISTEN {CHANGE_NOTIFY_CHANNEL}")
+                # LISTEN開始前の変更を取りこぼさないよう一度確認
+                self._check_latest()
+
+                while self._active:
+                    # 停止要求を確認するため1秒ごとに待機を抜ける
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    if connection.notifies:
+                        # 同時に届いた通知は1回の確認にまとめる
+                        connection.notifies.clear()
+                        self._check_latest()
+
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"データベース変更のLISTENエラー（{self.reconnect_seconds}秒後に再接続）: {e}")
+                time.sleep(self.reconnect_seconds)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _poll_change_seq(self):
+        """SQL Server/SQLite: 変更フィードの位置（インデックス参照のみの軽量クエリ）を短い間隔で確認"""
+        while self._active:
+            try:
+                self._check_latest()
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"データベース変更の確認エラー: {e}")
+            time.sleep(self.poll_interval)
+
+    def get_stats(self) -> Dict:
+        stats = dict(self._stats)
+        stats['active'] = self._active
+        stats['latest_seq'] = self._latest_seq
+        return stats
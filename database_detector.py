@@ -1,15 +1,28 @@
 #!/usr/bin/env python3
 """
 データベース自動検出モジュール
-PostgreSQLとSQL Serverを自動的に検出して接続
+PostgreSQLとSQL Serverを自動的に検出して接続（どちらも使えない場合はSQLite）
 """
 
-import psycopg2
-import pyodbc
 import logging
 import json
+import os
+import sqlite3
+from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+try:
+    import psycopg2
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+try:
+    import pyodbc
+    PYODBC_AVAILABLE = True
+except ImportError:
+    PYODBC_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class DatabaseDetector:
@@ -41,7 +54,13 @@ class DatabaseDetector:
         # 設定ファイルの優先設定を確認
         preferred_db = self.config.get('database', {}).get('database_type', 'postgresql')
         
-        if preferred_db == 'sqlserver':
+        if preferred_db == 'sqlite':
+            # SQLiteが指定されている場合はサーバーを探さない（パッシブモード・オフライン用）
+            sqlite_config = self._get_sqlite_config()
+            if self._test_sqlite(sqlite_config):
+                logger.info("SQLiteを使用します。")
+                return "sqlite", sqlite_config
+        elif preferred_db == 'sqlserver':
             # SQL ServerのJCLデータベースを優先的に試す（Windows環境用）
             sql_config = self._get_sqlserver_config()
             if self._test_sqlserver(sql_config):
@@ -66,7 +85,14 @@ class DatabaseDetector:
                 logger.info("SQL Server (JCL)が検出されました。SQL Serverを使用します。")
                 return "sqlserver", sql_config
         
-        # どちらも使えない場合は設定ファイルの設定を使用
+        # どちらも使えない場合はローカルのSQLiteにフォールバック
+        if preferred_db != 'sqlite':
+            sqlite_config = self._get_sqlite_config()
+            if self._test_sqlite(sqlite_config):
+                logger.warning(f"サーバーデータベースが検出できませんでした。SQLiteを使用します: {sqlite_config['sqlite_path']}")
+                return "sqlite", sqlite_config
+        
+        # SQLiteも使えない場合は設定ファイルの設定を使用
         db_config = self.config.get('database', {})
         db_type = db_config.get('database_type', 'postgresql')
         logger.warning(f"データベースが検出できませんでした。設定ファイルの設定を使用します: {db_type}")
@@ -108,8 +134,23 @@ class DatabaseDetector:
             
         return config
     
+    def _get_sqlite_config(self) -> Dict:
+        """SQLite用のデフォルト設定取得"""
+        db_config = self.config.get('database', {})
+        
+        return {
+            'database_type': 'sqlite',
+            'sqlite_path': db_config.get('sqlite_path', 'data/lme_news.db'),
+            'sqlite_reader_pool_size': db_config.get('sqlite_reader_pool_size', 4),
+            'timeout': db_config.get('timeout', 30)
+        }
+    
     def _test_postgresql(self, config: Dict) -> bool:
         """PostgreSQL接続テスト"""
+        if not PSYCOPG2_AVAILABLE:
+            logger.debug("psycopg2がインストールされていません")
+            return False
+        
         try:
             conn = psycopg2.connect(
                 host=config.get('host'),
@@ -134,6 +175,10 @@ class DatabaseDetector:
     
     def _test_sqlserver(self, config: Dict) -> bool:
         """SQL Server接続テスト"""
+        if not PYODBC_AVAILABLE:
+            logger.debug("pyodbcがインストールされていません")
+            return False
+        
         try:
             # まずWindows認証を試す
             if config.get('trusted_connection'):
@@ -178,11 +223,54 @@ class DatabaseDetector:
                 
             return False
     
+    def _test_sqlite(self, config: Dict) -> bool:
+        """SQLite接続テスト（検出だけではファイルを作成しない、FTS5が使えることも確認）"""
+        try:
+            db_path = Path(config.get('sqlite_path'))
+            
+            # FTS5はファイルに触れずインメモリDBで確認する
+            conn = sqlite3.connect(':memory:')
+            try:
+                conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(body)")
+            except sqlite3.OperationalError:
+                logger.warning("SQLiteがFTS5に対応していません")
+                return False
+            finally:
+                conn.close()
+            
+            if db_path.exists():
+                # 既存ファイルは読み取り専用で開き、SQLiteとして読めることだけ確認する
+                conn = sqlite3.connect(
+                    f"{db_path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    timeout=config.get('timeout', 30)
+                )
+                try:
+                    conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                finally:
+                    conn.close()
+            else:
+                # 未作成の場合は、作成先（最も近い既存の親ディレクトリ）に書き込めるかだけ確認する
+                parent = db_path.resolve().parent
+                while not parent.exists():
+                    parent = parent.parent
+                if not os.access(parent, os.W_OK | os.X_OK):
+                    logger.debug(f"SQLiteファイルを作成できません: {db_path}")
+                    return False
+            
+            logger.info(f"SQLite接続テスト成功: {db_path}")
+            return True
+            
+        except Exception as e:
+            logger.debug(f"SQLite接続テスト失敗: {e}")
+            return False
+    
     def get_available_databases(self) -> Dict[str, bool]:
         """利用可能なデータベースの一覧を取得"""
         result = {
             'postgresql': False,
-            'sqlserver': False
+            'sqlserver': False,
+            'sqlite': False
         }
         
         # PostgreSQLテスト
@@ -193,6 +281,9 @@ class DatabaseDetector:
         sql_config = self._get_sqlserver_config()
         result['sqlserver'] = self._test_sqlserver(sql_config)
         
+        # SQLiteテスト
+        result['sqlite'] = self._test_sqlite(self._get_sqlite_config())
+        
         return result
 
 
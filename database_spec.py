@@ -1,18 +1,77 @@
 #!/usr/bin/env python3
 """
 仕様書対応データベース管理モジュール
-PostgreSQL/SQL Server両対応設計
+PostgreSQL/SQL Server/SQLite対応設計
 """
 
-import psycopg2
-import pyodbc
-from psycopg2.extras import DictCursor
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 import logging
+import json
+import threading
+import time
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 
-from models_spec import NewsArticle, SystemStats, SPEC_DATABASE_SCHEMA, SQLSERVER_SPEC_SCHEMA, NewsSearchFilter
+# データベースドライバーは使用するバックエンドのもののみ必要
+try:
+    import psycopg2
+    from psycopg2.extras import DictCursor, execute_values
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+try:
+    import pyodbc
+    PYODBC_AVAILABLE = True
+except ImportError:
+    PYODBC_AVAILABLE = False
+
+from models_spec import NewsArticle, SystemStats, SPEC_DATABASE_SCHEMA, SQLSERVER_SPEC_SCHEMA, SQLITE_SPEC_SCHEMA, NewsSearchFilter, compute_dedup_key, CHANGE_SEQ_LOCK_BASE, extract_importance_score, compile_filter_template, QUERY_TEMPLATE_CACHE_SIZE
+from cache_utils import TTLCache, VersionedLRUCache
+from partition_manager import NewsPartitionManager
+from migration_manager import SchemaMigrationManager
+from sqlite_backend import SQLiteConnectionPool
+from write_buffer import NewsStateWriteBuffer
+
+# 一覧カードの表示に必要なカラム（本文・翻訳は詳細表示時にget_news_by_idで取得）
+LIST_COLUMNS = [
+    'news_id', 'title', 'publish_time', 'acquire_time', 'source', 'sentiment',
+    'summary', 'keywords', 'related_metals', 'is_manual', 'rating', 'is_read',
+    'read_at', 'importance_score'
+]
+
+# SQL Serverで文字列パラメータを宣言する長さ（nvarchar(4000)に固定してプランを共有）
+SQLSERVER_STRING_PARAM_SIZE = 4000
+
+# 並び順にレーティングを使わないソート（それ以外は未反映の記事状態を先に反映して検索）
+TIME_ONLY_SORTS = ("time_desc", "time_asc")
+
+class _CancellableConnection:
+    """
+    SQL Server用の接続ラッパー（作成したカーソルを記録し、別スレッドから実行中のクエリをキャンセル）
+    pyodbcの接続には接続単位のキャンセルがないため、カーソルのcancel（SQLCancel）を使用する
+    """
+    
+    def __init__(self, connection):
+        object.__setattr__(self, 'raw_connection', connection)
+        object.__setattr__(self, '_cursors', [])
+    
+    def cursor(self, *args, **kwargs):
+        cursor = self.raw_connection.cursor(*args, **kwargs)
+        self._cursors.append(cursor)
+        return cursor
+    
+    def cancel(self):
+        """この接続で作成したカーソルの実行中のクエリをキャンセル"""
+        for cursor in list(self._cursors):
+            cursor.cancel()
+    
+    def __getattr__(self, name):
+        return getattr(self.raw_connection, name)
+    
+    def __setattr__(self, name, value):
+        # timeout（SQL_ATTR_QUERY_TIMEOUT）・autocommitなどは元の接続に設定
+        setattr(self.raw_connection, name, value)
 
 class SpecDatabaseManager:
     """仕様書対応データベース管理クラス"""
@@ -31,10 +90,12 @@ class SpecDatabaseManager:
             # 全体設定が渡された場合
             db_config = config["database"]
             news_config = config.get("news_collection", {})
+            ui_config = config.get("ui_settings", {})
         else:
             # database部分のみが渡された場合
             db_config = config
             news_config = {}
+            ui_config = {}
         
         self.db_type = db_config.get("database_type", "postgresql").lower()
         self.logger = logging.getLogger(__name__)
@@ -43,6 +104,51 @@ class SpecDatabaseManager:
         self.filter_url_only = news_config.get("filter_url_only_news", True)
         self.min_body_length = news_config.get("min_body_length", 50)
         
+        # 総件数の概算設定（ui_settings設定から取得）
+        self.estimate_total_count = ui_config.get("estimate_total_count", False)
+        self.estimate_count_threshold = ui_config.get("estimate_count_threshold", 10000)
+        
+        # 一覧表示用の本文抜粋の文字数
+        self.snippet_length = ui_config.get("snippet_length", 200)
+        
+        # ダッシュボード統計キャッシュ（自動更新による再集計を抑制）
+        self._stats_cache = TTLCache(ui_config.get("stats_cache_seconds", 30))
+        
+        # 検索結果キャッシュ（書き込みごとにデータバージョンを進めて無効化）
+        # 別プロセスからの書き込みはバージョンに反映されないため有効期間で上限を設ける
+        self._result_cache = VersionedLRUCache(
+            ui_config.get("search_cache_entries", 256),
+            ui_config.get("search_cache_seconds", 60)
+        )
+        self._data_version = 0
+        self._data_version_lock = threading.Lock()
+        
+        # 既読・レーティング更新の書き込みバッファ（連続した更新をまとめて一括反映）
+        self.state_buffer = NewsStateWriteBuffer(
+            self.apply_news_state_updates,
+            ui_config.get("state_flush_interval_ms", 500),
+            ui_config.get("state_buffer_max_pending", 500)
+        )
+        
+        # 一覧クエリのSQL（検索条件の形ごとにメモ化。値はすべてパラメータ）
+        self._list_sql_templates: Dict[tuple, str] = {}
+        self._list_sql_stats = {'hits': 0, 'misses': 0}
+        self._changed_connections = set()
+        
+        # UIハンドラーからのクエリのタイムアウト・キャンセル用（スレッドごとの実行中接続）
+        # 変更済み接続・実行中接続はワーカースレッドから更新されるためロックで保護
+        self._query_context = threading.local()
+        self._active_connections: Dict[int, Any] = {}
+        self._connections_lock = threading.Lock()
+        
+        # 月次パーティション管理（アーカイブ層はメンテナンス時に設定される）
+        self.partition_manager = NewsPartitionManager(self, config if "database" in config else {})
+        self.archive_table: Optional[str] = None
+        self.archive_boundary: Optional[datetime] = None
+        
+        # スキーマのバージョン管理（起動時は適用済みバージョンの確認のみ）
+        self.migration_manager = SchemaMigrationManager(self, config if "database" in config else {})
+        
         # 接続パラメータ設定
         if self.db_type == "postgresql":
             self.connection_params = {
@@ -64,11 +170,20 @@ class SpecDatabaseManager:
                 'encrypt': db_config.get('encrypt', True),
                 'trust_server_certificate': db_config.get('trust_server_certificate', False)
             }
+        elif self.db_type == "sqlite":
+            self.connection_params = {
+                'path': db_config.get('sqlite_path', 'data/lme_news.db'),
+                'reader_pool_size': db_config.get('sqlite_reader_pool_size', 4),
+                'timeout': db_config.get('timeout', 30)
+            }
+            self._sqlite_pool = SQLiteConnectionPool(**self.connection_params)
     
     @contextmanager
     def get_connection(self):
         """データベース接続コンテキストマネージャー"""
         connection = None
+        previous_active = None
+        timeout_applied = False
         try:
             if self.db_type == "postgresql":
                 connection = psycopg2.connect(**self.connection_params)
@@ -101,49 +216,589 @@ class SpecDatabaseManager:
                 conn_str = ";" + ";".join(conn_str_parts) + ";"
                 self.logger.debug(f"SQL Server接続文字列: {conn_str.replace(self.connection_params.get('password', ''), '***')}")
                 
-                connection = pyodbc.connect(conn_str, timeout=timeout)
+                connection = _CancellableConnection(pyodbc.connect(conn_str, timeout=timeout))
+            elif self.db_type == "sqlite":
+                # 書き込み接続は1本を共有し、プール側のロックで直列化
+                connection = self._sqlite_pool.acquire_writer()
+            
+            previous_active = self._register_active_connection(connection)
+            timeout_applied = self._apply_query_timeout(connection)
             
             yield connection
             connection.commit()
             
+            # コミット後にデータバージョンを進める（コミット前の状態がキャッシュされないように）
+            if self._pop_data_changed(connection):
+                self._bump_data_version()
+            
         except Exception as e:
             if connection:
+                self._pop_data_changed(connection)
                 connection.rollback()
             self.logger.error(f"データベース操作エラー: {e}")
             raise
         finally:
             if connection:
-                connection.close()
+                self._unregister_active_connection(previous_active)
+                if self.db_type == "sqlite":
+                    if timeout_applied:
+                        connection.set_progress_handler(None, 0)
+                    self._sqlite_pool.release_writer()
+                else:
+                    connection.close()
     
-    def create_tables(self) -> bool:
-        """テーブル作成"""
+    @contextmanager
+    def get_read_connection(self):
+        """
+        読み取り専用の接続コンテキストマネージャー
+        SQLiteはWALモードの読み取り接続プールから取得（書き込み中も並行して読める）
+        その他のデータベースはget_connectionと同じ
+        """
+        if self.db_type != "sqlite":
+            with self.get_connection() as connection:
+                yield connection
+            return
+        
+        connection = self._sqlite_pool.acquire_reader()
+        previous_active = self._register_active_connection(connection)
+        timeout_applied = self._apply_query_timeout(connection)
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # スキーマ選択
-                schema = SPEC_DATABASE_SCHEMA if self.db_type == "postgresql" else SQLSERVER_SPEC_SCHEMA
-                
-                # テーブル作成
-                for table_name, create_sql in schema.items():
-                    if table_name != "indexes":
-                        self.logger.info(f"テーブル作成中: {table_name}")
-                        cursor.execute(create_sql)
-                
-                # インデックス作成
-                for index_sql in schema["indexes"]:
-                    try:
-                        cursor.execute(index_sql)
-                    except Exception as e:
-                        self.logger.warning(f"インデックス作成警告: {e}")
-                
-                self.logger.info("データベーステーブル作成完了")
+            yield connection
+        except Exception as e:
+            self.logger.error(f"データベース操作エラー: {e}")
+            raise
+        finally:
+            self._unregister_active_connection(previous_active)
+            if timeout_applied:
+                connection.set_progress_handler(None, 0)
+            self._sqlite_pool.release_reader(connection)
+    
+    @contextmanager
+    def query_timeout(self, seconds: Optional[float]):
+        """
+        現在のスレッドで開く接続にクエリタイムアウトを設定
+        
+        Args:
+            seconds: タイムアウト秒数（Noneの場合は設定しない）
+        """
+        previous = getattr(self._query_context, 'timeout', None)
+        self._query_context.timeout = seconds
+        try:
+            yield
+        finally:
+            self._query_context.timeout = previous
+    
+    def _apply_query_timeout(self, connection) -> bool:
+        """接続にクエリタイムアウトを適用（query_timeoutで設定されている場合）"""
+        seconds = getattr(self._query_context, 'timeout', None)
+        if not seconds:
+            return False
+        
+        if self.db_type == "postgresql":
+            cursor = connection.cursor()
+            cursor.execute("SET statement_timeout = %s", (int(seconds * 1000),))
+            cursor.close()
+        elif self.db_type == "sqlite":
+            # 一定命令数ごとに期限を確認し、超過していればクエリを中断
+            deadline = time.monotonic() + seconds
+            connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        else:
+            # 以降に作成するカーソルのSQL_ATTR_QUERY_TIMEOUT（秒単位）
+            connection.timeout = max(1, int(seconds))
+        return True
+    
+    def _register_active_connection(self, connection):
+        """現在のスレッドで実行中の接続を登録（入れ子の場合は外側の接続を返す）"""
+        thread_id = threading.get_ident()
+        with self._connections_lock:
+            previous = self._active_connections.get(thread_id)
+            self._active_connections[thread_id] = connection
+        return previous
+    
+    def _unregister_active_connection(self, previous):
+        """実行中の接続の登録を解除（入れ子の場合は外側の接続に戻す）"""
+        thread_id = threading.get_ident()
+        with self._connections_lock:
+            if previous is None:
+                self._active_connections.pop(thread_id, None)
+            else:
+                self._active_connections[thread_id] = previous
+    
+    def cancel_query(self, thread_id: int) -> bool:
+        """
+        指定スレッドで実行中のクエリをキャンセル
+        
+        Args:
+            thread_id: クエリを実行しているスレッドのID
+            
+        Returns:
+            bool: キャンセル要求を送信できたか
+        """
+        # 登録解除（接続のプールへの返却）はこのロックを待つため、キャンセル中に他の処理へ渡った接続は中断しない
+        with self._connections_lock:
+            connection = self._active_connections.get(thread_id)
+            if connection is None:
+                return False
+            
+            try:
+                if self.db_type == "postgresql":
+                    connection.cancel()
+                elif self.db_type == "sqlite":
+                    connection.interrupt()
+                else:
+                    # 接続で作成したカーソルのSQLCancel
+                    connection.cancel()
+                self.logger.info(f"クエリキャンセル要求送信: thread={thread_id}")
                 return True
+            except Exception as e:
+                self.logger.warning(f"クエリキャンセルエラー: {e}")
+                return False
+    
+    def iter_query_batches(self, sql: str, params: tuple = (), batch_size: int = 1000,
+                           cursor_name: str = "stream_cursor") -> Iterator[List[tuple]]:
+        """
+        クエリ結果をバッチ単位で読み出す（全件をメモリに載せない）
+        PostgreSQLは名前付きカーソル（サーバーサイド）、SQL Server・SQLiteは
+        順方向カーソルのfetchmanyで読み出す
+        
+        Args:
+            sql: SELECT文
+            params: パラメータ
+            batch_size: 1バッチの行数
+            cursor_name: PostgreSQLの名前付きカーソル名
+        """
+        with self.get_read_connection() as conn:
+            if self.db_type == "postgresql":
+                cursor = conn.cursor(name=cursor_name)
+                cursor.itersize = batch_size
+            else:
+                cursor = conn.cursor()
+            cursor.execute(sql, params)
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+            cursor.close()
+    
+    def iter_search_batches(self, search_filter: NewsSearchFilter, columns: List[str],
+                            batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        検索結果を全件バッチ単位で読み出す（エクスポート用、limit/offsetは無視）
+        一覧表示と同じ検索条件・重複除去・並び順で、batch_size件ずつ辞書のリストを返す
+        
+        Args:
+            search_filter: 検索フィルター
+            columns: 取得カラム
+            batch_size: 1バッチの行数
+        """
+        self._flush_news_state_for(search_filter)
+        
+        where_clause, params = self._build_list_where_clause(search_filter)
+        params.extend(search_filter.to_sql_order_params(self.db_type))
+        sql = f"""
+            SELECT {', '.join(columns)} FROM {self._get_news_relation(search_filter)}
+            WHERE {where_clause}
+            {search_filter.to_sql_order_clause(self.db_type)}
+        """
+        
+        for rows in self.iter_query_batches(sql, tuple(params), batch_size, "news_export_stream"):
+            batch = [dict(zip(columns, row)) for row in rows]
+            # 追加のクライアントサイドフィルタリング（本文を取得する場合のみ判定可能）
+            if self.filter_url_only and 'body' in columns:
+                batch = self._filter_url_only_news(batch)
+            yield self.state_buffer.overlay(batch)
+    
+    def close(self):
+        """未反映の記事状態を反映し、保持している接続を閉じる（SQLiteの接続プール）"""
+        self.state_buffer.close()
+        if self.db_type == "sqlite":
+            self._sqlite_pool.close_all()
+    
+    def _mark_data_changed(self, connection):
+        """接続内でニュースデータを変更したことを記録（コミット時にデータバージョンを更新）"""
+        with self._connections_lock:
+            self._changed_connections.add(self._connection_key(connection))
+    
+    def _pop_data_changed(self, connection) -> bool:
+        """接続の変更記録を取り出す（変更していればTrue）"""
+        key = self._connection_key(connection)
+        with self._connections_lock:
+            changed = key in self._changed_connections
+            self._changed_connections.discard(key)
+        return changed
+    
+    @staticmethod
+    def _connection_key(connection) -> int:
+        """変更記録のキー（SQL Serverのラッパーとcursor.connectionの元の接続を同一視）"""
+        return id(getattr(connection, 'raw_connection', connection))
+    
+    def _bump_data_version(self):
+        """データバージョンを進め、検索結果キャッシュ・ダッシュボード統計キャッシュを無効化"""
+        with self._data_version_lock:
+            self._data_version += 1
+        self._stats_cache.invalidate()
+    
+    def invalidate_result_cache(self):
+        """検索結果キャッシュを無効化（別プロセスによる更新を検知した場合など）"""
+        self._bump_data_version()
+    
+    def get_cache_stats(self) -> Dict:
+        """検索結果キャッシュの統計情報（ヒット率など）"""
+        stats = self._result_cache.get_stats()
+        stats['data_version'] = self._data_version
+        
+        template_info = compile_filter_template.cache_info()
+        stats['query_templates'] = {
+            'list_shapes': len(self._list_sql_templates),
+            'list_hits': self._list_sql_stats['hits'],
+            'list_misses': self._list_sql_stats['misses'],
+            'filter_hits': template_info.hits,
+            'filter_misses': template_info.misses
+        }
+        return stats
+    
+    def create_tables(self) -> bool:
+        """
+        テーブル作成（スキーマバージョンを確認し、未適用のマイグレーションのみ実行）
+        最新バージョンのデータベースではバージョン確認のみで終了する
+        """
+        try:
+            if not self.migration_manager.migrate():
+                return False
+            
+            # 月次パーティションのメンテナンス（設定で有効な場合）
+            partition_result = self.partition_manager.maintain()
+            if partition_result['converted']:
+                # 変換時に旧テーブルのインデックスが削除されるため親テーブルに再作成
+                # 更新時の採番トリガーも旧テーブルとともに削除されるため再作成
+                schema = self._get_schema()
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    self._create_change_feed(cursor, schema)
+                    self._create_indexes(cursor, schema)
+                self.migration_manager.reapply_indexes()
+            return True
                 
         except Exception as e:
             self.logger.error(f"テーブル作成エラー: {e}")
             return False
     
+    def apply_base_schema(self):
+        """初期スキーマ（テーブル・追加カラム・変更フィード・基本インデックス・全文検索・集計テーブル）を作成"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # スキーマ選択
+            schema = self._get_schema()
+            
+            # テーブル作成
+            for table_name, create_sql in schema.items():
+                if table_name not in ("columns", "change_feed", "indexes", "search_index", "online_indexes", "retired_indexes"):
+                    self.logger.info(f"テーブル作成中: {table_name}")
+                    cursor.execute(create_sql)
+            
+            # 既存テーブルへのカラム追加
+            for column_sql in schema.get("columns", []):
+                cursor.execute(column_sql)
+            
+            # 変更フィード（change_seqの採番トリガー）
+            self._create_change_feed(cursor, schema)
+            
+            # インデックス作成
+            self._create_indexes(cursor, schema)
+            
+            # 全文検索インデックス作成（SQLiteのみ）
+            if schema.get("search_index"):
+                self._create_search_index(cursor, schema)
+            
+            # 既存データから集計テーブルを初期構築
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM news_daily_rollup),
+                       (SELECT COUNT(*) FROM news_source_counts)
+            """)
+            rollup_rows, source_rows = cursor.fetchone()
+            if rollup_rows == 0 or source_rows == 0:
+                self.rebuild_aggregates(cursor)
+            
+            self.logger.info("データベーステーブル作成完了")
+    
+    def _get_schema(self) -> Dict:
+        """データベースタイプに対応するスキーマ定義"""
+        if self.db_type == "postgresql":
+            return SPEC_DATABASE_SCHEMA
+        elif self.db_type == "sqlite":
+            return SQLITE_SPEC_SCHEMA
+        else:
+            return SQLSERVER_SPEC_SCHEMA
+    
+    def _create_search_index(self, cursor, schema: Dict):
+        """SQLiteの全文検索インデックスを作成（新規作成時は既存記事から構築）"""
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'news_fts'")
+        is_new_index = cursor.fetchone()[0] == 0
+        
+        for index_sql in schema["search_index"]:
+            cursor.execute(index_sql)
+        
+        if is_new_index:
+            cursor.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+            self.logger.info("全文検索インデックス構築完了")
+    
+    def apply_change_feed(self):
+        """変更フィードの採番トリガー等を再作成（スキーママイグレーション用）"""
+        with self.get_connection() as conn:
+            self._create_change_feed(conn.cursor(), self._get_schema())
+    
+    def _create_change_feed(self, cursor, schema: Dict):
+        """変更フィード用のchange_seq採番トリガー等を作成（SQL Serverはrowversionのため不要）"""
+        if self.db_type == "sqlite":
+            # change_seq追加前に作成されたデータベースはカラムを追加し既存行はrowid順で採番
+            cursor.execute("PRAGMA table_info(news_table)")
+            if 'change_seq' not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE news_table ADD COLUMN change_seq INTEGER")
+                cursor.execute("UPDATE news_table SET change_seq = rowid")
+        
+        for feed_sql in schema.get("change_feed", []):
+            cursor.execute(feed_sql)
+    
+    def _convert_rowversion(self, rows: List[Dict]) -> List[Dict]:
+        """SQL Server: 全カラム取得時のrowversion（change_seq、binary(8)）を整数に変換"""
+        for row in rows:
+            if isinstance(row.get('change_seq'), (bytes, bytearray)):
+                row['change_seq'] = int.from_bytes(row['change_seq'], 'big')
+        return rows
+    
+    def _create_indexes(self, cursor, schema: Dict):
+        """スキーマ定義のインデックスを作成"""
+        for index_sql in schema["indexes"]:
+            try:
+                cursor.execute(index_sql)
+            except Exception as e:
+                self.logger.warning(f"インデックス作成警告: {e}")
+    
+    def backfill_dedup_keys(self, batch_size: int = 1000, pause_seconds: float = 0.0) -> int:
+        """
+        重複判定キー未設定の記事にキーを設定し、代表記事フラグを再計算
+        バッチごとにコミットするため、大量の既存行でも長時間のロックを保持しない
+        
+        Args:
+            batch_size: 1回の更新件数
+            pause_seconds: バッチ間の待機秒数（他の処理への影響を抑える）
+            
+        Returns:
+            int: キーを設定した件数
+            
+        Raises:
+            Exception: 補完途中のエラー（スキーママイグレーションを未適用のまま残し、次回起動時に再実行するため）
+        """
+        updated_count = 0
+        
+        if self.db_type == "postgresql":
+            select_sql = "SELECT news_id, title, source FROM news_table WHERE dedup_key IS NULL LIMIT %s"
+            update_sql = "UPDATE news_table SET dedup_key = %s WHERE news_id = %s"
+        elif self.db_type == "sqlite":
+            select_sql = "SELECT news_id, title, source FROM news_table WHERE dedup_key IS NULL LIMIT ?"
+            update_sql = "UPDATE news_table SET dedup_key = ? WHERE news_id = ?"
+        else:
+            select_sql = "SELECT TOP (?) news_id, title, source FROM news_table WHERE dedup_key IS NULL"
+            update_sql = "UPDATE news_table SET dedup_key = ? WHERE news_id = ?"
+        
+        try:
+            while True:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(select_sql, (batch_size,))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    
+                    cursor.executemany(update_sql, [
+                        (compute_dedup_key(row[1], row[2]), row[0]) for row in rows
+                    ])
+                    updated_count += len(rows)
+                
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+            
+            if updated_count > 0:
+                with self.get_connection() as conn:
+                    self._mark_data_changed(conn)
+                    self._refresh_all_canonical_flags(conn.cursor())
+                self.logger.info(f"重複判定キー補完完了: {updated_count}件")
+            
+            return updated_count
+            
+        except Exception as e:
+            self.logger.error(f"重複判定キー補完エラー（{updated_count}件まで補完済み）: {e}")
+            raise
+    
+    def backfill_importance_scores(self, batch_size: int = 1000, pause_seconds: float = 0.0) -> int:
+        """
+        keywordsに埋め込まれた旧形式の重要度タグ（[重要度:N/10]）をimportance_scoreカラムへ移行
+        バッチごとにコミットするため、大量の既存行でも長時間のロックを保持しない
+        
+        Args:
+            batch_size: 1回の更新件数
+            pause_seconds: バッチ間の待機秒数（他の処理への影響を抑える）
+            
+        Returns:
+            int: 移行した件数
+            
+        Raises:
+            Exception: 移行途中のエラー（スキーママイグレーションを未適用のまま残し、次回起動時に再実行するため）
+        """
+        updated_count = 0
+        
+        if self.db_type == "postgresql":
+            select_sql = """
+                SELECT news_id, keywords FROM news_table
+                WHERE importance_score IS NULL AND keywords LIKE %s AND news_id > %s
+                ORDER BY news_id LIMIT %s
+            """
+            update_sql = "UPDATE news_table SET importance_score = %s, keywords = %s WHERE news_id = %s"
+            select_params = lambda last_id: ('%重要度:%', last_id, batch_size)
+        elif self.db_type == "sqlite":
+            select_sql = """
+                SELECT news_id, keywords FROM news_table
+                WHERE importance_score IS NULL AND keywords LIKE ? AND news_id > ?
+                ORDER BY news_id LIMIT ?
+            """
+            update_sql = "UPDATE news_table SET importance_score = ?, keywords = ? WHERE news_id = ?"
+            select_params = lambda last_id: ('%重要度:%', last_id, batch_size)
+        else:
+            select_sql = """
+                SELECT TOP (?) news_id, keywords FROM news_table
+                WHERE importance_score IS NULL AND keywords LIKE ? AND news_id > ?
+                ORDER BY news_id
+            """
+            update_sql = "UPDATE news_table SET importance_score = ?, keywords = ? WHERE news_id = ?"
+            select_params = lambda last_id: (batch_size, '%重要度:%', last_id)
+        
+        try:
+            # タグの形式が不正な行で停滞しないようnews_id順に走査
+            last_id = ''
+            while True:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(select_sql, select_params(last_id))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    
+                    updates = []
+                    for news_id, keywords in rows:
+                        score, cleaned_keywords = extract_importance_score(keywords)
+                        if score is not None:
+                            updates.append((score, cleaned_keywords, news_id))
+                    
+                    if updates:
+                        cursor.executemany(update_sql, updates)
+                        updated_count += len(updates)
+                        self._mark_data_changed(conn)
+                
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+            
+            if updated_count > 0:
+                self.logger.info(f"重要度スコア移行完了: {updated_count}件")
+            
+            return updated_count
+            
+        except Exception as e:
+            self.logger.error(f"重要度スコア移行エラー（{updated_count}件まで移行済み）: {e}")
+            raise
+    
+    def _refresh_all_canonical_flags(self, cursor):
+        """全記事の代表記事フラグを再計算（重複グループ内で最新の記事を代表とする）"""
+        if self.db_type == "postgresql":
+            sql = """
+                UPDATE news_table AS n
+                SET is_canonical = (n.news_id = r.news_id)
+                FROM (
+                    SELECT DISTINCT ON (dedup_key) dedup_key, news_id
+                    FROM news_table
+                    WHERE dedup_key IS NOT NULL
+                    ORDER BY dedup_key, publish_time DESC, news_id DESC
+                ) r
+                WHERE n.dedup_key = r.dedup_key
+                  AND n.is_canonical IS DISTINCT FROM (n.news_id = r.news_id)
+            """
+        elif self.db_type == "sqlite":
+            sql = """
+                UPDATE news_table AS n
+                SET is_canonical = (n.news_id = r.news_id)
+                FROM (
+                    SELECT dedup_key, news_id,
+                           ROW_NUMBER() OVER (PARTITION BY dedup_key ORDER BY publish_time DESC, news_id DESC) AS rn
+                    FROM news_table
+                    WHERE dedup_key IS NOT NULL
+                ) r
+                WHERE r.rn = 1
+                  AND n.dedup_key = r.dedup_key
+                  AND n.is_canonical IS NOT (n.news_id = r.news_id)
+            """
+        else:
+            sql = """
+                WITH ranked AS (
+                    SELECT is_canonical,
+                           ROW_NUMBER() OVER (PARTITION BY dedup_key ORDER BY publish_time DESC, news_id DESC) AS rn
+                    FROM news_table
+                    WHERE dedup_key IS NOT NULL
+                )
+                UPDATE ranked
+                SET is_canonical = CASE WHEN rn = 1 THEN 1 ELSE 0 END
+                WHERE is_canonical <> CASE WHEN rn = 1 THEN 1 ELSE 0 END
+            """
+        
+        cursor.execute(sql)
+        self.logger.debug(f"代表記事フラグ再計算: {cursor.rowcount}件更新")
+    
+    def _refresh_canonical_flag(self, cursor, dedup_key: str):
+        """指定キーの重複グループ内で代表記事フラグを再計算（インデックス検索のみ）"""
+        if self.db_type == "postgresql":
+            sql = """
+                UPDATE news_table
+                SET is_canonical = (news_id = (
+                    SELECT news_id FROM news_table
+                    WHERE dedup_key = %s
+                    ORDER BY publish_time DESC, news_id DESC
+                    LIMIT 1
+                ))
+                WHERE dedup_key = %s
+            """
+        elif self.db_type == "sqlite":
+            sql = """
+                UPDATE news_table
+                SET is_canonical = (news_id = (
+                    SELECT news_id FROM news_table
+                    WHERE dedup_key = ?
+                    ORDER BY publish_time DESC, news_id DESC
+                    LIMIT 1
+                ))
+                WHERE dedup_key = ?
+            """
+        else:
+            sql = """
+                UPDATE news_table
+                SET is_canonical = CASE WHEN news_id = (
+                    SELECT TOP 1 news_id FROM news_table
+                    WHERE dedup_key = ?
+                    ORDER BY publish_time DESC, news_id DESC
+                ) THEN 1 ELSE 0 END
+                WHERE dedup_key = ?
+            """
+        
+        cursor.execute(sql, (dedup_key, dedup_key))
+    
+    def _get_canonical_filter(self) -> str:
+        """代表記事のみを対象にするフィルター条件"""
+        if self.db_type == "postgresql":
+            return "is_canonical = TRUE"
+        else:
+            return "is_canonical = 1"
+    
     def insert_news_article(self, article: NewsArticle) -> bool:
         """ニュース記事挿入"""
         try:
@@ -153,30 +808,42 @@ class SpecDatabaseManager:
                 # デバッグログ：挿入前の記事情報をログ出力
                 self.logger.info(f"ニュース記事挿入開始: news_id={article.news_id}, title='{article.title[:50]}...', is_manual={article.is_manual}")
                 
+                # 更新時のソース別・金属別件数の差分計算・重複グループの付け替え用に既存値を取得
                 if self.db_type == "postgresql":
-                    sql = """
+                    cursor.execute("SELECT source, related_metals, publish_time, dedup_key FROM news_table WHERE news_id = %s", (article.news_id,))
+                else:
+                    cursor.execute("SELECT source, related_metals, publish_time, dedup_key FROM news_table WHERE news_id = ?", (article.news_id,))
+                previous = cursor.fetchone()
+                
+                # 公開日時は更新しないため既存記事の値を使用（パーティションテーブルでは競合判定キーの一部）
+                publish_time = previous[2] if previous else article.publish_time
+                
+                if self.db_type == "postgresql":
+                    sql = f"""
                         INSERT INTO news_table (
                             news_id, title, body, publish_time, acquire_time, 
                             source, url, sentiment, summary, keywords, 
-                            related_metals, translation, is_manual, rating
+                            related_metals, translation, is_manual, rating, dedup_key
                         ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        ) ON CONFLICT (news_id) DO UPDATE SET
+                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        ) ON CONFLICT ({self._get_news_conflict_columns()}) DO UPDATE SET
                             title = EXCLUDED.title,
                             body = EXCLUDED.body,
                             source = EXCLUDED.source,
                             url = EXCLUDED.url,
                             related_metals = EXCLUDED.related_metals,
                             translation = EXCLUDED.translation,
-                            rating = EXCLUDED.rating
+                            rating = EXCLUDED.rating,
+                            dedup_key = EXCLUDED.dedup_key
+                        RETURNING (xmax = 0) AS inserted
                     """
                 elif self.db_type == "sqlserver":
                     sql = """
                         MERGE news_table AS target
-                        USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)) AS source 
+                        USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)) AS source 
                                (news_id, title, body, publish_time, acquire_time, 
                                 source, url, sentiment, summary, keywords, 
-                                related_metals, translation, is_manual, rating)
+                                related_metals, translation, is_manual, rating, dedup_key)
                         ON target.news_id = source.news_id
                         WHEN MATCHED THEN
                             UPDATE SET title = source.title,
@@ -185,15 +852,36 @@ class SpecDatabaseManager:
                                       url = source.url,
                                       related_metals = source.related_metals,
                                       translation = source.translation,
-                                      rating = source.rating
+                                      rating = source.rating,
+                                      dedup_key = source.dedup_key
                         WHEN NOT MATCHED THEN
                             INSERT (news_id, title, body, publish_time, acquire_time,
                                    source, url, sentiment, summary, keywords,
-                                   related_metals, translation, is_manual, rating)
+                                   related_metals, translation, is_manual, rating, dedup_key)
                             VALUES (source.news_id, source.title, source.body, 
                                    source.publish_time, source.acquire_time, source.source,
                                    source.url, source.sentiment, source.summary, 
-                                   source.keywords, source.related_metals, source.translation, source.is_manual, source.rating);
+                                   source.keywords, source.related_metals, source.translation, source.is_manual, source.rating,
+                                   source.dedup_key)
+                        OUTPUT $action;
+                    """
+                elif self.db_type == "sqlite":
+                    sql = """
+                        INSERT INTO news_table (
+                            news_id, title, body, publish_time, acquire_time, 
+                            source, url, sentiment, summary, keywords, 
+                            related_metals, translation, is_manual, rating, dedup_key
+                        ) VALUES (
+                            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                        ) ON CONFLICT (news_id) DO UPDATE SET
+                            title = excluded.title,
+                            body = excluded.body,
+                            source = excluded.source,
+                            url = excluded.url,
+                            related_metals = excluded.related_metals,
+                            translation = excluded.translation,
+                            rating = excluded.rating,
+                            dedup_key = excluded.dedup_key
                     """
                 
                 # SQL ServerのBIT型対応
@@ -207,7 +895,7 @@ class SpecDatabaseManager:
                     article.news_id,
                     article.title,
                     article.body,
-                    article.publish_time,
+                    publish_time,
                     article.acquire_time,
                     article.source,
                     article.url,
@@ -217,19 +905,42 @@ class SpecDatabaseManager:
                     article.related_metals,
                     article.translation,
                     is_manual_value,
-                    article.rating
+                    article.rating,
+                    article.dedup_key
                 )
                 self.logger.debug(f"実行SQL: {sql}")
                 self.logger.debug(f"パラメータ: news_id={params[0]}, title='{params[1][:30]}...', source='{params[5]}', is_manual={params[11]}")
                 
                 cursor.execute(sql, params)
+                self._mark_data_changed(conn)
                 
-                # SQL Serverでの影響行数確認
-                if self.db_type == "sqlserver":
-                    affected_rows = cursor.rowcount
-                    self.logger.info(f"SQL Server MERGE実行完了: 影響行数={affected_rows}")
+                # 新規挿入か既存記事の更新かを判定
+                if self.db_type == "sqlite":
+                    # 書き込み接続は直列化されているため事前取得した既存値で判定できる
+                    inserted = previous is None
+                    self.logger.info(f"SQLite INSERT実行完了: inserted={inserted}")
                 else:
-                    self.logger.info(f"PostgreSQL INSERT実行完了")
+                    result = cursor.fetchone()
+                    if self.db_type == "sqlserver":
+                        inserted = bool(result) and result[0] == 'INSERT'
+                        self.logger.info(f"SQL Server MERGE実行完了: action={result[0] if result else None}")
+                    else:
+                        inserted = bool(result) and bool(result[0])
+                        self.logger.info(f"PostgreSQL INSERT実行完了: inserted={inserted}")
+                
+                # 新規挿入時のみ日別集計を加算（更新では公開日時・手動フラグは変わらない）
+                if inserted:
+                    self._apply_rollup_delta(cursor, article.publish_time, article.is_manual, 1)
+                    self._apply_lookup_delta(cursor, article.source, article.related_metals, 1)
+                elif previous:
+                    self._apply_lookup_change(cursor, previous[0], previous[1], article.source, article.related_metals)
+                
+                # 重複グループ内の代表記事フラグを更新
+                self._refresh_canonical_flag(cursor, article.dedup_key)
+                
+                # タイトル・ソースの変更で重複グループが変わった場合は元のグループも再計算
+                if previous and previous[3] and previous[3] != article.dedup_key:
+                    self._refresh_canonical_flag(cursor, previous[3])
                 
                 # 挿入後の確認：実際にデータが保存されたかチェック
                 self._verify_insertion(cursor, article.news_id)
@@ -241,6 +952,12 @@ class SpecDatabaseManager:
             self.logger.error(f"挿入失敗記事: news_id={article.news_id}, title='{article.title[:50]}...'")
             return False
     
+    def _get_news_conflict_columns(self) -> str:
+        """PostgreSQLのUPSERT競合判定カラム（パーティションテーブルは主キーに公開日時を含む）"""
+        if not hasattr(self, '_news_table_partitioned'):
+            self._news_table_partitioned = self.partition_manager.is_partitioned()
+        return "news_id, publish_time" if self._news_table_partitioned else "news_id"
+    
     def _verify_insertion(self, cursor, news_id: str):
         """挿入確認のためのヘルパーメソッド"""
         try:
@@ -260,133 +977,655 @@ class SpecDatabaseManager:
         except Exception as e:
             self.logger.error(f"挿入確認エラー: {e}")
     
+    def _apply_rollup_delta(self, cursor, publish_time: datetime, is_manual: bool, delta: int):
+        """日別集計の件数を増減"""
+        rollup_date = publish_time.date() if isinstance(publish_time, datetime) else publish_time
+        
+        if self.db_type == "postgresql":
+            sql = """
+                INSERT INTO news_daily_rollup (rollup_date, is_manual, article_count)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (rollup_date, is_manual) DO UPDATE SET
+                    article_count = news_daily_rollup.article_count + EXCLUDED.article_count
+            """
+            cursor.execute(sql, (rollup_date, bool(is_manual), delta))
+        elif self.db_type == "sqlite":
+            sql = """
+                INSERT INTO news_daily_rollup (rollup_date, is_manual, article_count)
+                VALUES (?, ?, ?)
+                ON CONFLICT (rollup_date, is_manual) DO UPDATE SET
+                    article_count = news_daily_rollup.article_count + excluded.article_count
+            """
+            cursor.execute(sql, (rollup_date, 1 if is_manual else 0, delta))
+        else:
+            sql = """
+                MERGE news_daily_rollup WITH (HOLDLOCK) AS target
+                USING (VALUES (?, ?, ?)) AS source (rollup_date, is_manual, delta)
+                ON target.rollup_date = source.rollup_date AND target.is_manual = source.is_manual
+                WHEN MATCHED THEN
+                    UPDATE SET article_count = target.article_count + source.delta
+                WHEN NOT MATCHED THEN
+                    INSERT (rollup_date, is_manual, article_count)
+                    VALUES (source.rollup_date, source.is_manual, source.delta);
+            """
+            cursor.execute(sql, (rollup_date, 1 if is_manual else 0, delta))
+    
+    def _apply_lookup_delta(self, cursor, source: Optional[str], related_metals: Optional[str], delta: int):
+        """ソース別・金属別件数を増減"""
+        if self.db_type == "postgresql":
+            source_sql = """
+                INSERT INTO news_source_counts (source, article_count) VALUES (%s, %s)
+                ON CONFLICT (source) DO UPDATE SET
+                    article_count = news_source_counts.article_count + EXCLUDED.article_count
+            """
+            metal_sql = """
+                INSERT INTO news_metal_counts (metal, article_count) VALUES (%s, %s)
+                ON CONFLICT (metal) DO UPDATE SET
+                    article_count = news_metal_counts.article_count + EXCLUDED.article_count
+            """
+        elif self.db_type == "sqlite":
+            source_sql = """
+                INSERT INTO news_source_counts (source, article_count) VALUES (?, ?)
+                ON CONFLICT (source) DO UPDATE SET
+                    article_count = news_source_counts.article_count + excluded.article_count
+            """
+            metal_sql = """
+                INSERT INTO news_metal_counts (metal, article_count) VALUES (?, ?)
+                ON CONFLICT (metal) DO UPDATE SET
+                    article_count = news_metal_counts.article_count + excluded.article_count
+            """
+        else:
+            source_sql = """
+                MERGE news_source_counts WITH (HOLDLOCK) AS target
+                USING (VALUES (?, ?)) AS source (source, delta)
+                ON target.source = source.source
+                WHEN MATCHED THEN
+                    UPDATE SET article_count = target.article_count + source.delta
+                WHEN NOT MATCHED THEN
+                    INSERT (source, article_count) VALUES (source.source, source.delta);
+            """
+            metal_sql = """
+                MERGE news_metal_counts WITH (HOLDLOCK) AS target
+                USING (VALUES (?, ?)) AS source (metal, delta)
+                ON target.metal = source.metal
+                WHEN MATCHED THEN
+                    UPDATE SET article_count = target.article_count + source.delta
+                WHEN NOT MATCHED THEN
+                    INSERT (metal, article_count) VALUES (source.metal, source.delta);
+            """
+        
+        if source:
+            cursor.execute(source_sql, (source, delta))
+        
+        metals = self._split_metals(related_metals)
+        if metals:
+            cursor.executemany(metal_sql, [(metal, delta) for metal in sorted(metals)])
+    
+    def _apply_lookup_change(self, cursor, old_source: Optional[str], old_metals: Optional[str],
+                             new_source: Optional[str], new_metals: Optional[str]):
+        """記事更新時のソース・関連金属の変更分のみ件数へ反映"""
+        if old_source != new_source:
+            self._apply_lookup_delta(cursor, old_source, None, -1)
+            self._apply_lookup_delta(cursor, new_source, None, 1)
+        
+        old_set = self._split_metals(old_metals)
+        new_set = self._split_metals(new_metals)
+        if old_set != new_set:
+            self._apply_lookup_delta(cursor, None, ','.join(old_set - new_set), -1)
+            self._apply_lookup_delta(cursor, None, ','.join(new_set - old_set), 1)
+    
+    @staticmethod
+    def _split_metals(related_metals: Optional[str]) -> set:
+        """カンマ区切りの関連金属文字列を集合に変換"""
+        if not related_metals:
+            return set()
+        return {metal.strip() for metal in related_metals.split(',') if metal.strip()}
+    
+    def rebuild_aggregates(self, cursor=None) -> bool:
+        """
+        集計テーブル（日別集計・ソース別・金属別件数）をnews_tableから再構築
+        一括削除・一括更新・フラグ修正後に使用
+        
+        Args:
+            cursor: 指定時は呼び出し元のトランザクション内で再構築
+        """
+        if self.db_type == "postgresql":
+            metal_rebuild_sql = """
+                INSERT INTO news_metal_counts (metal, article_count)
+                SELECT TRIM(metal), COUNT(DISTINCT news_id)
+                FROM news_table, unnest(string_to_array(related_metals, ',')) AS metal
+                WHERE related_metals IS NOT NULL AND TRIM(metal) <> ''
+                GROUP BY TRIM(metal)
+            """
+        elif self.db_type == "sqlite":
+            # SQLiteには文字列分割関数がないため再帰CTEで分割
+            metal_rebuild_sql = """
+                WITH RECURSIVE split (news_id, metal, rest) AS (
+                    SELECT news_id, '', related_metals || ','
+                    FROM news_table
+                    WHERE related_metals IS NOT NULL
+                    UNION ALL
+                    SELECT news_id, substr(rest, 1, instr(rest, ',') - 1), substr(rest, instr(rest, ',') + 1)
+                    FROM split
+                    WHERE rest <> ''
+                )
+                INSERT INTO news_metal_counts (metal, article_count)
+                SELECT TRIM(metal), COUNT(DISTINCT news_id)
+                FROM split
+                WHERE TRIM(metal) <> ''
+                GROUP BY TRIM(metal)
+            """
+        else:
+            metal_rebuild_sql = """
+                INSERT INTO news_metal_counts (metal, article_count)
+                SELECT LTRIM(RTRIM(m.value)), COUNT(DISTINCT n.news_id)
+                FROM news_table n
+                CROSS APPLY STRING_SPLIT(n.related_metals, ',') m
+                WHERE n.related_metals IS NOT NULL AND LTRIM(RTRIM(m.value)) <> ''
+                GROUP BY LTRIM(RTRIM(m.value))
+            """
+        
+        # SQLiteのCASTは数値に変換されるためdate()で日付部分を取り出す
+        date_expr = "date(publish_time)" if self.db_type == "sqlite" else "CAST(publish_time AS DATE)"
+        
+        rebuild_sqls = [
+            "DELETE FROM news_daily_rollup",
+            f"""
+                INSERT INTO news_daily_rollup (rollup_date, is_manual, article_count)
+                SELECT {date_expr}, is_manual, COUNT(*)
+                FROM news_table
+                WHERE is_manual IS NOT NULL
+                GROUP BY {date_expr}, is_manual
+            """,
+            "DELETE FROM news_source_counts",
+            """
+                INSERT INTO news_source_counts (source, article_count)
+                SELECT source, COUNT(*)
+                FROM news_table
+                GROUP BY source
+            """,
+            "DELETE FROM news_metal_counts",
+            metal_rebuild_sql
+        ]
+        
+        try:
+            # 手動フラグ修正などの一括更新後にも呼ばれるため、検索結果キャッシュも無効化する
+            if cursor is not None:
+                for sql in rebuild_sqls:
+                    cursor.execute(sql)
+                self._mark_data_changed(cursor.connection)
+            else:
+                with self.get_connection() as conn:
+                    rebuild_cursor = conn.cursor()
+                    for sql in rebuild_sqls:
+                        rebuild_cursor.execute(sql)
+                    self._mark_data_changed(conn)
+            
+            self.logger.info("集計テーブル再構築完了")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"集計テーブル再構築エラー: {e}")
+            if cursor is not None:
+                raise
+            return False
+    
+    def update_statistics(self) -> bool:
+        """
+        news_tableの統計情報を更新（大量投入・削除後にクエリプランの推定行数を実態に合わせる）
+        SQLiteはANALYZEを実行するまでインデックスの選択性が分からず、複合インデックスを選ばないことがある
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                if self.db_type == "postgresql":
+                    cursor.execute("ANALYZE news_table")
+                elif self.db_type == "sqlite":
+                    cursor.execute("ANALYZE")
+                else:
+                    cursor.execute("UPDATE STATISTICS news_table")
+            
+            self.logger.info("統計情報更新完了")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"統計情報更新エラー: {e}")
+            return False
+    
     def insert_news_batch(self, articles: List[NewsArticle]) -> int:
         """ニュース記事一括挿入"""
         successful_inserts = 0
         
-        for article in articles:
-            if self.insert_news_article(article):
-                successful_inserts += 1
+        for article in articles:
+            if self.insert_news_article(article):
+                successful_inserts += 1
+        
+        self.logger.info(f"一括挿入完了: {successful_inserts}/{len(articles)} 件成功")
+        return successful_inserts
+    
+    def insert_system_stats(self, stats: SystemStats) -> bool:
+        """システム統計挿入"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                if self.db_type == "postgresql":
+                    sql = """
+                        INSERT INTO system_stats (
+                            collection_date, total_collected, successful_queries, failed_queries,
+                            api_calls_made, errors_encountered, execution_time_seconds
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """
+                else:
+                    sql = """
+                        INSERT INTO system_stats (
+                            collection_date, total_collected, successful_queries, failed_queries,
+                            api_calls_made, errors_encountered, execution_time_seconds
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """
+                
+                cursor.execute(sql, (
+                    stats.collection_date,
+                    stats.total_collected,
+                    stats.successful_queries,
+                    stats.failed_queries,
+                    stats.api_calls_made,
+                    stats.errors_encountered,
+                    stats.execution_time_seconds
+                ))
+                
+                # コミット後にダッシュボード統計キャッシュを無効化
+                self._mark_data_changed(conn)
+                return True
+                
+        except Exception as e:
+            self.logger.error(f"統計データ挿入エラー: {e}")
+            return False
+    
+    def _build_list_where_clause(self, search_filter: NewsSearchFilter) -> Tuple[str, list]:
+        """
+        一覧表示用のWHERE句を生成（検索条件 + URLのみ本文の除外 + 重複除去）
+        
+        Args:
+            search_filter: 検索フィルター
+            
+        Returns:
+            (where_clause, parameters)
+        """
+        # WHERE句とパラメータ生成
+        where_clause, params = search_filter.to_sql_where_clause(self.db_type)
+        
+        # 本文がURLのみのものを除外する条件を追加（設定で有効な場合、手動登録は除外対象外）
+        if self.filter_url_only:
+            url_only_filter = self._get_url_only_filter()
+            if where_clause == "1=1":
+                where_clause = url_only_filter
+            else:
+                where_clause = f"({where_clause}) AND {url_only_filter}"
+        
+        # 重複除去: 書き込み時に計算済みの代表記事フラグで絞り込み
+        where_clause = f"{self._get_canonical_filter()} AND ({where_clause})"
+        return where_clause, params
+    
+    def _get_news_relation(self, search_filter: Optional[NewsSearchFilter]) -> str:
+        """
+        検索対象のテーブル（アーカイブ検索で期間がアーカイブ層にかかる場合のみアーカイブテーブルを含める）
+        """
+        if (self.archive_table and search_filter is not None and search_filter.include_archive
+                and (search_filter.start_date is None or search_filter.start_date < self.archive_boundary)):
+            return f"(SELECT * FROM news_table UNION ALL SELECT * FROM {self.archive_table}) news_table"
+        return "news_table"
+    
+    def search_news(self, search_filter: NewsSearchFilter, full_columns: bool = False) -> List[Dict]:
+        """
+        ニュース検索
+        
+        Args:
+            search_filter: 検索フィルター
+            full_columns: True=全カラム取得、False=一覧表示用カラム＋本文抜粋（snippet）のみ
+        """
+        try:
+            results, _ = self._execute_list_query(search_filter, with_total=False, full_columns=full_columns)
+            return results
+                
+        except Exception as e:
+            self.logger.error(f"ニュース検索エラー: {e}")
+            return []
+    
+    def search_news_page(self, search_filter: NewsSearchFilter, estimate_count: Optional[bool] = None,
+                         full_columns: bool = False) -> Dict:
+        """
+        ニュース検索（1ページ分と総件数を1回のクエリで取得）
+        
+        Args:
+            search_filter: 検索フィルター
+            estimate_count: 総件数を統計情報から概算するか（Noneの場合は設定値）
+            full_columns: True=全カラム取得、False=一覧表示用カラム＋本文抜粋（snippet）のみ
+            
+        Returns:
+            Dict: news（ページ内の記事）, total_count（総件数）, count_is_estimate（概算かどうか）
+        """
+        if estimate_count is None:
+            estimate_count = self.estimate_total_count
+        
+        try:
+            # 大量件数になる検索は概算件数で代替し、ウィンドウ集計を省略
+            if estimate_count:
+                estimated = self._estimate_list_count(search_filter)
+                if estimated is not None and estimated >= self.estimate_count_threshold:
+                    results, _ = self._execute_list_query(search_filter, with_total=False, full_columns=full_columns)
+                    return {'news': results, 'total_count': estimated, 'count_is_estimate': True}
+            
+            results, total_count = self._execute_list_query(search_filter, with_total=True, full_columns=full_columns)
+            
+            # ページ範囲外の場合は同じ条件で件数のみ取得
+            if total_count is None:
+                total_count = self.get_news_count(search_filter)
+            
+            return {'news': results, 'total_count': total_count, 'count_is_estimate': False}
+            
+        except Exception as e:
+            self.logger.error(f"ニュース検索エラー: {e}")
+            return {'news': [], 'total_count': 0, 'count_is_estimate': False}
+    
+    def _execute_list_query(self, search_filter: NewsSearchFilter, with_total: bool,
+                            full_columns: bool = False) -> Tuple[List[Dict], Optional[int]]:
+        """
+        一覧クエリ実行
+        
+        Args:
+            search_filter: 検索フィルター
+            with_total: COUNT(*) OVER() で総件数も同時に取得するか
+            full_columns: 全カラムを取得するか（Falseの場合は一覧表示用カラムのみ）
+            
+        Returns:
+            (results, total_count): 総件数は取得しない場合・結果0件の場合はNone
+        """
+        self._flush_news_state_for(search_filter)
+        
+        cache_key = (search_filter.cache_key(), with_total, full_columns, self._get_news_relation(search_filter))
+        data_version = self._data_version
+        cached = self._result_cache.get(cache_key, data_version)
+        if cached is not None:
+            results, total_count = cached
+            # 呼び出し側で書き換えられてもキャッシュに影響しないよう行をコピー
+            return self.state_buffer.overlay([dict(row) for row in results]), total_count
+        
+        with self.get_read_connection() as conn:
+            if self.db_type == "postgresql":
+                cursor = conn.cursor(cursor_factory=DictCursor)
+            else:
+                cursor = conn.cursor()
+            
+            sql = self._get_list_sql(search_filter, with_total, full_columns)
+            
+            # パラメータはWHERE句 → ORDER BY句（関連性ソート） → ページ範囲の順
+            params = search_filter.to_sql_where_clause(self.db_type)[1]
+            params.extend(search_filter.to_sql_order_params(self.db_type))
+            if self.db_type == "sqlserver":
+                params.extend([search_filter.offset, search_filter.limit])
+            else:
+                params.extend([search_filter.limit, search_filter.offset])
+            
+            self.logger.debug(f"実行SQL: {sql}")
+            self.logger.debug(f"SQLパラメータ: {params}")
+            self._execute_parameterized(cursor, sql, params)
+            
+            if self.db_type == "postgresql":
+                results = [dict(row) for row in cursor.fetchall()]
+            else:
+                columns = [column[0] for column in cursor.description]
+                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                if full_columns and self.db_type == "sqlserver":
+                    self._convert_rowversion(results)
+        
+        total_count = None
+        if with_total:
+            for row in results:
+                total_count = row.pop('total_count_')
+        
+        # 追加のクライアントサイドフィルタリング（念のため）
+        if self.filter_url_only:
+            results = self._filter_url_only_news(results)
+        
+        # クエリ開始時点のバージョンで登録（実行中の書き込みは次回参照時に無効化される）
+        self._result_cache.set(cache_key, data_version, ([dict(row) for row in results], total_count))
+        return self.state_buffer.overlay(results), total_count
+    
+    def _get_list_sql(self, search_filter: NewsSearchFilter, with_total: bool, full_columns: bool) -> str:
+        """
+        一覧クエリのSQL（検索条件の形ごとにメモ化）
+        同じ形の検索は同一のSQL文になるため、SQLiteのステートメントキャッシュや
+        SQL Serverのプランキャッシュで再利用される
+        """
+        relation = self._get_news_relation(search_filter)
+        template_key = (search_filter.query_shape(self.db_type), with_total, full_columns, relation)
+        
+        sql = self._list_sql_templates.get(template_key)
+        if sql is not None:
+            self._list_sql_stats['hits'] += 1
+            return sql
+        
+        self._list_sql_stats['misses'] += 1
+        where_clause, _ = self._build_list_where_clause(search_filter)
+        order_clause = search_filter.to_sql_order_clause(self.db_type)
+        total_column = ", COUNT(*) OVER() AS total_count_" if with_total else ""
+        select_columns = "*" if full_columns else self._get_list_columns()
+        
+        if self.db_type == "postgresql":
+            page_clause = "LIMIT %s OFFSET %s"
+        elif self.db_type == "sqlite":
+            page_clause = "LIMIT ? OFFSET ?"
+        else:
+            page_clause = "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+        
+        sql = f"""
+                    SELECT {select_columns}{total_column} FROM {relation}
+                    WHERE {where_clause}
+                    {order_clause}
+                    {page_clause}
+                """
+        
+        # 形の組み合わせは有限だが、念のため上限を超えたら作り直す
+        if len(self._list_sql_templates) >= QUERY_TEMPLATE_CACHE_SIZE:
+            self._list_sql_templates.clear()
+        self._list_sql_templates[template_key] = sql
+        return sql
+    
+    def _execute_parameterized(self, cursor, sql: str, params: list):
+        """
+        パラメータ化クエリの実行（SQL Serverは文字列パラメータの型を固定）
+        pyodbcは文字列を値の長さのnvarchar(n)で宣言するため、キーワードの長さごとに
+        別のプランがキャッシュされる。長さを固定して同じ形の検索でプランを共有する
+        """
+        if self.db_type == "sqlserver" and PYODBC_AVAILABLE:
+            cursor.setinputsizes([
+                (pyodbc.SQL_WVARCHAR, SQLSERVER_STRING_PARAM_SIZE, 0) if isinstance(value, str) else None
+                for value in params
+            ])
+        cursor.execute(sql, params)
+    
+    def _get_list_columns(self) -> str:
+        """一覧表示用のSELECTカラム（本文は先頭の抜粋と文字数のみ）"""
+        if self.db_type == "postgresql":
+            body_columns = f"LEFT(body, {int(self.snippet_length)}) AS snippet, LENGTH(body) AS body_length"
+        elif self.db_type == "sqlite":
+            body_columns = f"substr(body, 1, {int(self.snippet_length)}) AS snippet, length(body) AS body_length"
+        else:
+            body_columns = f"LEFT(body, {int(self.snippet_length)}) AS snippet, DATALENGTH(body) / 2 AS body_length"
+        return ", ".join(LIST_COLUMNS) + ", " + body_columns
+    
+    def _estimate_list_count(self, search_filter: NewsSearchFilter) -> Optional[int]:
+        """
+        一覧件数の概算（テーブル統計またはクエリプランの推定行数）
+        
+        Returns:
+            概算件数。概算できない場合はNone
+        """
+        # SQLiteは行数の統計を持たないため概算しない
+        if self.db_type == "sqlite":
+            return None
         
-        self.logger.info(f"一括挿入完了: {successful_inserts}/{len(articles)} 件成功")
-        return successful_inserts
-    
-    def insert_system_stats(self, stats: SystemStats) -> bool:
-        """システム統計挿入"""
         try:
-            with self.get_connection() as conn:
+            filter_where, _ = search_filter.to_sql_where_clause(self.db_type)
+            is_unfiltered = filter_where == "1=1"
+            
+            with self.get_read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if self.db_type == "postgresql":
-                    sql = """
-                        INSERT INTO system_stats (
-                            collection_date, total_collected, successful_queries, failed_queries,
-                            api_calls_made, errors_encountered, execution_time_seconds
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """
-                elif self.db_type == "sqlserver":
-                    sql = """
-                        INSERT INTO system_stats (
-                            collection_date, total_collected, successful_queries, failed_queries,
-                            api_calls_made, errors_encountered, execution_time_seconds
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """
-                
-                cursor.execute(sql, (
-                    stats.collection_date,
-                    stats.total_collected,
-                    stats.successful_queries,
-                    stats.failed_queries,
-                    stats.api_calls_made,
-                    stats.errors_encountered,
-                    stats.execution_time_seconds
-                ))
-                
-                return True
+                    if is_unfiltered:
+                        cursor.execute("SELECT reltuples::BIGINT FROM pg_class WHERE relname = 'news_table'")
+                        result = cursor.fetchone()
+                        return int(result[0]) if result and result[0] >= 0 else None
+                    
+                    # 条件付きはプランナーの推定行数を使用
+                    where_clause, params = self._build_list_where_clause(search_filter)
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM news_table WHERE {where_clause}", params)
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    return int(plan[0]['Plan']['Plan Rows'])
+                else:
+                    # SQL Serverは条件なしの場合のみパーティション統計を使用
+                    if not is_unfiltered:
+                        return None
+                    cursor.execute("""
+                        SELECT SUM(row_count) FROM sys.dm_db_partition_stats
+                        WHERE object_id = OBJECT_ID('news_table') AND index_id IN (0, 1)
+                    """)
+                    result = cursor.fetchone()
+                    return int(result[0]) if result and result[0] is not None else None
+                    
+        except Exception as e:
+            self.logger.warning(f"件数概算エラー: {e}")
+            return None
+    
+    def get_latest_news(self, limit: int = 50) -> List[Dict]:
+        """最新ニュース取得"""
+        search_filter = NewsSearchFilter()
+        search_filter.limit = limit
+        return self.search_news(search_filter)
+    
+    def get_latest_change_seq(self) -> int:
+        """
+        変更フィードの現在位置（get_changes_sinceの初期カーソル、記事がなければ0）
+        """
+        try:
+            with self.get_read_connection() as conn:
+                return self._read_change_seq_bound(conn.cursor())
                 
         except Exception as e:
-            self.logger.error(f"統計データ挿入エラー: {e}")
-            return False
+            self.logger.error(f"変更フィード位置取得エラー: {e}")
+            return 0
+    
+    def _read_change_seq_bound(self, cursor) -> int:
+        """この位置までの変更はすべてコミット済みとして読める変更フィードの位置"""
+        if self.db_type == "postgresql":
+            # 採番済みの位置を読んでから、採番中のトランザクションのロック（採番値の下限）を確認する
+            # （READ COMMITTEDのため、この後の検索はロック解放済み＝コミット済みの変更を読める）
+            cursor.execute("SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM news_change_seq")
+            issued_seq = int(cursor.fetchone()[0])
+            lock_class = CHANGE_SEQ_LOCK_BASE >> 32
+            cursor.execute(f"""
+                SELECT MIN(((classid::bigint << 32) | objid::bigint) - {CHANGE_SEQ_LOCK_BASE}) FROM pg_locks
+                WHERE locktype = 'advisory' AND objsubid = 1
+                  AND database = (SELECT oid FROM pg_database WHERE datname = current_database())
+                  AND classid::bigint BETWEEN {lock_class} AND {lock_class + 0xFF}
+            """)
+            result = cursor.fetchone()
+            if result and result[0] is not None:
+                return min(issued_seq, int(result[0]) - 1)
+            return issued_seq
+        elif self.db_type == "sqlite":
+            cursor.execute("SELECT last_seq FROM news_change_counter WHERE id = 1")
+        else:
+            # 未コミットのトランザクションが使用中の値より前まで
+            cursor.execute("SELECT CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT) - 1")
+        
+        result = cursor.fetchone()
+        return int(result[0]) if result and result[0] is not None else 0
     
-    def search_news(self, search_filter: NewsSearchFilter) -> List[Dict]:
-        """ニュース検索"""
+    def get_changes_since(self, since_seq: int, limit: int = 500,
+                          min_importance_score: Optional[int] = None) -> Dict:
+        """
+        変更フィード: カーソル以降に挿入・更新された記事を変更順に取得
+        公開日時ではなく取り込み・更新の順序で追跡するため、遅れて届いた記事も取りこぼさない
+        
+        Args:
+            since_seq: カーソル（前回のnext_seq、初回はget_latest_change_seq）
+            limit: 最大取得件数
+            min_importance_score: 重要度スコア下限（通知用、省略時は全件）
+            
+        Returns:
+            Dict: changes（一覧表示用カラム＋is_canonical, change_seq、変更順）,
+                  next_seq（次回のカーソル、条件に一致しない変更も含め走査済みの位置）,
+                  has_more（取得しきれなかった変更があるか）
+        """
+        columns = ", ".join(LIST_COLUMNS + ['is_canonical'])
+        importance_clause = ""
+        if min_importance_score is not None:
+            importance_clause = "AND importance_score >= " + ("%s" if self.db_type == "postgresql" else "?")
+        
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
+                # 走査範囲の上限を先に確定（上限までの変更はすべてコミット済み）
+                bound_seq = self._read_change_seq_bound(conn.cursor())
+                params = [since_seq, bound_seq]
+                if min_importance_score is not None:
+                    params.append(min_importance_score)
+                
                 if self.db_type == "postgresql":
                     cursor = conn.cursor(cursor_factory=DictCursor)
-                else:
+                    sql = f"""
+                        SELECT {columns}, change_seq FROM news_table
+                        WHERE change_seq > %s AND change_seq <= %s {importance_clause}
+                        ORDER BY change_seq
+                        LIMIT %s
+                    """
+                    cursor.execute(sql, params + [limit + 1])
+                    changes = [dict(row) for row in cursor.fetchall()]
+                elif self.db_type == "sqlite":
                     cursor = conn.cursor()
-                
-                # WHERE句とパラメータ生成
-                where_clause, params = search_filter.to_sql_where_clause(self.db_type)
-                
-                # ORDER BY句生成
-                order_clause = search_filter.to_sql_order_clause(self.db_type)
-                
-                # 本文がURLのみのものを除外する条件を追加（設定で有効な場合、手動登録は除外対象外）
-                if self.filter_url_only:
-                    url_only_filter = self._get_url_only_filter()
-                    if where_clause == "1=1":
-                        where_clause = url_only_filter
-                    else:
-                        where_clause = f"({where_clause}) AND {url_only_filter}"
-                
-                if self.db_type == "postgresql":
-                    # PostgreSQL: DISTINCT ON を使用して重複を除去、カスタムソート適用
                     sql = f"""
-                        SELECT * FROM (
-                            SELECT DISTINCT ON (title, source) * FROM news_table 
-                            WHERE {where_clause}
-                            ORDER BY title, source, publish_time DESC
-                        ) deduplicated
-                        {order_clause}
-                        LIMIT %s OFFSET %s
+                        SELECT {columns}, change_seq FROM news_table
+                        WHERE change_seq > ? AND change_seq <= ? {importance_clause}
+                        ORDER BY change_seq
+                        LIMIT ?
                     """
-                    params.extend([search_filter.limit, search_filter.offset])
+                    cursor.execute(sql, params + [limit + 1])
+                    columns_desc = [column[0] for column in cursor.description]
+                    changes = [dict(zip(columns_desc, row)) for row in cursor.fetchall()]
                 else:
-                    # SQL Server: ROW_NUMBER()を使用して重複除去、カスタムソート適用
+                    # rowversionはbinary(8)のため比較値も変換（インデックスを使用）
+                    cursor = conn.cursor()
                     sql = f"""
-                        SELECT * FROM (
-                            SELECT *, ROW_NUMBER() OVER (PARTITION BY title, source ORDER BY publish_time DESC) as rn
-                            FROM news_table 
-                            WHERE {where_clause}
-                        ) ranked
-                        WHERE rn = 1
-                        {order_clause}
-                        OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+                        SELECT TOP (?) {columns}, CAST(change_seq AS BIGINT) AS change_seq FROM news_table
+                        WHERE change_seq > CAST(CAST(? AS BIGINT) AS BINARY(8))
+                          AND change_seq <= CAST(CAST(? AS BIGINT) AS BINARY(8)) {importance_clause}
+                        ORDER BY change_seq
                     """
-                    params.extend([search_filter.offset, search_filter.limit])
-                
-                self.logger.debug(f"実行SQL: {sql}")
-                self.logger.debug(f"SQLパラメータ: {params}")
-                cursor.execute(sql, params)
-                
-                if self.db_type == "postgresql":
-                    results = [dict(row) for row in cursor.fetchall()]
-                else:
-                    columns = [column[0] for column in cursor.description]
-                    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                
-                # 追加のクライアントサイドフィルタリング（念のため）
-                if self.filter_url_only:
-                    return self._filter_url_only_news(results)
-                else:
-                    return results
+                    cursor.execute(sql, [limit + 1] + params)
+                    columns_desc = [column[0] for column in cursor.description]
+                    changes = [dict(zip(columns_desc, row)) for row in cursor.fetchall()]
+            
+            has_more = len(changes) > limit
+            changes = self.state_buffer.overlay(changes[:limit])
+            # 取得しきれた場合は条件に一致しなかった変更も走査済みのため上限まで進める
+            if has_more:
+                next_seq = changes[-1]['change_seq']
+            else:
+                next_seq = max(since_seq, bound_seq)
+            return {'changes': changes, 'next_seq': next_seq, 'has_more': has_more}
                 
         except Exception as e:
-            self.logger.error(f"ニュース検索エラー: {e}")
-            return []
-    
-    def get_latest_news(self, limit: int = 50) -> List[Dict]:
-        """最新ニュース取得"""
-        search_filter = NewsSearchFilter()
-        search_filter.limit = limit
-        return self.search_news(search_filter)
+            self.logger.error(f"変更フィード取得エラー: {e}")
+            return {'changes': [], 'next_seq': since_seq, 'has_more': False}
     
     def get_news_by_id(self, news_id: str) -> Optional[Dict]:
         """IDによるニュース取得"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 if self.db_type == "postgresql":
                     cursor = conn.cursor(cursor_factory=DictCursor)
                     sql = "SELECT * FROM news_table WHERE news_id = %s"
@@ -399,10 +1638,13 @@ class SpecDatabaseManager:
                 
                 if result:
                     if self.db_type == "postgresql":
-                        return dict(result)
+                        news = dict(result)
                     else:
                         columns = [column[0] for column in cursor.description]
-                        return dict(zip(columns, result))
+                        news = dict(zip(columns, result))
+                    if self.db_type == "sqlserver":
+                        self._convert_rowversion([news])
+                    return self.state_buffer.overlay([news])[0]
                 
                 return None
                 
@@ -411,15 +1653,23 @@ class SpecDatabaseManager:
             return None
     
     def get_news_count(self, search_filter: NewsSearchFilter = None) -> int:
-        """ニュース件数取得"""
+        """
+        ニュース件数取得
+        
+        Args:
+            search_filter: 検索フィルター（指定時は一覧表示と同じ重複除去・URLフィルターを適用）
+        """
+        if search_filter:
+            self._flush_news_state_for(search_filter)
+        
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if search_filter:
-                    where_clause, params = search_filter.to_sql_where_clause(self.db_type)
-                    sql = f"SELECT COUNT(*) FROM news_table WHERE {where_clause}"
-                    cursor.execute(sql, params)
+                    where_clause, params = self._build_list_where_clause(search_filter)
+                    sql = f"SELECT COUNT(*) FROM {self._get_news_relation(search_filter)} WHERE {where_clause}"
+                    self._execute_parameterized(cursor, sql, params)
                 else:
                     sql = "SELECT COUNT(*) FROM news_table"
                     cursor.execute(sql)
@@ -433,19 +1683,23 @@ class SpecDatabaseManager:
     
     def get_sources_list(self) -> List[str]:
         """ソース一覧取得（手動登録を最上位に表示）"""
+        sources = [item['source'] for item in self.get_sources_with_counts()]
+        
+        # 手動登録を最上位に移動
+        if '手動登録' in sources:
+            sources.remove('手動登録')
+            sources.insert(0, '手動登録')
+        
+        return sources
+    
+    def get_sources_with_counts(self) -> List[Dict]:
+        """ソース別記事件数取得（集計テーブルから取得）"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 cursor = conn.cursor()
-                sql = "SELECT DISTINCT source FROM news_table ORDER BY source"
+                sql = "SELECT source, article_count FROM news_source_counts WHERE article_count > 0 ORDER BY source"
                 cursor.execute(sql)
-                sources = [row[0] for row in cursor.fetchall()]
-                
-                # 手動登録を最上位に移動
-                if '手動登録' in sources:
-                    sources.remove('手動登録')
-                    sources.insert(0, '手動登録')
-                
-                return sources
+                return [{'source': row[0], 'count': int(row[1])} for row in cursor.fetchall()]
                 
         except Exception as e:
             self.logger.error(f"ソース一覧取得エラー: {e}")
@@ -453,19 +1707,16 @@ class SpecDatabaseManager:
     
     def get_related_metals_list(self) -> List[str]:
         """関連金属一覧取得"""
+        return [item['metal'] for item in self.get_related_metals_with_counts()]
+    
+    def get_related_metals_with_counts(self) -> List[Dict]:
+        """関連金属別記事件数取得（集計テーブルから取得）"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 cursor = conn.cursor()
-                sql = "SELECT DISTINCT related_metals FROM news_table WHERE related_metals IS NOT NULL"
+                sql = "SELECT metal, article_count FROM news_metal_counts WHERE article_count > 0 ORDER BY metal"
                 cursor.execute(sql)
-                
-                all_metals = set()
-                for row in cursor.fetchall():
-                    if row[0]:
-                        metals = [metal.strip() for metal in row[0].split(',')]
-                        all_metals.update(metals)
-                
-                return sorted(list(all_metals))
+                return [{'metal': row[0], 'count': int(row[1])} for row in cursor.fetchall()]
                 
         except Exception as e:
             self.logger.error(f"関連金属一覧取得エラー: {e}")
@@ -482,9 +1733,9 @@ class SpecDatabaseManager:
                 
                 # まず対象ニュースが存在するか確認
                 if self.db_type == "postgresql":
-                    check_sql = "SELECT news_id, title, is_manual FROM news_table WHERE news_id = %s"
+                    check_sql = "SELECT news_id, title, is_manual, dedup_key, publish_time, source, related_metals FROM news_table WHERE news_id = %s"
                 else:
-                    check_sql = "SELECT news_id, title, is_manual FROM news_table WHERE news_id = ?"
+                    check_sql = "SELECT news_id, title, is_manual, dedup_key, publish_time, source, related_metals FROM news_table WHERE news_id = ?"
                 
                 cursor.execute(check_sql, (news_id,))
                 existing_news = cursor.fetchone()
@@ -510,6 +1761,15 @@ class SpecDatabaseManager:
                 affected_rows = cursor.rowcount
                 
                 if affected_rows > 0:
+                    self._mark_data_changed(conn)
+                    
+                    # 削除した記事が代表記事だった場合に備えて重複グループを再計算
+                    if existing_news[3]:
+                        self._refresh_canonical_flag(cursor, existing_news[3])
+                    
+                    self._apply_rollup_delta(cursor, existing_news[4], True, -affected_rows)
+                    self._apply_lookup_delta(cursor, existing_news[5], existing_news[6], -affected_rows)
+                    
                     self.logger.info(f"ニュース削除成功: {news_id} (影響行数: {affected_rows})")
                     return True
                 else:
@@ -533,6 +1793,12 @@ class SpecDatabaseManager:
                         WHERE acquire_time >= NOW() - INTERVAL '%s days'
                     """
                     cursor.execute(sql, (days_back,))
+                elif self.db_type == "sqlite":
+                    sql = """
+                        SELECT news_id FROM news_table 
+                        WHERE acquire_time >= ?
+                    """
+                    cursor.execute(sql, (datetime.now() - timedelta(days=days_back),))
                 else:
                     sql = """
                         SELECT news_id FROM news_table 
@@ -573,25 +1839,8 @@ class SpecDatabaseManager:
                     values.append(analysis_data['translation'])
                 
                 if analysis_data.get('importance_score') is not None:
-                    # importance_scoreを新しいカラムとして追加する場合
-                    # まずはkeywordsフィールドに重要度情報を含める
-                    current_keywords = analysis_data.get('keywords', '')
-                    importance_info = f"[重要度:{analysis_data['importance_score']}/10]"
-                    if current_keywords:
-                        enhanced_keywords = f"{current_keywords} {importance_info}"
-                    else:
-                        enhanced_keywords = importance_info
-                    
-                    # keywordsフィールドに重要度も含める
-                    if 'keywords = %s' not in ' '.join(update_fields) and 'keywords = ?' not in ' '.join(update_fields):
-                        update_fields.append('keywords = %s' if self.db_type == "postgresql" else 'keywords = ?')
-                        values.append(enhanced_keywords)
-                    else:
-                        # 既にkeywordsが設定されている場合は置き換え
-                        for i, field in enumerate(update_fields):
-                            if 'keywords' in field:
-                                values[i] = enhanced_keywords
-                                break
+                    update_fields.append('importance_score = %s' if self.db_type == "postgresql" else 'importance_score = ?')
+                    values.append(int(analysis_data['importance_score']))
                 
                 if not update_fields:
                     return False
@@ -601,6 +1850,7 @@ class SpecDatabaseManager:
                 values.append(news_id)
                 
                 cursor.execute(sql, values)
+                self._mark_data_changed(conn)
                 
                 return cursor.rowcount > 0
                 
@@ -616,6 +1866,8 @@ class SpecDatabaseManager:
                 self.logger.error(f"無効なレーティング値: {rating}")
                 return False
             
+            # 直接更新がバッファ内の古い更新で上書きされないよう先に反映
+            self.state_buffer.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -625,6 +1877,7 @@ class SpecDatabaseManager:
                     sql = "UPDATE news_table SET rating = ? WHERE news_id = ?"
                 
                 cursor.execute(sql, (rating, news_id))
+                self._mark_data_changed(conn)
                 
                 return cursor.rowcount > 0
                 
@@ -635,17 +1888,21 @@ class SpecDatabaseManager:
     def mark_news_as_read(self, news_id: str) -> bool:
         """ニュースを既読にマーク"""
         try:
+            self.state_buffer.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
                 if self.db_type == "postgresql":
                     sql = "UPDATE news_table SET is_read = TRUE, read_at = CURRENT_TIMESTAMP WHERE news_id = %s"
+                elif self.db_type == "sqlite":
+                    sql = "UPDATE news_table SET is_read = 1, read_at = datetime('now', 'localtime') WHERE news_id = ?"
                 else:
                     sql = "UPDATE news_table SET is_read = 1, read_at = GETDATE() WHERE news_id = ?"
                 
                 cursor.execute(sql, (news_id,))
                 
                 if cursor.rowcount > 0:
+                    self._mark_data_changed(conn)
                     self.logger.debug(f"ニュースを既読にマーク: {news_id}")
                     return True
                 else:
@@ -659,6 +1916,7 @@ class SpecDatabaseManager:
     def mark_news_as_unread(self, news_id: str) -> bool:
         """ニュースを未読にマーク"""
         try:
+            self.state_buffer.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -670,6 +1928,7 @@ class SpecDatabaseManager:
                 cursor.execute(sql, (news_id,))
                 
                 if cursor.rowcount > 0:
+                    self._mark_data_changed(conn)
                     self.logger.debug(f"ニュースを未読にマーク: {news_id}")
                     return True
                 else:
@@ -680,9 +1939,103 @@ class SpecDatabaseManager:
             self.logger.error(f"未読マークエラー: {e}")
             return False
     
+    def queue_news_rating(self, news_id: str, rating: Optional[int]) -> bool:
+        """
+        ニュースレーティング更新（書き込みバッファ経由、バッファ無効時は即時更新）
+        同じ記事への連続した更新は最後の値のみ反映される
+        """
+        if rating is not None and (rating < 1 or rating > 3):
+            self.logger.error(f"無効なレーティング値: {rating}")
+            return False
+        
+        if not self.state_buffer.enabled:
+            return self.update_news_rating(news_id, rating)
+        
+        self.state_buffer.put(news_id, rating=rating)
+        return True
+    
+    def queue_read_state(self, news_id: str, is_read: bool) -> bool:
+        """既読・未読の更新（書き込みバッファ経由、バッファ無効時は即時更新）"""
+        if not self.state_buffer.enabled:
+            return self.mark_news_as_read(news_id) if is_read else self.mark_news_as_unread(news_id)
+        
+        self.state_buffer.put(news_id, is_read=is_read, read_at=datetime.now() if is_read else None)
+        return True
+    
+    def _flush_news_state_for(self, search_filter: Optional[NewsSearchFilter]):
+        """検索条件・並び順が既読状態・レーティングに依存する場合は未反映の更新を先に反映"""
+        if search_filter is None or not self.state_buffer.has_pending():
+            return
+        if (search_filter.is_read is not None or search_filter.rating is not None
+                or search_filter.query_shape(self.db_type)[-1] not in TIME_ONLY_SORTS):
+            self.state_buffer.flush()
+    
+    def apply_news_state_updates(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        記事状態の一括更新（書き込みバッファの反映処理）
+        
+        Args:
+            updates: 記事ID → 変更するカラム（rating / is_read / read_at）
+            
+        Returns:
+            int: 更新した記事数
+        """
+        rows = []
+        for news_id, fields in updates.items():
+            rows.append((
+                news_id,
+                'rating' in fields, fields.get('rating'),
+                'is_read' in fields, fields.get('is_read'), fields.get('read_at')
+            ))
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            if self.db_type == "postgresql":
+                # 1文のUPDATE ... FROM (VALUES ...) で反映
+                execute_values(cursor, """
+                    UPDATE news_table AS t SET
+                        rating = CASE WHEN v.set_rating THEN v.rating ELSE t.rating END,
+                        is_read = CASE WHEN v.set_read THEN v.is_read ELSE t.is_read END,
+                        read_at = CASE WHEN v.set_read THEN v.read_at ELSE t.read_at END
+                    FROM (VALUES %s) AS v(news_id, set_rating, rating, set_read, is_read, read_at)
+                    WHERE t.news_id = v.news_id
+                """, rows, template="(%s, %s, %s::integer, %s, %s::boolean, %s::timestamp)",
+                    page_size=len(rows))
+                updated = cursor.rowcount
+            else:
+                # 同一ステートメントをバッチ実行（SQL Serverはfast_executemany）
+                if self.db_type == "sqlserver":
+                    cursor.fast_executemany = True
+                    sql = """
+                        UPDATE news_table SET
+                            rating = CASE WHEN ? = 1 THEN CAST(? AS INT) ELSE rating END,
+                            is_read = CASE WHEN ? = 1 THEN CAST(? AS BIT) ELSE is_read END,
+                            read_at = CASE WHEN ? = 1 THEN CAST(? AS DATETIME2) ELSE read_at END
+                        WHERE news_id = ?
+                    """
+                else:
+                    sql = """
+                        UPDATE news_table SET
+                            rating = CASE WHEN ? = 1 THEN ? ELSE rating END,
+                            is_read = CASE WHEN ? = 1 THEN ? ELSE is_read END,
+                            read_at = CASE WHEN ? = 1 THEN ? ELSE read_at END
+                        WHERE news_id = ?
+                    """
+                params = [
+                    (int(set_rating), rating, int(set_read), is_read, int(set_read), read_at, news_id)
+                    for news_id, set_rating, rating, set_read, is_read, read_at in rows
+                ]
+                cursor.executemany(sql, params)
+                updated = cursor.rowcount if cursor.rowcount >= 0 else len(rows)
+            
+            self._mark_data_changed(conn)
+            return updated
+    
     def mark_all_as_read(self, filter_conditions: Optional[Dict] = None) -> int:
         """全ニュースを既読にマーク（条件付き可能）"""
         try:
+            self.state_buffer.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -690,6 +2043,9 @@ class SpecDatabaseManager:
                 if self.db_type == "postgresql":
                     sql = base_sql.format("TRUE", "CURRENT_TIMESTAMP")
                     where_clause = "WHERE is_read = FALSE"
+                elif self.db_type == "sqlite":
+                    sql = base_sql.format("1", "datetime('now', 'localtime')")
+                    where_clause = "WHERE is_read = 0"
                 else:
                     sql = base_sql.format("1", "GETDATE()")
                     where_clause = "WHERE is_read = 0"
@@ -707,6 +2063,7 @@ class SpecDatabaseManager:
                 
                 sql += " " + where_clause
                 cursor.execute(sql, params)
+                self._mark_data_changed(conn)
                 
                 affected_rows = cursor.rowcount
                 self.logger.info(f"一括既読マーク完了: {affected_rows} 件")
@@ -734,6 +2091,18 @@ class SpecDatabaseManager:
                         WHERE collection_date >= NOW() - INTERVAL '%s days'
                     """
                     cursor.execute(sql, (days,))
+                elif self.db_type == "sqlite":
+                    sql = """
+                        SELECT 
+                            COUNT(*) as total_runs,
+                            SUM(total_collected) as total_news,
+                            AVG(execution_time_seconds) as avg_execution_time,
+                            SUM(api_calls_made) as total_api_calls,
+                            SUM(errors_encountered) as total_errors
+                        FROM system_stats 
+                        WHERE collection_date >= ?
+                    """
+                    cursor.execute(sql, (datetime.now() - timedelta(days=days),))
                 else:
                     sql = """
                         SELECT 
@@ -760,6 +2129,70 @@ class SpecDatabaseManager:
             self.logger.error(f"統計サマリー取得エラー: {e}")
             return {}
     
+    def get_dashboard_stats(self, days: int = 30) -> Dict:
+        """
+        ダッシュボード統計取得（日別集計と収集統計を1クエリで集計、TTLキャッシュ経由）
+        
+        Args:
+            days: 収集統計の対象日数
+            
+        Returns:
+            Dict: total_news, today_news, refinitiv_news, manual_news, collection_runs, avg_execution_time
+        """
+        today = datetime.now().date()
+        # 集計中にコミットされた書き込みの前の値が登録されても参照されないようデータバージョンをキーに含める
+        cache_key = (today, days, self._data_version)
+        
+        cached = self._stats_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
+        try:
+            with self.get_read_connection() as conn:
+                cursor = conn.cursor()
+                
+                since = datetime.now() - timedelta(days=days)
+                if self.db_type == "postgresql":
+                    sql = """
+                        SELECT
+                            COALESCE(SUM(article_count), 0),
+                            COALESCE(SUM(CASE WHEN rollup_date >= %s THEN article_count ELSE 0 END), 0),
+                            COALESCE(SUM(CASE WHEN is_manual = FALSE THEN article_count ELSE 0 END), 0),
+                            COALESCE(SUM(CASE WHEN is_manual = TRUE THEN article_count ELSE 0 END), 0),
+                            (SELECT COUNT(*) FROM system_stats WHERE collection_date >= %s),
+                            (SELECT AVG(execution_time_seconds) FROM system_stats WHERE collection_date >= %s)
+                        FROM news_daily_rollup
+                    """
+                else:
+                    sql = """
+                        SELECT
+                            COALESCE(SUM(article_count), 0),
+                            COALESCE(SUM(CASE WHEN rollup_date >= ? THEN article_count ELSE 0 END), 0),
+                            COALESCE(SUM(CASE WHEN is_manual = 0 THEN article_count ELSE 0 END), 0),
+                            COALESCE(SUM(CASE WHEN is_manual = 1 THEN article_count ELSE 0 END), 0),
+                            (SELECT COUNT(*) FROM system_stats WHERE collection_date >= ?),
+                            (SELECT AVG(execution_time_seconds) FROM system_stats WHERE collection_date >= ?)
+                        FROM news_daily_rollup
+                    """
+                
+                cursor.execute(sql, (today, since, since))
+                result = cursor.fetchone()
+            
+            stats = {
+                'total_news': int(result[0] or 0),
+                'today_news': int(result[1] or 0),
+                'refinitiv_news': int(result[2] or 0),
+                'manual_news': int(result[3] or 0),
+                'collection_runs': int(result[4] or 0),
+                'avg_execution_time': float(result[5] or 0)
+            }
+            self._stats_cache.set(cache_key, stats)
+            return dict(stats)
+            
+        except Exception as e:
+            self.logger.error(f"ダッシュボード統計取得エラー: {e}")
+            return {}
+    
     def test_connection(self) -> bool:
         """接続テスト"""
         try:
@@ -767,7 +2200,7 @@ class SpecDatabaseManager:
                 cursor = conn.cursor()
                 if self.db_type == "postgresql":
                     cursor.execute("SELECT 1")
-                elif self.db_type == "sqlserver":
+                else:
                     cursor.execute("SELECT 1")
                 
                 result = cursor.fetchone()
@@ -780,130 +2213,158 @@ class SpecDatabaseManager:
 
     def find_duplicate_news(self) -> List[Dict]:
         """
-        タイトルとソースが同じ重複ニュースを検出
+        タイトルとソースが同じ重複ニュースを検出（重複判定キーで集計）
         
         Returns:
             List[Dict]: 重複ニュースのリスト
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if self.db_type == "postgresql":
                     sql = """
-                        SELECT title, source, COUNT(*) as duplicate_count,
-                               ARRAY_AGG(news_id ORDER BY publish_time DESC) as news_ids
-                        FROM news_table 
-                        GROUP BY title, source 
-                        HAVING COUNT(*) > 1
-                        ORDER BY duplicate_count DESC
+                        SELECT c.title, c.source, g.dedup_key, g.duplicate_count, g.news_ids
+                        FROM (
+                            SELECT dedup_key, COUNT(*) as duplicate_count,
+                                   ARRAY_AGG(news_id ORDER BY publish_time DESC) as news_ids
+                            FROM news_table 
+                            WHERE dedup_key IS NOT NULL
+                            GROUP BY dedup_key 
+                            HAVING COUNT(*) > 1
+                        ) g
+                        JOIN news_table c ON c.dedup_key = g.dedup_key AND c.is_canonical = TRUE
+                        ORDER BY g.duplicate_count DESC
+                    """
+                elif self.db_type == "sqlite":
+                    sql = """
+                        SELECT c.title, c.source, g.dedup_key, g.duplicate_count, g.news_ids
+                        FROM (
+                            SELECT dedup_key, COUNT(*) as duplicate_count,
+                                   group_concat(news_id, ',') as news_ids
+                            FROM (
+                                SELECT dedup_key, news_id FROM news_table
+                                WHERE dedup_key IS NOT NULL
+                                ORDER BY publish_time DESC
+                            )
+                            GROUP BY dedup_key 
+                            HAVING COUNT(*) > 1
+                        ) g
+                        JOIN news_table c ON c.dedup_key = g.dedup_key AND c.is_canonical = 1
+                        ORDER BY g.duplicate_count DESC
                     """
                 else:
                     sql = """
-                        SELECT title, source, COUNT(*) as duplicate_count,
-                               STRING_AGG(news_id, ',') as news_ids
-                        FROM news_table 
-                        GROUP BY title, source 
-                        HAVING COUNT(*) > 1
-                        ORDER BY duplicate_count DESC
+                        SELECT c.title, c.source, g.dedup_key, g.duplicate_count, g.news_ids
+                        FROM (
+                            SELECT dedup_key, COUNT(*) as duplicate_count,
+                                   STRING_AGG(CAST(news_id AS NVARCHAR(MAX)), ',') WITHIN GROUP (ORDER BY publish_time DESC) as news_ids
+                            FROM news_table 
+                            WHERE dedup_key IS NOT NULL
+                            GROUP BY dedup_key 
+                            HAVING COUNT(*) > 1
+                        ) g
+                        JOIN news_table c ON c.dedup_key = g.dedup_key AND c.is_canonical = 1
+                        ORDER BY g.duplicate_count DESC
                     """
                 
                 cursor.execute(sql)
                 
-                if self.db_type == "postgresql":
-                    return [dict(row) for row in cursor.fetchall()]
-                else:
-                    columns = [column[0] for column in cursor.description]
-                    results = []
-                    for row in cursor.fetchall():
-                        row_dict = dict(zip(columns, row))
-                        # SQL Serverの場合、カンマ区切りを配列に変換
-                        if 'news_ids' in row_dict and row_dict['news_ids']:
-                            row_dict['news_ids'] = row_dict['news_ids'].split(',')
-                        results.append(row_dict)
-                    return results
+                columns = [column[0] for column in cursor.description]
+                results = []
+                for row in cursor.fetchall():
+                    row_dict = dict(zip(columns, row))
+                    # SQL Server・SQLiteの場合、カンマ区切りを配列に変換
+                    if isinstance(row_dict.get('news_ids'), str):
+                        row_dict['news_ids'] = row_dict['news_ids'].split(',')
+                    results.append(row_dict)
+                return results
                     
         except Exception as e:
             self.logger.error(f"重複ニュース検出エラー: {e}")
             return []
 
-    def remove_duplicate_news(self, keep_latest: bool = True) -> int:
+    def remove_duplicate_news(self, keep_latest: bool = True, dry_run: bool = False,
+                              chunk_size: int = 1000) -> int:
         """
         重複ニュースを削除（最新または最古を保持）
         
         Args:
             keep_latest: True=最新を保持、False=最古を保持
+            dry_run: True=削除せず削除対象件数のみ返す
+            chunk_size: 1トランザクションあたりの削除件数（ロック時間を抑制）
             
         Returns:
-            int: 削除された件数
+            int: 削除された件数（dry_run時は削除対象件数）
         """
+        order = "DESC" if keep_latest else "ASC"
+        ranked_cte = f"""
+            WITH ranked AS (
+                SELECT news_id,
+                       ROW_NUMBER() OVER (PARTITION BY dedup_key ORDER BY publish_time {order}, news_id {order}) AS rn
+                FROM news_table
+                WHERE dedup_key IS NOT NULL
+            )
+        """
+        
+        if self.db_type == "postgresql":
+            delete_sql = ranked_cte + """
+                DELETE FROM news_table
+                WHERE news_id IN (SELECT news_id FROM ranked WHERE rn > 1 LIMIT %s)
+            """
+        elif self.db_type == "sqlite":
+            # WITH句で始まる文はsqlite3のrowcountが取得できないためサブクエリで記述
+            delete_sql = f"""
+                DELETE FROM news_table
+                WHERE news_id IN (
+                    SELECT news_id FROM (
+                        SELECT news_id,
+                               ROW_NUMBER() OVER (PARTITION BY dedup_key ORDER BY publish_time {order}, news_id {order}) AS rn
+                        FROM news_table
+                        WHERE dedup_key IS NOT NULL
+                    ) ranked
+                    WHERE rn > 1 LIMIT ?
+                )
+            """
+        else:
+            delete_sql = ranked_cte + """
+                DELETE TOP (?) FROM ranked WHERE rn > 1
+            """
+        
         try:
-            duplicates = self.find_duplicate_news()
+            if dry_run:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(ranked_cte + "SELECT COUNT(*) FROM ranked WHERE rn > 1")
+                    target_count = int(cursor.fetchone()[0] or 0)
+                
+                self.logger.info(f"重複ニュース削除（ドライラン）: 削除対象{target_count}件")
+                return target_count
+            
             deleted_count = 0
             
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                for duplicate in duplicates:
-                    title = duplicate['title']
-                    source = duplicate['source']
-                    news_ids = duplicate['news_ids']
-                    
-                    if len(news_ids) <= 1:
-                        continue
-                    
-                    # 保持するニュースID（最新または最古）
-                    if self.db_type == "postgresql":
-                        if keep_latest:
-                            keep_sql = """
-                                SELECT news_id FROM news_table 
-                                WHERE title = %s AND source = %s 
-                                ORDER BY publish_time DESC LIMIT 1
-                            """
-                        else:
-                            keep_sql = """
-                                SELECT news_id FROM news_table 
-                                WHERE title = %s AND source = %s 
-                                ORDER BY publish_time ASC LIMIT 1
-                            """
-                        cursor.execute(keep_sql, (title, source))
-                        keep_id = cursor.fetchone()[0]
-                        
-                        # 他を削除
-                        delete_sql = """
-                            DELETE FROM news_table 
-                            WHERE title = %s AND source = %s AND news_id != %s
-                        """
-                        cursor.execute(delete_sql, (title, source, keep_id))
-                        
-                    else:
-                        if keep_latest:
-                            keep_sql = """
-                                SELECT TOP 1 news_id FROM news_table 
-                                WHERE title = ? AND source = ? 
-                                ORDER BY publish_time DESC
-                            """
-                        else:
-                            keep_sql = """
-                                SELECT TOP 1 news_id FROM news_table 
-                                WHERE title = ? AND source = ? 
-                                ORDER BY publish_time ASC
-                            """
-                        cursor.execute(keep_sql, (title, source))
-                        keep_id = cursor.fetchone()[0]
-                        
-                        # 他を削除
-                        delete_sql = """
-                            DELETE FROM news_table 
-                            WHERE title = ? AND source = ? AND news_id != ?
-                        """
-                        cursor.execute(delete_sql, (title, source, keep_id))
-                    
-                    deleted_count += cursor.rowcount - 1 if cursor.rowcount > 0 else 0
-                
-                conn.commit()
-                self.logger.info(f"重複ニュース削除完了: {deleted_count}件")
-                return deleted_count
+            # チャンク単位でコミットし、長時間のロックを避ける
+            while True:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(delete_sql, (chunk_size,))
+                    chunk_deleted = cursor.rowcount if cursor.rowcount > 0 else 0
+                    if chunk_deleted > 0:
+                        self._mark_data_changed(conn)
+                
+                deleted_count += chunk_deleted
+                if chunk_deleted < chunk_size:
+                    break
+            
+            if deleted_count > 0:
+                # 保持した記事を代表記事にし、集計テーブルを再構築
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    self._refresh_all_canonical_flags(cursor)
+                    self.rebuild_aggregates(cursor)
+            
+            self.logger.info(f"重複ニュース削除完了: {deleted_count}件")
+            return deleted_count
                 
         except Exception as e:
             self.logger.error(f"重複ニュース削除エラー: {e}")
@@ -917,9 +2378,24 @@ class SpecDatabaseManager:
             Dict: 重複統計情報
         """
         try:
-            duplicates = self.find_duplicate_news()
-            total_duplicates = len(duplicates)
-            total_duplicate_items = sum(d['duplicate_count'] for d in duplicates)
+            with self.get_read_connection() as conn:
+                cursor = conn.cursor()
+                
+                # 重複判定キーのインデックスのみで集計
+                cursor.execute("""
+                    SELECT COUNT(*), COALESCE(SUM(cnt), 0)
+                    FROM (
+                        SELECT COUNT(*) AS cnt
+                        FROM news_table
+                        WHERE dedup_key IS NOT NULL
+                        GROUP BY dedup_key
+                        HAVING COUNT(*) > 1
+                    ) duplicate_groups
+                """)
+                result = cursor.fetchone()
+            
+            total_duplicates = int(result[0] or 0)
+            total_duplicate_items = int(result[1] or 0)
             redundant_items = total_duplicate_items - total_duplicates  # 削除可能な件数
             
             return {
@@ -933,6 +2409,42 @@ class SpecDatabaseManager:
             self.logger.error(f"重複統計取得エラー: {e}")
             return {}
 
+    def update_source_name(self, old_source: str, new_source: str) -> int:
+        """
+        ソース名を一括変更（重複判定キーも再計算）
+        
+        Args:
+            old_source: 変更前のソース名
+            new_source: 変更後のソース名
+            
+        Returns:
+            int: 更新された件数
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # ソースは重複判定キーの一部のため、キーをクリアして再計算させる
+                if self.db_type == "postgresql":
+                    sql = "UPDATE news_table SET source = %s, dedup_key = NULL WHERE source = %s"
+                else:
+                    sql = "UPDATE news_table SET source = ?, dedup_key = NULL WHERE source = ?"
+                
+                cursor.execute(sql, (new_source, old_source))
+                updated_count = cursor.rowcount
+                self._mark_data_changed(conn)
+            
+            if updated_count > 0:
+                self.backfill_dedup_keys()
+                self.rebuild_aggregates()
+            
+            self.logger.info(f"ソース名変更: '{old_source}' → '{new_source}' ({updated_count}件)")
+            return updated_count
+            
+        except Exception as e:
+            self.logger.error(f"ソース名変更エラー: {e}")
+            return 0
+
     def _get_url_only_filter(self) -> str:
         """本文がURLのみの記事を除外するフィルター条件を生成（手動登録は除外対象外）"""
         if self.db_type == "postgresql":
@@ -941,6 +2453,12 @@ class SpecDatabaseManager:
                 (LENGTH(body) > {self.min_body_length} AND 
                  NOT (body ~ '^\\s*https?://[^\\s]+\\s*$'))
             )"""
+        elif self.db_type == "sqlite":  # REGEXPはsqlite_backendで登録した関数
+            return f"""(
+                is_manual = 1 OR 
+                (length(body) > {self.min_body_length} AND 
+                 NOT (body REGEXP '^\\s*https?://[^\\s]+\\s*$'))
+            )"""
         else:  # SQL Server - NVARCHAR(MAX)でLEN()は使えないためDATALENGTH()使用
             return f"""(
                 is_manual = 1 OR 
@@ -959,14 +2477,17 @@ class SpecDatabaseManager:
                 filtered_news.append(news)
                 continue
                 
-            body = news.get('body', '').strip()
+            # 一覧表示用カラムの場合は本文抜粋と本文の文字数で判定
+            body = (news.get('body') if 'body' in news else news.get('snippet')) or ''
+            body = body.strip()
+            body_length = news.get('body_length', len(body)) or 0
             
             # 本文が空または短すぎる場合は除外
-            if not body or len(body) <= self.min_body_length:
+            if not body or body_length <= self.min_body_length:
                 continue
             
-            # 本文がURLのみかチェック
-            if self._is_url_only_body(body):
+            # 本文がURLのみかチェック（抜粋が本文全体の場合のみ判定可能）
+            if body_length <= len(body) and self._is_url_only_body(body):
                 continue
             
             filtered_news.append(news)
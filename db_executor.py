@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+UIハンドラー用のデータベース実行モジュール
+eelのハンドラーはgeventのgreenlet上で動くため、同期ドライバーのクエリを
+ワーカースレッドで実行し、待機中も他のUIリクエストを処理できるようにする
+"""
+
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import gevent
+from gevent.event import Event
+from gevent.threadpool import ThreadPool
+
+
+class DatabaseQueryTimeout(Exception):
+    """クエリがタイムアウトした"""
+
+
+class DatabaseQueryCancelled(Exception):
+    """クエリがキャンセルされた（画面遷移や後続リクエストによる置き換え）"""
+
+
+class _DatabaseTask:
+    """実行中のデータベース処理"""
+
+    def __init__(self, task_id: int, group: Optional[str], timeout: Optional[float]):
+        self.task_id = task_id
+        self.group = group
+        self.timeout = timeout
+        self.thread_id: Optional[int] = None
+        self.cancelled = False
+        self.cancel_event = Event()
+
+
+class DatabaseExecutor:
+    """データベース処理をワーカースレッドで実行するクラス（タイムアウト・キャンセル対応）"""
+
+    def __init__(self, db_manager, max_workers: int = 4, default_timeout: Optional[float] = 30):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            max_workers: 同時に実行するクエリ数の上限
+            default_timeout: クエリタイムアウト秒数の既定値（Noneで無制限）
+        """
+        self.db_manager = db_manager
+        self.default_timeout = default_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._pool = ThreadPool(max_workers)
+        self._tasks: Dict[int, _DatabaseTask] = {}
+        self._task_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stats = {'completed': 0, 'failed': 0, 'timeouts': 0, 'cancelled': 0}
+
+    def run(self, func: Callable, *args, group: Optional[str] = None, supersede: bool = False,
+            timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        データベース処理をワーカースレッドで実行し、結果を待つ（待機中は他のgreenletが動く）
+
+        Args:
+            func: 実行する処理（SpecDatabaseManagerのメソッドなど）
+            group: キャンセル単位のグループ名（画面ごとなど）
+            supersede: Trueの場合、同じグループの実行中の処理をキャンセルしてから実行
+            timeout: タイムアウト秒数（Noneの場合は既定値）
+
+        Raises:
+            DatabaseQueryTimeout: タイムアウトした場合
+            DatabaseQueryCancelled: キャンセルされた場合
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        if supersede and group:
+            self.cancel_group(group)
+
+        task = _DatabaseTask(next(self._task_ids), group, timeout)
+        with self._lock:
+            self._tasks[task.task_id] = task
+
+        try:
+            async_result = self._pool.spawn(self._invoke, task, func, args, kwargs)
+            gevent.wait([async_result, task.cancel_event], timeout=timeout, count=1)
+
+            # キャンセル済みの処理は完了していても結果を返さない（画面遷移後の古い結果）
+            if task.cancelled:
+                self._stats['cancelled'] += 1
+                raise DatabaseQueryCancelled(f"クエリがキャンセルされました: {getattr(func, '__name__', func)}")
+
+            if async_result.ready():
+                try:
+                    result = async_result.get()
+                except Exception:
+                    self._stats['failed'] += 1
+                    raise
+                self._stats['completed'] += 1
+                return result
+
+            # タイムアウト: 実行中のクエリを中断してワーカーを解放
+            self._cancel_task(task)
+            self._stats['timeouts'] += 1
+            self.logger.warning(f"クエリタイムアウト（{timeout}秒）: {getattr(func, '__name__', func)}")
+            raise DatabaseQueryTimeout(f"クエリがタイムアウトしました（{timeout}秒）")
+
+        finally:
+            with self._lock:
+                self._tasks.pop(task.task_id, None)
+
+    def _invoke(self, task: _DatabaseTask, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """ワーカースレッドでの実行（接続にクエリタイムアウトを設定）"""
+        # 実行スレッドの設定・解除はキャンセルと同じロックで行い、
+        # スレッドが次の処理に移った後に前の処理へのキャンセルが届かないようにする
+        with self._lock:
+            if task.cancelled:
+                raise DatabaseQueryCancelled("実行前にキャンセルされました")
+            task.thread_id = threading.get_ident()
+        try:
+            with self.db_manager.query_timeout(task.timeout):
+                return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                task.thread_id = None
+
+    def _cancel_task(self, task: _DatabaseTask):
+        """処理をキャンセル（待機中のgreenletを起こし、実行中のクエリを中断）"""
+        task.cancelled = True
+        task.cancel_event.set()
+
+        # ロック中はスレッドがこの処理を実行中のまま（解除を待たせる）
+        with self._lock:
+            if task.thread_id is not None:
+                self.db_manager.cancel_query(task.thread_id)
+
+    def cancel_group(self, group: Optional[str] = None) -> int:
+        """
+        グループの実行中の処理をキャンセル
+
+        Args:
+            group: グループ名（Noneの場合はグループ指定された全処理）
+
+        Returns:
+            int: キャンセルした件数
+        """
+        with self._lock:
+            targets = [task for task in self._tasks.values()
+                       if task.group is not None and (group is None or task.group == group)]
+
+        for task in targets:
+            self._cancel_task(task)
+
+        if targets:
+            self.logger.info(f"データベース処理キャンセル: group={group}, {len(targets)}件")
+        return len(targets)
+
+    def get_stats(self) -> Dict:
+        """実行統計（完了・失敗・タイムアウト・キャンセル件数と実行中件数）"""
+        with self._lock:
+            running = len(self._tasks)
+        return dict(self._stats, running=running)
+
+    def shutdown(self):
+        """ワーカースレッドを停止"""
+        self._pool.kill()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+データベース間のニュースデータ移行・同期モジュール
+移行元はサーバーサイドカーソルで行を順次読み出し、移行先へはバッチ単位で一括書き込みする
+進捗（ウォーターマーク）は状態ファイルに保存し、中断しても続きから再開できる
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from psycopg2.extras import execute_values
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# 同期対象カラム（news_idが主キー）
+# change_seq（変更フィード）は各データベースで採番するため対象外
+NEWS_SYNC_COLUMNS = [
+    'news_id', 'title', 'body', 'publish_time', 'acquire_time', 'source', 'url',
+    'sentiment', 'summary', 'keywords', 'related_metals', 'translation', 'is_manual',
+    'rating', 'is_read', 'read_at', 'importance_score', 'dedup_key', 'is_canonical'
+]
+NEWS_BOOLEAN_COLUMNS = {'is_manual', 'is_read', 'is_canonical'}
+
+STATS_SYNC_COLUMNS = [
+    'id', 'collection_date', 'total_collected', 'successful_queries', 'failed_queries',
+    'api_calls_made', 'errors_encountered', 'execution_time_seconds', 'created_at'
+]
+
+# SQL Serverの一括書き込み用ステージングテーブル（セッション単位の一時テーブル）
+SQLSERVER_STAGE_TABLE = "#news_sync_stage"
+
+
+def build_side_config(config: Dict, database_type: str, overrides: Optional[Dict] = None) -> Dict:
+    """
+    全体設定から移行元・移行先の設定を生成（database設定にmigration側の上書きを適用）
+
+    Args:
+        config: 全体設定
+        database_type: データベースタイプ
+        overrides: 接続情報の上書き（migration.source / migration.target）
+    """
+    side_config = dict(config)
+    side_config["database"] = dict(config.get("database", {}), **(overrides or {}))
+    side_config["database"]["database_type"] = database_type
+    # 移行ツールでは月次パーティションのメンテナンスを行わない
+    side_config["partitioning"] = {}
+    return side_config
+
+
+def _normalize_value(column: str, value):
+    """チェックサム用の値の正規化（バックエンド間の型・精度の違いを吸収）"""
+    if value is None:
+        return None
+    if column in NEWS_BOOLEAN_COLUMNS:
+        return bool(value)
+    if isinstance(value, datetime):
+        # SQL ServerのDATETIME2とPostgreSQLの精度差を避けるため秒単位で比較
+        return value.replace(microsecond=0).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    return value
+
+
+def row_checksum(row: tuple, columns: List[str] = NEWS_SYNC_COLUMNS) -> int:
+    """1行のチェックサム（64ビット整数）"""
+    normalized = [_normalize_value(column, value) for column, value in zip(columns, row)]
+    digest = hashlib.sha1(json.dumps(normalized, ensure_ascii=False, default=str).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class NewsDatabaseSync:
+    """データベース間のニュースデータ移行・同期クラス"""
+
+    def __init__(self, source_db, target_db, config: Dict, state_file: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            source_db: 移行元のSpecDatabaseManager
+            target_db: 移行先のSpecDatabaseManager
+            config: 全体設定（migration設定を使用）
+            state_file: 状態ファイルパス（省略時はmigration.state_file）
+        """
+        self.source_db = source_db
+        self.target_db = target_db
+        self.logger = logging.getLogger(__name__)
+
+        migration_config = config.get("migration", {})
+        self.batch_size = migration_config.get("migration_batch_size", 1000)
+        self.preserve_ids = migration_config.get("preserve_ids", True)
+        self.sync_interval = migration_config.get("sync_interval_seconds", 60)
+        self.recheck_days = migration_config.get("sync_recheck_days", 7)
+        self.state_file = state_file or migration_config.get("state_file", "data/migration_state.json")
+
+        self.state = self._load_state()
+
+    # ------------------------------------------------------------------
+    # 状態ファイル（ウォーターマーク）
+    # ------------------------------------------------------------------
+
+    def _describe(self, db_manager) -> str:
+        """状態ファイルで移行元・移行先を識別する文字列（パスワードは含めない）"""
+        params = db_manager.connection_params
+        location = params.get('path') or params.get('server') or params.get('host')
+        return f"{db_manager.db_type}:{location}/{params.get('database', '')}"
+
+    def _load_state(self) -> Dict:
+        """状態ファイル読み込み（移行元・移行先が異なる場合は初期状態）"""
+        pair = {'source': self._describe(self.source_db), 'target': self._describe(self.target_db)}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('source') == pair['source'] and state.get('target') == pair['target']:
+                return state
+            self.logger.warning("状態ファイルの移行元・移行先が異なるため、最初から移行します")
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"状態ファイル読み込みエラー（最初から移行します）: {e}")
+
+        return dict(pair, full_copy_done=False, last_news_id=None, acquire_watermark=None,
+                    last_stats_id=None, copied_rows=0)
+
+    def _save_state(self):
+        """状態ファイル保存（書き込み途中で中断しても壊れないよう置き換えで保存）"""
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.state_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.state_file)
+
+    def reset_state(self):
+        """ウォーターマークを初期化（次回は最初から移行）"""
+        self.state.update(full_copy_done=False, last_news_id=None, acquire_watermark=None,
+                          last_stats_id=None, copied_rows=0)
+        self._save_state()
+
+    # ------------------------------------------------------------------
+    # 読み出し（サーバーサイドカーソル）
+    # ------------------------------------------------------------------
+
+    def _placeholder(self, db_manager) -> str:
+        return "%s" if db_manager.db_type == "postgresql" else "?"
+
+    def _stream_rows(self, sql: str, params: tuple = ()) -> Iterator[List[tuple]]:
+        """移行元からバッチ単位で行を読み出す（サーバーサイドカーソル）"""
+        return self.source_db.iter_query_batches(sql, params, self.batch_size, "news_sync_stream")
+
+    def _news_select(self, where_clause: str = "1=1", order_by: str = "news_id") -> str:
+        return f"SELECT {', '.join(NEWS_SYNC_COLUMNS)} FROM news_table WHERE {where_clause} ORDER BY {order_by}"
+
+    # ------------------------------------------------------------------
+    # 書き込み（一括API）
+    # ------------------------------------------------------------------
+
+    def _upsert_news(self, rows: List[tuple]):
+        """移行先へニュースを一括upsert（news_idが同じ行は上書き）"""
+        columns = ", ".join(NEWS_SYNC_COLUMNS)
+        update_columns = [column for column in NEWS_SYNC_COLUMNS if column != 'news_id']
+        if self.target_db.db_type == "postgresql":
+            # パーティションテーブルは主キーが(news_id, publish_time)
+            conflict_columns = self.target_db._get_news_conflict_columns()
+            partitioned = conflict_columns != "news_id"
+            update_columns = [column for column in update_columns
+                              if not (partitioned and column == 'publish_time')]
+
+        with self.target_db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if self.target_db.db_type == "postgresql":
+                if partitioned:
+                    # 公開日時が変わった行は別パーティションの行になるため、古い行を先に削除
+                    publish_index = NEWS_SYNC_COLUMNS.index('publish_time')
+                    execute_values(cursor, """
+                        DELETE FROM news_table AS t USING (VALUES %s) AS s(news_id, publish_time)
+                        WHERE t.news_id = s.news_id AND t.publish_time <> s.publish_time
+                    """, [(row[0], row[publish_index]) for row in rows], page_size=len(rows))
+                updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+                execute_values(cursor, f"""
+                    INSERT INTO news_table ({columns}) VALUES %s
+                    ON CONFLICT ({conflict_columns}) DO UPDATE SET {updates}
+                """, rows, page_size=len(rows))
+            elif self.target_db.db_type == "sqlite":
+                placeholders = ", ".join("?" for _ in NEWS_SYNC_COLUMNS)
+                updates = ", ".join(f"{column} = excluded.{column}" for column in update_columns)
+                cursor.executemany(f"""
+                    INSERT INTO news_table ({columns}) VALUES ({placeholders})
+                    ON CONFLICT(news_id) DO UPDATE SET {updates}
+                """, rows)
+            else:
+                # ステージングテーブルへ一括挿入してからMERGE
+                placeholders = ", ".join("?" for _ in NEWS_SYNC_COLUMNS)
+                updates = ", ".join(f"t.{column} = s.{column}" for column in update_columns)
+                source_columns = ", ".join(f"s.{column}" for column in NEWS_SYNC_COLUMNS)
+                cursor.execute(f"""
+                    IF OBJECT_ID('tempdb..{SQLSERVER_STAGE_TABLE}') IS NULL
+                        SELECT TOP 0 {columns} INTO {SQLSERVER_STAGE_TABLE} FROM news_table
+                """)
+                cursor.fast_executemany = True
+                cursor.executemany(f"INSERT INTO {SQLSERVER_STAGE_TABLE} ({columns}) VALUES ({placeholders})", rows)
+                cursor.execute(f"""
+                    MERGE news_table WITH (HOLDLOCK) AS t
+                    USING {SQLSERVER_STAGE_TABLE} AS s ON t.news_id = s.news_id
+                    WHEN MATCHED THEN UPDATE SET {updates}
+                    WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({source_columns});
+                """)
+                cursor.execute(f"DROP TABLE {SQLSERVER_STAGE_TABLE}")
+
+    def _delete_news(self, news_ids: List[str]):
+        """移行先から移行元で削除されたニュースを削除"""
+        placeholder = self._placeholder(self.target_db)
+        with self.target_db.get_connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(news_ids), self.batch_size):
+                chunk = news_ids[start:start + self.batch_size]
+                cursor.execute(
+                    f"DELETE FROM news_table WHERE news_id IN ({', '.join(placeholder for _ in chunk)})",
+                    chunk
+                )
+
+    def _insert_stats(self, rows: List[tuple]):
+        """システム統計を一括挿入（preserve_idsがFalseの場合は移行先で採番）"""
+        columns = STATS_SYNC_COLUMNS if self.preserve_ids else STATS_SYNC_COLUMNS[1:]
+        if not self.preserve_ids:
+            rows = [row[1:] for row in rows]
+        column_list = ", ".join(columns)
+
+        with self.target_db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if self.target_db.db_type == "postgresql":
+                execute_values(cursor, f"INSERT INTO system_stats ({column_list}) VALUES %s ON CONFLICT DO NOTHING",
+                               rows, page_size=len(rows))
+                if self.preserve_ids:
+                    # 移行後の採番が重複しないようシーケンスを進める
+                    cursor.execute("SELECT setval(pg_get_serial_sequence('system_stats', 'id'), "
+                                   "(SELECT COALESCE(MAX(id), 1) FROM system_stats))")
+            elif self.target_db.db_type == "sqlite":
+                placeholders = ", ".join("?" for _ in columns)
+                cursor.executemany(f"INSERT OR IGNORE INTO system_stats ({column_list}) VALUES ({placeholders})", rows)
+            else:
+                placeholders = ", ".join("?" for _ in columns)
+                if self.preserve_ids:
+                    cursor.execute("SET IDENTITY_INSERT system_stats ON")
+                cursor.fast_executemany = True
+                cursor.executemany(f"INSERT INTO system_stats ({column_list}) VALUES ({placeholders})", rows)
+                if self.preserve_ids:
+                    cursor.execute("SET IDENTITY_INSERT system_stats OFF")
+
+    # ------------------------------------------------------------------
+    # 移行・同期
+    # ------------------------------------------------------------------
+
+    def _get_source_max_acquire_time(self) -> Optional[datetime]:
+        with self.source_db.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(acquire_time) FROM news_table")
+            result = cursor.fetchone()
+            if not result or result[0] is None:
+                return None
+            # SQLiteは集計結果の型変換が行われないため文字列で返る
+            return datetime.fromisoformat(result[0]) if isinstance(result[0], str) else result[0]
+
+    def migrate(self) -> Dict:
+        """
+        全件移行（news_id順に読み出し、バッチごとにウォーターマークを保存して再開可能）
+
+        Returns:
+            Dict: copied_rows（今回移行した行数）, total_rows（累計）, elapsed_seconds
+        """
+        start = time.time()
+        if not self.target_db.create_tables():
+            raise RuntimeError("移行先のテーブル作成に失敗しました")
+
+        # 移行中に追加された記事は差分同期で取り込むため、開始時点の取得日時を記録
+        if self.state.get('acquire_watermark') is None:
+            max_acquire = self._get_source_max_acquire_time()
+            self.state['acquire_watermark'] = max_acquire.isoformat() if max_acquire else None
+
+        copied = 0
+        if not self.state.get('full_copy_done'):
+            placeholder = self._placeholder(self.source_db)
+            last_news_id = self.state.get('last_news_id')
+            if last_news_id is not None:
+                self.logger.info(f"前回の続きから移行を再開: news_id > {last_news_id}")
+                sql, params = self._news_select(f"news_id > {placeholder}"), (last_news_id,)
+            else:
+                sql, params = self._news_select(), ()
+
+            for rows in self._stream_rows(sql, params):
+                self._upsert_news(rows)
+                copied += len(rows)
+                self.state['last_news_id'] = rows[-1][0]
+                self.state['copied_rows'] = self.state.get('copied_rows', 0) + len(rows)
+                self._save_state()
+                self.logger.info(f"ニュース移行中: 累計 {self.state['copied_rows']} 件")
+
+            self.state['full_copy_done'] = True
+            self._save_state()
+
+        self._copy_system_stats()
+        self.target_db.rebuild_aggregates()
+        # 一括投入後は統計情報がないため一覧クエリのインデックスが選ばれないことがある
+        self.target_db.update_statistics()
+
+        elapsed = time.time() - start
+        self.logger.info(f"ニュース移行完了: 今回 {copied} 件, 累計 {self.state.get('copied_rows', 0)} 件 ({elapsed:.1f}秒)")
+        return {'copied_rows': copied, 'total_rows': self.state.get('copied_rows', 0), 'elapsed_seconds': elapsed}
+
+    def _copy_system_stats(self) -> int:
+        """システム統計の差分コピー（idのウォーターマーク以降）"""
+        placeholder = self._placeholder(self.source_db)
+        last_id = self.state.get('last_stats_id') or 0
+        sql = f"SELECT {', '.join(STATS_SYNC_COLUMNS)} FROM system_stats WHERE id > {placeholder} ORDER BY id"
+
+        copied = 0
+        for rows in self._stream_rows(sql, (last_id,)):
+            self._insert_stats(rows)
+            copied += len(rows)
+            self.state['last_stats_id'] = rows[-1][0]
+            self._save_state()
+        return copied
+
+    def sync_once(self) -> Dict:
+        """
+        差分同期を1回実行
+        1. 取得日時のウォーターマーク以降に追加された記事をコピー
+        2. 直近の公開日の日別チェックサムを比較し、不一致の日は更新・削除を反映
+           （既読・レーティング・分析結果の更新や重複除去による削除を取り込む）
+
+        Returns:
+            Dict: new_rows, updated_rows, deleted_rows, mismatched_days
+        """
+        if not self.state.get('full_copy_done'):
+            self.migrate()
+
+        result = {'new_rows': 0, 'updated_rows': 0, 'deleted_rows': 0, 'mismatched_days': 0}
+        placeholder = self._placeholder(self.source_db)
+
+        watermark = self.state.get('acquire_watermark')
+        if watermark:
+            sql = self._news_select(f"acquire_time >= {placeholder}", "acquire_time, news_id")
+            params = (datetime.fromisoformat(watermark),)
+        else:
+            sql, params = self._news_select(order_by="acquire_time, news_id"), ()
+
+        acquire_index = NEWS_SYNC_COLUMNS.index('acquire_time')
+        for rows in self._stream_rows(sql, params):
+            self._upsert_news(rows)
+            result['new_rows'] += len(rows)
+            self.state['acquire_watermark'] = rows[-1][acquire_index].isoformat()
+            self._save_state()
+
+        since = datetime.now() - timedelta(days=self.recheck_days)
+        source_buckets = self._day_checksums(self.source_db, since)
+        target_buckets = self._day_checksums(self.target_db, since)
+        mismatched = sorted(day for day in set(source_buckets) | set(target_buckets)
+                            if source_buckets.get(day) != target_buckets.get(day))
+        result['mismatched_days'] = len(mismatched)
+
+        for day in mismatched:
+            updated, deleted = self._reconcile_day(day)
+            result['updated_rows'] += updated
+            result['deleted_rows'] += deleted
+
+        result['system_stats_rows'] = self._copy_system_stats()
+
+        if result['new_rows'] or result['updated_rows'] or result['deleted_rows']:
+            self.target_db.rebuild_aggregates()
+        return result
+
+    def run_continuous(self, interval_seconds: Optional[float] = None, max_cycles: Optional[int] = None):
+        """
+        差分同期を一定間隔で繰り返す（Ctrl+Cで停止）
+
+        Args:
+            interval_seconds: 同期間隔（省略時はmigration.sync_interval_seconds）
+            max_cycles: 最大実行回数（Noneの場合は停止されるまで）
+        """
+        interval = interval_seconds if interval_seconds is not None else self.sync_interval
+        cycles = 0
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                try:
+                    result = self.sync_once()
+                    self.logger.info(f"差分同期: 追加 {result['new_rows']} 件, 更新 {result['updated_rows']} 件, "
+                                     f"削除 {result['deleted_rows']} 件")
+                except Exception as e:
+                    self.logger.error(f"差分同期エラー（次回再試行）: {e}")
+                cycles += 1
+                if max_cycles is None or cycles < max_cycles:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            self.logger.info("差分同期を停止しました")
+
+    # ------------------------------------------------------------------
+    # 検証（件数・チェックサム）
+    # ------------------------------------------------------------------
+
+    def _day_checksums(self, db_manager, since: Optional[datetime] = None) -> Dict[str, Tuple[int, int]]:
+        """
+        公開日ごとの件数とチェックサム（行チェックサムのXORなので読み出し順に依存しない）
+        """
+        placeholder = self._placeholder(db_manager)
+        where_clause, params = ("1=1", ())
+        if since is not None:
+            where_clause, params = f"publish_time >= {placeholder}", (since,)
+        sql = f"SELECT {', '.join(NEWS_SYNC_COLUMNS)} FROM news_table WHERE {where_clause}"
+
+        publish_index = NEWS_SYNC_COLUMNS.index('publish_time')
+        buckets: Dict[str, List[int]] = {}
+        for rows in db_manager.iter_query_batches(sql, params, self.batch_size, "news_sync_checksum"):
+            for row in rows:
+                day = row[publish_index].date().isoformat()
+                bucket = buckets.setdefault(day, [0, 0])
+                bucket[0] += 1
+                bucket[1] ^= row_checksum(row)
+
+        return {day: (count, checksum) for day, (count, checksum) in buckets.items()}
+
+    def _reconcile_day(self, day: str) -> Tuple[int, int]:
+        """公開日1日分の行を移行元に合わせる（更新行の再コピーと削除行の削除）"""
+        day_start = datetime.fromisoformat(day)
+        day_end = day_start + timedelta(days=1)
+
+        source_ids = set()
+        placeholder = self._placeholder(self.source_db)
+        sql = self._news_select(f"publish_time >= {placeholder} AND publish_time < {placeholder}")
+        updated = 0
+        for rows in self._stream_rows(sql, (day_start, day_end)):
+            self._upsert_news(rows)
+            updated += len(rows)
+            source_ids.update(row[0] for row in rows)
+
+        target_placeholder = self._placeholder(self.target_db)
+        with self.target_db.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT news_id FROM news_table WHERE publish_time >= {target_placeholder} AND publish_time < {target_placeholder}",
+                (day_start, day_end)
+            )
+            deleted_ids = [row[0] for row in cursor.fetchall() if row[0] not in source_ids]
+
+        if deleted_ids:
+            self._delete_news(deleted_ids)
+        return updated, len(deleted_ids)
+
+    def verify(self) -> Dict:
+        """
+        移行元と移行先の件数・チェックサムを比較
+
+        Returns:
+            Dict: match, source_count, target_count, source_checksum, target_checksum, mismatched_days
+        """
+        source_buckets = self._day_checksums(self.source_db)
+        target_buckets = self._day_checksums(self.target_db)
+
+        def _total(buckets):
+            count, checksum = 0, 0
+            for day_count, day_checksum in buckets.values():
+                count += day_count
+                checksum ^= day_checksum
+            return count, checksum
+
+        source_count, source_checksum = _total(source_buckets)
+        target_count, target_checksum = _total(target_buckets)
+        mismatched = sorted(day for day in set(source_buckets) | set(target_buckets)
+                            if source_buckets.get(day) != target_buckets.get(day))
+
+        return {
+            'match': not mismatched,
+            'source_count': source_count,
+            'target_count': target_count,
+            'source_checksum': f"{source_checksum:016x}",
+            'target_checksum': f"{target_checksum:016x}",
+            'mismatched_days': mismatched
+        }
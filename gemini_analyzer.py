@@ -5,17 +5,25 @@ Gemini AI分析モジュール
 """
 
 import google.generativeai as genai
+import os
 import time
 import json
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import asyncio
 import aiohttp
 from pathlib import Path
 
+from analysis_cache import PersistentAnalysisCache, compute_content_hash
+
 @dataclass
 class AnalysisResult:
     """分析結果データクラス"""
@@ -30,50 +38,255 @@ class AnalysisResult:
     model_used: Optional[str] = None
     cost_estimate: Optional[float] = None
 
+# 分析項目（項目名, 有効化する設定キー）
+ANALYSIS_FIELDS = [
+    ('summary', 'summary_generation'),
+    ('sentiment', 'sentiment_analysis'),
+    ('keywords', 'keyword_extraction'),
+    ('importance', 'importance_scoring'),
+    ('translation', 'translation_enabled'),
+]
+
+# 分析項目ごとの取得結果の格納先（AnalysisResultの属性名）
+ANALYSIS_RESULT_ATTRIBUTES = {
+    'summary': 'summary',
+    'sentiment': 'sentiment',
+    'keywords': 'keywords',
+    'importance': 'importance_score',
+    'translation': 'translation',
+}
+
+SENTIMENT_LABELS = ['ポジティブ', 'ネガティブ', 'ニュートラル']
+
+# 永続キャッシュに保存する分析結果の項目
+CACHED_RESULT_FIELDS = [
+    'summary', 'sentiment', 'keywords', 'importance_score',
+    'sentiment_reason', 'importance_reason', 'translation', 'model_used'
+]
+
+# プロンプトの組み立て方を変更したら更新（キャッシュ済みの分析結果を無効化）
+ANALYSIS_PROMPT_VERSION = 1
+
 class GeminiRateLimiter:
-    """レート制限管理"""
+    """
+    レート制限管理（スレッドセーフ、asyncioから待機可能）
+    分間リクエスト数・分間トークン数はdequeのスライディングウィンドウ、日次リクエスト数は日付ごとに集計
+    state_pathを指定すると状態をファイルに保存し、再起動後も日次の利用分を引き継ぐ
+    """
     
-    def __init__(self, max_per_minute: int = 15, max_per_day: int = 1500):
+    def __init__(self, max_per_minute: int = 15, max_per_day: int = 1500,
+                 max_tokens_per_minute: Optional[int] = None, state_path: Optional[str] = None,
+                 window_seconds: float = 60.0):
         self.max_per_minute = max_per_minute
         self.max_per_day = max_per_day
-        self.minute_requests = []
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.state_path = state_path
+        self.window_seconds = window_seconds
+        self.logger = logging.getLogger('GeminiNewsAnalyzer')
+        
+        self.minute_requests: Deque[float] = deque()
+        self.minute_tokens: Deque[Tuple[float, int]] = deque()
+        self.minute_token_total = 0
         self.daily_requests = 0
-        self.daily_reset_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.current_day = date.today()
+        self._lock = threading.Lock()
         
-    def can_make_request(self) -> bool:
-        """リクエスト可能かチェック"""
-        now = datetime.now()
+        if state_path:
+            self._load_state()
+    
+    def _prune(self, now: float):
+        """ウィンドウ外の記録を破棄し、日付が変わっていれば日次の件数をリセット"""
+        cutoff = now - self.window_seconds
+        while self.minute_requests and self.minute_requests[0] <= cutoff:
+            self.minute_requests.popleft()
+        while self.minute_tokens and self.minute_tokens[0][0] <= cutoff:
+            self.minute_token_total -= self.minute_tokens.popleft()[1]
         
-        # 日次制限リセット
-        if now >= self.daily_reset_time + timedelta(days=1):
+        today = date.fromtimestamp(now)
+        if today != self.current_day:
+            self.current_day = today
             self.daily_requests = 0
-            self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    def _wait_seconds(self, now: float, tokens: int) -> Optional[float]:
+        """枠が空くまでの秒数（0以下なら即時、日次上限に達していればNone）"""
+        if self.daily_requests >= self.max_per_day:
+            return None
         
-        # 分次制限チェック
-        one_minute_ago = now - timedelta(minutes=1)
-        self.minute_requests = [t for t in self.minute_requests if t > one_minute_ago]
+        waits = [0.0]
         
-        return (len(self.minute_requests) < self.max_per_minute and 
-                self.daily_requests < self.max_per_day)
+        # 上限未満になるまでに古い順に解放されるリクエスト
+        if len(self.minute_requests) >= self.max_per_minute:
+            oldest = self.minute_requests[len(self.minute_requests) - self.max_per_minute]
+            waits.append(oldest + self.window_seconds - now)
+        
+        # 今回のトークン数が収まるまでに解放される記録（1件で上限を超える場合はウィンドウが空になるまで）
+        if self.max_tokens_per_minute and self.minute_tokens:
+            excess = self.minute_token_total + tokens - self.max_tokens_per_minute
+            if excess > 0:
+                released = 0
+                for timestamp, count in self.minute_tokens:
+                    released += count
+                    if released >= excess:
+                        waits.append(timestamp + self.window_seconds - now)
+                        break
+                else:
+                    waits.append(self.minute_tokens[-1][0] + self.window_seconds - now)
+        
+        return max(waits)
+    
+    def _record(self, now: float, requests: int, tokens: int):
+        """リクエスト・トークン数を記録"""
+        for _ in range(requests):
+            self.minute_requests.append(now)
+        self.daily_requests += requests
+        if tokens > 0:
+            self.minute_tokens.append((now, tokens))
+            self.minute_token_total += tokens
+        self._save_state()
+    
+    def try_acquire(self, tokens: int = 0) -> Optional[float]:
+        """
+        枠があればリクエスト1件とトークン数を記録
+        
+        Returns:
+            Optional[float]: 確保できれば0、できなければ待機秒数（日次上限に達していればNone）
+        """
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            wait = self._wait_seconds(now, tokens)
+            if wait is not None and wait <= 0:
+                self._record(now, 1, tokens)
+                return 0.0
+            return wait
+    
+    async def acquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> bool:
+        """
+        枠が空くまで待機してリクエスト1件とトークン数を記録
+        
+        Args:
+            tokens: 今回のリクエストの入力トークン数（概算）
+            max_wait: 最大待機秒数（Noneの場合は枠が空くまで待機）
+            
+        Returns:
+            bool: 確保できればTrue（日次上限に達した場合・max_waitを超える場合はFalse）
+        """
+        deadline = time.monotonic() + max_wait if max_wait is not None else None
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait is None:
+                return False
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+    
+    def record_tokens(self, tokens: int):
+        """応答の出力トークン数など、リクエスト後に判明したトークン数を記録"""
+        if tokens <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            self._record(now, 0, tokens)
+    
+    def can_make_request(self) -> bool:
+        """リクエスト可能かチェック"""
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            wait = self._wait_seconds(now, 0)
+            return wait is not None and wait <= 0
     
     def record_request(self):
         """リクエスト記録"""
-        now = datetime.now()
-        self.minute_requests.append(now)
-        self.daily_requests += 1
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            self._record(now, 1, 0)
     
     def wait_time(self) -> float:
         """待機時間計算"""
-        if not self.minute_requests:
-            return 0
-        
-        oldest_request = min(self.minute_requests)
-        time_since_oldest = (datetime.now() - oldest_request).total_seconds()
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            wait = self._wait_seconds(now, 0)
+            return max(0.0, wait) if wait is not None else 0.0
+    
+    def get_status(self) -> Dict:
+        """現在の利用状況"""
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            wait = self._wait_seconds(now, 0)
+            return {
+                'requests_this_minute': len(self.minute_requests),
+                'tokens_this_minute': self.minute_token_total,
+                'requests_today': self.daily_requests,
+                'max_requests_per_minute': self.max_per_minute,
+                'max_tokens_per_minute': self.max_tokens_per_minute,
+                'max_requests_per_day': self.max_per_day,
+                'can_make_request': wait is not None and wait <= 0
+            }
+    
+    def _load_state(self):
+        """保存済みの状態を読み込み（日付が変わっていれば日次の件数は引き継がない）"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"レート制限の状態を読み込めません: {e}")
+            return
         
-        if len(self.minute_requests) >= self.max_per_minute:
-            return 60 - time_since_oldest
+        now = time.time()
+        cutoff = now - self.window_seconds
+        if state.get('date') == self.current_day.isoformat():
+            self.daily_requests = int(state.get('daily_requests', 0))
+        self.minute_requests.extend(t for t in state.get('minute_requests', []) if cutoff < t <= now)
+        for timestamp, tokens in state.get('minute_tokens', []):
+            if cutoff < timestamp <= now:
+                self.minute_tokens.append((timestamp, tokens))
+                self.minute_token_total += tokens
+    
+    def _save_state(self):
+        """状態をファイルに保存（一時ファイルに書き出してから置き換え）"""
+        if not self.state_path:
+            return
         
-        return 0
+        state = {
+            'date': self.current_day.isoformat(),
+            'daily_requests': self.daily_requests,
+            'minute_requests': list(self.minute_requests),
+            'minute_tokens': [list(entry) for entry in self.minute_tokens]
+        }
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.state_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            self.logger.warning(f"レート制限の状態を保存できません: {e}")
+
+# プロセス内で共有するレート制限（収集器ごとに分析器が作られても同じ枠を使う）
+_shared_rate_limiters: Dict[tuple, GeminiRateLimiter] = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+def get_shared_rate_limiter(max_per_minute: int, max_per_day: int, max_tokens_per_minute: Optional[int] = None,
+                            state_path: Optional[str] = None) -> GeminiRateLimiter:
+    """同じ制限値・状態ファイルのレート制限をプロセス内で1つだけ作成して共有"""
+    key = (max_per_minute, max_per_day, max_tokens_per_minute, os.path.abspath(state_path) if state_path else None)
+    with _shared_rate_limiters_lock:
+        limiter = _shared_rate_limiters.get(key)
+        if limiter is None:
+            limiter = GeminiRateLimiter(max_per_minute, max_per_day, max_tokens_per_minute, state_path)
+            _shared_rate_limiters[key] = limiter
+        return limiter
 
 class GeminiNewsAnalyzer:
     """Geminiニュース分析器"""
@@ -93,19 +306,38 @@ class GeminiNewsAnalyzer:
             self.fallback_model = None
             self.logger.warning("Gemini APIキーが設定されていません")
         
-        # レート制限管理
-        self.rate_limiter = GeminiRateLimiter(
+        # レート制限管理（プロセス内の全分析器で共有）
+        self.rate_limiter = get_shared_rate_limiter(
             max_per_minute=self.gemini_config.get("max_requests_per_minute", 15),
-            max_per_day=self.gemini_config.get("max_requests_per_day", 1500)
+            max_per_day=self.gemini_config.get("max_requests_per_day", 1500),
+            max_tokens_per_minute=self.gemini_config.get("max_tokens_per_minute"),
+            state_path=self.gemini_config.get("rate_limit_state_file")
         )
         
+        # 同時リクエスト数（分間の上限を超えない範囲）とタイムアウト
+        # 同期APIの呼び出しは専用スレッドプールで実行し、応答待ちの間も他の記事のリクエストを進める
+        # （タイムアウトした呼び出しもスレッドが戻るまで枠を占有するため、プールで待たされることはない）
+        self.max_concurrent_requests = max(1, min(
+            self.gemini_config.get("max_concurrent_requests", 4),
+            self.rate_limiter.max_per_minute
+        ))
+        self.request_timeout = self.gemini_config.get("request_timeout_seconds", 60)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests, thread_name_prefix="gemini")
+        self._request_semaphores = weakref.WeakKeyDictionary()
+        self._next_request_at = 0.0
+        
         # コスト追跡
         self.daily_cost = 0.0
         self.max_daily_cost = self.gemini_config.get("cost_optimization", {}).get("max_daily_cost_usd", 5.0)
+        # 送信中のリクエストの見積もりコスト（並行リクエストが日次コスト制限を超えないよう送信前に確保）
+        self._reserved_cost = 0.0
         
         # 分析済みニュースキャッシュ
         self.analyzed_cache = set()
         
+        # 分析結果の永続キャッシュ（本文ハッシュ + プロンプトのバージョンで記事ID・再起動をまたいで再利用）
+        self.analysis_cache = self._create_analysis_cache()
+        
         # パフォーマンス統計
         self.stats = {
             'total_analyzed': 0,
@@ -113,6 +345,11 @@ class GeminiNewsAnalyzer:
             'failed_analyses': 0,
             'cache_hits': 0,
             'api_calls_made': 0,
+            'combined_analyses': 0,
+            'field_fallbacks': 0,
+            'batch_requests': 0,
+            'batch_splits': 0,
+            'estimated_tokens': 0,
             'total_cost': 0.0
         }
     
@@ -129,6 +366,58 @@ class GeminiNewsAnalyzer:
         
         return logger
     
+    def _create_analysis_cache(self) -> Optional[PersistentAnalysisCache]:
+        """設定で有効な場合に分析結果の永続キャッシュを開く"""
+        cache_config = self.gemini_config.get("analysis_cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        
+        try:
+            ttl_days = cache_config.get("ttl_days", 30)
+            return PersistentAnalysisCache(
+                cache_config.get("cache_path", "data/analysis_cache.db"),
+                max_entries=cache_config.get("max_entries", 20000),
+                ttl_seconds=ttl_days * 86400 if ttl_days else None
+            )
+        except Exception as e:
+            self.logger.warning(f"分析キャッシュを開けないため無効化します: {e}")
+            return None
+    
+    def _get_prompt_version(self) -> str:
+        """プロンプト・モデルのバージョン（いずれかが変われば別のキャッシュキーになる）"""
+        version_source = json.dumps({
+            'version': ANALYSIS_PROMPT_VERSION,
+            'model': self.model.model_name if self.model else None,
+            'prompts': self.gemini_config.get("analysis_prompts", {})
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(version_source.encode('utf-8')).hexdigest()[:16]
+    
+    def _get_cached_analysis(self, item: Dict) -> Optional[AnalysisResult]:
+        """同じ本文の分析結果がキャッシュにあれば返す（必要な項目が揃っていない場合はNone）"""
+        if self.analysis_cache is None:
+            return None
+        
+        try:
+            cached = self.analysis_cache.get(item['cache_key'])
+        except Exception as e:
+            self.logger.warning(f"分析キャッシュ参照エラー: {e}")
+            return None
+        if not cached:
+            return None
+        
+        result = AnalysisResult(**{field: cached.get(field) for field in CACHED_RESULT_FIELDS})
+        # 翻訳なしで分析した記事などは再分析
+        if any(getattr(result, ANALYSIS_RESULT_ATTRIBUTES[field]) is None for field in item['fields']):
+            return None
+        
+        result.analysis_time = datetime.now()
+        result.cost_estimate = 0.0
+        if item['news_id']:
+            self.analyzed_cache.add(item['news_id'])
+        self.stats['cache_hits'] += 1
+        self.logger.info(f"分析キャッシュを使用: {item['title'][:50]}...")
+        return result
+    
     def _estimate_cost(self, text_length: int, model_name: str) -> float:
         """コスト見積もり（概算）"""
         # Gemini Flash: $0.075 per 1M input tokens, $0.30 per 1M output tokens
@@ -147,6 +436,10 @@ class GeminiNewsAnalyzer:
         
         return input_cost + output_cost
     
+    def _estimate_tokens(self, text_length: int) -> int:
+        """トークン数の概算（_estimate_costと同じく文字数/4）"""
+        return max(1, text_length // 4)
+    
     def _should_analyze_news(self, news: Dict) -> bool:
         """ニュース分析対象かどうか判定"""
         if not self.gemini_config.get("enable_ai_analysis", False):
@@ -239,52 +532,126 @@ class GeminiNewsAnalyzer:
         # 英語キーワードが3個以上含まれていれば翻訳対象
         return english_count >= 3
     
-    async def _call_gemini_api(self, prompt: str, use_fallback: bool = False) -> Optional[str]:
-        """Gemini API呼び出し"""
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """実行中のイベントループ用の同時リクエスト数制限（asyncio.runごとにループが異なるため個別に作成）"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._request_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._request_semaphores[loop] = semaphore
+        return semaphore
+    
+    async def _wait_for_request_slot(self):
+        """リクエストの送信間隔をrate_limit_delay秒以上空ける（応答待ちの間に次のリクエストを送信できる）"""
+        delay = self.gemini_config.get("rate_limit_delay", 4.5)
+        if delay <= 0:
+            return
+        
+        now = time.monotonic()
+        slot = max(now, self._next_request_at)
+        self._next_request_at = slot + delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def _call_gemini_api(self, prompt: str, use_fallback: bool = False,
+                               generation_config: Optional[Dict] = None) -> Optional[str]:
+        """Gemini API呼び出し（generation_configでJSONスキーマ出力などを指定）"""
         if not self.model:
             return None
         
-        # レート制限チェック
+        # 同時リクエスト数の枠（タイムアウトした呼び出しはスレッドが戻るまで枠を解放しない）
+        semaphore = self._get_request_semaphore()
+        await semaphore.acquire()
+        pending_future = None
+        try:
+            model = self.fallback_model if use_fallback else self.model
+            
+            # 日次コスト制限チェック（送信中のリクエストの見積もりコストを含めて判定し、このリクエスト分を確保）
+            cost = self._estimate_cost(len(prompt), model.model_name)
+            if self.daily_cost + self._reserved_cost + cost > self.max_daily_cost:
+                self.logger.warning(f"日次コスト制限に達したため、リクエストをスキップ: ${self.daily_cost:.4f}")
+                return None
+            self._reserved_cost += cost
+            
+            try:
+                response_text, pending_future = await self._send_gemini_request(model, prompt, cost, generation_config)
+                if response_text is not False:
+                    return response_text
+            finally:
+                self._reserved_cost -= cost
+        finally:
+            if pending_future is None:
+                semaphore.release()
+            else:
+                self._release_when_done(pending_future, semaphore)
+        
+        # フォールバックモデル試行（同時リクエスト数の枠を解放してから再試行）
+        if not use_fallback and self.fallback_model:
+            self.logger.info("フォールバックモデルで再試行")
+            return await self._call_gemini_api(prompt, use_fallback=True, generation_config=generation_config)
+        
+        return None
+    
+    async def _send_gemini_request(self, model, prompt: str, cost: float, generation_config: Optional[Dict]):
+        """
+        レート制限の枠を確保してAPIを呼び出す
+        
+        Returns:
+            Tuple: (応答テキスト（スキップ時はNone、失敗時はFalse）, タイムアウトして実行中のままの呼び出し（なければNone）)
+        """
+        # 分間リクエスト数・分間トークン数・日次リクエスト数の枠を確保（最大1分待機）
+        # 同時実行中の他のリクエストが上限を超えないよう送信前に記録
         wait_time = self.rate_limiter.wait_time()
         if wait_time > 0:
-            self.logger.info(f"レート制限のため {wait_time:.1f}秒待機")
-            await asyncio.sleep(wait_time)
-        
-        # レート制限再チェック
-        if not self.rate_limiter.can_make_request():
+            self.logger.info(f"レート制限のため最大 {wait_time:.1f}秒待機")
+        if not await self.rate_limiter.acquire(self._estimate_tokens(len(prompt)), max_wait=60):
             self.logger.warning("レート制限により分析をスキップ")
-            return None
+            return None, None
+        
+        await self._wait_for_request_slot()
         
+        # API呼び出し（ブロッキング呼び出しをスレッドプールで実行）
+        future = self._executor.submit(model.generate_content, prompt, generation_config=generation_config)
         try:
-            model = self.fallback_model if use_fallback else self.model
-            
-            # API呼び出し
-            response = model.generate_content(prompt)
-            
-            # レート制限記録
-            self.rate_limiter.record_request()
+            response = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.request_timeout)
+            response_text = response.text
             self.stats['api_calls_made'] += 1
             
-            # コスト更新
-            cost = self._estimate_cost(len(prompt), model.model_name)
+            # コスト・トークン数更新（出力トークン数は応答後に分間トークン数へ加算）
+            self.rate_limiter.record_tokens(self._estimate_tokens(len(response_text or '')))
+            self.stats['estimated_tokens'] += self._estimate_tokens(len(prompt) + len(response_text or ''))
             self.daily_cost += cost
             self.stats['total_cost'] += cost
             
-            # 設定した遅延
-            delay = self.gemini_config.get("rate_limit_delay", 4.5)
-            await asyncio.sleep(delay)
-            
-            return response.text if response.text else None
+            return (response_text if response_text else None), None
             
+        except asyncio.TimeoutError:
+            # 送信済みのリクエストは課金されている可能性があるため見積もりを計上
+            self.logger.error(f"Gemini API呼び出しタイムアウト（{self.request_timeout}秒）")
+            self.stats['estimated_tokens'] += self._estimate_tokens(len(prompt))
+            self.daily_cost += cost
+            self.stats['total_cost'] += cost
+            return False, (None if future.done() else future)
         except Exception as e:
             self.logger.error(f"Gemini API呼び出しエラー: {e}")
-            
-            # フォールバックモデル試行
-            if not use_fallback and self.fallback_model:
-                self.logger.info("フォールバックモデルで再試行")
-                return await self._call_gemini_api(prompt, use_fallback=True)
-            
-            return None
+        return False, None
+    
+    def _release_when_done(self, future, semaphore: asyncio.Semaphore):
+        """タイムアウトした呼び出しのスレッドが戻ったら、出力トークン数を記録して同時リクエスト数の枠を解放"""
+        loop = asyncio.get_running_loop()
+        
+        def on_done(done_future):
+            try:
+                response_text = done_future.result().text
+                self.rate_limiter.record_tokens(self._estimate_tokens(len(response_text or '')))
+            except Exception:
+                pass  # 失敗した呼び出しは出力トークンなし
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # イベントループ終了後（枠はループごとのため解放不要）
+        
+        future.add_done_callback(on_done)
     
     def _parse_importance_response(self, response: str) -> Tuple[Optional[int], Optional[str]]:
         """重要度レスポンス解析"""
@@ -330,6 +697,270 @@ class GeminiNewsAnalyzer:
         
         return sentiment, reason
     
+    def _normalize_sentiment(self, value: Optional[str]) -> Optional[str]:
+        """センチメントの表記ゆれを統一（判定できない値はNone）"""
+        if not value:
+            return None
+        
+        value_lower = value.lower()
+        if 'ポジティブ' in value or 'positive' in value_lower:
+            return 'ポジティブ'
+        if 'ネガティブ' in value or 'negative' in value_lower:
+            return 'ネガティブ'
+        if 'ニュートラル' in value or 'neutral' in value_lower or '中立' in value:
+            return 'ニュートラル'
+        return None
+    
+    def _get_enabled_fields(self, title: str, body: str) -> List[str]:
+        """設定で有効な分析項目（翻訳は英語記事のみ）"""
+        fields = [name for name, config_key in ANALYSIS_FIELDS if self.gemini_config.get(config_key, False)]
+        if 'translation' in fields and not self._should_translate(title, body):
+            fields.remove('translation')
+        return fields
+    
+    def _build_field_spec(self, fields: List[str]) -> Tuple[List[str], Dict]:
+        """
+        分析項目ごとの指示とJSONスキーマのプロパティを作成
+        
+        Returns:
+            Tuple[List[str], Dict]: 項目ごとの指示, JSONスキーマのproperties
+        """
+        prompts = self.gemini_config.get("analysis_prompts", {})
+        properties = {}
+        instructions = []
+        
+        if 'summary' in fields:
+            properties['summary'] = {'type': 'string'}
+            instructions.append(f"- summary: {prompts.get('summary', '要約してください:')}")
+        
+        if 'sentiment' in fields:
+            properties['sentiment'] = {'type': 'string', 'enum': SENTIMENT_LABELS}
+            properties['sentiment_reason'] = {'type': 'string'}
+            instructions.append(
+                f"- sentiment, sentiment_reason: {prompts.get('sentiment', 'センチメントを評価してください:')}"
+                f"（sentimentは{'/'.join(SENTIMENT_LABELS)}のいずれか、理由はsentiment_reason）"
+            )
+        
+        if 'keywords' in fields:
+            properties['keywords'] = {'type': 'array', 'items': {'type': 'string'}}
+            instructions.append(f"- keywords: {prompts.get('keywords', 'キーワードを抽出してください:')}（文字列の配列）")
+        
+        if 'importance' in fields:
+            properties['importance_score'] = {'type': 'integer'}
+            properties['importance_reason'] = {'type': 'string'}
+            instructions.append(
+                f"- importance_score, importance_reason: {prompts.get('importance', '重要度を評価してください:')}"
+                "（importance_scoreは1〜10の整数、理由はimportance_reason）"
+            )
+        
+        if 'translation' in fields:
+            properties['translation'] = {'type': 'string'}
+            instructions.append(f"- translation: {prompts.get('translation', '日本語に翻訳してください:')}")
+        
+        return instructions, properties
+    
+    def _build_combined_prompt(self, text: str, fields: List[str]) -> Tuple[str, Dict]:
+        """
+        有効な全項目を1回で取得する統合分析プロンプトとJSONスキーマを作成
+        
+        Returns:
+            Tuple[str, Dict]: プロンプト, レスポンスのJSONスキーマ
+        """
+        instructions, properties = self._build_field_spec(fields)
+        prompt = (
+            "以下のニュースを分析し、次の項目を持つJSONオブジェクトのみを返してください。\n"
+            + "\n".join(instructions)
+            + f"\n\nニュース:\n{text}"
+        )
+        schema = {'type': 'object', 'properties': properties, 'required': list(properties)}
+        return prompt, schema
+    
+    def _extract_json(self, response: Optional[str]):
+        """レスポンスからJSONを抽出（コードブロックや前後の文章が付いていても抽出、失敗時はNone）"""
+        if not response:
+            return None
+        
+        text = response.strip()
+        fence_match = re.search(r'```(?:json)?\s*(.*?)```', text, re.DOTALL)
+        if fence_match:
+            text = fence_match.group(1).strip()
+        
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        
+        # 最初の括弧から対応する最後の括弧までを再解析（オブジェクト → 配列の順）
+        for open_char, close_char in (('{', '}'), ('[', ']')):
+            start, end = text.find(open_char), text.rfind(close_char)
+            if 0 <= start < end:
+                try:
+                    return json.loads(text[start:end + 1])
+                except json.JSONDecodeError:
+                    continue
+        return None
+    
+    def _parse_combined_response(self, response: Optional[str]) -> Dict:
+        """統合分析レスポンス（JSONオブジェクト）を解析"""
+        data = self._extract_json(response)
+        return data if isinstance(data, dict) else {}
+    
+    def _apply_combined_fields(self, result: AnalysisResult, data: Dict, fields: List[str]) -> List[str]:
+        """
+        統合分析の値を検証してAnalysisResultに設定
+        
+        Returns:
+            List[str]: 欠落・不正のため個別に取得し直す項目
+        """
+        def text_value(value) -> Optional[str]:
+            return value.strip() if isinstance(value, str) and value.strip() else None
+        
+        if 'summary' in fields:
+            result.summary = text_value(data.get('summary'))
+        
+        if 'sentiment' in fields:
+            result.sentiment = self._normalize_sentiment(text_value(data.get('sentiment')))
+            result.sentiment_reason = text_value(data.get('sentiment_reason'))
+        
+        if 'keywords' in fields:
+            keywords = data.get('keywords')
+            if isinstance(keywords, list):
+                keywords = ', '.join(str(keyword).strip() for keyword in keywords if str(keyword).strip())
+            result.keywords = text_value(keywords)
+        
+        if 'importance' in fields:
+            score = data.get('importance_score')
+            try:
+                score = int(float(score)) if not isinstance(score, bool) else None
+            except (TypeError, ValueError):
+                score = None
+            result.importance_score = score if score is not None and 1 <= score <= 10 else None
+            result.importance_reason = text_value(data.get('importance_reason'))
+        
+        if 'translation' in fields:
+            result.translation = text_value(data.get('translation'))
+        
+        return [field for field in fields if getattr(result, ANALYSIS_RESULT_ATTRIBUTES[field]) is None]
+    
+    async def _analyze_combined(self, text: str, fields: List[str], result: AnalysisResult) -> Optional[List[str]]:
+        """
+        有効な全項目をJSONスキーマ指定の1回の呼び出しで取得
+        
+        Returns:
+            Optional[List[str]]: 応答に含まれなかった項目（API呼び出し自体が失敗・スキップされた場合はNone）
+        """
+        prompt, schema = self._build_combined_prompt(text, fields)
+        response = await self._call_gemini_api(prompt, generation_config={
+            'response_mime_type': 'application/json',
+            'response_schema': schema
+        })
+        self.stats['combined_analyses'] += 1
+        if response is None:
+            return None
+        
+        data = self._parse_combined_response(response)
+        if response and not data:
+            self.logger.warning("統合分析のレスポンスをJSONとして解析できませんでした")
+        
+        return self._apply_combined_fields(result, data, fields)
+    
+    async def _analyze_field(self, field: str, text: str, result: AnalysisResult):
+        """分析項目を個別のプロンプトで取得"""
+        prompts = self.gemini_config.get("analysis_prompts", {})
+        
+        if field == 'summary':
+            summary_prompt = f"{prompts.get('summary', '要約してください:')}\n\n{text}"
+            result.summary = await self._call_gemini_api(summary_prompt)
+        
+        elif field == 'sentiment':
+            sentiment_prompt = f"{prompts.get('sentiment', 'センチメントを評価してください:')}\n\n{text}"
+            sentiment_response = await self._call_gemini_api(sentiment_prompt)
+            result.sentiment, result.sentiment_reason = self._parse_sentiment_response(sentiment_response)
+        
+        elif field == 'keywords':
+            keyword_prompt = f"{prompts.get('keywords', 'キーワードを抽出してください:')}\n\n{text}"
+            result.keywords = await self._call_gemini_api(keyword_prompt)
+        
+        elif field == 'importance':
+            importance_prompt = f"{prompts.get('importance', '重要度を評価してください:')}\n\n{text}"
+            importance_response = await self._call_gemini_api(importance_prompt)
+            result.importance_score, result.importance_reason = self._parse_importance_response(importance_response)
+        
+        elif field == 'translation':
+            translation_prompt = f"{prompts.get('translation', '日本語に翻訳してください:')}\n\n{text}"
+            result.translation = await self._call_gemini_api(translation_prompt)
+    
+    def _prepare_news_item(self, news: Dict) -> Optional[Dict]:
+        """分析用に本文を整形し、対象項目を決定（本文が空ならNone）"""
+        title = news.get('title', '')
+        body = news.get('body', '')
+        text = self._clean_and_truncate_text(f"{title}\n\n{body}")
+        if not text:
+            return None
+        
+        prompt_version = self._get_prompt_version()
+        return {
+            'news_id': news.get('news_id', ''),
+            'title': title,
+            'text': text,
+            'fields': self._get_enabled_fields(title, body),
+            'prompt_version': prompt_version,
+            'cache_key': compute_content_hash(text, prompt_version)
+        }
+    
+    def _complete_analysis(self, item: Dict, result: AnalysisResult) -> AnalysisResult:
+        """分析結果にモデル情報を設定し、分析済みとして記録"""
+        if result.translation:
+            self.logger.info(f"翻訳完了: {item['title'][:30]}...")
+        
+        # モデル情報
+        result.model_used = self.model.model_name if self.model else None
+        result.cost_estimate = self._estimate_cost(len(item['text']), result.model_used or "unknown")
+        
+        # キャッシュに追加
+        if item['news_id']:
+            self.analyzed_cache.add(item['news_id'])
+        if self.analysis_cache is not None:
+            try:
+                self.analysis_cache.set(item['cache_key'], item['prompt_version'],
+                                        {field: getattr(result, field) for field in CACHED_RESULT_FIELDS})
+            except Exception as e:
+                self.logger.warning(f"分析キャッシュ登録エラー: {e}")
+        
+        self.stats['successful_analyses'] += 1
+        self.logger.info(f"ニュース分析完了: {item['title'][:50]}...")
+        
+        return result
+    
+    async def _analyze_prepared_item(self, item: Dict, use_cache: bool = True) -> Optional[AnalysisResult]:
+        """整形済みの1記事を分析（API呼び出しの前に分析キャッシュを参照、統合分析の呼び出しが失敗した場合はNone）"""
+        cached = self._get_cached_analysis(item) if use_cache else None
+        if cached:
+            return cached
+        
+        result = AnalysisResult(analysis_time=datetime.now())
+        fields = item['fields']
+        text = item['text']
+        
+        # 統合分析: 有効な全項目を1回の呼び出しで取得（欠けた項目のみ個別に再取得）
+        if self.gemini_config.get("combined_analysis", True) and fields:
+            remaining_fields = await self._analyze_combined(text, fields, result)
+            if remaining_fields is None:
+                # エラー・タイムアウト・制限によるスキップは項目ごとに呼び直しても解消しないため、次回の収集時に再分析する
+                self.logger.warning(f"統合分析のAPI呼び出しに失敗: {item['title'][:30]}...")
+                self.stats['failed_analyses'] += 1
+                return None
+            if remaining_fields:
+                self.logger.info(f"統合分析で取得できなかった項目を個別に取得: {', '.join(remaining_fields)}")
+                self.stats['field_fallbacks'] += len(remaining_fields)
+        else:
+            remaining_fields = fields
+        
+        for field in remaining_fields:
+            await self._analyze_field(field, text, result)
+        
+        return self._complete_analysis(item, result)
+    
     async def analyze_news_item(self, news: Dict) -> Optional[AnalysisResult]:
         """個別ニュース分析"""
         if not self._should_analyze_news(news):
@@ -338,65 +969,190 @@ class GeminiNewsAnalyzer:
         try:
             self.stats['total_analyzed'] += 1
             
-            title = news.get('title', '')
-            body = news.get('body', '')
-            text = self._clean_and_truncate_text(f"{title}\n\n{body}")
-            
-            if not text:
+            item = self._prepare_news_item(news)
+            if not item:
                 return None
             
-            result = AnalysisResult(analysis_time=datetime.now())
-            prompts = self.gemini_config.get("analysis_prompts", {})
-            
-            # 要約生成
-            if self.gemini_config.get("summary_generation", False):
-                summary_prompt = f"{prompts.get('summary', '要約してください:')}\n\n{text}"
-                result.summary = await self._call_gemini_api(summary_prompt)
-            
-            # センチメント分析
-            if self.gemini_config.get("sentiment_analysis", False):
-                sentiment_prompt = f"{prompts.get('sentiment', 'センチメントを評価してください:')}\n\n{text}"
-                sentiment_response = await self._call_gemini_api(sentiment_prompt)
-                result.sentiment, result.sentiment_reason = self._parse_sentiment_response(sentiment_response)
-            
-            # キーワード抽出
-            if self.gemini_config.get("keyword_extraction", False):
-                keyword_prompt = f"{prompts.get('keywords', 'キーワードを抽出してください:')}\n\n{text}"
-                result.keywords = await self._call_gemini_api(keyword_prompt)
-            
-            # 重要度評価
-            if self.gemini_config.get("importance_scoring", False):
-                importance_prompt = f"{prompts.get('importance', '重要度を評価してください:')}\n\n{text}"
-                importance_response = await self._call_gemini_api(importance_prompt)
-                result.importance_score, result.importance_reason = self._parse_importance_response(importance_response)
-            
-            # 翻訳（英語記事の場合、設定で有効な場合のみ）
-            if self.gemini_config.get("translation_enabled", False) and self._should_translate(title, body):
-                translation_prompt = f"{prompts.get('translation', '日本語に翻訳してください:')}\n\n{text}"
-                result.translation = await self._call_gemini_api(translation_prompt)
-                self.logger.info(f"翻訳完了: {title[:30]}...")
-            
-            # モデル情報
-            result.model_used = self.model.model_name if self.model else None
-            result.cost_estimate = self._estimate_cost(len(text), result.model_used or "unknown")
-            
-            # キャッシュに追加
-            news_id = news.get('news_id', '')
-            if news_id:
-                self.analyzed_cache.add(news_id)
-            
-            self.stats['successful_analyses'] += 1
-            self.logger.info(f"ニュース分析完了: {title[:50]}...")
-            
-            return result
+            return await self._analyze_prepared_item(item)
             
         except Exception as e:
             self.logger.error(f"ニュース分析エラー: {e}")
             self.stats['failed_analyses'] += 1
             return None
     
+    def _estimate_item_tokens(self, item: Dict) -> int:
+        """1記事分の入出力トークン数の概算（出力は約200トークン、翻訳は本文と同程度）"""
+        input_tokens = self._estimate_tokens(len(item['text']))
+        output_tokens = 200 + (input_tokens if 'translation' in item['fields'] else 0)
+        return input_tokens + output_tokens
+    
+    def _pack_batches(self, items: List[Dict]) -> List[List[Dict]]:
+        """トークン予算と記事数の上限に収まるよう記事を1リクエスト単位にまとめる"""
+        token_budget = self.gemini_config.get("batch_token_budget", 12000)
+        max_articles = self.gemini_config.get("max_articles_per_request", 8)
+        
+        batches = []
+        current = []
+        current_tokens = 0
+        for item in items:
+            item_tokens = self._estimate_item_tokens(item)
+            if current and (current_tokens + item_tokens > token_budget or len(current) >= max_articles):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            # 予算を超える記事は単独のリクエストにする
+            current.append(item)
+            current_tokens += item_tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _build_batch_prompt(self, items: List[Dict]) -> Tuple[str, Dict]:
+        """
+        複数記事を1回で分析するプロンプトとJSONスキーマを作成（記事IDごとに結果を返させる）
+        
+        Returns:
+            Tuple[str, Dict]: プロンプト, レスポンスのJSONスキーマ
+        """
+        all_fields = [name for name, _ in ANALYSIS_FIELDS if any(name in item['fields'] for item in items)]
+        instructions, properties = self._build_field_spec(all_fields)
+        
+        article_schema = {
+            'type': 'object',
+            'properties': {'id': {'type': 'string'}, **properties},
+            'required': ['id']
+        }
+        schema = {
+            'type': 'object',
+            'properties': {'articles': {'type': 'array', 'items': article_schema}},
+            'required': ['articles']
+        }
+        
+        sections = []
+        for item in items:
+            sections.append(f"### id: {item['news_id']}\n対象項目: {', '.join(item['fields'])}\n{item['text']}")
+        
+        prompt = (
+            f"以下の{len(items)}件のニュースをそれぞれ分析し、articles配列に記事ごとのJSONオブジェクトを返してください。"
+            "各オブジェクトのidには記事のidをそのまま設定し、対象項目に挙げた項目のみを含めてください。\n"
+            + "\n".join(instructions)
+            + "\n\n"
+            + "\n\n".join(sections)
+        )
+        return prompt, schema
+    
+    def _parse_batch_response(self, response: Optional[str]) -> Dict[str, Dict]:
+        """複数記事の分析レスポンスを記事IDごとの辞書に変換"""
+        data = self._extract_json(response)
+        # articlesを省略して配列のみが返された場合も受け付ける
+        entries = data.get('articles') if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return {}
+        return {
+            str(entry['id']): entry
+            for entry in entries
+            if isinstance(entry, dict) and entry.get('id') is not None
+        }
+    
+    async def _analyze_packed_batch(self, items: List[Dict]) -> List[Tuple[str, AnalysisResult]]:
+        """
+        まとめた記事を1回のリクエストで分析
+        応答全体が失敗した場合は半分に分割して再試行し、応答に含まれなかった記事のみを再度まとめて再試行する
+        """
+        if len(items) == 1:
+            # キャッシュは一括分析の前に参照済み
+            result = await self._analyze_prepared_item(items[0], use_cache=False)
+            return [(items[0]['news_id'], result)] if result else []
+        
+        prompt, schema = self._build_batch_prompt(items)
+        response = await self._call_gemini_api(prompt, generation_config={
+            'response_mime_type': 'application/json',
+            'response_schema': schema
+        })
+        self.stats['batch_requests'] += 1
+        if response is None:
+            # API呼び出し自体の失敗は分割しても解消しないため、次回の収集時に再分析する
+            self.logger.warning(f"一括分析のAPI呼び出しに失敗: {len(items)}件")
+            self.stats['failed_analyses'] += len(items)
+            return []
+        entries = self._parse_batch_response(response)
+        
+        results = []
+        retry_items = []
+        for item in items:
+            entry = entries.get(str(item['news_id']))
+            if entry is None:
+                retry_items.append(item)
+                continue
+            
+            result = AnalysisResult(analysis_time=datetime.now())
+            remaining_fields = self._apply_combined_fields(result, entry, item['fields'])
+            # 一部の項目のみ欠けた記事は項目単位で取得
+            if remaining_fields:
+                self.stats['field_fallbacks'] += len(remaining_fields)
+                for field in remaining_fields:
+                    await self._analyze_field(field, item['text'], result)
+            results.append((item['news_id'], self._complete_analysis(item, result)))
+        
+        if retry_items:
+            self.stats['batch_splits'] += 1
+            if len(retry_items) == len(items):
+                self.logger.warning(f"一括分析の応答を解析できなかったため分割して再試行: {len(items)}件")
+                middle = len(items) // 2
+                results.extend(await self._analyze_packed_batch(items[:middle]))
+                results.extend(await self._analyze_packed_batch(items[middle:]))
+            else:
+                self.logger.info(f"一括分析の応答に含まれなかった記事を再試行: {len(retry_items)}件")
+                results.extend(await self._analyze_packed_batch(retry_items))
+        
+        return results
+    
+    async def _analyze_news_requests(self, news_list: List[Dict]) -> List[Tuple[str, AnalysisResult]]:
+        """複数記事をトークン予算内でまとめたリクエストで一括分析"""
+        items = []
+        results = []
+        for news in news_list:
+            if not self._should_analyze_news(news):
+                continue
+            self.stats['total_analyzed'] += 1
+            item = self._prepare_news_item(news)
+            if not item:
+                continue
+            
+            # 同じ本文の分析結果があればリクエストに含めない
+            cached = self._get_cached_analysis(item)
+            if cached:
+                results.append((item['news_id'], cached))
+            else:
+                items.append(item)
+        
+        async def analyze_batch(batch: List[Dict]) -> List[Tuple[str, AnalysisResult]]:
+            # 日次コスト制限チェック
+            if self.daily_cost >= self.max_daily_cost:
+                self.logger.warning("日次コスト制限に達したため、分析を停止")
+                return []
+            
+            try:
+                batch_results = await self._analyze_packed_batch(batch)
+                self.logger.info(f"一括分析完了: {len(batch_results)}/{len(batch)}件")
+                return batch_results
+            except Exception as e:
+                self.logger.error(f"一括分析エラー: {e}")
+                self.stats['failed_analyses'] += len(batch)
+                return []
+        
+        # リクエスト単位で並行実行（同時実行数は_call_gemini_apiで制限）
+        for batch_results in await asyncio.gather(*[analyze_batch(batch) for batch in self._pack_batches(items)]):
+            results.extend(batch_results)
+        
+        return results
+    
     async def analyze_news_batch(self, news_list: List[Dict]) -> List[Tuple[str, AnalysisResult]]:
-        """ニュース一括分析"""
+        """ニュース一括分析（batch_processing有効時は複数記事を1リクエストにまとめる）"""
+        if self.gemini_config.get("batch_processing", False):
+            return await self._analyze_news_requests(news_list)
+        
         batch_size = self.gemini_config.get("cost_optimization", {}).get("batch_size", 5)
         results = []
         
@@ -438,11 +1194,13 @@ class GeminiNewsAnalyzer:
             'daily_cost': self.daily_cost,
             'remaining_daily_budget': max(0, self.max_daily_cost - self.daily_cost),
             'cache_size': len(self.analyzed_cache),
-            'rate_limit_status': {
-                'requests_this_minute': len(self.rate_limiter.minute_requests),
-                'requests_today': self.rate_limiter.daily_requests,
-                'can_make_request': self.rate_limiter.can_make_request()
-            }
+            'analysis_cache': self.analysis_cache.get_stats() if self.analysis_cache else None,
+            # 1リクエストあたりの記事数・1記事あたりのトークン数（概算）
+            'articles_per_request': round(self.stats['successful_analyses'] / self.stats['api_calls_made'], 2)
+                                    if self.stats['api_calls_made'] else 0,
+            'tokens_per_article': round(self.stats['estimated_tokens'] / self.stats['successful_analyses'])
+                                  if self.stats['successful_analyses'] else 0,
+            'rate_limit_status': self.rate_limiter.get_status()
         }
 
 # 使用例とテスト用
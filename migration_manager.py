@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+スキーマのバージョン管理モジュール
+適用済みバージョンをschema_migrationsテーブルに記録し、未適用のマイグレーションのみ実行する
+インデックスは稼働中のテーブルをロックしないようオンラインで作成し、データ補完はバッチ単位で実行する
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# (バージョン, 名前, 実行メソッド名) の順に適用
+MIGRATIONS = [
+    (1, "base_schema", "_migrate_base_schema"),
+    (2, "list_query_indexes", "_migrate_list_query_indexes"),
+    (3, "backfill_dedup_and_importance", "_migrate_backfills"),
+    (4, "change_feed_commit_bound", "_migrate_change_feed"),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+class SchemaMigrationManager:
+    """スキーママイグレーション管理クラス"""
+
+    def __init__(self, db_manager, config: Dict):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            config: 全体設定（schema_migrations設定を使用）
+        """
+        self.db_manager = db_manager
+        self.db_type = db_manager.db_type
+        self.logger = logging.getLogger(__name__)
+
+        migration_config = config.get("schema_migrations", {})
+        self.online_index_build = migration_config.get("online_index_build", True)
+        self.backfill_batch_size = migration_config.get("backfill_batch_size", 1000)
+        self.backfill_pause_seconds = migration_config.get("backfill_pause_seconds", 0.1)
+
+    def get_current_version(self) -> int:
+        """適用済みの最新バージョン（バージョン管理導入前のデータベースは0）"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if self.db_type == "postgresql":
+                cursor.execute("SELECT to_regclass('schema_migrations')")
+                exists = cursor.fetchone()[0] is not None
+            elif self.db_type == "sqlite":
+                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'")
+                exists = cursor.fetchone()[0] > 0
+            else:
+                cursor.execute("SELECT OBJECT_ID('schema_migrations')")
+                exists = cursor.fetchone()[0] is not None
+
+            if not exists:
+                return 0
+
+            cursor.execute("SELECT MAX(version) FROM schema_migrations")
+            return cursor.fetchone()[0] or 0
+
+    def get_applied_migrations(self) -> List[Dict]:
+        """適用済みマイグレーションの一覧"""
+        if self.get_current_version() == 0:
+            return []
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version, name, applied_at, duration_seconds FROM schema_migrations ORDER BY version")
+            return [
+                {'version': row[0], 'name': row[1], 'applied_at': row[2], 'duration_seconds': row[3]}
+                for row in cursor.fetchall()
+            ]
+
+    def migrate(self) -> bool:
+        """
+        未適用のマイグレーションを順に実行（最新ならバージョン確認のみ）
+
+        Returns:
+            bool: すべて適用済み（または適用成功）ならTrue
+        """
+        current_version = self.get_current_version()
+        pending = [migration for migration in MIGRATIONS if migration[0] > current_version]
+        if not pending:
+            self.logger.debug(f"スキーマは最新です（バージョン{current_version}）")
+            return True
+
+        self._create_versions_table()
+
+        for version, name, method_name in pending:
+            self.logger.info(f"スキーママイグレーション適用中: v{version} {name}")
+            started = time.time()
+            try:
+                getattr(self, method_name)()
+            except Exception as e:
+                self.logger.error(f"スキーママイグレーションエラー（v{version} {name}）: {e}")
+                return False
+            self._record_version(version, name, time.time() - started)
+
+        self.logger.info(f"スキーママイグレーション完了: v{current_version} → v{LATEST_VERSION}")
+        return True
+
+    def _create_versions_table(self):
+        """バージョン記録テーブルを作成"""
+        with self.db_manager.get_connection() as conn:
+            conn.cursor().execute(self.db_manager._get_schema()["schema_migrations"])
+
+    def _record_version(self, version: int, name: str, duration_seconds: float):
+        """適用済みバージョンを記録（同時起動した別プロセスが記録済みなら何もしない）"""
+        placeholder = "%s" if self.db_type == "postgresql" else "?"
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM schema_migrations WHERE version = {placeholder}", (version,))
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute(f"""
+                        INSERT INTO schema_migrations (version, name, applied_at, duration_seconds)
+                        VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder})
+                    """, (version, name, datetime.now(), round(duration_seconds, 3)))
+        except Exception as e:
+            self.logger.warning(f"スキーマバージョン記録警告（v{version}）: {e}")
+
+    def _migrate_base_schema(self):
+        """v1: 初期スキーマ（テーブル・追加カラム・変更フィード・基本インデックス・全文検索・集計テーブル）"""
+        self.db_manager.apply_base_schema()
+
+    def _migrate_list_query_indexes(self):
+        """v2: 一覧クエリ用の部分インデックスをオンラインで作成し、置き換え済みのインデックスを削除"""
+        self.apply_online_indexes()
+
+    def _migrate_backfills(self):
+        """v3: 既存記事の重複判定キー・重要度スコアをバッチ単位で補完"""
+        self.db_manager.backfill_dedup_keys(self.backfill_batch_size, self.backfill_pause_seconds)
+        self.db_manager.backfill_importance_scores(self.backfill_batch_size, self.backfill_pause_seconds)
+
+    def _migrate_change_feed(self):
+        """v4: 変更フィードの採番トリガーを再作成（PostgreSQLはコミット前の採番値を読み飛ばさないようロックを追加）"""
+        self.db_manager.apply_change_feed()
+
+    def reapply_indexes(self):
+        """オンライン作成対象のインデックスを再作成（パーティション変換でテーブルを作り直した後に使用）"""
+        try:
+            self.apply_online_indexes()
+        except Exception as e:
+            self.logger.error(f"インデックス再作成エラー: {e}")
+
+    def apply_online_indexes(self):
+        """スキーマ定義のonline_indexesを作成し、retired_indexesを削除（作成済みのものはスキップ）"""
+        schema = self.db_manager._get_schema()
+
+        if self.db_type == "postgresql":
+            self._apply_postgresql_indexes(schema)
+        elif self.db_type == "sqlite":
+            # SQLiteは書き込み接続が1本のためオンライン作成の区別なし
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                for name, definition in schema["online_indexes"]:
+                    cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON news_table{definition}")
+                for name in schema["retired_indexes"]:
+                    cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        else:
+            self._apply_sqlserver_indexes(schema)
+
+    def _apply_postgresql_indexes(self, schema: Dict):
+        """
+        PostgreSQL: CREATE INDEX CONCURRENTLYで作成（書き込みをブロックしない）
+        パーティションテーブルの親には直接CONCURRENTLYで作成できないため、
+        親にはON ONLYで定義のみ作成し、各パーティションでオンライン作成したインデックスを付け替える
+        """
+        concurrently = "CONCURRENTLY " if self.online_index_build else ""
+
+        with self.db_manager.get_connection() as conn:
+            # CONCURRENTLYはトランザクションブロック内で実行できない
+            conn.autocommit = True
+            cursor = conn.cursor()
+            partitions = self._list_postgresql_partitions(cursor)
+
+            for name, definition in schema["online_indexes"]:
+                self._drop_invalid_postgresql_index(cursor, name, concurrently)
+
+                if partitions is None:
+                    cursor.execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON news_table{definition}")
+                    continue
+
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY news_table{definition}")
+                for partition in partitions:
+                    partition_index = f"{partition}_{name[len('idx_'):]}"
+                    self._drop_invalid_postgresql_index(cursor, partition_index, concurrently)
+                    cursor.execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {partition_index} ON {partition}{definition}")
+                    cursor.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+            for name in schema["retired_indexes"]:
+                # パーティションテーブルのインデックスはCONCURRENTLYで削除できない
+                drop_option = concurrently if partitions is None else ""
+                cursor.execute(f"DROP INDEX {drop_option}IF EXISTS {name}")
+
+        self.logger.info(f"一覧クエリ用インデックスを作成: {len(schema['online_indexes'])}件")
+
+    def _list_postgresql_partitions(self, cursor) -> Optional[List[str]]:
+        """PostgreSQL: news_tableのパーティション一覧（未パーティションならNone）"""
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'news_table'")
+        if cursor.fetchone()[0] != 'p':
+            return None
+
+        cursor.execute("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'news_table'::regclass
+            ORDER BY c.relname
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+    def _drop_invalid_postgresql_index(self, cursor, name: str, concurrently: str):
+        """PostgreSQL: 中断したCONCURRENTLY作成で残った無効なインデックスを削除"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s AND c.relkind = 'i' AND NOT i.indisvalid
+        """, (name,))
+        if cursor.fetchone()[0] > 0:
+            self.logger.warning(f"無効なインデックスを削除して再作成: {name}")
+            cursor.execute(f"DROP INDEX {concurrently}IF EXISTS {name}")
+
+    def _apply_sqlserver_indexes(self, schema: Dict):
+        """SQL Server: ONLINE = ONで作成（未対応のエディションでは通常の作成）"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            for name, definition in schema["online_indexes"]:
+                cursor.execute("SELECT COUNT(*) FROM sys.indexes WHERE name = ? AND object_id = OBJECT_ID('news_table')", (name,))
+                if cursor.fetchone()[0] > 0:
+                    continue
+
+                create_sql = f"CREATE INDEX {name} ON news_table{definition}"
+                if self.online_index_build:
+                    try:
+                        cursor.execute(f"{create_sql} WITH (ONLINE = ON)")
+                        conn.commit()
+                        continue
+                    except Exception as e:
+                        conn.rollback()
+                        self.logger.warning(f"オンラインでのインデックス作成に失敗したため通常作成します: {name}（{e}）")
+
+                cursor.execute(create_sql)
+                conn.commit()
+
+            for name in schema["retired_indexes"]:
+                cursor.execute(f"IF EXISTS (SELECT * FROM sys.indexes WHERE name = '{name}') DROP INDEX {name} ON news_table;")
+
+        self.logger.info(f"一覧クエリ用インデックスを作成: {len(schema['online_indexes'])}件")
+
+
+if __name__ == "__main__":
+    # スキーママイグレーションの手動実行
+    import json
+    from database_spec import SpecDatabaseManager
+
+    logging.basicConfig(level=logging.INFO)
+
+    with open("config_spec.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    manager = SpecDatabaseManager(config).migration_manager
+    manager.migrate()
+    for migration in manager.get_applied_migrations():
+        print(migration)
@@ -5,10 +5,13 @@ Refinitivニュースモニタリングシステム用
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional, List
 import uuid
 import json
+import hashlib
+import re
 
 @dataclass
 class NewsArticle:
@@ -40,6 +43,11 @@ class NewsArticle:
                 # Refinitivからの場合は別途設定される
                 self.news_id = f"system_{uuid.uuid4().hex[:12]}"
     
+    @property
+    def dedup_key(self) -> str:
+        """重複判定キー（タイトル+ソースの正規化ハッシュ）"""
+        return compute_dedup_key(self.title, self.source)
+    
     def to_dict(self) -> dict:
         """辞書形式に変換"""
         return {
@@ -58,7 +66,8 @@ class NewsArticle:
             'is_manual': self.is_manual,
             'rating': self.rating,
             'is_read': self.is_read,
-            'read_at': self.read_at
+            'read_at': self.read_at,
+            'dedup_key': self.dedup_key
         }
 
 @dataclass
@@ -84,6 +93,18 @@ class SystemStats:
             'execution_time_seconds': self.execution_time_seconds
         }
 
+# 一覧のソートキー（ORDER BY句とインデックスで同じ式を使い、インデックス順に読み出せるようにする）
+# レーティングは1〜3のため、未評価を0とした降順で「評価済み → 未評価」の順になる
+RATING_SORT_KEY = "COALESCE(rating, 0)"
+# レーティング優先: 3 → 2 → 未評価 → 1
+RATING_PRIORITY_SORT_KEY = "(CASE WHEN rating = 3 THEN 1 WHEN rating = 2 THEN 2 WHEN rating IS NULL THEN 3 ELSE 4 END)"
+# 低評価順: 1 → 2 → 3 → 未評価
+RATING_ASC_SORT_KEY = "COALESCE(rating, 4)"
+
+# PostgreSQLの変更フィード: 採番したトランザクションが保持する共有アドバイザリロックのキー
+# （キー = 基数 + 次に採番される値。pg_locksで未コミットの採番値の下限を求める。上位24bitで他のロックと区別）
+CHANGE_SEQ_LOCK_BASE = 0x4C4D45 << 40
+
 # データベーススキーマ定義（仕様書準拠）
 SPEC_DATABASE_SCHEMA = {
     "news_table": """
@@ -103,7 +124,20 @@ SPEC_DATABASE_SCHEMA = {
             is_manual BOOLEAN DEFAULT FALSE,
             rating INTEGER DEFAULT NULL CHECK (rating >= 1 AND rating <= 3),
             is_read BOOLEAN DEFAULT FALSE,
-            read_at TIMESTAMP DEFAULT NULL
+            read_at TIMESTAMP DEFAULT NULL,
+            importance_score INTEGER DEFAULT NULL,
+            dedup_key VARCHAR(40),
+            is_canonical BOOLEAN DEFAULT TRUE
+        );
+    """,
+    
+    # 適用済みスキーマバージョン（migration_managerが記録）
+    "schema_migrations": """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP NOT NULL,
+            duration_seconds REAL
         );
     """,
     
@@ -121,6 +155,109 @@ SPEC_DATABASE_SCHEMA = {
         );
     """,
     
+    # ダッシュボード統計用の日別集計（挿入時に増分更新）
+    "news_daily_rollup": """
+        CREATE TABLE IF NOT EXISTS news_daily_rollup (
+            rollup_date DATE NOT NULL,
+            is_manual BOOLEAN NOT NULL,
+            article_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (rollup_date, is_manual)
+        );
+    """,
+    
+    # フィルター選択肢用のソース別・金属別件数（挿入・削除時に増分更新）
+    "news_source_counts": """
+        CREATE TABLE IF NOT EXISTS news_source_counts (
+            source TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL DEFAULT 0
+        );
+    """,
+    
+    "news_metal_counts": """
+        CREATE TABLE IF NOT EXISTS news_metal_counts (
+            metal TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL DEFAULT 0
+        );
+    """,
+    
+    # 既存テーブルへの追加カラム
+    # change_seqは変更フィード用の単調増加シーケンス（挿入時に採番、更新時はトリガーで再採番）
+    # パーティション変換時にテーブルを作り直しても引き継げるよう独立したシーケンスを使用
+    "columns": [
+        "ALTER TABLE news_table ADD COLUMN IF NOT EXISTS dedup_key VARCHAR(40);",
+        "ALTER TABLE news_table ADD COLUMN IF NOT EXISTS is_canonical BOOLEAN DEFAULT TRUE;",
+        "ALTER TABLE news_table ADD COLUMN IF NOT EXISTS importance_score INTEGER DEFAULT NULL;",
+        "CREATE SEQUENCE IF NOT EXISTS news_change_seq;",
+        "ALTER TABLE news_table ADD COLUMN IF NOT EXISTS change_seq BIGINT DEFAULT nextval('news_change_seq');"
+    ],
+    
+    # 変更フィード: 挿入・更新された行に新しいシーケンスを採番
+    # シーケンスはコミット順ではなく採番順のため、トランザクションで最初の採番前に
+    # 採番値の下限をキーにした共有アドバイザリロックを取得し、読み取り側はコミット前の値の手前までを読む
+    "change_feed": [
+        f"""
+        CREATE OR REPLACE FUNCTION news_touch_change_seq() RETURNS trigger AS $$
+        BEGIN
+            IF COALESCE(current_setting('lme_news.change_seq_locked', true), '') = '' THEN
+                PERFORM pg_advisory_xact_lock_shared({CHANGE_SEQ_LOCK_BASE} + (
+                    SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END FROM news_change_seq
+                ));
+                PERFORM set_config('lme_news.change_seq_locked', 'on', true);
+            END IF;
+            NEW.change_seq := nextval('news_change_seq');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        # 挿入時もロック取得後に採番し直す（列のDEFAULTはトリガーより先に評価されるため）
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'news_change_seq_insert' AND tgrelid = 'news_table'::regclass
+            ) THEN
+                CREATE TRIGGER news_change_seq_insert BEFORE INSERT ON news_table
+                FOR EACH ROW EXECUTE PROCEDURE news_touch_change_seq();
+            END IF;
+        END $$;
+        """,
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'news_change_seq_update' AND tgrelid = 'news_table'::regclass
+            ) THEN
+                CREATE TRIGGER news_change_seq_update BEFORE UPDATE ON news_table
+                FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+                EXECUTE PROCEDURE news_touch_change_seq();
+            END IF;
+        END $$;
+        """,
+        # 変更のプッシュ通知（change_notifierがLISTEN、同一トランザクション内の通知は1回にまとめられる）
+        """
+        CREATE OR REPLACE FUNCTION news_notify_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('news_changes', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'news_change_notify' AND tgrelid = 'news_table'::regclass
+            ) THEN
+                CREATE TRIGGER news_change_notify AFTER INSERT OR UPDATE ON news_table
+                FOR EACH STATEMENT EXECUTE PROCEDURE news_notify_change();
+            END IF;
+        END $$;
+        """
+    ],
+    
     "indexes": [
         "CREATE INDEX IF NOT EXISTS idx_news_publish_time ON news_table(publish_time DESC);",
         "CREATE INDEX IF NOT EXISTS idx_news_source ON news_table(source);",
@@ -128,13 +265,32 @@ SPEC_DATABASE_SCHEMA = {
         "CREATE INDEX IF NOT EXISTS idx_news_is_manual ON news_table(is_manual);",
         "CREATE INDEX IF NOT EXISTS idx_news_title_search ON news_table USING gin(to_tsvector('english', title));",
         "CREATE INDEX IF NOT EXISTS idx_news_body_search ON news_table USING gin(to_tsvector('english', body));",
+        "CREATE INDEX IF NOT EXISTS idx_news_dedup_key ON news_table(dedup_key, publish_time DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_news_importance_publish_time ON news_table(importance_score, publish_time);",
+        "CREATE INDEX IF NOT EXISTS idx_news_change_seq ON news_table(change_seq);",
         "CREATE INDEX IF NOT EXISTS idx_system_stats_date ON system_stats(collection_date);"
-    ]
+    ],
+    
+    # 一覧クエリ用: 代表記事のみの部分インデックス（ソートキーごと・よく使う絞り込み条件 + 時系列）
+    # scripts/benchmark_query_plans.py のワークロードで先頭ページをソートなしで取得できることを確認
+    # 稼働中のテーブルへ追加するためmigration_managerがオンラインで作成（インデックス名, 対象カラムと条件）
+    "online_indexes": [
+        ("idx_news_canonical_time", "(publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_canonical_rating_time", f"(({RATING_SORT_KEY}) DESC, publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_canonical_rating_priority", f"({RATING_PRIORITY_SORT_KEY}, publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_canonical_rating_asc", f"(({RATING_ASC_SORT_KEY}), publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_read_time", "(is_read, publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_source_time", "(source, publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE"),
+        ("idx_news_rating_time", "(rating, publish_time DESC, acquire_time DESC) WHERE is_canonical = TRUE")
+    ],
+    
+    # オンラインで削除する旧インデックス（idx_news_canonical_time に置き換え）
+    "retired_indexes": ["idx_news_canonical_publish_time"]
 }
 
 # SQL Server用スキーマ（Azure SQL Database対応）
 SQLSERVER_SPEC_SCHEMA = {
-    "news_table": """
+    "news_table": f"""
         IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'news_table')
         CREATE TABLE news_table (
             news_id NVARCHAR(255) PRIMARY KEY,
@@ -153,7 +309,24 @@ SQLSERVER_SPEC_SCHEMA = {
             rating INTEGER DEFAULT NULL,
             is_read BIT DEFAULT 0,
             read_at DATETIME2 DEFAULT NULL,
-            importance_score INTEGER DEFAULT NULL
+            importance_score INTEGER DEFAULT NULL,
+            dedup_key VARCHAR(40) NULL,
+            is_canonical BIT NOT NULL DEFAULT 1,
+            change_seq ROWVERSION,
+            rating_sort_key AS {RATING_SORT_KEY},
+            rating_priority_key AS {RATING_PRIORITY_SORT_KEY},
+            rating_asc_key AS {RATING_ASC_SORT_KEY}
+        );
+    """,
+    
+    # 適用済みスキーマバージョン（migration_managerが記録）
+    "schema_migrations": """
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'schema_migrations')
+        CREATE TABLE schema_migrations (
+            version INT PRIMARY KEY,
+            name NVARCHAR(100) NOT NULL,
+            applied_at DATETIME2 NOT NULL,
+            duration_seconds FLOAT
         );
     """,
     
@@ -172,15 +345,235 @@ SQLSERVER_SPEC_SCHEMA = {
         );
     """,
     
+    # ダッシュボード統計用の日別集計（挿入時に増分更新）
+    "news_daily_rollup": """
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'news_daily_rollup')
+        CREATE TABLE news_daily_rollup (
+            rollup_date DATE NOT NULL,
+            is_manual BIT NOT NULL,
+            article_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (rollup_date, is_manual)
+        );
+    """,
+    
+    # フィルター選択肢用のソース別・金属別件数（挿入・削除時に増分更新）
+    "news_source_counts": """
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'news_source_counts')
+        CREATE TABLE news_source_counts (
+            source NVARCHAR(500) PRIMARY KEY,
+            article_count INT NOT NULL DEFAULT 0
+        );
+    """,
+    
+    "news_metal_counts": """
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'news_metal_counts')
+        CREATE TABLE news_metal_counts (
+            metal NVARCHAR(200) PRIMARY KEY,
+            article_count INT NOT NULL DEFAULT 0
+        );
+    """,
+    
+    # 既存テーブルへの追加カラム
+    "columns": [
+        "IF COL_LENGTH('news_table', 'dedup_key') IS NULL ALTER TABLE news_table ADD dedup_key VARCHAR(40) NULL;",
+        "IF COL_LENGTH('news_table', 'is_canonical') IS NULL ALTER TABLE news_table ADD is_canonical BIT NOT NULL DEFAULT 1;",
+        "IF COL_LENGTH('news_table', 'importance_score') IS NULL ALTER TABLE news_table ADD importance_score INTEGER NULL;",
+        # 変更フィード用（rowversionは挿入・更新のたびにデータベース全体で単調増加）
+        "IF COL_LENGTH('news_table', 'change_seq') IS NULL ALTER TABLE news_table ADD change_seq ROWVERSION;",
+        # 一覧のソートキー（式インデックスがないため計算列にインデックスを作成）
+        f"IF COL_LENGTH('news_table', 'rating_sort_key') IS NULL ALTER TABLE news_table ADD rating_sort_key AS {RATING_SORT_KEY};",
+        f"IF COL_LENGTH('news_table', 'rating_priority_key') IS NULL ALTER TABLE news_table ADD rating_priority_key AS {RATING_PRIORITY_SORT_KEY};",
+        f"IF COL_LENGTH('news_table', 'rating_asc_key') IS NULL ALTER TABLE news_table ADD rating_asc_key AS {RATING_ASC_SORT_KEY};"
+    ],
+    
     "indexes": [
         "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_publish_time') CREATE INDEX idx_news_publish_time ON news_table(publish_time DESC);",
         "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_source') CREATE INDEX idx_news_source ON news_table(source);",
         "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_related_metals') CREATE INDEX idx_news_related_metals ON news_table(related_metals);",
         "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_is_manual') CREATE INDEX idx_news_is_manual ON news_table(is_manual);",
+        "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_dedup_key') CREATE INDEX idx_news_dedup_key ON news_table(dedup_key, publish_time DESC);",
+        "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_importance_publish_time') CREATE INDEX idx_news_importance_publish_time ON news_table(importance_score, publish_time);",
+        "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_news_change_seq') CREATE INDEX idx_news_change_seq ON news_table(change_seq);",
         "IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_system_stats_date') CREATE INDEX idx_system_stats_date ON system_stats(collection_date);"
-    ]
+    ],
+    
+    # 一覧クエリ用: 代表記事のみのフィルター選択インデックス（ソートキーは計算列、ONLINE = ONで作成）
+    "online_indexes": [
+        ("idx_news_canonical_time", "(publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_time", "(rating_sort_key DESC, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_priority", "(rating_priority_key, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_asc", "(rating_asc_key, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_read_time", "(is_read, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_source_time", "(source, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_rating_time", "(rating, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1")
+    ],
+    
+    # idx_news_canonical_time に置き換え
+    "retired_indexes": ["idx_news_canonical_publish_time"]
 }
 
+# SQLite用スキーマ（パッシブモード・オフライン環境・テスト用）
+# 日時はISO形式文字列、真偽値は0/1で保存（Python型との変換はsqlite_backendで登録）
+SQLITE_SPEC_SCHEMA = {
+    "news_table": """
+        CREATE TABLE IF NOT EXISTS news_table (
+            news_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            publish_time TIMESTAMP NOT NULL,
+            acquire_time TIMESTAMP NOT NULL,
+            source TEXT NOT NULL,
+            url TEXT,
+            sentiment TEXT,
+            summary TEXT,
+            keywords TEXT,
+            related_metals TEXT,
+            translation TEXT,
+            is_manual BOOLEAN DEFAULT 0,
+            rating INTEGER DEFAULT NULL CHECK (rating >= 1 AND rating <= 3),
+            is_read BOOLEAN DEFAULT 0,
+            read_at TIMESTAMP DEFAULT NULL,
+            importance_score INTEGER DEFAULT NULL,
+            dedup_key TEXT,
+            is_canonical BOOLEAN NOT NULL DEFAULT 1,
+            change_seq INTEGER
+        );
+    """,
+    
+    # 適用済みスキーマバージョン（migration_managerが記録）
+    "schema_migrations": """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_seconds REAL
+        );
+    """,
+    
+    "system_stats": """
+        CREATE TABLE IF NOT EXISTS system_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            collection_date TIMESTAMP NOT NULL,
+            total_collected INTEGER DEFAULT 0,
+            successful_queries INTEGER DEFAULT 0,
+            failed_queries INTEGER DEFAULT 0,
+            api_calls_made INTEGER DEFAULT 0,
+            errors_encountered INTEGER DEFAULT 0,
+            execution_time_seconds REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+        );
+    """,
+    
+    # ダッシュボード統計用の日別集計（挿入時に増分更新）
+    "news_daily_rollup": """
+        CREATE TABLE IF NOT EXISTS news_daily_rollup (
+            rollup_date DATE NOT NULL,
+            is_manual BOOLEAN NOT NULL,
+            article_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (rollup_date, is_manual)
+        );
+    """,
+    
+    # フィルター選択肢用のソース別・金属別件数（挿入・削除時に増分更新）
+    "news_source_counts": """
+        CREATE TABLE IF NOT EXISTS news_source_counts (
+            source TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL DEFAULT 0
+        );
+    """,
+    
+    "news_metal_counts": """
+        CREATE TABLE IF NOT EXISTS news_metal_counts (
+            metal TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL DEFAULT 0
+        );
+    """,
+    
+    # 新規バックエンドのため追加カラムはCREATE TABLEに含めている
+    # （change_seqのみ追加前に作成されたデータベースがあるため_create_change_feedで追加）
+    "columns": [],
+    
+    # 変更フィード: 採番用カウンターから挿入・更新された行にシーケンスを採番
+    # （行の削除で最大値が戻らないようMAX(change_seq)ではなくカウンターを使用）
+    "change_feed": [
+        """
+        CREATE TABLE IF NOT EXISTS news_change_counter (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_seq INTEGER NOT NULL
+        );
+        """,
+        "INSERT OR IGNORE INTO news_change_counter (id, last_seq) SELECT 1, COALESCE(MAX(change_seq), 0) FROM news_table;",
+        """
+        CREATE TRIGGER IF NOT EXISTS news_change_seq_insert AFTER INSERT ON news_table BEGIN
+            UPDATE news_change_counter SET last_seq = last_seq + 1 WHERE id = 1;
+            UPDATE news_table SET change_seq = (SELECT last_seq FROM news_change_counter WHERE id = 1)
+            WHERE rowid = new.rowid;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS news_change_seq_update AFTER UPDATE ON news_table
+        WHEN new.change_seq IS old.change_seq BEGIN
+            UPDATE news_change_counter SET last_seq = last_seq + 1 WHERE id = 1;
+            UPDATE news_table SET change_seq = (SELECT last_seq FROM news_change_counter WHERE id = 1)
+            WHERE rowid = new.rowid;
+        END;
+        """
+    ],
+    
+    # キーワード検索用の全文検索インデックス（trigramで部分一致検索、news_tableのrowidに連動）
+    "search_index": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, body, content='news_table', content_rowid='rowid', tokenize='trigram'
+        );
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news_table BEGIN
+            INSERT INTO news_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news_table BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, body ON news_table BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+            INSERT INTO news_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+        END;
+        """
+    ],
+    
+    "indexes": [
+        "CREATE INDEX IF NOT EXISTS idx_news_publish_time ON news_table(publish_time DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_news_source ON news_table(source);",
+        "CREATE INDEX IF NOT EXISTS idx_news_related_metals ON news_table(related_metals);",
+        "CREATE INDEX IF NOT EXISTS idx_news_is_manual ON news_table(is_manual);",
+        "CREATE INDEX IF NOT EXISTS idx_news_dedup_key ON news_table(dedup_key, publish_time DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_news_importance_publish_time ON news_table(importance_score, publish_time);",
+        "CREATE INDEX IF NOT EXISTS idx_news_change_seq ON news_table(change_seq);",
+        "CREATE INDEX IF NOT EXISTS idx_system_stats_date ON system_stats(collection_date);"
+    ],
+    
+    # 一覧クエリ用: 代表記事のみの部分インデックス（ソートキーはORDER BY句と同じ式）
+    "online_indexes": [
+        ("idx_news_canonical_time", "(publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_time", f"({RATING_SORT_KEY} DESC, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_priority", f"({RATING_PRIORITY_SORT_KEY}, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_canonical_rating_asc", f"({RATING_ASC_SORT_KEY}, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_read_time", "(is_read, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_source_time", "(source, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1"),
+        ("idx_news_rating_time", "(rating, publish_time DESC, acquire_time DESC) WHERE is_canonical = 1")
+    ],
+    
+    # idx_news_canonical_time に置き換え
+    "retired_indexes": ["idx_news_canonical_publish_time"]
+}
+
+# FTS5のtrigramトークナイザーで検索可能な最小文字数（これより短いキーワードはLIKE検索）
+SQLITE_FTS_MIN_KEYWORD_LENGTH = 3
+
 # 金属カテゴリマッピング
 METAL_CATEGORIES = {
     'copper': ['copper', 'cu', 'red metal'],
@@ -221,6 +614,48 @@ def extract_related_metals(title: str, body: str) -> str:
     
     return ', '.join(found_metals) if found_metals else None
 
+def compute_dedup_key(title: str, source: str) -> str:
+    """
+    重複判定キーを計算（書き込み時に保存し、一覧クエリの重複除去に使用）
+    
+    Args:
+        title: ニュースタイトル
+        source: ニュースソース
+        
+    Returns:
+        正規化したタイトルとソースのSHA-1ハッシュ（16進40文字）
+    """
+    # 大文字小文字・前後空白・連続空白の違いは同一記事とみなす
+    normalized_title = re.sub(r'\s+', ' ', str(title or '')).strip().lower()
+    normalized_source = re.sub(r'\s+', ' ', str(source or '')).strip().lower()
+    
+    key_source = f"{normalized_title}\x1f{normalized_source}"
+    return hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+
+# 旧形式でkeywordsに埋め込まれていた重要度タグ
+IMPORTANCE_TAG_PATTERN = re.compile(r'\s*\[重要度:(\d+)/10\]')
+
+def extract_importance_score(keywords: Optional[str]) -> tuple[Optional[int], Optional[str]]:
+    """
+    keywordsに埋め込まれた重要度タグを分離
+    
+    Args:
+        keywords: キーワード文字列（例: "copper, LME [重要度:8/10]"）
+        
+    Returns:
+        (重要度スコア, タグを除去したキーワード文字列)
+    """
+    if not keywords:
+        return None, keywords
+    
+    match = IMPORTANCE_TAG_PATTERN.search(keywords)
+    if not match:
+        return None, keywords
+    
+    score = max(1, min(10, int(match.group(1))))
+    cleaned = IMPORTANCE_TAG_PATTERN.sub('', keywords).strip()
+    return score, cleaned or None
+
 def validate_manual_news_input(data: dict) -> tuple[bool, str]:
     """
     手動ニュース入力の検証
@@ -265,17 +700,78 @@ class NewsSearchFilter:
         self.start_date: Optional[datetime] = None
         self.end_date: Optional[datetime] = None
         self.source: Optional[str] = None
+        self.source_exact: bool = False  # ソースを完全一致で絞り込む（UIのソース選択など、インデックスで絞り込める）
         self.related_metals: Optional[List[str]] = None
         self.is_manual: Optional[bool] = None
         self.rating: Optional[int] = None
         self.min_importance_score: Optional[int] = None  # 重要度スコア下限フィルター
         self.is_read: Optional[bool] = None  # 既読フィルター
+        self.include_archive: bool = False  # アーカイブ層（切り離し済みパーティション）も検索
         self.limit: int = 100
         self.offset: int = 0
         # ソート機能
         self.sort_by: str = "smart"  # smart, time_desc, time_asc, rating_desc, rating_asc, relevance
         self.sort_direction: str = "desc"
     
+    def cache_key(self) -> tuple:
+        """結果キャッシュ用の正規化キー（SQLが同一になる条件は同じキーになる）"""
+        return (
+            self.keyword or None,
+            self.start_date,
+            self.end_date,
+            self.source or None,
+            self.source_exact,
+            tuple(sorted(self.related_metals)) if self.related_metals else None,
+            self.is_manual,
+            self.rating,
+            self.min_importance_score,
+            self.is_read,
+            self.include_archive,
+            self.limit,
+            self.offset,
+            self.sort_by,
+            self.sort_direction
+        )
+    
+    def query_shape(self, db_type: str = "postgresql") -> tuple:
+        """
+        SQLの形（どの条件が指定されているか）を表すキー
+        値が異なっても形が同じ検索は同じSQL文になり、テンプレートとクエリプランを再利用できる
+        """
+        if not self.keyword:
+            keyword_mode = None
+        elif db_type == "sqlite" and len(self.keyword) >= SQLITE_FTS_MIN_KEYWORD_LENGTH:
+            keyword_mode = "fts"
+        else:
+            keyword_mode = "like"
+        
+        if not self.source:
+            source_mode = None
+        else:
+            source_mode = "exact" if self.source_exact else "like"
+        
+        sort_by = self.sort_by if self.sort_by in SORT_OPTIONS else "smart"
+        # キーワードなしの関連性ソートはスマートソートと同じ
+        if sort_by == "relevance" and not self.keyword:
+            sort_by = "smart"
+        # レーティングで絞り込んだ場合、レーティング系のソートは時系列（新しい順）と同じ順序
+        # （rating + publish_timeのインデックスで読み出せる）
+        if self.rating is not None and sort_by in ("smart", "rating_priority", "rating_desc", "rating_asc"):
+            sort_by = "time_desc"
+        
+        return (
+            keyword_mode,
+            self.start_date is not None,
+            self.end_date is not None,
+            source_mode,
+            len(self.related_metals) if self.related_metals else 0,
+            self.is_manual is not None,
+            self.rating is not None,
+            self.min_importance_score is not None,
+            self.is_read is not None,
+            sort_by
+        )
+    
     def to_sql_where_clause(self, db_type: str = "postgresql") -> tuple[str, list]:
         """
         SQLのWHERE句とパラメータを生成
@@ -286,89 +782,58 @@ class NewsSearchFilter:
         Returns:
             (where_clause, parameters)
         """
-        conditions = []
+        where_clause, _ = compile_filter_template(db_type, self.query_shape(db_type))
+        return where_clause, self._where_params(db_type)
+    
+    def _where_params(self, db_type: str) -> list:
+        """WHERE句のパラメータ（compile_filter_templateの条件と同じ順序）"""
         params = []
         
         if self.keyword:
-            if db_type == "postgresql":
-                conditions.append("(title ILIKE %s OR body ILIKE %s)")
-                params.extend([f"%{self.keyword}%", f"%{self.keyword}%"])
-            else:  # SQL Server
-                conditions.append("(title LIKE ? OR body LIKE ?)")
+            if db_type == "sqlite" and len(self.keyword) >= SQLITE_FTS_MIN_KEYWORD_LENGTH:
+                # FTS5のフレーズ検索として渡す
+                params.append('"' + self.keyword.replace('"', '""') + '"')
+            else:
                 params.extend([f"%{self.keyword}%", f"%{self.keyword}%"])
         
-        if self.start_date:
-            if db_type == "postgresql":
-                conditions.append("publish_time >= %s")
-            else:
-                conditions.append("publish_time >= ?")
+        if self.start_date is not None:
             params.append(self.start_date)
         
-        if self.end_date:
-            if db_type == "postgresql":
-                conditions.append("publish_time <= %s")
-            else:
-                conditions.append("publish_time <= ?")
+        if self.end_date is not None:
             params.append(self.end_date)
         
         if self.source:
-            if db_type == "postgresql":
-                conditions.append("source ILIKE %s")
-                params.append(f"%{self.source}%")
-            else:
-                conditions.append("source LIKE ?")
-                params.append(f"%{self.source}%")
+            params.append(self.source if self.source_exact else f"%{self.source}%")
         
         if self.related_metals:
-            metal_conditions = []
-            for metal in self.related_metals:
-                if db_type == "postgresql":
-                    metal_conditions.append("related_metals ILIKE %s")
-                    params.append(f"%{metal}%")
-                else:
-                    metal_conditions.append("related_metals LIKE ?")
-                    params.append(f"%{metal}%")
-            if metal_conditions:
-                conditions.append(f"({' OR '.join(metal_conditions)})")
+            params.extend(f"%{metal}%" for metal in self.related_metals)
         
         if self.is_manual is not None:
             if db_type == "postgresql":
-                conditions.append("is_manual = %s")
                 params.append(self.is_manual)
             else:
                 # SQL ServerのBIT型は1/0で比較
-                conditions.append("is_manual = ?")
                 params.append(1 if self.is_manual else 0)
         
         if self.rating is not None:
-            if db_type == "postgresql":
-                conditions.append("rating = %s")
-            else:
-                conditions.append("rating = ?")
             params.append(self.rating)
         
         if self.min_importance_score is not None:
-            if db_type == "postgresql":
-                conditions.append("importance_score >= %s")
-            else:
-                conditions.append("importance_score >= ?")
             params.append(self.min_importance_score)
         
         if self.is_read is not None:
             if db_type == "postgresql":
-                conditions.append("is_read = %s")
                 params.append(self.is_read)
             else:
-                # SQL ServerのBIT型は1/0で比較
-                conditions.append("is_read = ?")
                 params.append(1 if self.is_read else 0)
         
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        return where_clause, params
+        return params
     
     def to_sql_order_clause(self, db_type: str = "postgresql") -> str:
         """
         SQLのORDER BY句を生成（時系列とレーティング最適化）
+        関連性ソートのキーワードはプレースホルダーになるため、to_sql_order_paramsの値を
+        WHERE句のパラメータの後に渡す
         
         Args:
             db_type: データベースタイプ
@@ -376,64 +841,122 @@ class NewsSearchFilter:
         Returns:
             order_clause: ORDER BY句
         """
-        if self.sort_by == "smart":
-            # スマートソート: レーティング優先、次に時系列
-            return """ORDER BY 
-                CASE 
-                    WHEN rating IS NOT NULL THEN rating 
-                    ELSE 0 
-                END DESC,
-                publish_time DESC,
-                acquire_time DESC"""
-        
-        elif self.sort_by == "rating_priority":
-            # レーティング優先: 高レーティング → 未評価 → 低レーティング、同じレーティング内は時系列
-            return """ORDER BY 
-                CASE 
-                    WHEN rating = 3 THEN 1
-                    WHEN rating = 2 THEN 2  
-                    WHEN rating IS NULL THEN 3
-                    WHEN rating = 1 THEN 4
-                    ELSE 5
-                END,
+        _, order_clause = compile_filter_template(db_type, self.query_shape(db_type))
+        return order_clause
+    
+    def to_sql_order_params(self, db_type: str = "postgresql") -> list:
+        """ORDER BY句のパラメータ（関連性ソートのキーワードのみ）"""
+        if self.query_shape(db_type)[-1] == "relevance":
+            return [f"%{self.keyword}%", f"%{self.keyword}%"]
+        return []
+
+
+SORT_OPTIONS = ("smart", "rating_priority", "time_desc", "time_asc", "rating_desc", "rating_asc", "relevance")
+
+# 検索条件の形ごとにコンパイル済みSQLを保持する件数
+QUERY_TEMPLATE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=QUERY_TEMPLATE_CACHE_SIZE)
+def compile_filter_template(db_type: str, shape: tuple) -> tuple[str, str]:
+    """
+    検索条件の形からWHERE句・ORDER BY句のテンプレートを生成（形ごとにメモ化）
+    値はすべてプレースホルダーで渡すため、同じ形の検索は同一のSQL文になる
+
+    Args:
+        db_type: データベースタイプ
+        shape: NewsSearchFilter.query_shapeの戻り値
+
+    Returns:
+        (where_clause, order_clause)
+    """
+    (keyword_mode, has_start, has_end, source_mode, metal_count,
+     has_is_manual, has_rating, has_min_importance, has_is_read, sort_by) = shape
+
+    p = "%s" if db_type == "postgresql" else "?"
+    like = "ILIKE" if db_type == "postgresql" else "LIKE"
+    conditions = []
+
+    if keyword_mode == "fts":
+        # trigramの全文検索インデックスで部分一致（大文字小文字を区別しない）
+        conditions.append(f"rowid IN (SELECT rowid FROM news_fts WHERE news_fts MATCH {p})")
+    elif keyword_mode == "like":
+        conditions.append(f"(title {like} {p} OR body {like} {p})")
+
+    if has_start:
+        conditions.append(f"publish_time >= {p}")
+
+    if has_end:
+        conditions.append(f"publish_time <= {p}")
+
+    if source_mode == "exact":
+        conditions.append(f"source = {p}")
+    elif source_mode == "like":
+        conditions.append(f"source {like} {p}")
+
+    if metal_count:
+        conditions.append("(" + " OR ".join([f"related_metals {like} {p}"] * metal_count) + ")")
+
+    if has_is_manual:
+        conditions.append(f"is_manual = {p}")
+
+    if has_rating:
+        conditions.append(f"rating = {p}")
+
+    if has_min_importance:
+        conditions.append(f"importance_score >= {p}")
+
+    if has_is_read:
+        conditions.append(f"is_read = {p}")
+
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    return where_clause, _compile_order_clause(db_type, sort_by)
+
+
+def _compile_order_clause(db_type: str, sort_by: str) -> str:
+    """
+    ORDER BY句のテンプレート（sort_byは正規化済み）
+    レーティング系のソートはスキーマの式インデックス（SQL Serverは計算列のインデックス）と
+    同じソートキーを使うため、先頭ページの取得でソートせずにインデックス順に読み出せる
+    """
+    if sort_by == "rating_priority":
+        # レーティング優先: 高レーティング → 未評価 → 低レーティング、同じレーティング内は時系列
+        return f"ORDER BY {_rating_sort_key(db_type, RATING_PRIORITY_SORT_KEY)}, publish_time DESC, acquire_time DESC"
+
+    elif sort_by == "time_desc":
+        return "ORDER BY publish_time DESC, acquire_time DESC"
+
+    elif sort_by == "time_asc":
+        return "ORDER BY publish_time ASC, acquire_time ASC"
+
+    elif sort_by == "rating_desc":
+        # 未評価は最後（レーティングは1〜3のため0として並べると同じ順序）
+        return f"ORDER BY {_rating_sort_key(db_type, RATING_SORT_KEY)} DESC, publish_time DESC, acquire_time DESC"
+
+    elif sort_by == "rating_asc":
+        # 未評価は最後
+        return f"ORDER BY {_rating_sort_key(db_type, RATING_ASC_SORT_KEY)}, publish_time DESC, acquire_time DESC"
+
+    elif sort_by == "relevance":
+        # 関連性ソート: キーワードマッチ度 + レーティング + 時系列（キーワードはパラメータ）
+        p = "%s" if db_type == "postgresql" else "?"
+        like = "ILIKE" if db_type == "postgresql" else "LIKE"
+        return f"""ORDER BY
+                (CASE WHEN title {like} {p} THEN 2 ELSE 0 END +
+                 CASE WHEN body {like} {p} THEN 1 ELSE 0 END +
+                 CASE WHEN rating IS NOT NULL THEN rating * 0.5 ELSE 0 END) DESC,
                 publish_time DESC"""
-        
-        elif self.sort_by == "time_desc":
-            return "ORDER BY publish_time DESC, acquire_time DESC"
-        
-        elif self.sort_by == "time_asc":
-            return "ORDER BY publish_time ASC, acquire_time ASC"
-        
-        elif self.sort_by == "rating_desc":
-            if db_type == "postgresql":
-                return "ORDER BY rating DESC NULLS LAST, publish_time DESC"
-            else:  # SQL Server
-                return "ORDER BY CASE WHEN rating IS NULL THEN 1 ELSE 0 END, rating DESC, publish_time DESC"
-        
-        elif self.sort_by == "rating_asc":
-            if db_type == "postgresql":
-                return "ORDER BY rating ASC NULLS LAST, publish_time DESC"
-            else:  # SQL Server
-                return "ORDER BY CASE WHEN rating IS NULL THEN 1 ELSE 0 END, rating ASC, publish_time DESC"
-        
-        elif self.sort_by == "relevance":
-            # 関連性ソート: キーワードマッチ度 + レーティング + 時系列
-            if self.keyword:
-                if db_type == "postgresql":
-                    return f"""ORDER BY 
-                        (CASE WHEN title ILIKE '%{self.keyword}%' THEN 2 ELSE 0 END +
-                         CASE WHEN body ILIKE '%{self.keyword}%' THEN 1 ELSE 0 END +
-                         CASE WHEN rating IS NOT NULL THEN rating * 0.5 ELSE 0 END) DESC,
-                        publish_time DESC"""
-                else:  # SQL Server
-                    return f"""ORDER BY 
-                        (CASE WHEN title LIKE '%{self.keyword}%' THEN 2 ELSE 0 END +
-                         CASE WHEN body LIKE '%{self.keyword}%' THEN 1 ELSE 0 END +
-                         CASE WHEN rating IS NOT NULL THEN rating * 0.5 ELSE 0 END) DESC,
-                        publish_time DESC"""
-            else:
-                return self.to_sql_order_clause(db_type).replace("relevance", "smart")
-        
-        else:
-            # デフォルトはスマートソート
-            return self.to_sql_order_clause(db_type).replace(self.sort_by, "smart")
\ No newline at end of file
+
+    # スマートソート（既定）: レーティング優先、次に時系列（評価済みの記事が少ないため時系列とほぼ同じ順序）
+    return f"ORDER BY {_rating_sort_key(db_type, RATING_SORT_KEY)} DESC, publish_time DESC, acquire_time DESC"
+
+
+def _rating_sort_key(db_type: str, expression: str) -> str:
+    """ソートキーの式（SQL Serverは同じ式の計算列を参照）"""
+    if db_type == "sqlserver":
+        return {
+            RATING_SORT_KEY: "rating_sort_key",
+            RATING_PRIORITY_SORT_KEY: "rating_priority_key",
+            RATING_ASC_SORT_KEY: "rating_asc_key"
+        }[expression]
+    return expression
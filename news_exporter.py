@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+検索結果のエクスポートモジュール
+検索条件に一致する記事をサーバー側カーソル（PostgreSQL）またはfetchmanyで一定件数ずつ取得し、
+CSV / NDJSON / Parquet へ逐次書き出す（件数によらずメモリ使用量は一定）
+"""
+
+import os
+import csv
+import gzip
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from models_spec import NewsSearchFilter
+
+# Parquet出力は任意（pyarrow未インストール時はCSV/NDJSONのみ）
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+
+# 出力カラム（内部管理用の重複判定キー・変更シーケンスは含めない）
+EXPORT_COLUMNS = [
+    'news_id', 'title', 'body', 'publish_time', 'acquire_time', 'source', 'url',
+    'sentiment', 'summary', 'keywords', 'related_metals', 'translation', 'is_manual',
+    'rating', 'is_read', 'read_at', 'importance_score'
+]
+EXPORT_DATETIME_COLUMNS = {'publish_time', 'acquire_time', 'read_at'}
+EXPORT_BOOLEAN_COLUMNS = {'is_manual', 'is_read'}
+EXPORT_INTEGER_COLUMNS = {'rating', 'importance_score'}
+
+
+class NewsExportCancelled(Exception):
+    """エクスポートがキャンセルされた"""
+
+
+def detect_export_format(path: str) -> str:
+    """出力ファイル名の拡張子から形式を判定（.csv / .ndjson / .jsonl / .parquet、.gz付きも可）"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".parquet"):
+        return "parquet"
+    if name.endswith(".ndjson") or name.endswith(".jsonl"):
+        return "ndjson"
+    return "csv"
+
+
+def _normalize_value(column: str, value):
+    """バックエンドによる型の違いを揃える（SQLiteの真偽値0/1・文字列の日時など）"""
+    if value is None:
+        return None
+    if column in EXPORT_BOOLEAN_COLUMNS:
+        return bool(value)
+    if column in EXPORT_DATETIME_COLUMNS and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class _CsvWriter:
+    """CSV出力（Excelで開けるようBOM付きUTF-8）"""
+
+    def __init__(self, path: str, columns: List[str], compress: bool = False):
+        self.columns = columns
+        if compress:
+            self._file = gzip.open(path, 'wt', encoding='utf-8-sig', newline='')
+        else:
+            self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: List[Dict]):
+        self._writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value
+             for value in (row[column] for column in self.columns)]
+            for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _NdjsonWriter:
+    """NDJSON出力（1行1記事）"""
+
+    def __init__(self, path: str, columns: List[str], compress: bool = False):
+        self.columns = columns
+        if compress:
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows: List[Dict]):
+        for row in rows:
+            record = {
+                column: row[column].isoformat() if isinstance(row[column], datetime) else row[column]
+                for column in self.columns
+            }
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Parquet出力（バッチごとに行グループとして追記、スキーマは固定）"""
+
+    def __init__(self, path: str, columns: List[str]):
+        self.columns = columns
+        fields = []
+        for column in columns:
+            if column in EXPORT_DATETIME_COLUMNS:
+                fields.append(pyarrow.field(column, pyarrow.timestamp('us')))
+            elif column in EXPORT_BOOLEAN_COLUMNS:
+                fields.append(pyarrow.field(column, pyarrow.bool_()))
+            elif column in EXPORT_INTEGER_COLUMNS:
+                fields.append(pyarrow.field(column, pyarrow.int32()))
+            else:
+                fields.append(pyarrow.field(column, pyarrow.string()))
+        self.schema = pyarrow.schema(fields)
+        self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, rows: List[Dict]):
+        if not rows:
+            return
+        arrays = [
+            pyarrow.array([row[field.name] for row in rows], type=field.type)
+            for field in self.schema
+        ]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class NewsExporter:
+    """検索結果のストリーミングエクスポートクラス"""
+
+    def __init__(self, db_manager, config: Dict):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            config: 全体設定（export設定を使用）
+        """
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+
+        export_config = config.get("export", {})
+        self.export_directory = export_config.get("export_directory", "exports")
+        self.batch_size = export_config.get("export_batch_size", 2000)
+        # 進捗通知の最短間隔（秒）
+        self.progress_interval = export_config.get("progress_interval_seconds", 1.0)
+
+    def export(self, search_filter: NewsSearchFilter, output_path: str, export_format: Optional[str] = None,
+               columns: Optional[List[str]] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None,
+               cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        検索結果をファイルへエクスポート（一時ファイルに書いてから置き換え）
+
+        Args:
+            search_filter: 検索条件（limit/offsetは無視して全件を出力）
+            output_path: 出力ファイルパス
+            export_format: csv / ndjson / parquet（省略時は拡張子から判定）
+            columns: 出力カラム（省略時はEXPORT_COLUMNS）
+            progress_callback: 進捗通知（出力済み件数, 総件数）
+            cancel_event: セットされたらバッチの区切りで中断（NewsExportCancelled）
+
+        Returns:
+            Dict: path, format, rows, total_rows, bytes, elapsed_seconds
+        """
+        export_format = export_format or detect_export_format(output_path)
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"未対応のエクスポート形式: {export_format}")
+        if export_format == "parquet" and not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet形式の出力にはpyarrowが必要です")
+        columns = columns or EXPORT_COLUMNS
+
+        started = time.monotonic()
+        total_rows = self.db_manager.get_news_count(search_filter)
+        self.logger.info(f"エクスポート開始: {output_path}（{export_format}、{total_rows}件）")
+
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{output_path}.tmp"
+
+        # 一時ファイル名では拡張子で判定できないため圧縮有無は出力パスから決める
+        compress = output_path.lower().endswith(".gz")
+        if export_format == "parquet":
+            writer = _ParquetWriter(temp_path, columns)
+        elif export_format == "ndjson":
+            writer = _NdjsonWriter(temp_path, columns, compress)
+        else:
+            writer = _CsvWriter(temp_path, columns, compress)
+
+        exported = 0
+        last_progress = 0.0
+        last_reported = None
+        try:
+            for batch in self.db_manager.iter_search_batches(search_filter, columns, self.batch_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise NewsExportCancelled(f"エクスポートをキャンセルしました（{exported}件出力済み）")
+
+                writer.write([
+                    {column: _normalize_value(column, row[column]) for column in columns}
+                    for row in batch
+                ])
+                exported += len(batch)
+
+                now = time.monotonic()
+                if progress_callback and now - last_progress >= self.progress_interval:
+                    last_progress = now
+                    last_reported = (exported, max(total_rows, exported))
+                    progress_callback(*last_reported)
+
+            writer.close()
+            os.replace(temp_path, output_path)
+
+        except BaseException:
+            writer.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if progress_callback and (exported, exported) != last_reported:
+            progress_callback(exported, exported)
+
+        elapsed = time.monotonic() - started
+        self.logger.info(f"エクスポート完了: {output_path}（{exported}件、{elapsed:.1f}秒）")
+        return {
+            'path': os.path.abspath(output_path),
+            'format': export_format,
+            'rows': exported,
+            'total_rows': total_rows,
+            'bytes': os.path.getsize(output_path),
+            'elapsed_seconds': round(elapsed, 3)
+        }
+
+    def build_output_path(self, export_format: str) -> str:
+        """UIからのエクスポート用の出力ファイルパス（export_directory配下、日時入りファイル名）"""
+        extension = {"csv": "csv", "ndjson": "ndjson.gz", "parquet": "parquet"}[export_format]
+        return os.path.join(self.export_directory, f"news_export_{datetime.now():%Y%m%d_%H%M%S}.{extension}")
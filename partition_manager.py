@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+ニューステーブルの月次パーティション管理モジュール
+PostgreSQL: 宣言的パーティション（古い月はアーカイブテーブルへ切り離し）
+SQL Server: パーティション関数/スキーム（古い月はページ圧縮）
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# パーティション関連オブジェクト名
+PARTITION_PREFIX = "news_table_p"
+ARCHIVE_TABLE = "news_table_archive"
+UNPARTITIONED_TABLE = "news_table_unpartitioned"
+DEFAULT_PARTITION = "news_table_default"
+SQLSERVER_PARTITION_FUNCTION = "pf_news_monthly"
+SQLSERVER_PARTITION_SCHEME = "ps_news_monthly"
+
+
+def month_start(value: datetime) -> datetime:
+    """月初日時に切り捨て"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """月初日時に月数を加算"""
+    month_index = value.year * 12 + (value.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """月に対応するパーティションテーブル名（例: news_table_p202401）"""
+    return f"{PARTITION_PREFIX}{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_month(name: str) -> Optional[datetime]:
+    """パーティションテーブル名から対象月を取得"""
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m")
+    except ValueError:
+        return None
+
+
+class NewsPartitionManager:
+    """ニューステーブルの月次パーティション管理クラス"""
+
+    def __init__(self, db_manager, config: Dict):
+        """
+        初期化
+
+        Args:
+            db_manager: SpecDatabaseManager
+            config: 全体設定（partitioning設定、backup.enable_auto_backupを使用）
+        """
+        self.db_manager = db_manager
+        self.db_type = db_manager.db_type
+        self.logger = logging.getLogger(__name__)
+
+        partition_config = config.get("partitioning", {})
+        self.enabled = partition_config.get("enable_partitioning", False)
+        self.months_ahead = partition_config.get("months_ahead", 2)
+        self.archive_tablespace = partition_config.get("archive_tablespace")
+
+        # ホット層の保持日数を過ぎた月をコールド層（切り離し/圧縮）へ移す
+        self.retention_days = partition_config.get("hot_retention_days", 30)
+
+        # 自動アーカイブ（ファイル出力・削除）はnews_tableのみが対象のため、
+        # 有効な場合はPostgreSQLのアーカイブテーブルへの切り離しを行わない（アーカイブ出力を優先）
+        self.archive_purge_enabled = config.get("backup", {}).get("enable_auto_backup", False)
+
+    def is_partitioned(self) -> bool:
+        """news_tableがパーティション化済みか"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if self.db_type == "postgresql":
+                cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'news_table'")
+                result = cursor.fetchone()
+                return bool(result) and result[0] == 'p'
+            else:
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM sys.indexes i
+                    JOIN sys.partition_schemes ps ON ps.data_space_id = i.data_space_id
+                    WHERE i.object_id = OBJECT_ID('news_table') AND ps.name = '{SQLSERVER_PARTITION_SCHEME}'
+                """)
+                return cursor.fetchone()[0] > 0
+
+    def maintain(self) -> Dict:
+        """
+        起動時メンテナンス（未パーティションなら変換、先の月のパーティション作成、保持期間超過分の移動）
+
+        Returns:
+            Dict: converted, created_partitions, archived_partitions
+        """
+        result = {'converted': False, 'created_partitions': 0, 'archived_partitions': 0}
+        if not self.enabled:
+            return result
+
+        # SQLiteはパーティションをサポートしない
+        if self.db_type == "sqlite":
+            self.logger.warning("SQLiteではパーティション化は使用できません（enable_partitioningを無視）")
+            return result
+
+        try:
+            if not self.is_partitioned():
+                result['converted'] = self.convert_to_partitioned()
+                if not result['converted']:
+                    return result
+            elif self._has_unpartitioned_table():
+                # 前回の変換がデータ移し替えの途中で中断した場合は続きから再開
+                self.logger.info("中断したパーティション変換のデータ移し替えを再開")
+                result['converted'] = self._copy_unpartitioned_rows()
+                if not result['converted']:
+                    return result
+
+            result['created_partitions'] = self.ensure_future_partitions()
+            result['archived_partitions'] = self.apply_retention()
+            self.refresh_archive_boundary()
+
+        except Exception as e:
+            self.logger.error(f"パーティションメンテナンスエラー: {e}")
+
+        return result
+
+    def convert_to_partitioned(self) -> bool:
+        """既存のnews_tableを月次パーティションテーブルへ変換（初回のみ）"""
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT MIN(publish_time) FROM news_table")
+                oldest = cursor.fetchone()[0]
+
+                first_month = month_start(oldest) if oldest else month_start(datetime.now())
+                last_month = add_months(month_start(datetime.now()), self.months_ahead)
+
+                if self.db_type == "postgresql":
+                    self._convert_postgresql(cursor, first_month, last_month)
+                else:
+                    self._convert_sqlserver(cursor, first_month, last_month)
+
+            # PostgreSQLはテーブル作成をコミットしてから月単位でデータを移し替える
+            if self.db_type == "postgresql" and not self._copy_unpartitioned_rows():
+                return False
+
+            self.logger.info(f"news_tableを月次パーティションへ変換完了: {first_month:%Y-%m}〜{last_month:%Y-%m}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"パーティション変換エラー: {e}")
+            return False
+
+    def _convert_postgresql(self, cursor, first_month: datetime, last_month: datetime):
+        """PostgreSQL: 宣言的パーティションテーブルを作成（データは_copy_unpartitioned_rowsで移し替え）"""
+        cursor.execute(f"ALTER TABLE news_table RENAME TO {UNPARTITIONED_TABLE}")
+        cursor.execute(f"""
+            CREATE TABLE news_table (
+                LIKE {UNPARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+            ) PARTITION BY RANGE (publish_time)
+        """)
+        # パーティションキーを含む主キー（news_idの一意性は挿入時のUPSERTで担保）
+        cursor.execute("ALTER TABLE news_table ADD PRIMARY KEY (news_id, publish_time)")
+
+        month = first_month
+        while month <= last_month:
+            self._create_postgresql_partition(cursor, month)
+            month = add_months(month, 1)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF news_table DEFAULT")
+
+    def _has_unpartitioned_table(self) -> bool:
+        """PostgreSQL: 変換途中の旧テーブルが残っているか"""
+        if self.db_type != "postgresql":
+            return False
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass(%s)", (UNPARTITIONED_TABLE,))
+            return cursor.fetchone()[0] is not None
+
+    def _copy_unpartitioned_rows(self) -> bool:
+        """
+        PostgreSQL: 旧テーブルの記事を1か月分ずつ別トランザクションでパーティションテーブルへ移し替え
+        （全件を1トランザクションで移さずロック・WALの増加を抑える。移し替え中に書き込まれた記事は上書きしない）
+
+        Returns:
+            bool: 移し替えが完了し旧テーブルを削除できたか（中断した場合は次回起動時に再開）
+        """
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT MIN(publish_time), MAX(publish_time) FROM {UNPARTITIONED_TABLE}")
+                oldest, newest = cursor.fetchone()
+
+            copied = 0
+            if oldest is not None:
+                month = month_start(oldest)
+                while month <= newest:
+                    next_month = add_months(month, 1)
+                    with self.db_manager.get_connection() as conn:
+                        cursor = conn.cursor()
+                        cursor.execute(f"""
+                            INSERT INTO news_table SELECT * FROM {UNPARTITIONED_TABLE}
+                            WHERE publish_time >= %s AND publish_time < %s
+                            ON CONFLICT DO NOTHING
+                        """, (month, next_month))
+                        copied += max(cursor.rowcount, 0)
+                    month = next_month
+
+            # 旧テーブルのインデックスも削除され、create_tablesで親テーブルに再作成される
+            with self.db_manager.get_connection() as conn:
+                conn.cursor().execute(f"DROP TABLE {UNPARTITIONED_TABLE}")
+
+            self.logger.info(f"パーティションテーブルへの移し替え完了: {copied}件")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"パーティションテーブルへの移し替えエラー: {e}")
+            return False
+
+    def _create_postgresql_partition(self, cursor, month: datetime):
+        """PostgreSQL: 指定月のパーティションを作成"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF news_table
+            FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')
+        """)
+
+    def _convert_sqlserver(self, cursor, first_month: datetime, last_month: datetime):
+        """SQL Server: パーティション関数/スキームを作成しクラスター化主キーをスキーム上に再作成"""
+        boundaries = []
+        month = first_month
+        while month <= last_month:
+            boundaries.append(f"'{month:%Y-%m-%d}'")
+            month = add_months(month, 1)
+
+        cursor.execute(f"""
+            CREATE PARTITION FUNCTION {SQLSERVER_PARTITION_FUNCTION} (DATETIME2)
+            AS RANGE RIGHT FOR VALUES ({', '.join(boundaries)})
+        """)
+        cursor.execute(f"""
+            CREATE PARTITION SCHEME {SQLSERVER_PARTITION_SCHEME}
+            AS PARTITION {SQLSERVER_PARTITION_FUNCTION} ALL TO ([PRIMARY])
+        """)
+
+        # 既存の主キー（news_idのみ）を削除し、パーティションキーを含めて再作成
+        cursor.execute("""
+            DECLARE @pk sysname = (
+                SELECT name FROM sys.key_constraints
+                WHERE parent_object_id = OBJECT_ID('news_table') AND type = 'PK'
+            );
+            IF @pk IS NOT NULL EXEC('ALTER TABLE news_table DROP CONSTRAINT ' + QUOTENAME(@pk));
+        """)
+        cursor.execute(f"""
+            ALTER TABLE news_table ADD CONSTRAINT pk_news_table
+            PRIMARY KEY CLUSTERED (news_id, publish_time) ON {SQLSERVER_PARTITION_SCHEME}(publish_time)
+        """)
+
+    def ensure_future_partitions(self) -> int:
+        """
+        現在月から設定月数先までのパーティションを作成
+
+        Returns:
+            int: 新規作成したパーティション数
+        """
+        current = month_start(datetime.now())
+        target_months = [add_months(current, i) for i in range(self.months_ahead + 1)]
+        created = 0
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if self.db_type == "postgresql":
+                existing = {month for _, month in self._list_postgresql_partitions(cursor, "news_table")}
+                for month in target_months:
+                    if month not in existing:
+                        self._create_postgresql_partition(cursor, month)
+                        created += 1
+            else:
+                existing = set(self._list_sqlserver_boundaries(cursor))
+                for month in target_months:
+                    if month not in existing:
+                        cursor.execute(f"ALTER PARTITION SCHEME {SQLSERVER_PARTITION_SCHEME} NEXT USED [PRIMARY]")
+                        cursor.execute(f"ALTER PARTITION FUNCTION {SQLSERVER_PARTITION_FUNCTION}() SPLIT RANGE ('{month:%Y-%m-%d}')")
+                        created += 1
+
+        if created > 0:
+            self.logger.info(f"パーティション作成: {created}件")
+        return created
+
+    def apply_retention(self) -> int:
+        """
+        ホット層の保持期間（partitioning.hot_retention_days）を過ぎた月をコールド層へ移動
+        PostgreSQL: アーカイブテーブルへ切り離し / SQL Server: ページ圧縮
+
+        Returns:
+            int: 移動（圧縮）したパーティション数
+        """
+        cutoff = month_start(datetime.now() - timedelta(days=self.retention_days))
+
+        if self.db_type == "postgresql" and self.archive_purge_enabled:
+            # 切り離した記事は自動アーカイブの出力・削除の対象外になるため移動しない
+            self.logger.info("自動アーカイブが有効なためアーカイブテーブルへの切り離しをスキップ")
+            return 0
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            if self.db_type == "postgresql":
+                moved = self._archive_postgresql_partitions(cursor, cutoff)
+                if moved > 0:
+                    # 切り離した記事を集計テーブル（ダッシュボード・フィルター件数）から除外
+                    self.db_manager.rebuild_aggregates(cursor)
+            else:
+                moved = self._compress_sqlserver_partitions(cursor, cutoff)
+
+        if moved > 0:
+            self.logger.info(f"保持期間超過パーティションをアーカイブ: {moved}件（{cutoff:%Y-%m}より前）")
+        return moved
+
+    def _archive_postgresql_partitions(self, cursor, cutoff: datetime) -> int:
+        """PostgreSQL: 月末がcutoff以前のパーティションをアーカイブテーブルへ付け替え"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE} (
+                LIKE news_table INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+            ) PARTITION BY RANGE (publish_time)
+        """)
+        self._sync_archive_columns(cursor)
+
+        moved = 0
+        for name, month in self._list_postgresql_partitions(cursor, "news_table"):
+            if add_months(month, 1) > cutoff:
+                continue
+
+            cursor.execute(f"ALTER TABLE news_table DETACH PARTITION {name}")
+            if self.archive_tablespace:
+                cursor.execute(f"ALTER TABLE {name} SET TABLESPACE {self.archive_tablespace}")
+            cursor.execute(f"""
+                ALTER TABLE {ARCHIVE_TABLE} ATTACH PARTITION {name}
+                FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')
+            """)
+            moved += 1
+
+        return moved
+
+    def _sync_archive_columns(self, cursor):
+        """PostgreSQL: news_tableに後から追加されたカラムをアーカイブテーブルにも追加"""
+        cursor.execute(f"""
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = 'news_table'::regclass AND a.attnum > 0 AND NOT a.attisdropped
+              AND a.attname NOT IN (
+                  SELECT attname FROM pg_attribute
+                  WHERE attrelid = '{ARCHIVE_TABLE}'::regclass AND attnum > 0 AND NOT attisdropped
+              )
+            ORDER BY a.attnum
+        """)
+        for column_name, column_type in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {ARCHIVE_TABLE} ADD COLUMN IF NOT EXISTS {column_name} {column_type}")
+
+    def _compress_sqlserver_partitions(self, cursor, cutoff: datetime) -> int:
+        """SQL Server: 上限境界がcutoff以前の未圧縮パーティションをページ圧縮"""
+        boundaries = self._list_sqlserver_boundaries(cursor)
+
+        cursor.execute("""
+            SELECT partition_number, data_compression_desc FROM sys.partitions
+            WHERE object_id = OBJECT_ID('news_table') AND index_id IN (0, 1)
+        """)
+        compression = {row[0]: row[1] for row in cursor.fetchall()}
+
+        compressed = 0
+        # RANGE RIGHTのため、境界k（1始まり）を上限とするのはパーティション番号k
+        for partition_number, upper_bound in enumerate(boundaries, start=1):
+            if upper_bound > cutoff or compression.get(partition_number) == 'PAGE':
+                continue
+            cursor.execute(
+                f"ALTER TABLE news_table REBUILD PARTITION = {partition_number} WITH (DATA_COMPRESSION = PAGE)"
+            )
+            compressed += 1
+
+        return compressed
+
+    def refresh_archive_boundary(self):
+        """アーカイブ層とホット層の境界をデータベース管理クラスへ反映（検索時のテーブル選択に使用）"""
+        if self.db_type != "postgresql":
+            return
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass(%s)", (ARCHIVE_TABLE,))
+            if cursor.fetchone()[0] is None:
+                return
+
+            archived = self._list_postgresql_partitions(cursor, ARCHIVE_TABLE)
+
+        if archived:
+            self.db_manager.archive_table = ARCHIVE_TABLE
+            self.db_manager.archive_boundary = add_months(max(month for _, month in archived), 1)
+
+    def _list_postgresql_partitions(self, cursor, parent_table: str) -> List[Tuple[str, datetime]]:
+        """PostgreSQL: 親テーブル配下の月次パーティション一覧（名前, 対象月）"""
+        cursor.execute("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+        """, (parent_table,))
+
+        partitions = []
+        for (name,) in cursor.fetchall():
+            month = parse_partition_month(name)
+            if month is not None:
+                partitions.append((name, month))
+        return sorted(partitions, key=lambda item: item[1])
+
+    def _list_sqlserver_boundaries(self, cursor) -> List[datetime]:
+        """SQL Server: パーティション関数の境界値一覧（昇順）"""
+        cursor.execute(f"""
+            SELECT CAST(prv.value AS DATETIME2) FROM sys.partition_range_values prv
+            JOIN sys.partition_functions pf ON pf.function_id = prv.function_id
+            WHERE pf.name = '{SQLSERVER_PARTITION_FUNCTION}'
+            ORDER BY prv.boundary_id
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    # パーティションメンテナンスの手動実行
+    import json
+    from database_spec import SpecDatabaseManager
+
+    logging.basicConfig(level=logging.INFO)
+
+    with open("config_spec.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    manager = NewsPartitionManager(SpecDatabaseManager(config), config)
+    manager.enabled = True
+    print(manager.maintain())
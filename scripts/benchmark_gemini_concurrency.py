@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Gemini分析の同時実行ベンチマーク
+応答まで一定時間ブロックするローカルの疑似モデルで記事ごとの分析を実行し、
+同時リクエスト数（max_concurrent_requests）ごとのスループットを計測する（APIキー・通信不要）
+
+使い方:
+    python scripts/benchmark_gemini_concurrency.py
+    python scripts/benchmark_gemini_concurrency.py --articles 60 --latency 0.5 --concurrency 1 2 4 8 16
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from typing import Dict, List
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_analyzer import GeminiNewsAnalyzer
+
+SAMPLE_BODY = ('London Metal Exchange copper prices rose as mining supply fell, '
+               'China demand recovered and LME inventory declined.')
+
+
+class LatencyFakeModel:
+    """実際のクライアントと同じく応答まで呼び出し元スレッドをブロックする疑似モデル"""
+
+    model_name = "fake-gemini"
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency_seconds)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        text = json.dumps({
+            "summary": "供給懸念で銅価格が上昇。",
+            "sentiment": "ポジティブ",
+            "sentiment_reason": "供給不足",
+            "keywords": ["copper", "LME"],
+            "importance_score": 7,
+            "importance_reason": "主要金属の価格に影響"
+        }, ensure_ascii=False)
+        return type("FakeResponse", (), {"text": text})()
+
+
+def build_news(count: int) -> List[Dict]:
+    """分析対象の記事を生成"""
+    return [
+        {'news_id': f"bench_{i:05d}", 'title': f"LME copper prices surge #{i}", 'body': SAMPLE_BODY}
+        for i in range(count)
+    ]
+
+
+def measure_throughput(concurrency: int, articles: int, latency_seconds: float,
+                       request_timeout: float = 30.0) -> Dict:
+    """
+    指定した同時リクエスト数で記事ごとの分析を実行
+
+    Returns:
+        Dict: concurrency, articles, analyzed, elapsed_seconds, articles_per_second, max_in_flight
+    """
+    analyzer = GeminiNewsAnalyzer({"gemini_integration": {
+        "enable_ai_analysis": True,
+        "summary_generation": True,
+        "sentiment_analysis": True,
+        "keyword_extraction": True,
+        "importance_scoring": True,
+        "rate_limit_delay": 0,
+        "max_requests_per_minute": 100000,
+        "max_requests_per_day": 1000000,
+        "max_concurrent_requests": concurrency,
+        "request_timeout_seconds": request_timeout,
+        # 記事ごとに1リクエスト（並行実行の効果のみを計測）
+        "cost_optimization": {"batch_size": articles}
+    }})
+    model = LatencyFakeModel(latency_seconds)
+    analyzer.model = model
+
+    started = time.perf_counter()
+    results = asyncio.run(analyzer.analyze_news_batch(build_news(articles)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'concurrency': concurrency,
+        'articles': articles,
+        'analyzed': len(results),
+        'elapsed_seconds': round(elapsed, 3),
+        'articles_per_second': round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        'max_in_flight': model.max_in_flight
+    }
+
+
+def run_benchmark(concurrency_levels: List[int], articles: int, latency_seconds: float) -> List[Dict]:
+    """同時リクエスト数ごとにスループットを計測"""
+    return [measure_throughput(concurrency, articles, latency_seconds) for concurrency in concurrency_levels]
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='Gemini分析の同時実行ベンチマーク（疑似モデル使用）')
+    parser.add_argument('--articles', type=int, default=32, help='分析する記事数')
+    parser.add_argument('--latency', type=float, default=0.5, help='疑似モデルの応答時間（秒）')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8], help='計測する同時リクエスト数')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.concurrency, args.articles, args.latency)
+
+    print("=" * 70)
+    print(f"Gemini分析スループット（{args.articles}記事、応答時間{args.latency}秒）")
+    print("=" * 70)
+    baseline = results[0]['articles_per_second'] or 1
+    for result in results:
+        print(f"同時{result['concurrency']:>3}件: {result['elapsed_seconds']:>7.2f}秒  "
+              f"{result['articles_per_second']:>7.2f}記事/秒  "
+              f"x{result['articles_per_second'] / baseline:.1f}  最大同時実行{result['max_in_flight']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+一覧表示のペイロードサイズ・レイテンシ計測スクリプト
+全カラム取得（変更前）と一覧表示用カラム取得（変更後）を比較
+
+使い方:
+    # 合成データのSQLiteで計測（本文・要約・翻訳を実際の記事程度の長さに揃える）
+    python scripts/benchmark_list_payload.py --rows 20000 --body-chars 3000
+
+    # 既存のデータベースで計測
+    python scripts/benchmark_list_payload.py --config config_spec.json
+"""
+
+import json
+import time
+import statistics
+import argparse
+import tempfile
+import sys
+import os
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from models_spec import NewsSearchFilter
+from benchmark_query_plans import create_synthetic_database
+
+
+def measure_page(db_manager: SpecDatabaseManager, page: int, per_page: int, full_columns: bool) -> tuple:
+    """1ページ分の取得時間（総件数込み・行のみ、ミリ秒）とJSONペイロードサイズ（バイト）を計測"""
+    search_filter = NewsSearchFilter()
+    search_filter.limit = per_page
+    search_filter.offset = (page - 1) * per_page
+
+    # 検索結果キャッシュを使わずにデータベースからの取得を計測
+    db_manager.invalidate_result_cache()
+    start = time.perf_counter()
+    page_result = db_manager.search_news_page(search_filter, full_columns=full_columns)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # 総件数の集計を除いた行の取得のみ
+    db_manager.invalidate_result_cache()
+    start = time.perf_counter()
+    db_manager.search_news(search_filter, full_columns=full_columns)
+    rows_ms = (time.perf_counter() - start) * 1000
+
+    # eelと同様にJSONへシリアライズしたサイズを計測
+    payload = json.dumps(page_result, default=str, ensure_ascii=False)
+    return elapsed_ms, rows_ms, len(payload.encode('utf-8')), len(page_result['news'])
+
+
+def pad_article_text(db_manager: SpecDatabaseManager, body_chars: int, batch_size: int = 5000):
+    """合成記事の本文・要約・翻訳を実際の記事程度の長さに揃える（全カラム取得時のペイロード用）"""
+    summary = "LME銅相場は中国の需要回復と在庫減少を背景に上昇した。" * 5
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT news_id, body FROM news_table")
+        rows = cursor.fetchall()
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(
+                "UPDATE news_table SET body = ?, summary = ?, translation = ? WHERE news_id = ?",
+                [((body * (body_chars // len(body) + 1))[:body_chars], summary,
+                  ("翻訳: " + body * (body_chars // len(body) + 1))[:body_chars // 2], news_id)
+                 for news_id, body in rows[start:start + batch_size]]
+            )
+        db_manager._mark_data_changed(conn)
+
+
+def run_benchmark(db_manager: SpecDatabaseManager, pages: int, per_page: int, repeat: int) -> dict:
+    """全カラム・一覧カラムそれぞれでページ取得を繰り返し計測"""
+    results = {}
+
+    for label, full_columns in (('全カラム（変更前）', True), ('一覧カラム（変更後）', False)):
+        latencies = []
+        row_latencies = []
+        payload_sizes = []
+
+        for _ in range(repeat):
+            for page in range(1, pages + 1):
+                elapsed_ms, rows_ms, payload_bytes, row_count = measure_page(db_manager, page, per_page, full_columns)
+                if row_count == 0:
+                    break
+                latencies.append(elapsed_ms)
+                row_latencies.append(rows_ms)
+                payload_sizes.append(payload_bytes)
+
+        results[label] = {
+            'samples': len(latencies),
+            'latency_median_ms': statistics.median(latencies) if latencies else 0,
+            'latency_p95_ms': sorted(latencies)[int(len(latencies) * 0.95) - 1] if latencies else 0,
+            'rows_median_ms': statistics.median(row_latencies) if row_latencies else 0,
+            'payload_avg_kb': (sum(payload_sizes) / len(payload_sizes) / 1024) if payload_sizes else 0
+        }
+
+    return results
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='一覧表示のペイロードサイズ・レイテンシ計測')
+    parser.add_argument('--config', help='既存データベースの設定ファイル（省略時は合成データのSQLite）')
+    parser.add_argument('--rows', type=int, default=20000, help='合成データの件数')
+    parser.add_argument('--body-chars', type=int, default=3000, help='合成データの本文の文字数')
+    parser.add_argument('--pages', type=int, default=5, help='計測ページ数')
+    parser.add_argument('--per-page', type=int, default=50, help='1ページあたりの件数')
+    parser.add_argument('--repeat', type=int, default=3, help='繰り返し回数')
+    args = parser.parse_args()
+
+    try:
+        if args.config:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                db_manager = SpecDatabaseManager(json.load(f))
+        else:
+            db_path = os.path.join(tempfile.mkdtemp(prefix="lme_payload_bench_"), "bench.db")
+            db_manager = create_synthetic_database(db_path, args.rows)
+            pad_article_text(db_manager, args.body_chars)
+            db_manager.update_statistics()
+
+        results = run_benchmark(db_manager, args.pages, args.per_page, args.repeat)
+
+        print("=" * 70)
+        print(f"一覧ページ計測結果（{args.per_page}件/ページ, {args.pages}ページ x {args.repeat}回, {db_manager.db_type}）")
+        print("=" * 70)
+        print(f"{'取得方式':<20}{'計測数':>8}{'中央値(ms)':>14}{'p95(ms)':>12}{'行のみ(ms)':>14}{'平均サイズ(KB)':>16}")
+        for label, stats in results.items():
+            print(f"{label:<20}{stats['samples']:>8}{stats['latency_median_ms']:>14.1f}"
+                  f"{stats['latency_p95_ms']:>12.1f}{stats['rows_median_ms']:>14.1f}{stats['payload_avg_kb']:>16.1f}")
+
+    except Exception as e:
+        print(f"計測エラー: {e}")
+
+
+if __name__ == "__main__":
+    main()
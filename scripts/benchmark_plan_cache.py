@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+SQL Serverのプランキャッシュ再利用率の計測スクリプト
+ランダムなキーワード・フィルターで一覧検索を繰り返し、news_tableを参照する
+キャッシュ済みプランの増加数と使用回数からプランの再利用率を算出する
+"""
+
+import json
+import random
+import argparse
+import sys
+import os
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from models_spec import NewsSearchFilter
+
+KEYWORDS = ['copper', 'aluminium', 'zinc', 'nickel', 'smelter', 'inventory', 'LME', 'China demand',
+            'warehouse stocks', '銅', 'アルミ', '在庫']
+SOURCES = ['REUTERS', 'BLOOMBERG', 'FASTMARKETS', None]
+METALS = ['Copper', 'Aluminium', 'Zinc', 'Nickel', 'Lead', 'Tin']
+SORTS = ['smart', 'time_desc', 'relevance', 'rating_priority']
+
+PLAN_CACHE_SQL = """
+    SELECT COUNT(*), COALESCE(SUM(CAST(cp.usecounts AS BIGINT)), 0)
+    FROM sys.dm_exec_cached_plans cp
+    CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) st
+    WHERE st.text LIKE '%news_table%'
+      AND st.text NOT LIKE '%dm_exec_cached_plans%'
+"""
+
+
+def build_random_filter(rng: random.Random) -> NewsSearchFilter:
+    """UIからの検索を想定したランダムな検索条件"""
+    search_filter = NewsSearchFilter()
+    search_filter.limit = 50
+    search_filter.offset = rng.choice([0, 0, 50, 100])
+    search_filter.sort_by = rng.choice(SORTS)
+    if rng.random() < 0.7:
+        search_filter.keyword = rng.choice(KEYWORDS)
+    search_filter.source = rng.choice(SOURCES)
+    if rng.random() < 0.3:
+        search_filter.related_metals = [rng.choice(METALS)]
+    return search_filter
+
+
+def get_plan_cache_counts(db_manager: SpecDatabaseManager) -> tuple:
+    """news_tableを参照するキャッシュ済みプランの数と使用回数の合計"""
+    with db_manager.get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(PLAN_CACHE_SQL)
+        plans, uses = cursor.fetchone()
+        return int(plans), int(uses)
+
+
+def run_benchmark(db_manager: SpecDatabaseManager, queries: int, seed: int) -> dict:
+    """検索を繰り返し、プランキャッシュの増分から再利用率を算出"""
+    rng = random.Random(seed)
+    plans_before, uses_before = get_plan_cache_counts(db_manager)
+
+    shapes = set()
+    for _ in range(queries):
+        search_filter = build_random_filter(rng)
+        shapes.add(search_filter.query_shape(db_manager.db_type))
+        # 結果キャッシュを通さず毎回データベースへ問い合わせる
+        db_manager.invalidate_result_cache()
+        db_manager.search_news_page(search_filter)
+
+    plans_after, uses_after = get_plan_cache_counts(db_manager)
+    new_plans = plans_after - plans_before
+    executions = uses_after - uses_before
+
+    return {
+        'queries': queries,
+        'filter_shapes': len(shapes),
+        'new_plans': new_plans,
+        'plan_executions': executions,
+        # 新規コンパイル以外の実行はキャッシュ済みプランの再利用
+        'plan_reuse_rate': (1 - new_plans / executions) if executions > 0 else 0.0,
+        'template_stats': db_manager.get_cache_stats()['query_templates']
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='SQL Serverのプランキャッシュ再利用率の計測')
+    parser.add_argument('--config', default='config_spec.json', help='設定ファイルパス')
+    parser.add_argument('--queries', type=int, default=500, help='検索回数')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    parser.add_argument('--free-proc-cache', action='store_true',
+                        help='計測前にDBCC FREEPROCCACHEでプランキャッシュを消去（要権限、検証環境のみ）')
+    args = parser.parse_args()
+
+    try:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        db_manager = SpecDatabaseManager(config)
+        if db_manager.db_type != "sqlserver":
+            print(f"このスクリプトはSQL Server専用です（現在: {db_manager.db_type}）")
+            return
+
+        if args.free_proc_cache:
+            with db_manager.get_connection() as conn:
+                conn.cursor().execute("DBCC FREEPROCCACHE")
+
+        results = run_benchmark(db_manager, args.queries, args.seed)
+
+        print("=" * 60)
+        print(f"プランキャッシュ計測結果（{results['queries']}回検索）")
+        print("=" * 60)
+        print(f"検索条件の形の種類:     {results['filter_shapes']}")
+        print(f"新規キャッシュプラン数: {results['new_plans']}")
+        print(f"プラン実行回数:         {results['plan_executions']}")
+        print(f"プラン再利用率:         {results['plan_reuse_rate']:.1%}")
+        print(f"SQLテンプレート:        {results['template_stats']}")
+
+    except Exception as e:
+        print(f"計測エラー: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+一覧クエリのクエリプラン回帰ベンチマーク
+実際の一覧検索（NewsSearchFilterの各ソート × よく使う絞り込み条件）を大量データに対して実行し、
+EXPLAINのプランとレイテンシを記録する。ベースラインと比較して、ソート・全件走査への退行や
+レイテンシの悪化があれば終了コード1で失敗する
+
+使い方:
+    # 100万件の合成データ（SQLite）で計測し、ベースラインを保存
+    python scripts/benchmark_query_plans.py --rows 1000000 --db-path bench.db --save-baseline plan_baseline.json
+
+    # 同じデータで再計測してベースラインと比較（インデックス・SQL変更後の回帰確認）
+    python scripts/benchmark_query_plans.py --db-path bench.db --baseline plan_baseline.json
+
+    # 既存のデータベース（PostgreSQL / SQL Server）で計測
+    python scripts/benchmark_query_plans.py --config config_spec.json --baseline plan_baseline_pg.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from models_spec import NewsSearchFilter, compute_dedup_key, extract_related_metals
+
+# 計測する絞り込み条件（UIの一覧・検索でよく使う条件）
+WORKLOAD_FILTERS = {
+    'all': {},
+    'unread': {'is_read': False},
+    'source': {'source': 'REUTERS', 'source_exact': True},
+    'last_7_days': {'start_days': 7},
+    'manual': {'is_manual': True},
+    'metal': {'related_metals': ['Copper']},
+    'rating': {'rating': 3},
+    'keyword': {'keyword': 'smelter'},
+}
+# 関連性ソートはキーワード検索時のみ（キーワードなしはスマートソートと同じ）
+WORKLOAD_SORTS = ['smart', 'rating_priority', 'time_desc', 'time_asc', 'rating_desc', 'rating_asc']
+
+SYNTHETIC_SOURCES = ['REUTERS', 'BLOOMBERG', 'FASTMARKETS', 'METAL BULLETIN', 'MINING.COM',
+                     'ARGUS', 'PLATTS', 'NIKKEI', '手動登録']
+SYNTHETIC_TOPICS = [
+    ('Copper prices rise on Chinese demand', 'LME copper rose as Chinese smelter output slowed and inventory fell.'),
+    ('Aluminium stocks fall at LME warehouses', 'Aluminium inventory in LME warehouses dropped for a third week.'),
+    ('Zinc market tightens after smelter shutdown', 'A zinc smelter shutdown in Europe tightened the refined market.'),
+    ('Nickel slides as Indonesian supply grows', 'Nickel prices fell on rising Indonesian supply and weak demand.'),
+    ('Lead demand steady from battery makers', 'Battery makers kept lead purchases steady despite weak car sales.'),
+    ('Tin jumps on Myanmar mining halt', 'Tin prices jumped after authorities halted mining in Wa State.'),
+    ('銅価格が上昇、中国の需要回復で', 'LME銅相場は中国の需要回復を背景に上昇した。在庫は減少傾向。'),
+    ('アルミ在庫が減少', 'LME倉庫のアルミニウム在庫が3週連続で減少した。'),
+]
+
+# プランの退行とみなす特徴（ベースラインになかったものが現れたら失敗）
+PLAN_REGRESSION_FEATURES = ('sort', 'full_scan')
+
+
+def generate_synthetic_rows(start: int, count: int, rng: random.Random, now: datetime, days: int) -> List[tuple]:
+    """
+    合成記事の行を生成（seed_articlesと同じカラム順 + 既読状態・重要度）
+    約2%は同じ記事の再配信（重複除去の対象）、レーティング付きは約1割、既読は約6割
+    """
+    rows = []
+    for i in range(start, start + count):
+        title, body = SYNTHETIC_TOPICS[i % len(SYNTHETIC_TOPICS)]
+        source = SYNTHETIC_SOURCES[rng.randrange(len(SYNTHETIC_SOURCES))]
+        # 再配信は直前の記事と同じタイトル・ソース
+        number = i - 1 if i > 0 and rng.random() < 0.02 else i
+        title = f"{title} #{number}"
+        publish_time = now - timedelta(seconds=rng.randint(0, days * 86400))
+        is_manual = source == '手動登録'
+        is_read = rng.random() < 0.6
+        body_text = f"{body} " * rng.randint(1, 8)
+        rows.append((
+            f"{'manual' if is_manual else 'bench'}_{i:08d}", title, body_text, publish_time,
+            publish_time + timedelta(minutes=5), source, None, None, None, None,
+            extract_related_metals(title, body), None, 1 if is_manual else 0,
+            rng.choice([1, 2, 3]) if rng.random() < 0.1 else None,
+            compute_dedup_key(title, source), 1 if is_read else 0,
+            publish_time + timedelta(hours=1) if is_read else None,
+            rng.randint(1, 10) if rng.random() < 0.3 else None
+        ))
+    return rows
+
+
+def create_synthetic_database(db_path: str, rows: int, seed: int = 42, days: int = 3 * 365,
+                              chunk_size: int = 50000) -> SpecDatabaseManager:
+    """合成データのSQLiteデータベースを作成（一定件数ずつ投入するためメモリ使用量は一定）"""
+    config = {
+        "database": {"database_type": "sqlite", "sqlite_path": db_path},
+        "news_collection": {"filter_url_only_news": True, "min_body_length": 50},
+        "ui_settings": {}
+    }
+    db_manager = SpecDatabaseManager(config)
+    assert db_manager.create_tables(), "テーブル作成に失敗しました"
+
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    started = time.monotonic()
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, rows, chunk_size):
+            cursor.executemany("""
+                INSERT INTO news_table (
+                    news_id, title, body, publish_time, acquire_time,
+                    source, url, sentiment, summary, keywords,
+                    related_metals, translation, is_manual, rating, dedup_key,
+                    is_read, read_at, importance_score
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, generate_synthetic_rows(start, min(chunk_size, rows - start), rng, now, days))
+            print(f"\r合成データ投入: {min(start + chunk_size, rows):,} / {rows:,} 件", end='', flush=True)
+        db_manager._refresh_all_canonical_flags(cursor)
+        db_manager.rebuild_aggregates(cursor)
+    print(f"（{time.monotonic() - started:.0f}秒）")
+
+    # 本番と同じく統計情報を収集してからプランを確認
+    db_manager.update_statistics()
+    return db_manager
+
+
+def build_workload(now: Optional[datetime] = None) -> Dict[str, NewsSearchFilter]:
+    """計測する検索条件（ソート × 絞り込み条件、先頭ページ50件）"""
+    now = now or datetime.now()
+    workload = {}
+    for filter_name, conditions in WORKLOAD_FILTERS.items():
+        sorts = WORKLOAD_SORTS + (['relevance'] if conditions.get('keyword') else [])
+        for sort_by in sorts:
+            search_filter = NewsSearchFilter()
+            search_filter.limit = 50
+            search_filter.sort_by = sort_by
+            for key, value in conditions.items():
+                if key == 'start_days':
+                    search_filter.start_date = now - timedelta(days=value)
+                else:
+                    setattr(search_filter, key, value)
+            workload[f"{filter_name}/{sort_by}"] = search_filter
+    return workload
+
+
+def explain_plan(db_manager: SpecDatabaseManager, search_filter: NewsSearchFilter) -> List[str]:
+    """一覧クエリ（先頭ページ取得）のプランを取得"""
+    sql = db_manager._get_list_sql(search_filter, with_total=False, full_columns=False)
+    params = search_filter.to_sql_where_clause(db_manager.db_type)[1]
+    params.extend(search_filter.to_sql_order_params(db_manager.db_type))
+
+    with db_manager.get_read_connection() as conn:
+        cursor = conn.cursor()
+        if db_manager.db_type == "postgresql":
+            cursor.execute("EXPLAIN " + sql, params + [search_filter.limit, search_filter.offset])
+            return [row[0] for row in cursor.fetchall()]
+        elif db_manager.db_type == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params + [search_filter.limit, search_filter.offset])
+            return [row[3] for row in cursor.fetchall()]
+        else:
+            # SHOWPLAN_TEXTは実行せずに推定プランのみを返す
+            cursor.execute("SET SHOWPLAN_TEXT ON")
+            try:
+                cursor.execute(sql, params + [search_filter.offset, search_filter.limit])
+                lines = []
+                while True:
+                    lines.extend(row[0] for row in cursor.fetchall())
+                    if not cursor.nextset():
+                        break
+                return lines
+            finally:
+                cursor.execute("SET SHOWPLAN_TEXT OFF")
+
+
+def summarize_plan(db_type: str, plan: List[str]) -> Dict:
+    """プランからソートの有無・news_tableの全件走査の有無・使用インデックスを抽出"""
+    text = "\n".join(plan)
+    indexes = set()
+    if db_type == "postgresql":
+        sort = any(line.strip().lstrip('->').strip().startswith(('Sort', 'Incremental Sort')) for line in plan)
+        full_scan = 'Seq Scan on news_table' in text
+        for line in plan:
+            if ' using ' in line:
+                indexes.add(line.split(' using ')[1].split()[0])
+    elif db_type == "sqlite":
+        # 「RIGHT PART OF ORDER BY」はインデックス順の同値内の並べ替えのみのため対象外
+        sort = 'USE TEMP B-TREE FOR ORDER BY' in text
+        full_scan = any(line.startswith('SCAN news_table') and 'INDEX' not in line for line in plan)
+        for line in plan:
+            if 'news_table USING' in line and ' INDEX ' in line:
+                indexes.add(line.split(' INDEX ')[1].split()[0])
+    else:
+        sort = '|--Sort(' in text or '|--Top N Sort(' in text
+        full_scan = 'Table Scan(OBJECT:([' in text or ('Clustered Index Scan(' in text and 'news_table' in text)
+        for line in plan:
+            if 'Index Seek(' in line or 'Index Scan(' in line:
+                name = line.split('.[', 3)[-1].split(']')[0] if '.[' in line else ''
+                if name.startswith('idx_'):
+                    indexes.add(name)
+    return {'sort': sort, 'full_scan': full_scan, 'indexes': sorted(indexes)}
+
+
+def measure_latency(db_manager: SpecDatabaseManager, search_filter: NewsSearchFilter, repeat: int) -> Dict:
+    """
+    結果キャッシュを通さずに一覧ページ取得を繰り返し、中央値と最大値（ミリ秒）を計測
+    総件数の集計（COUNT(*) OVER()）は条件に一致する全行を数えるためプランによらず一定で、
+    EXPLAINと同じ先頭ページのクエリのみを計測する
+    """
+    latencies = []
+    for _ in range(repeat):
+        db_manager.invalidate_result_cache()
+        started = time.perf_counter()
+        db_manager.search_news(search_filter)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(latencies), 2), 'max_ms': round(max(latencies), 2)}
+
+
+def run_benchmark(db_manager: SpecDatabaseManager, repeat: int = 5) -> Dict:
+    """ワークロード全体のプランとレイテンシを計測"""
+    cases = {}
+    for name, search_filter in build_workload().items():
+        plan = explain_plan(db_manager, search_filter)
+        cases[name] = {
+            **summarize_plan(db_manager.db_type, plan),
+            **measure_latency(db_manager, search_filter, repeat),
+            'plan': plan
+        }
+    return {
+        'db_type': db_manager.db_type,
+        'rows': db_manager.get_news_count(),
+        'measured_at': datetime.now().isoformat(timespec='seconds'),
+        'cases': cases
+    }
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, tolerance: float = 0.5,
+                          min_delta_ms: float = 5.0) -> List[str]:
+    """
+    ベースラインとの比較
+
+    Args:
+        tolerance: 許容するレイテンシの増加率（0.5 = 1.5倍まで）
+        min_delta_ms: これ未満の増加は計測誤差として無視
+
+    Returns:
+        退行の説明のリスト（空なら退行なし）
+    """
+    regressions = []
+    for name, base in baseline.get('cases', {}).items():
+        current = results['cases'].get(name)
+        if current is None:
+            continue
+        for feature in PLAN_REGRESSION_FEATURES:
+            if current[feature] and not base[feature]:
+                regressions.append(f"{name}: プランに{feature}が発生（インデックス: {current['indexes']}）")
+        limit_ms = max(base['median_ms'] * (1 + tolerance), base['median_ms'] + min_delta_ms)
+        if current['median_ms'] > limit_ms:
+            regressions.append(f"{name}: {base['median_ms']:.1f}ms → {current['median_ms']:.1f}ms")
+    return regressions
+
+
+def print_results(results: Dict):
+    print("=" * 90)
+    print(f"クエリプラン・レイテンシ（{results['db_type']}、{results['rows']:,}件）")
+    print("=" * 90)
+    for name, case in results['cases'].items():
+        flags = ",".join(feature for feature in PLAN_REGRESSION_FEATURES if case[feature]) or "-"
+        indexes = ",".join(case['indexes']) or "-"
+        print(f"{name:<28} {case['median_ms']:>9.1f}ms  {flags:<15} {indexes}")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='一覧クエリのクエリプラン回帰ベンチマーク')
+    parser.add_argument('--config', help='既存データベースの設定ファイル（省略時は合成データのSQLite）')
+    parser.add_argument('--db-path', help='合成データのSQLiteファイル（存在すれば再利用）')
+    parser.add_argument('--rows', type=int, default=1000000, help='合成データの件数')
+    parser.add_argument('--seed', type=int, default=42, help='合成データの乱数シード')
+    parser.add_argument('--repeat', type=int, default=5, help='各検索の計測回数')
+    parser.add_argument('--baseline', help='比較するベースライン（JSON）')
+    parser.add_argument('--save-baseline', help='計測結果をベースラインとして保存')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='許容するレイテンシの増加率')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='計測誤差として無視する増加量（ミリ秒）')
+    args = parser.parse_args()
+
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            db_manager = SpecDatabaseManager(json.load(f))
+        # 既存データベースにも現在のスキーマのインデックスを作成
+        db_manager.create_tables()
+    elif args.db_path and os.path.exists(args.db_path):
+        db_manager = SpecDatabaseManager({
+            "database": {"database_type": "sqlite", "sqlite_path": args.db_path},
+            "news_collection": {"filter_url_only_news": True, "min_body_length": 50},
+            "ui_settings": {}
+        })
+        db_manager.create_tables()
+        db_manager.update_statistics()
+    else:
+        db_path = args.db_path or os.path.join(tempfile.mkdtemp(prefix="lme_plan_bench_"), "bench.db")
+        db_manager = create_synthetic_database(db_path, args.rows, args.seed)
+
+    results = run_benchmark(db_manager, args.repeat)
+    print_results(results)
+    db_manager.close()
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"ベースラインを保存しました: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"✗ {len(regressions)}件の退行:")
+            for message in regressions:
+                print(f"  {message}")
+            return False
+        print("✓ ベースラインからの退行なし")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
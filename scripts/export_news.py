@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+検索結果のエクスポートスクリプト
+検索条件に一致する記事をCSV / NDJSON / Parquetへストリーミング出力する（数年分でもメモリ使用量は一定）
+
+使い方:
+    python scripts/export_news.py news.csv --start 2023-01-01 --end 2024-12-31
+    python scripts/export_news.py copper.ndjson.gz --keyword copper --metal Copper
+    python scripts/export_news.py all.parquet --include-archive --sort time_asc
+"""
+
+import json
+import logging
+import argparse
+import sys
+import os
+from datetime import datetime
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from models_spec import NewsSearchFilter, SORT_OPTIONS
+from news_exporter import NewsExporter, EXPORT_FORMATS
+
+
+def load_config(config_path: str):
+    """設定ファイル読み込み"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"設定ファイルが見つかりません: {config_path}")
+
+
+def build_filter(args) -> NewsSearchFilter:
+    """コマンドライン引数から検索条件を作成"""
+    search_filter = NewsSearchFilter()
+    search_filter.include_archive = args.include_archive
+    search_filter.sort_by = args.sort
+    if args.start:
+        search_filter.start_date = datetime.fromisoformat(args.start)
+    if args.end:
+        search_filter.end_date = datetime.fromisoformat(args.end + 'T23:59:59')
+    if args.keyword:
+        search_filter.keyword = args.keyword
+    if args.source:
+        search_filter.source = args.source
+    if args.metal:
+        search_filter.related_metals = [args.metal]
+    if args.rating:
+        search_filter.rating = args.rating
+    if args.manual is not None:
+        search_filter.is_manual = args.manual == 'true'
+    return search_filter
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='検索結果のエクスポート')
+    parser.add_argument('output', help='出力ファイルパス（拡張子 .csv / .ndjson / .parquet で形式を判定、.gz で圧縮）')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help='出力形式（既定は拡張子から判定）')
+    parser.add_argument('--config', default='config_spec.json', help='設定ファイルパス')
+    parser.add_argument('--start', help='開始日（YYYY-MM-DD）')
+    parser.add_argument('--end', help='終了日（YYYY-MM-DD、当日を含む）')
+    parser.add_argument('--keyword', help='キーワード')
+    parser.add_argument('--source', help='ソース')
+    parser.add_argument('--metal', help='関連金属')
+    parser.add_argument('--rating', type=int, choices=[1, 2, 3], help='レーティング')
+    parser.add_argument('--manual', choices=['true', 'false'], help='手動登録のみ / 自動収集のみ')
+    parser.add_argument('--sort', choices=SORT_OPTIONS, default='time_desc', help='並び順')
+    parser.add_argument('--include-archive', action='store_true', help='パーティションのアーカイブ層も対象にする')
+    parser.add_argument('--batch-size', type=int, help='1回の取得件数（既定はexport.export_batch_size）')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+    try:
+        config = load_config(args.config)
+        db_manager = SpecDatabaseManager(config)
+        if not db_manager.test_connection():
+            logger.error("データベース接続失敗")
+            return False
+        # アーカイブ層（パーティション）の境界を反映
+        db_manager.partition_manager.refresh_archive_boundary()
+
+        exporter = NewsExporter(db_manager, config)
+        if args.batch_size:
+            exporter.batch_size = args.batch_size
+
+        def show_progress(exported: int, total: int):
+            percent = exported * 100 // total if total else 100
+            print(f"\r{exported:,} / {total:,} 件 ({percent}%)", end='', flush=True)
+
+        result = exporter.export(build_filter(args), args.output, args.format, progress_callback=show_progress)
+        print()
+        print(f"エクスポート完了: {result['path']} ({result['rows']:,}件, "
+              f"{result['bytes'] / 1024 / 1024:.1f}MB, {result['elapsed_seconds']:.1f}秒)")
+        db_manager.close()
+        return True
+
+    except Exception as e:
+        logger.error(f"エクスポートエラー: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
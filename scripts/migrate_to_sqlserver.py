@@ -1,29 +1,45 @@
 #!/usr/bin/env python3
 """
-PostgreSQLからSQL Serverへのデータ移行スクリプト
+データベース間のデータ移行・同期スクリプト（既定はPostgreSQL → SQL Server）
+移行元・移行先はconfig_spec.jsonのmigration設定（source_database / target_database と
+接続情報の上書き source / target）で指定する
+
+使い方:
+    python scripts/migrate_to_sqlserver.py migrate          # 全件移行（中断しても続きから再開）
+    python scripts/migrate_to_sqlserver.py sync             # 差分同期を継続実行
+    python scripts/migrate_to_sqlserver.py sync --once      # 差分同期を1回実行
+    python scripts/migrate_to_sqlserver.py verify           # 件数・チェックサムで検証
 """
 
 import json
 import logging
+import argparse
 import sys
+import os
 from datetime import datetime
-from typing import Dict, Any
 
-from database import DatabaseManager
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from db_sync import NewsDatabaseSync, build_side_config
+
 
 def setup_logging():
     """ログ設定"""
+    os.makedirs('logs', exist_ok=True)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler(f'migration_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', encoding='utf-8')
+            logging.FileHandler(f'logs/migration_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', encoding='utf-8')
         ]
     )
     return logging.getLogger(__name__)
 
-def load_config(config_path: str = "../config.json"):
+
+def load_config(config_path: str):
     """設定ファイル読み込み"""
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -31,127 +47,81 @@ def load_config(config_path: str = "../config.json"):
     except FileNotFoundError:
         raise FileNotFoundError(f"設定ファイルが見つかりません: {config_path}")
 
-def create_sqlserver_config(base_config: Dict[str, Any]) -> Dict[str, Any]:
-    """SQL Server用設定作成"""
-    sqlserver_config = base_config["database"].copy()
-    sqlserver_config["database_type"] = "sqlserver"
-    
-    # SQL Server接続情報を設定（ユーザー入力）
-    print("SQL Server接続情報を入力してください:")
-    sqlserver_config["server"] = input("サーバー名 (例: localhost): ").strip() or "localhost"
-    sqlserver_config["database"] = input("データベース名: ").strip()
-    sqlserver_config["user"] = input("ユーザー名: ").strip()
-    sqlserver_config["password"] = input("パスワード: ").strip()
-    
-    return sqlserver_config
-
-def migrate_data(source_db: DatabaseManager, target_db: DatabaseManager, logger: logging.Logger) -> bool:
-    """データ移行実行"""
-    try:
-        # ニュースデータ移行
-        logger.info("ニュースデータ移行開始...")
-        
-        # PostgreSQLからデータ取得
-        news_data = source_db.get_recent_news(days=365, limit=10000)  # 1年分
-        logger.info(f"移行対象ニュース: {len(news_data)} 件")
-        
-        # SQL Serverに挿入
-        migrated_count = 0
-        for news in news_data:
-            # データ変換
-            from models import NewsItem
-            import json
-            
-            news_item = NewsItem(
-                story_id=news['story_id'],
-                headline=news['headline'],
-                source=news['source'],
-                published_date=news['published_date'],
-                body=news.get('body'),
-                priority_score=news['priority_score'],
-                metal_category=news.get('metal_category'),
-                keywords=json.loads(news.get('keywords', '[]')) if news.get('keywords') else None,
-                query_type=news.get('query_type'),
-                created_at=news.get('created_at'),
-                updated_at=news.get('updated_at')
-            )
-            
-            if target_db.insert_news_item(news_item):
-                migrated_count += 1
-        
-        logger.info(f"ニュースデータ移行完了: {migrated_count}/{len(news_data)} 件")
-        
-        # 統計データ移行
-        logger.info("統計データ移行開始...")
-        stats_data = source_db.get_stats_summary(days=365)
-        logger.info(f"統計データ移行完了")
-        
-        return True
-        
-    except Exception as e:
-        logger.error(f"データ移行エラー: {e}")
-        return False
+
+def create_sync(config: dict, state_file: str = None, batch_size: int = None) -> NewsDatabaseSync:
+    """migration設定から移行元・移行先のデータベースマネージャーと同期処理を作成"""
+    migration_config = config.setdefault("migration", {})
+    if batch_size:
+        migration_config["migration_batch_size"] = batch_size
+
+    source_config = build_side_config(config, migration_config.get("source_database", "postgresql"),
+                                      migration_config.get("source"))
+    target_config = build_side_config(config, migration_config.get("target_database", "sqlserver"),
+                                      migration_config.get("target"))
+
+    source_db = SpecDatabaseManager(source_config)
+    target_db = SpecDatabaseManager(target_config)
+    return NewsDatabaseSync(source_db, target_db, config, state_file)
+
 
 def main():
     """メイン処理"""
+    parser = argparse.ArgumentParser(description='データベース間のデータ移行・同期')
+    parser.add_argument('command', choices=['migrate', 'sync', 'verify'], help='実行する処理')
+    parser.add_argument('--config', default='config_spec.json', help='設定ファイルパス')
+    parser.add_argument('--state-file', help='状態ファイルパス（既定はmigration.state_file）')
+    parser.add_argument('--batch-size', type=int, help='バッチサイズ（既定はmigration.migration_batch_size）')
+    parser.add_argument('--reset', action='store_true', help='ウォーターマークを初期化して最初から移行')
+    parser.add_argument('--once', action='store_true', help='差分同期を1回だけ実行')
+    parser.add_argument('--interval', type=float, help='差分同期の間隔秒数（既定はmigration.sync_interval_seconds）')
+    args = parser.parse_args()
+
     logger = setup_logging()
-    logger.info("PostgreSQL → SQL Server データ移行開始")
-    
+
     try:
-        # 設定読み込み
-        config = load_config()
-        
-        # PostgreSQL接続設定
-        pg_config = config["database"]
-        pg_config["database_type"] = "postgresql"
-        
-        # SQL Server接続設定作成
-        sqlserver_config = create_sqlserver_config(config)
-        
-        # データベースマネージャー初期化
-        logger.info("PostgreSQL接続確認...")
-        source_db = DatabaseManager(pg_config)
-        if not source_db.test_connection():
-            logger.error("PostgreSQL接続失敗")
-            return False
-        
-        logger.info("SQL Server接続確認...")
-        target_db = DatabaseManager(sqlserver_config)
-        if not target_db.test_connection():
-            logger.error("SQL Server接続失敗")
-            return False
-        
-        # SQL Serverにテーブル作成
-        logger.info("SQL Serverテーブル作成...")
-        if not target_db.create_tables():
-            logger.error("SQL Serverテーブル作成失敗")
-            return False
-        
-        # データ移行実行
-        if migrate_data(source_db, target_db, logger):
-            logger.info("データ移行完了!")
-            
-            print("\n" + "="*60)
-            print("🎉 SQL Server移行完了!")
-            print("="*60)
-            print("移行先:")
-            print(f"サーバー: {sqlserver_config['server']}")
-            print(f"データベース: {sqlserver_config['database']}")
-            print("\n次のステップ:")
-            print("1. config.json のdatabase_typeを'sqlserver'に変更")
-            print("2. SQL Server接続情報を設定")
-            print("3. 動作確認")
-            print("="*60)
-            
+        config = load_config(args.config)
+        sync = create_sync(config, args.state_file, args.batch_size)
+        logger.info(f"移行元: {sync.source_db.db_type} → 移行先: {sync.target_db.db_type}")
+
+        for label, db_manager in (('移行元', sync.source_db), ('移行先', sync.target_db)):
+            if not db_manager.test_connection():
+                logger.error(f"{label}データベース接続失敗")
+                return False
+
+        if args.reset:
+            sync.reset_state()
+
+        if args.command == 'migrate':
+            result = sync.migrate()
+            verification = sync.verify()
+            print("\n" + "=" * 60)
+            print(f"移行完了: 今回 {result['copied_rows']} 件 / 累計 {result['total_rows']} 件 "
+                  f"({result['elapsed_seconds']:.1f}秒)")
+            print(f"件数: 移行元 {verification['source_count']} / 移行先 {verification['target_count']}")
+            print(f"チェックサム: 移行元 {verification['source_checksum']} / 移行先 {verification['target_checksum']}")
+            print("=" * 60)
+            return verification['match']
+
+        elif args.command == 'sync':
+            if args.once:
+                result = sync.sync_once()
+                logger.info(f"差分同期完了: {result}")
+            else:
+                sync.run_continuous(args.interval)
             return True
+
         else:
-            logger.error("データ移行失敗")
-            return False
-            
+            verification = sync.verify()
+            print(json.dumps(verification, ensure_ascii=False, indent=2))
+            if not verification['match']:
+                logger.warning(f"不一致の公開日: {', '.join(verification['mismatched_days'][:20])}")
+            return verification['match']
+
     except Exception as e:
         logger.error(f"移行処理エラー: {e}")
         return False
 
+
 if __name__ == "__main__":
     success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SQLiteバックエンド用の接続管理モジュール
+WALモードで書き込み接続1本（直列化）と読み取り接続プールを管理
+サーバー不要のパッシブモード・オフライン環境・テスト用
+"""
+
+import sqlite3
+import threading
+import logging
+import re
+from datetime import datetime, date
+from pathlib import Path
+from typing import List, Optional
+
+
+def _adapt_datetime(value: datetime) -> str:
+    """datetimeを比較可能なISO形式文字列で保存"""
+    return value.isoformat(" ")
+
+
+def _adapt_date(value: date) -> str:
+    """dateをISO形式文字列で保存"""
+    return value.isoformat()
+
+
+def _convert_timestamp(value: bytes) -> datetime:
+    """TIMESTAMP型カラムをdatetimeに変換"""
+    return datetime.fromisoformat(value.decode())
+
+
+def _convert_date(value: bytes) -> date:
+    """DATE型カラムをdateに変換"""
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_boolean(value: bytes) -> bool:
+    """BOOLEAN型カラムをboolに変換（PostgreSQL/SQL Serverと同じ型で返す）"""
+    return value not in (b"0", b"")
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    """REGEXP演算子の実装（URLのみ本文の除外条件で使用）"""
+    if value is None:
+        return False
+    return re.search(pattern, value) is not None
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, _adapt_date)
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("BOOLEAN", _convert_boolean)
+
+
+class SQLiteConnectionPool:
+    """SQLite接続プール（書き込みは1接続で直列化、読み取りは複数接続で並行実行）"""
+
+    def __init__(self, path: str, reader_pool_size: int = 4, timeout: float = 30):
+        """
+        初期化
+
+        Args:
+            path: データベースファイルパス
+            reader_pool_size: 保持する読み取り接続の最大数
+            timeout: ロック待ちのタイムアウト秒数
+        """
+        self.path = path
+        self.reader_pool_size = reader_pool_size
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """接続を作成してWALモード・関数を設定"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+
+        # WALモードでは読み取りが書き込みをブロックしない
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def acquire_writer(self) -> sqlite3.Connection:
+        """書き込み接続を取得（release_writerまで他スレッドの書き込みを待たせる）"""
+        self._writer_lock.acquire()
+        try:
+            if self._writer is None:
+                self._writer = self._connect()
+            return self._writer
+        except Exception:
+            self._writer_lock.release()
+            raise
+
+    def release_writer(self):
+        """書き込み接続を返却"""
+        self._writer_lock.release()
+
+    def acquire_reader(self) -> sqlite3.Connection:
+        """読み取り接続をプールから取得（空の場合は新規作成）"""
+        with self._readers_lock:
+            if self._readers:
+                return self._readers.pop()
+        return self._connect(read_only=True)
+
+    def release_reader(self, connection: sqlite3.Connection):
+        """読み取り接続をプールへ返却（上限を超える分は閉じる）"""
+        try:
+            # 読み取りスナップショットを残さない
+            connection.rollback()
+        except sqlite3.Error:
+            connection.close()
+            return
+
+        with self._readers_lock:
+            if len(self._readers) < self.reader_pool_size:
+                self._readers.append(connection)
+                return
+        connection.close()
+
+    def close_all(self):
+        """全接続を閉じる"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for connection in readers:
+            connection.close()
+
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+パフォーマンステスト用の共通フィクスチャ
+外部サービス不要のSQLiteデータベースにサンプル記事を投入して返す
+"""
+
+import os
+import sys
+import random
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_spec import SpecDatabaseManager
+from models_spec import NewsArticle, extract_related_metals
+
+SAMPLE_SOURCES = ['REUTERS', 'BLOOMBERG', 'FASTMARKETS', 'METAL BULLETIN', 'MINING.COM', '手動登録']
+SAMPLE_TOPICS = [
+    ('Copper prices rise on Chinese demand', 'LME copper rose as Chinese smelter output slowed and inventory fell.'),
+    ('Aluminium stocks fall at LME warehouses', 'Aluminium inventory in LME warehouses dropped for a third week.'),
+    ('Zinc market tightens after smelter shutdown', 'A zinc smelter shutdown in Europe tightened the refined market.'),
+    ('Nickel slides as Indonesian supply grows', 'Nickel prices fell on rising Indonesian supply and weak demand.'),
+    ('銅価格が上昇、中国の需要回復で', 'LME銅相場は中国の需要回復を背景に上昇した。在庫は減少傾向。'),
+    ('アルミ在庫が減少', 'LME倉庫のアルミニウム在庫が3週連続で減少した。'),
+]
+
+
+def build_sample_articles(count: int, seed: int = 42, days: int = 60) -> List[NewsArticle]:
+    """
+    再現可能なサンプル記事を生成
+
+    Args:
+        count: 記事数
+        seed: 乱数シード
+        days: 公開日時を分散させる日数
+    """
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    articles = []
+
+    for i in range(count):
+        title, body = SAMPLE_TOPICS[i % len(SAMPLE_TOPICS)]
+        source = SAMPLE_SOURCES[i % len(SAMPLE_SOURCES)]
+        publish_time = now - timedelta(minutes=rng.randint(0, days * 24 * 60))
+        is_manual = source == '手動登録'
+
+        article = NewsArticle(
+            news_id=f"{'manual' if is_manual else 'perf'}_{i:07d}",
+            title=f"{title} #{i}",
+            body=f"{body} " * rng.randint(1, 8),
+            publish_time=publish_time,
+            acquire_time=publish_time + timedelta(minutes=5),
+            source=source,
+            is_manual=is_manual,
+            rating=rng.choice([None, None, 1, 2, 3])
+        )
+        article.related_metals = extract_related_metals(article.title, article.body)
+        articles.append(article)
+
+    return articles
+
+
+def create_sqlite_db_manager(article_count: int = 0, db_path: Optional[str] = None,
+                             config_overrides: Optional[Dict] = None, seed: int = 42) -> SpecDatabaseManager:
+    """
+    サンプル記事を投入したSQLiteデータベースマネージャーを作成
+
+    Args:
+        article_count: 投入する記事数
+        db_path: データベースファイルパス（省略時は一時ディレクトリ）
+        config_overrides: 全体設定に上書きする項目（ui_settingsなど）
+        seed: サンプル記事の乱数シード
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="lme_news_test_"), "lme_news.db")
+
+    config = {
+        "database": {"database_type": "sqlite", "sqlite_path": db_path},
+        "news_collection": {"filter_url_only_news": True, "min_body_length": 50},
+        "ui_settings": {}
+    }
+    for key, value in (config_overrides or {}).items():
+        config.setdefault(key, {}).update(value)
+
+    db_manager = SpecDatabaseManager(config)
+    assert db_manager.create_tables(), "テーブル作成に失敗しました"
+
+    if article_count > 0:
+        seed_articles(db_manager, build_sample_articles(article_count, seed))
+
+    return db_manager
+
+
+def seed_articles(db_manager: SpecDatabaseManager, articles: List[NewsArticle]):
+    """記事を一括投入し、代表記事フラグと集計テーブルを再構築（大量投入用）"""
+    rows = [
+        (a.news_id, a.title, a.body, a.publish_time, a.acquire_time, a.source, a.url,
+         a.sentiment, a.summary, a.keywords, a.related_metals, a.translation,
+         1 if a.is_manual else 0, a.rating, a.dedup_key)
+        for a in articles
+    ]
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO news_table (
+                news_id, title, body, publish_time, acquire_time,
+                source, url, sentiment, summary, keywords,
+                related_metals, translation, is_manual, rating, dedup_key
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        db_manager._refresh_all_canonical_flags(cursor)
+        db_manager.rebuild_aggregates(cursor)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+保持期間を過ぎたニュースのアーカイブ出力・削除のテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import os
+import gzip
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+from perf_fixtures import create_sqlite_db_manager
+from archive_manager import NewsArchiveManager
+
+
+def _create_manager(db_manager, **overrides) -> NewsArchiveManager:
+    """テスト用アーカイブ管理（一時ディレクトリに出力）"""
+    backup_config = {
+        "backup_retention_days": 30,
+        "backup_directory": tempfile.mkdtemp(prefix="lme_archive_test_"),
+        "archive_chunk_rows": 150,
+        "purge_batch_size": 40,
+        "purge_batch_pause_seconds": 0
+    }
+    backup_config.update(overrides)
+    return NewsArchiveManager(db_manager, {"backup": backup_config})
+
+
+def _count_expired(db_manager, cutoff: datetime) -> int:
+    with db_manager.get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE publish_time < ?", (cutoff,))
+        return cursor.fetchone()[0]
+
+
+def test_archive_and_purge():
+    """保持期間を過ぎた記事がチャンク単位でファイルに出力され、データベースから削除される"""
+    print("=== アーカイブ出力・削除テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=1000)
+    manager = _create_manager(db_manager)
+
+    total_before = db_manager.get_news_count()
+    cutoff = datetime.now() - timedelta(days=30)
+    expired = _count_expired(db_manager, cutoff)
+    assert expired > 150, expired
+
+    # 重複グループの代表でない記事（アーカイブファイルの検索では除外）
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE news_table SET is_canonical = 0 WHERE publish_time < ? AND rowid % 4 = 0", (cutoff,))
+        duplicates = cursor.rowcount
+    assert duplicates > 0
+
+    result = manager.run()
+    assert result['archived_rows'] == expired, result
+    assert result['chunks'] == -(-expired // 150)
+    assert _count_expired(db_manager, datetime.now() - timedelta(days=30)) == 0
+    assert db_manager.get_news_count() == total_before - expired
+    assert db_manager.get_dashboard_stats(30)['total_news'] == total_before - expired
+
+    manifest = manager.load_manifest()
+    assert sum(entry['rows'] for entry in manifest['chunks']) == expired
+    assert all(entry['purged'] for entry in manifest['chunks'])
+    with gzip.open(os.path.join(manager.archive_directory, manifest['chunks'][0]['file']), 'rt', encoding='utf-8') as f:
+        first = json.loads(f.readline())
+    assert set(first) >= {'news_id', 'title', 'body', 'publish_time'}
+
+    # 2回目は対象なし・実行間隔内
+    assert manager.run()['archived_rows'] == 0
+    assert not manager.is_due()
+
+    # アーカイブファイルの検索と詳細取得
+    archived = manager.search_archived(keyword='SMELTER', end_date=cutoff)
+    assert archived and all(item['archived'] for item in archived)
+    assert all('smelter' in (item['title'] + item['snippet']).lower() for item in archived)
+    assert archived[0]['publish_time'] >= archived[-1]['publish_time']
+    assert manager.get_archived_by_id(archived[0]['news_id'])['body']
+    assert len(manager.search_archived(end_date=cutoff, limit=expired)) == expired - duplicates
+
+    db_manager.close()
+    print("✓ アーカイブ出力・削除テスト成功")
+
+
+def test_interrupted_purge_resumes():
+    """削除途中で中断しても、次回実行時に同じファイルの削除を完了し再出力しない"""
+    print("=== 削除中断からの再開テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=400)
+    manager = _create_manager(db_manager)
+    expired = _count_expired(db_manager, datetime.now() - timedelta(days=30))
+
+    original_purge = manager._purge
+
+    def failing_purge(news_ids):
+        original_purge(news_ids[:10])
+        raise RuntimeError("削除中に中断")
+
+    manager._purge = failing_purge
+    try:
+        manager.run()
+        assert False, "中断されませんでした"
+    except RuntimeError:
+        pass
+
+    manifest = manager.load_manifest()
+    assert len(manifest['chunks']) == 1 and not manifest['chunks'][0]['purged']
+
+    manager._purge = original_purge
+    manager.run()
+    manifest = manager.load_manifest()
+    assert sum(entry['rows'] for entry in manifest['chunks']) == expired
+    assert _count_expired(db_manager, datetime.now() - timedelta(days=30)) == 0
+
+    db_manager.close()
+    print("✓ 削除中断からの再開テスト成功")
+
+
+if __name__ == "__main__":
+    test_archive_and_purge()
+    test_interrupted_purge_resumes()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+変更フィード（change_seq / get_changes_since）のテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import database_spec
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import CHANGE_SEQ_LOCK_BASE, NewsArticle
+
+
+def _article(news_id: str, days_ago: int = 0) -> NewsArticle:
+    now = datetime.now().replace(microsecond=0)
+    return NewsArticle(
+        news_id=news_id, title=f'Nickel output update {news_id}', publish_time=now - timedelta(days=days_ago),
+        acquire_time=now, source='REUTERS',
+        body='Indonesian nickel pig iron output rose again as new smelters ramped up production.'
+    )
+
+
+def test_inserts_and_updates_in_change_order():
+    """遅れて届いた記事・更新された記事がカーソル以降の変更として取得される"""
+    print("=== 変更フィードテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=100)
+
+    cursor = db_manager.get_latest_change_seq()
+    assert cursor >= 100, cursor
+    assert db_manager.get_changes_since(cursor)['changes'] == []
+
+    # 公開日時の古い記事（遅延到着）と既存記事の更新
+    assert db_manager.insert_news_article(_article('late_1', days_ago=20))
+    existing_id = db_manager.get_changes_since(0, limit=1)['changes'][0]['news_id']
+    assert db_manager.update_news_rating(existing_id, 2)
+
+    feed = db_manager.get_changes_since(cursor)
+    assert [news['news_id'] for news in feed['changes']] == ['late_1', existing_id]
+    assert feed['changes'][1]['rating'] == 2
+    assert feed['next_seq'] == feed['changes'][-1]['change_seq'] > cursor
+    assert not feed['has_more']
+    assert 'body' not in feed['changes'][0]
+
+    # 次回は新しい変更のみ
+    cursor = feed['next_seq']
+    assert db_manager.get_changes_since(cursor)['changes'] == []
+
+    # 書き込みバッファ経由の更新も反映時に採番される
+    db_manager.queue_read_state('late_1', True)
+    db_manager.state_buffer.flush()
+    feed = db_manager.get_changes_since(cursor)
+    assert [news['news_id'] for news in feed['changes']] == ['late_1']
+    assert feed['changes'][0]['is_read']
+
+    db_manager.close()
+    print("✓ 変更フィードテスト成功")
+
+
+def test_paging_and_deleted_max():
+    """limitで分割取得でき、最大シーケンスの記事を削除してもシーケンスは再利用されない"""
+    print("=== 変更フィード分割取得テスト ===")
+    db_manager = create_sqlite_db_manager()
+
+    for i in range(5):
+        article = _article(f'manual_{i}')
+        article.is_manual = True
+        assert db_manager.insert_news_article(article)
+
+    seen = []
+    cursor = 0
+    while True:
+        feed = db_manager.get_changes_since(cursor, limit=2)
+        seen.extend(news['news_id'] for news in feed['changes'])
+        cursor = feed['next_seq']
+        if not feed['has_more']:
+            break
+    assert seen == [f'manual_{i}' for i in range(5)], seen
+
+    latest = db_manager.get_latest_change_seq()
+    assert latest == cursor
+    assert db_manager.delete_news_by_id('manual_4')
+    assert db_manager.insert_news_article(_article('after_delete'))
+    feed = db_manager.get_changes_since(latest)
+    assert [news['news_id'] for news in feed['changes']] == ['after_delete']
+    assert feed['next_seq'] > latest
+
+    # 重要度スコアでの絞り込み（通知用）
+    assert db_manager.update_news_analysis('manual_1', {'summary': '要約', 'importance_score': 9})
+    high = db_manager.get_changes_since(latest, min_importance_score=8)['changes']
+    assert [news['news_id'] for news in high] == ['manual_1']
+
+    db_manager.close()
+    print("✓ 変更フィード分割取得テスト成功")
+
+
+def test_filtered_feed_advances_cursor():
+    """条件に一致する変更がなくても、走査済みの位置までカーソルを進める（通知の再走査を防ぐ）"""
+    print("=== 変更フィード絞り込みカーソルテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=20)
+    cursor = db_manager.get_latest_change_seq()
+
+    for i in range(3):
+        assert db_manager.insert_news_article(_article(f'quiet_{i}'))
+    feed = db_manager.get_changes_since(cursor, limit=10, min_importance_score=8)
+    assert feed['changes'] == [] and not feed['has_more']
+    assert feed['next_seq'] == db_manager.get_latest_change_seq() > cursor
+    cursor = feed['next_seq']
+
+    # 一致する変更のみ返し、カーソルは一致しなかった後続の変更も越える
+    assert db_manager.update_news_analysis('quiet_1', {'summary': '要約', 'importance_score': 9})
+    assert db_manager.insert_news_article(_article('quiet_3'))
+    feed = db_manager.get_changes_since(cursor, limit=10, min_importance_score=8)
+    assert [news['news_id'] for news in feed['changes']] == ['quiet_1']
+    assert feed['next_seq'] == db_manager.get_latest_change_seq() > feed['changes'][0]['change_seq']
+
+    # 取得しきれない場合は最後に返した変更の位置から再開
+    for i in range(3):
+        assert db_manager.update_news_analysis(f'quiet_{i}', {'summary': '要約', 'importance_score': 8})
+    feed = db_manager.get_changes_since(cursor, limit=2, min_importance_score=8)
+    assert feed['has_more'] and feed['next_seq'] == feed['changes'][-1]['change_seq']
+    feed = db_manager.get_changes_since(feed['next_seq'], limit=2, min_importance_score=8)
+    assert [news['news_id'] for news in feed['changes']] == ['quiet_2'] and not feed['has_more']
+
+    db_manager.close()
+    print("✓ 変更フィード絞り込みカーソルテスト成功")
+
+
+class FakePostgresChangeFeed:
+    """
+    PostgreSQLの採番とロックを再現する疑似データベース
+    （採番はトリガーと同じく、トランザクションで最初の採番前に次の値をキーにした共有ロックを取得）
+    """
+
+    def __init__(self, committed_count: int):
+        self.last_value = committed_count
+        self.committed = [{'news_id': f'old_{seq}', 'change_seq': seq} for seq in range(1, committed_count + 1)]
+        self.pending = {}
+        self.locks = {}
+
+    def write(self, tx: str, news_id: str):
+        if tx not in self.locks:
+            self.locks[tx] = CHANGE_SEQ_LOCK_BASE + self.last_value + 1
+        self.last_value += 1
+        self.pending.setdefault(tx, []).append({'news_id': news_id, 'change_seq': self.last_value})
+
+    def commit(self, tx: str):
+        self.committed.extend(self.pending.pop(tx))
+        del self.locks[tx]
+
+    def cursor(self, cursor_factory=None):
+        return FakePostgresCursor(self)
+
+
+class FakePostgresCursor:
+    """変更フィードの読み取りで発行するSQLのみ解釈する疑似カーソル"""
+
+    def __init__(self, database):
+        self.database = database
+        self.result = []
+
+    def execute(self, sql, params=None):
+        if "FROM news_change_seq" in sql:
+            self.result = [(self.database.last_value,)]
+        elif "FROM pg_locks" in sql:
+            keys = [key - CHANGE_SEQ_LOCK_BASE for key in self.database.locks.values()]
+            self.result = [(min(keys) if keys else None,)]
+        else:
+            since_seq, bound_seq, limit = params
+            rows = sorted((row for row in self.database.committed if since_seq < row['change_seq'] <= bound_seq),
+                          key=lambda row: row['change_seq'])
+            self.result = rows[:limit]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+def test_postgresql_feed_waits_for_earlier_uncommitted_changes():
+    """PostgreSQL: 先に採番したトランザクションが後からコミットしても、その変更を読み飛ばさない"""
+    print("=== 変更フィード コミット順テスト ===")
+    db_manager = create_sqlite_db_manager()
+    database = FakePostgresChangeFeed(committed_count=10)
+
+    @contextmanager
+    def fake_read_connection():
+        yield database
+
+    db_manager.db_type = "postgresql"
+    db_manager.get_read_connection = fake_read_connection
+    had_dict_cursor = hasattr(database_spec, 'DictCursor')
+    if not had_dict_cursor:
+        database_spec.DictCursor = None
+    try:
+        cursor = db_manager.get_latest_change_seq()
+        assert cursor == 10
+
+        # B: 採番（seq 11）したままコミット前 / A: 後から採番（seq 12）して先にコミット
+        database.write('B', 'slow_insert')
+        database.write('A', 'fast_insert')
+        database.commit('A')
+        assert db_manager.get_latest_change_seq() == 10
+        feed = db_manager.get_changes_since(cursor)
+        assert feed['changes'] == [] and feed['next_seq'] == 10
+
+        # Bのコミット後に両方を変更順で取得
+        database.commit('B')
+        feed = db_manager.get_changes_since(feed['next_seq'])
+        assert [news['news_id'] for news in feed['changes']] == ['slow_insert', 'fast_insert']
+        assert feed['next_seq'] == 12
+    finally:
+        if not had_dict_cursor:
+            del database_spec.DictCursor
+        db_manager.db_type = "sqlite"
+        del db_manager.get_read_connection
+        db_manager.close()
+    print("✓ 変更フィード コミット順テスト成功")
+
+
+if __name__ == "__main__":
+    test_inserts_and_updates_in_change_order()
+    test_paging_and_deleted_max()
+    test_filtered_feed_advances_cursor()
+    test_postgresql_feed_waits_for_earlier_uncommitted_changes()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+データベース変更のプッシュ通知のテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from perf_fixtures import create_sqlite_db_manager
+from change_notifier import DatabaseChangeNotifier
+from database_spec import SpecDatabaseManager
+from models_spec import NewsArticle
+
+
+def test_change_reaches_listener_within_one_second():
+    """別の接続（別プロセス相当）で追加された記事が1秒以内にリスナーへ通知される"""
+    print("=== プッシュ通知テスト ===")
+    viewer_db = create_sqlite_db_manager(article_count=50)
+    # 収集側は同じデータベースファイルを別のマネージャーで更新
+    collector_db = SpecDatabaseManager(viewer_db.config)
+
+    notifier = DatabaseChangeNotifier(viewer_db, {"passive_mode": {"change_poll_interval_seconds": 0.1}})
+    received = []
+    notified = threading.Event()
+
+    def on_change(latest_seq):
+        received.append((time.monotonic(), latest_seq))
+        notified.set()
+
+    notifier.add_listener(on_change)
+    assert notifier.start()
+    start_seq = viewer_db.get_latest_change_seq()
+
+    # 変更がなければ通知されない
+    time.sleep(0.3)
+    assert not received
+
+    now = datetime.now().replace(microsecond=0)
+    committed_at = time.monotonic()
+    assert collector_db.insert_news_article(NewsArticle(
+        news_id='push_1', title='Tin prices jump on Myanmar supply halt', publish_time=now, acquire_time=now,
+        source='REUTERS', body='Tin prices jumped after authorities in Myanmar halted mining in Wa State.'
+    ))
+
+    assert notified.wait(1.0), "1秒以内に通知されませんでした"
+    delivered_at, latest_seq = received[0]
+    assert delivered_at - committed_at < 1.0
+    assert latest_seq > start_seq
+    assert [news['news_id'] for news in viewer_db.get_changes_since(start_seq)['changes']] == ['push_1']
+
+    # 更新も通知される
+    notified.clear()
+    assert collector_db.update_news_rating('push_1', 3)
+    assert notified.wait(1.0)
+    assert received[1][1] > latest_seq
+
+    notifier.stop()
+    assert notifier.get_stats()['changes'] == 2
+    collector_db.close()
+    viewer_db.close()
+    print("✓ プッシュ通知テスト成功")
+
+
+if __name__ == "__main__":
+    test_change_reaches_listener_within_one_second()
@@ -3,6 +3,9 @@
 データベース自動検出テストスクリプト
 """
 
+import tempfile
+from pathlib import Path
+
 from database_detector import DatabaseDetector
 
 def test_autodetect():
@@ -37,6 +40,8 @@ def test_autodetect():
     print("\n3. 選択されたデータベースへの接続テスト...")
     if selected_db_type == 'postgresql':
         success = detector._test_postgresql(selected_config)
+    elif selected_db_type == 'sqlite':
+        success = detector._test_sqlite(selected_config)
     else:
         success = detector._test_sqlserver(selected_config)
     
@@ -49,5 +54,24 @@ def test_autodetect():
     
     return selected_db_type, selected_config
 
+def test_sqlite_probe_does_not_create_file():
+    """SQLite検出がDBファイルやディレクトリを作成しないことを確認"""
+    detector = DatabaseDetector()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "data" / "lme_news.db"
+        
+        assert detector._test_sqlite({'sqlite_path': str(db_path)})
+        assert not db_path.exists()
+        assert not db_path.parent.exists()
+        
+        # 既存ファイルは読み取り専用で開くだけで、SQLite以外のファイルは不可と判定する
+        db_path.parent.mkdir()
+        db_path.write_bytes(b"not a database" * 100)
+        assert not detector._test_sqlite({'sqlite_path': str(db_path)})
+    
+    print("✓ SQLite検出はファイルを作成しない")
+
 if __name__ == "__main__":
-    test_autodetect()
\ No newline at end of file
+    test_autodetect()
+    test_sqlite_probe_does_not_create_file()
\ No newline at end of file
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+UIハンドラー用データベース実行モジュールのテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import gevent
+
+from perf_fixtures import create_sqlite_db_manager
+from database_spec import _CancellableConnection
+from db_executor import DatabaseExecutor, DatabaseQueryCancelled, DatabaseQueryTimeout, _DatabaseTask
+from models_spec import NewsSearchFilter
+
+# 終了しない再帰クエリ（タイムアウト・キャンセル確認用）
+ENDLESS_QUERY = """
+    WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter)
+    SELECT COUNT(*) FROM counter
+"""
+
+
+def _endless_query(db_manager):
+    """タイムアウトかキャンセルされるまで終わらないクエリ"""
+    with db_manager.get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(ENDLESS_QUERY)
+        return cursor.fetchone()
+
+
+def test_queries_do_not_block_other_greenlets():
+    """クエリ実行中も他のgreenletが動き、結果は通常どおり返る"""
+    print("=== 並行実行テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=300)
+    executor = DatabaseExecutor(db_manager, max_workers=4, default_timeout=10)
+
+    ticks = []
+
+    def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            gevent.sleep(0.01)
+
+    def slow_search():
+        time.sleep(0.2)  # ワーカースレッド上の遅いクエリを想定
+        return db_manager.search_news_page(NewsSearchFilter())
+
+    ticker_greenlet = gevent.spawn(ticker)
+    page = executor.run(slow_search, group='news_list')
+    ticker_greenlet.join()
+
+    assert page['total_count'] > 0
+    assert len(ticks) == 5, ticks
+    assert executor.get_stats()['completed'] == 1
+
+    executor.shutdown()
+    db_manager.close()
+    print("✓ 並行実行テスト成功")
+
+
+def test_timeout_interrupts_query():
+    """タイムアウトしたクエリは中断され、ワーカーが解放される"""
+    print("=== タイムアウトテスト ===")
+    db_manager = create_sqlite_db_manager()
+    executor = DatabaseExecutor(db_manager, max_workers=1, default_timeout=10)
+
+    start = time.perf_counter()
+    try:
+        executor.run(_endless_query, db_manager, timeout=0.3)
+        assert False, "タイムアウトしませんでした"
+    except DatabaseQueryTimeout:
+        pass
+    assert time.perf_counter() - start < 2
+
+    # ワーカーが解放されていれば次のクエリが実行できる
+    assert executor.run(db_manager.get_news_count) == 0
+    assert executor.get_stats()['timeouts'] == 1
+
+    executor.shutdown()
+    db_manager.close()
+    print("✓ タイムアウトテスト成功")
+
+
+def test_cancel_group():
+    """画面遷移（グループキャンセル）と後続リクエストによる置き換え"""
+    print("=== キャンセルテスト ===")
+    db_manager = create_sqlite_db_manager()
+    executor = DatabaseExecutor(db_manager, max_workers=2, default_timeout=10)
+    results = {}
+
+    def run_endless(name, **kwargs):
+        try:
+            results[name] = executor.run(_endless_query, db_manager, **kwargs)
+        except DatabaseQueryCancelled:
+            results[name] = 'cancelled'
+
+    # 画面遷移: グループ単位でキャンセル
+    waiter = gevent.spawn(run_endless, 'navigated', group='news_list')
+    gevent.sleep(0.2)
+    assert executor.cancel_group() == 1
+    waiter.join(timeout=2)
+    assert results['navigated'] == 'cancelled'
+
+    # 置き換え: 同じグループの新しいリクエストが古いものをキャンセル
+    waiter = gevent.spawn(run_endless, 'superseded', group='news_list')
+    gevent.sleep(0.2)
+    page = executor.run(db_manager.search_news_page, NewsSearchFilter(), group='news_list', supersede=True)
+    waiter.join(timeout=2)
+    assert results['superseded'] == 'cancelled'
+    assert page['total_count'] == 0
+
+    assert executor.get_stats()['cancelled'] == 2
+    assert executor.get_stats()['running'] == 0
+
+    executor.shutdown()
+    db_manager.close()
+    print("✓ キャンセルテスト成功")
+
+
+def test_sqlserver_cancel_uses_cursors():
+    """SQL Serverは接続で作成したカーソルのcancelで実行中のクエリをキャンセルする"""
+    print("=== SQL Serverキャンセルテスト ===")
+
+    class FakeCursor:
+        cancelled = False
+
+        def cancel(self):
+            self.cancelled = True
+
+    class FakeConnection:
+        timeout = 0
+
+        def cursor(self):
+            return FakeCursor()
+
+    db_manager = create_sqlite_db_manager()
+    raw_connection = FakeConnection()
+    connection = _CancellableConnection(raw_connection)
+    cursors = [connection.cursor(), connection.cursor()]
+    connection.timeout = 5
+    assert raw_connection.timeout == 5
+
+    db_manager.db_type = "sqlserver"
+    previous = db_manager._register_active_connection(connection)
+    try:
+        assert db_manager.cancel_query(threading.get_ident())
+    finally:
+        db_manager._unregister_active_connection(previous)
+        db_manager.db_type = "sqlite"
+    assert all(cursor.cancelled for cursor in cursors)
+    assert not db_manager.cancel_query(threading.get_ident())
+
+    # 変更記録はラッパーとcursor.connection（元の接続）で同じキー
+    db_manager._mark_data_changed(raw_connection)
+    assert db_manager._pop_data_changed(connection)
+    assert not db_manager._pop_data_changed(connection)
+
+    db_manager.close()
+    print("✓ SQL Serverキャンセルテスト成功")
+
+
+def test_cancel_does_not_reach_next_task_on_thread():
+    """完了した処理へのキャンセルは、同じワーカースレッドで次に実行中の処理を中断しない"""
+    print("=== キャンセル対象スレッドテスト ===")
+
+    class RecordingDbManager:
+        def __init__(self):
+            self.cancelled_threads = []
+
+        @contextmanager
+        def query_timeout(self, seconds):
+            yield
+
+        def cancel_query(self, thread_id):
+            self.cancelled_threads.append(thread_id)
+            return True
+
+    db_manager = RecordingDbManager()
+    executor = DatabaseExecutor(db_manager, max_workers=1)
+    finished_task = _DatabaseTask(1, 'news_list', None)
+    running_task = _DatabaseTask(2, 'news_list', None)
+    started = threading.Event()
+    release = threading.Event()
+
+    def worker():
+        executor._invoke(finished_task, lambda: None, (), {})
+        executor._invoke(running_task, lambda: (started.set(), release.wait(5)), (), {})
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert started.wait(5)
+
+    executor._cancel_task(finished_task)
+    assert db_manager.cancelled_threads == []
+    executor._cancel_task(running_task)
+    assert db_manager.cancelled_threads == [thread.ident]
+
+    release.set()
+    thread.join(5)
+    executor.shutdown()
+    print("✓ キャンセル対象スレッドテスト成功")
+
+
+if __name__ == "__main__":
+    test_queries_do_not_block_other_greenlets()
+    test_timeout_interrupts_query()
+    test_cancel_group()
+    test_sqlserver_cancel_uses_cursors()
+    test_cancel_does_not_reach_next_task_on_thread()
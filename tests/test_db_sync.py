@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+データベース間の移行・同期のテスト（SQLite同士で実行、外部サービス不要）
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import db_sync
+from perf_fixtures import create_sqlite_db_manager
+from db_sync import NEWS_SYNC_COLUMNS, NewsDatabaseSync
+from models_spec import NewsArticle, NewsSearchFilter
+
+SYNC_CONFIG = {"migration": {"migration_batch_size": 200, "sync_recheck_days": 90}}
+
+
+def _state_file() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="lme_sync_test_"), "migration_state.json")
+
+
+def test_migrate_resume_and_verify():
+    """中断した移行がウォーターマークから再開され、件数・チェックサムが一致する"""
+    print("=== 移行・再開テスト ===")
+    source_db = create_sqlite_db_manager(article_count=1000)
+    target_db = create_sqlite_db_manager()
+    state_file = _state_file()
+
+    # 3バッチ目で中断
+    sync = NewsDatabaseSync(source_db, target_db, SYNC_CONFIG, state_file)
+    original_upsert = sync._upsert_news
+    calls = []
+
+    def failing_upsert(rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError("接続断")
+        original_upsert(rows)
+
+    sync._upsert_news = failing_upsert
+    try:
+        sync.migrate()
+        assert False, "中断されませんでした"
+    except RuntimeError:
+        pass
+    assert sync.state['copied_rows'] == 400
+
+    # 新しいインスタンスで状態ファイルから再開
+    resumed = NewsDatabaseSync(source_db, target_db, SYNC_CONFIG, state_file)
+    result = resumed.migrate()
+    assert result['copied_rows'] == 600, result
+    assert result['total_rows'] == 1000
+
+    verification = resumed.verify()
+    assert verification['match'], verification
+    assert verification['target_count'] == 1000
+    assert target_db.get_dashboard_stats(30)['total_news'] == source_db.get_dashboard_stats(30)['total_news']
+
+    source_db.close()
+    target_db.close()
+    print("✓ 移行・再開テスト成功")
+
+
+def test_incremental_sync():
+    """追加・更新・削除が差分同期で反映される"""
+    print("=== 差分同期テスト ===")
+    source_db = create_sqlite_db_manager(article_count=300)
+    target_db = create_sqlite_db_manager()
+    sync = NewsDatabaseSync(source_db, target_db, SYNC_CONFIG, _state_file())
+    sync.migrate()
+
+    now = datetime.now().replace(microsecond=0)
+    assert source_db.insert_news_article(NewsArticle(
+        news_id='sync_new', title='Copper stocks fall again', publish_time=now, acquire_time=now + timedelta(minutes=1),
+        body='LME copper stocks fell for a fifth straight session as Chinese buyers returned.', source='REUTERS'
+    ))
+    updated_id = source_db.search_news_page(source_db_filter())['news'][0]['news_id']
+    assert source_db.update_news_rating(updated_id, 3)
+    assert source_db.mark_news_as_read(updated_id)
+    deleted_id = source_db.search_news_page(source_db_filter(is_manual=True))['news'][0]['news_id']
+    assert source_db.delete_news_by_id(deleted_id)
+
+    assert not sync.verify()['match']
+    result = sync.sync_once()
+    assert result['new_rows'] >= 1, result
+    assert result['deleted_rows'] == 1, result
+
+    assert sync.verify()['match']
+    assert target_db.get_news_by_id('sync_new') is not None
+    assert target_db.get_news_by_id(updated_id)['rating'] == 3
+    assert target_db.get_news_by_id(deleted_id) is None
+
+    # 変更がなければ何もしない
+    result = sync.sync_once()
+    assert result['mismatched_days'] == 0 and result['deleted_rows'] == 0, result
+
+    source_db.close()
+    target_db.close()
+    print("✓ 差分同期テスト成功")
+
+
+def source_db_filter(is_manual: bool = False) -> NewsSearchFilter:
+    """直近の記事を対象にする検索条件"""
+    search_filter = NewsSearchFilter()
+    search_filter.sort_by = 'time_desc'
+    search_filter.is_manual = is_manual
+    return search_filter
+
+
+def test_upsert_into_partitioned_postgresql_target():
+    """パーティション化したPostgreSQLの移行先は主キー(news_id, publish_time)で競合判定する"""
+    print("=== パーティション移行先テスト ===")
+
+    class RecordingTarget:
+        db_type = "postgresql"
+        connection_params = {'host': 'localhost', 'database': 'lme'}
+
+        def __init__(self):
+            self.statements = []
+
+        @contextmanager
+        def get_connection(self):
+            yield type("RecordingConnection", (), {"cursor": lambda _: None})()
+
+        def _get_news_conflict_columns(self):
+            return "news_id, publish_time"
+
+    target_db = RecordingTarget()
+    sync = NewsDatabaseSync(create_sqlite_db_manager(), target_db, SYNC_CONFIG, _state_file())
+    row = tuple(datetime(2024, 5, 1) if column == 'publish_time' else column for column in NEWS_SYNC_COLUMNS)
+
+    original = getattr(db_sync, 'execute_values', None)
+    db_sync.execute_values = lambda cursor, sql, rows, page_size: target_db.statements.append((" ".join(sql.split()), rows))
+    try:
+        sync._upsert_news([row])
+    finally:
+        if original is None:
+            del db_sync.execute_values
+        else:
+            db_sync.execute_values = original
+
+    (delete_sql, delete_rows), (insert_sql, _) = target_db.statements
+    assert delete_sql.startswith("DELETE FROM news_table") and delete_rows == [('news_id', datetime(2024, 5, 1))]
+    assert "ON CONFLICT (news_id, publish_time) DO UPDATE" in insert_sql
+    assert "publish_time = EXCLUDED.publish_time" not in insert_sql
+    sync.source_db.close()
+    print("✓ パーティション移行先テスト成功")
+
+
+if __name__ == "__main__":
+    test_migrate_resume_and_verify()
+    test_incremental_sync()
+    test_upsert_into_partitioned_postgresql_target()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Gemini分析器の統合分析テスト（応答を固定した疑似モデル使用、外部サービス不要）
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_analyzer import GeminiNewsAnalyzer, GeminiRateLimiter, get_shared_rate_limiter
+from analysis_cache import PersistentAnalysisCache
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from benchmark_gemini_concurrency import LatencyFakeModel, run_benchmark
+
+TEST_NEWS = {
+    'news_id': 'test_001',
+    'title': 'LME copper prices surge on supply concerns',
+    'body': 'London Metal Exchange copper prices rose as mining supply fell and China demand recovered.'
+}
+
+
+class FakeGeminiModel:
+    """呼び出し内容を記録し、用意した応答を順に返す疑似モデル（関数はプロンプトから応答を作成）"""
+
+    model_name = "fake-gemini"
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls.append((prompt, generation_config))
+        text = self.responses.pop(0) if self.responses else None
+        if callable(text):
+            text = text(prompt)
+        return type("FakeResponse", (), {"text": text})()
+
+
+def _create_analyzer(responses, **overrides) -> GeminiNewsAnalyzer:
+    gemini_config = {
+        "enable_ai_analysis": True,
+        "summary_generation": True,
+        "sentiment_analysis": True,
+        "keyword_extraction": True,
+        "importance_scoring": True,
+        "translation_enabled": True,
+        "rate_limit_delay": 0,
+        # レート制限はプロセス内で共有されるため、テスト全体の呼び出し回数で上限に達しないようにする
+        "max_requests_per_minute": 1000,
+        "max_requests_per_day": 100000
+    }
+    gemini_config.update(overrides)
+    analyzer = GeminiNewsAnalyzer({"gemini_integration": gemini_config})
+    analyzer.model = FakeGeminiModel(responses)
+    return analyzer
+
+
+def test_combined_analysis_single_call():
+    """有効な全項目を1回の呼び出し（JSONスキーマ指定）で取得する"""
+    print("=== 統合分析テスト ===")
+    response = {
+        "summary": "供給懸念で銅価格が上昇。",
+        "sentiment": "ポジティブ",
+        "sentiment_reason": "供給不足は価格の上昇要因",
+        "keywords": ["copper", "LME", "supply"],
+        "importance_score": 8,
+        "importance_reason": "主要金属の価格に直接影響",
+        "translation": "LME銅価格が供給懸念で急騰"
+    }
+    # コードブロックと前置きの文章が付いた応答も解析できる
+    analyzer = _create_analyzer([f"結果です:\n```json\n{json.dumps(response, ensure_ascii=False)}\n```"])
+
+    result = asyncio.run(analyzer.analyze_news_item(TEST_NEWS))
+    assert len(analyzer.model.calls) == 1
+    generation_config = analyzer.model.calls[0][1]
+    assert generation_config['response_mime_type'] == 'application/json'
+    assert set(generation_config['response_schema']['properties']) == set(response)
+
+    assert result.summary == response['summary']
+    assert result.sentiment == 'ポジティブ'
+    assert result.keywords == 'copper, LME, supply'
+    assert result.importance_score == 8
+    assert result.translation == response['translation']
+    assert analyzer.stats['field_fallbacks'] == 0
+
+    # 無効な項目はスキーマにもプロンプトにも含めない
+    analyzer = _create_analyzer(['{"summary": "要約"}'], sentiment_analysis=False, keyword_extraction=False,
+                                importance_scoring=False, translation_enabled=False)
+    result = asyncio.run(analyzer.analyze_news_item(dict(TEST_NEWS, news_id='test_002')))
+    assert result.summary == '要約'
+    assert list(analyzer.model.calls[0][1]['response_schema']['properties']) == ['summary']
+    print("✓ 統合分析テスト成功")
+
+
+def test_field_fallback():
+    """欠落・不正な項目のみ個別のプロンプトで取得し直す"""
+    print("=== 項目別フォールバックテスト ===")
+    analyzer = _create_analyzer([
+        '{"summary": "要約", "sentiment": "bullish", "keywords": [], "importance_score": 42, "translation": "翻訳"}',
+        'ネガティブ\n在庫増加が重荷',
+        'copper, zinc',
+        '6 中程度の影響'
+    ])
+    result = asyncio.run(analyzer.analyze_news_item(TEST_NEWS))
+    assert len(analyzer.model.calls) == 4
+    assert analyzer.model.calls[1][1] is None
+    assert result.summary == '要約'
+    assert result.translation == '翻訳'
+    assert (result.sentiment, result.sentiment_reason) == ('ネガティブ', '在庫増加が重荷')
+    assert result.keywords == 'copper, zinc'
+    assert result.importance_score == 6
+    assert analyzer.stats['field_fallbacks'] == 3
+
+    # 解析できない応答は全項目を個別に取得
+    analyzer = _create_analyzer(['not json', '要約', 'ニュートラル', 'copper', '5', '翻訳'])
+    result = asyncio.run(analyzer.analyze_news_item(TEST_NEWS))
+    assert len(analyzer.model.calls) == 6
+    assert (result.summary, result.sentiment, result.importance_score) == ('要約', 'ニュートラル', 5)
+
+    # 統合分析を無効にすると従来どおり項目ごとに呼び出す
+    analyzer = _create_analyzer(['要約', 'ポジティブ', 'copper', '7', '翻訳'], combined_analysis=False)
+    result = asyncio.run(analyzer.analyze_news_item(TEST_NEWS))
+    assert len(analyzer.model.calls) == 5
+    assert all(generation_config is None for _, generation_config in analyzer.model.calls)
+    assert result.importance_score == 7
+    print("✓ 項目別フォールバックテスト成功")
+
+
+def _batch_news(count: int):
+    return [dict(TEST_NEWS, news_id=f"batch_{i:03d}", title=f"{TEST_NEWS['title']} #{i}") for i in range(count)]
+
+
+def _batch_entry(news_id: str) -> dict:
+    return {"id": news_id, "summary": f"要約 {news_id}", "sentiment": "ニュートラル",
+            "keywords": ["copper"], "importance_score": 5}
+
+
+def test_batch_analysis():
+    """batch_processing有効時は複数記事を1リクエストにまとめ、欠けた記事・項目のみ再取得する"""
+    print("=== 一括分析テスト ===")
+    news_list = _batch_news(5)
+    entries = [_batch_entry(news['news_id']) for news in news_list]
+    del entries[3]['keywords']
+    partial_response = json.dumps({"articles": entries[:4]}, ensure_ascii=False)
+    single_response = json.dumps(_batch_entry('batch_004'), ensure_ascii=False)
+
+    analyzer = _create_analyzer([partial_response, 'copper, nickel', single_response],
+                                translation_enabled=False, batch_processing=True)
+    results = dict(asyncio.run(analyzer.analyze_news_batch(news_list)))
+
+    # 1回目: 5件まとめて / 2回目: 欠けた項目 / 3回目: 応答に含まれなかった記事
+    assert len(analyzer.model.calls) == 3
+    prompt, generation_config = analyzer.model.calls[0]
+    assert all(f"id: {news['news_id']}" in prompt for news in news_list)
+    assert 'articles' in generation_config['response_schema']['properties']
+    assert set(results) == {news['news_id'] for news in news_list}
+    assert results['batch_003'].keywords == 'copper, nickel'
+    assert results['batch_004'].summary == '要約 batch_004'
+
+    stats = analyzer.get_analysis_stats()
+    assert stats['successful_analyses'] == 5
+    assert stats['articles_per_request'] == round(5 / 3, 2)
+    assert stats['tokens_per_article'] > 0
+
+    # 応答を解析できない場合は半分に分割して再試行
+    def batch_response(prompt):
+        ids = [news['news_id'] for news in news_list if f"id: {news['news_id']}" in prompt]
+        return json.dumps({"articles": [_batch_entry(news_id) for news_id in ids]}, ensure_ascii=False)
+
+    analyzer = _create_analyzer(['not json', batch_response, batch_response],
+                                translation_enabled=False, batch_processing=True)
+    results = dict(asyncio.run(analyzer.analyze_news_batch(_batch_news(4))))
+    assert len(analyzer.model.calls) == 3
+    assert len(results) == 4
+    assert analyzer.stats['batch_splits'] == 1
+
+    # トークン予算を超える分は別のリクエストに分ける
+    analyzer = _create_analyzer([batch_response] * 5, translation_enabled=False, batch_processing=True)
+    analyzer.gemini_config['batch_token_budget'] = 3 * analyzer._estimate_item_tokens(
+        analyzer._prepare_news_item(news_list[0]))
+    results = dict(asyncio.run(analyzer.analyze_news_batch(news_list)))
+    assert len(results) == 5
+    assert len(analyzer.model.calls) == 2
+    print("✓ 一括分析テスト成功")
+
+
+def test_persistent_analysis_cache():
+    """同じ本文の分析結果を記事ID・インスタンス・再起動をまたいで再利用し、プロンプト変更で無効化する"""
+    print("=== 分析キャッシュテスト ===")
+    cache_config = {"enabled": True, "cache_path": os.path.join(tempfile.mkdtemp(prefix="lme_cache_test_"), "cache.db")}
+    response = json.dumps({"summary": "要約", "sentiment": "ポジティブ", "keywords": ["copper"],
+                           "importance_score": 8, "translation": "翻訳"}, ensure_ascii=False)
+
+    analyzer = _create_analyzer([response], analysis_cache=cache_config)
+    assert asyncio.run(analyzer.analyze_news_item(TEST_NEWS)).summary == '要約'
+    assert len(analyzer.model.calls) == 1
+
+    # 別インスタンス（再起動相当）で、IDと空白・大文字小文字だけが異なる再配信記事
+    reposted = dict(TEST_NEWS, news_id='repost_001', title=TEST_NEWS['title'].upper() + '  ')
+    analyzer = _create_analyzer([], analysis_cache=cache_config)
+    result = asyncio.run(analyzer.analyze_news_item(reposted))
+    assert analyzer.model.calls == []
+    assert (result.summary, result.importance_score, result.cost_estimate) == ('要約', 8, 0.0)
+    assert analyzer.get_analysis_stats()['analysis_cache']['hits'] == 1
+
+    # 一括分析でもリクエスト前に参照
+    analyzer = _create_analyzer([], analysis_cache=cache_config, batch_processing=True)
+    results = asyncio.run(analyzer.analyze_news_batch([dict(TEST_NEWS, news_id='repost_002')]))
+    assert [news_id for news_id, _ in results] == ['repost_002']
+    assert analyzer.model.calls == []
+
+    # プロンプトを変更すると再分析
+    analyzer = _create_analyzer([response], analysis_cache=cache_config,
+                                analysis_prompts={"summary": "別の要約指示:"})
+    asyncio.run(analyzer.analyze_news_item(dict(TEST_NEWS, news_id='repost_003')))
+    assert len(analyzer.model.calls) == 1
+
+    # 最大件数を超えると参照の古い順、有効期限切れは参照時に破棄
+    cache = PersistentAnalysisCache(os.path.join(tempfile.mkdtemp(prefix="lme_cache_test_"), "cache.db"),
+                                    max_entries=2, ttl_seconds=0.5)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, 'v1', {'summary': key})
+    cache.get('a')
+    cache.evict()
+    assert cache.get('a') == {'summary': 'a'}
+    assert cache.get('b') is None
+    time.sleep(0.6)
+    assert cache.get('c') is None
+    cache.close()
+    print("✓ 分析キャッシュテスト成功")
+
+
+def test_concurrent_requests_and_timeout():
+    """ブロッキングするモデル呼び出しも同時リクエスト数まで並行し、応答しない呼び出しはタイムアウトする"""
+    print("=== 同時実行テスト ===")
+    results = run_benchmark([1, 4], articles=8, latency_seconds=0.2)
+    for result in results:
+        print(f"  同時{result['concurrency']}件: {result['articles_per_second']}記事/秒")
+    assert all(result['analyzed'] == 8 for result in results)
+    assert [result['max_in_flight'] for result in results] == [1, 4]
+    assert results[1]['articles_per_second'] > results[0]['articles_per_second'] * 2.5
+
+    # タイムアウトした呼び出しは待たずに失敗扱い（項目別の再取得は行わず、次回の収集時に再分析）
+    analyzer = _create_analyzer([], request_timeout_seconds=0.2)
+    analyzer.model = LatencyFakeModel(2.0)
+    started = time.perf_counter()
+    result = asyncio.run(analyzer.analyze_news_item(TEST_NEWS))
+    assert time.perf_counter() - started < 0.6
+    assert result is None
+    assert analyzer.stats['api_calls_made'] == 0
+    assert analyzer.stats['field_fallbacks'] == 0 and analyzer.stats['failed_analyses'] == 1
+    assert TEST_NEWS['news_id'] not in analyzer.analyzed_cache
+    assert analyzer.daily_cost > 0 and analyzer.stats['estimated_tokens'] > 0
+
+    # タイムアウトした呼び出しはスレッドが戻るまで枠を占有し、後続のリクエストはプールで待たされてタイムアウトしない
+    class FirstCallHangsModel(LatencyFakeModel):
+        def generate_content(self, prompt, generation_config=None):
+            self.latency_seconds = 0.6 if self.calls == 0 else 0.05
+            return super().generate_content(prompt, generation_config)
+
+    analyzer = _create_analyzer([], request_timeout_seconds=0.3, max_concurrent_requests=1)
+    analyzer.model = FirstCallHangsModel(0)
+
+    async def analyze_two():
+        return await asyncio.gather(analyzer.analyze_news_item(TEST_NEWS),
+                                    analyzer.analyze_news_item(dict(TEST_NEWS, news_id='test_003')))
+
+    first, second = asyncio.run(analyze_two())
+    assert first is None and second is not None and second.summary
+    assert analyzer.model.max_in_flight == 1
+    print("✓ 同時実行テスト成功")
+
+
+def test_rate_limiter():
+    """分間リクエスト数・分間トークン数・日次リクエスト数の制限、状態の保存、プロセス内での共有"""
+    print("=== レート制限テスト ===")
+    # 分間リクエスト数: ウィンドウ内の上限に達したら最古の記録が外れるまで待機
+    limiter = GeminiRateLimiter(max_per_minute=2, max_per_day=100, window_seconds=0.3)
+    assert limiter.try_acquire() == 0 and limiter.try_acquire() == 0
+    wait = limiter.try_acquire()
+    assert 0 < wait <= 0.3
+    assert not limiter.can_make_request()
+    time.sleep(wait + 0.05)
+    assert limiter.try_acquire() == 0
+
+    # 並行した待機でもウィンドウあたりの上限を超えない
+    limiter = GeminiRateLimiter(max_per_minute=3, max_per_day=100, window_seconds=0.2)
+    async def acquire_all():
+        return await asyncio.gather(*(limiter.acquire() for _ in range(7)))
+    started = time.monotonic()
+    assert all(asyncio.run(acquire_all()))
+    assert time.monotonic() - started >= 0.4
+    assert len(limiter.minute_requests) <= 3
+
+    # 分間トークン数: 送信前の入力分と応答後の出力分を合算
+    limiter = GeminiRateLimiter(max_per_minute=100, max_per_day=100, max_tokens_per_minute=1000, window_seconds=0.3)
+    assert limiter.try_acquire(600) == 0
+    limiter.record_tokens(300)
+    assert limiter.try_acquire(200) > 0
+    assert limiter.get_status()['tokens_this_minute'] == 900
+    assert asyncio.run(limiter.acquire(200, max_wait=1))
+    # 上限を超える単独のリクエストもウィンドウが空けば送信
+    assert asyncio.run(limiter.acquire(5000, max_wait=1))
+
+    # 日次リクエスト数: 上限に達したら待機せずに失敗
+    limiter = GeminiRateLimiter(max_per_minute=100, max_per_day=2)
+    assert asyncio.run(limiter.acquire()) and asyncio.run(limiter.acquire())
+    assert limiter.try_acquire() is None
+    assert asyncio.run(limiter.acquire()) is False
+    assert limiter.get_status()['requests_today'] == 2
+
+    # 状態ファイル: 再起動後も日次の利用分を引き継ぐ
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_path = os.path.join(temp_dir, "state", "rate_limit.json")
+        limiter = GeminiRateLimiter(max_per_minute=100, max_per_day=3, max_tokens_per_minute=1000, state_path=state_path)
+        assert limiter.try_acquire(100) == 0 and limiter.try_acquire(100) == 0
+        restarted = GeminiRateLimiter(max_per_minute=100, max_per_day=3, max_tokens_per_minute=1000, state_path=state_path)
+        status = restarted.get_status()
+        assert (status['requests_today'], status['requests_this_minute'], status['tokens_this_minute']) == (2, 2, 200)
+        assert restarted.try_acquire() == 0
+        assert restarted.try_acquire() is None
+
+        # プロセス内の分析器は同じ制限値・状態ファイルのレート制限を共有
+        shared = get_shared_rate_limiter(50, 500, 1000, state_path)
+        assert shared is get_shared_rate_limiter(50, 500, 1000, os.path.join(temp_dir, "state", ".", "rate_limit.json"))
+        assert shared is not get_shared_rate_limiter(50, 500, 2000, state_path)
+        first = _create_analyzer([], max_requests_per_minute=50, max_requests_per_day=500,
+                                 max_tokens_per_minute=1000, rate_limit_state_file=state_path)
+        second = _create_analyzer([], max_requests_per_minute=50, max_requests_per_day=500,
+                                  max_tokens_per_minute=1000, rate_limit_state_file=state_path)
+        assert first.rate_limiter is second.rate_limiter is shared
+        assert first.get_analysis_stats()['rate_limit_status']['max_tokens_per_minute'] == 1000
+    print("✓ レート制限テスト成功")
+
+
+def test_daily_cost_limit_with_concurrent_batches():
+    """並行して送信する一括分析のリクエストも、送信中の見積もりコストを含めて日次コスト制限を守る"""
+    print("=== 日次コスト制限テスト ===")
+    news_list = _batch_news(6)
+
+    def batch_response(prompt):
+        ids = [news['news_id'] for news in news_list if f"id: {news['news_id']}" in prompt]
+        return json.dumps({"articles": [_batch_entry(news_id) for news_id in ids]}, ensure_ascii=False)
+
+    def create_analyzer():
+        analyzer = _create_analyzer([batch_response] * 20, translation_enabled=False, batch_processing=True,
+                                    max_concurrent_requests=4)
+        # 1リクエスト2記事に分ける
+        analyzer.gemini_config['batch_token_budget'] = 2 * analyzer._estimate_item_tokens(
+            analyzer._prepare_news_item(news_list[0]))
+        return analyzer
+
+    analyzer = create_analyzer()
+    assert len(asyncio.run(analyzer.analyze_news_batch(news_list))) == 6
+    assert len(analyzer.model.calls) == 3
+    cost_per_request = analyzer.daily_cost / 3
+
+    # 2リクエスト分の予算では、同時に送信できる場合も2リクエストまで
+    analyzer = create_analyzer()
+    analyzer.max_daily_cost = cost_per_request * 2.5
+    results = dict(asyncio.run(analyzer.analyze_news_batch(news_list)))
+    assert len(analyzer.model.calls) == 2, len(analyzer.model.calls)
+    assert len(results) == 4
+    assert analyzer.daily_cost <= analyzer.max_daily_cost
+    assert analyzer._reserved_cost == 0
+    print("✓ 日次コスト制限テスト成功")
+
+
+if __name__ == "__main__":
+    test_combined_analysis_single_call()
+    test_field_fallback()
+    test_batch_analysis()
+    test_persistent_analysis_cache()
+    test_concurrent_requests_and_timeout()
+    test_rate_limiter()
+    test_daily_cost_limit_with_concurrent_batches()
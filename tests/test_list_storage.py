@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+一覧表示用に書き込み時に保存する値のテスト（SQLiteフィクスチャ使用、外部サービス不要）
+重複判定キー・代表記事フラグ、日別集計とダッシュボード統計キャッシュ、ソース別・金属別件数、重要度スコア、重複記事の分割削除、一覧表示用の列の絞り込み
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from perf_fixtures import create_sqlite_db_manager, seed_articles
+from models_spec import NewsArticle, NewsSearchFilter, compute_dedup_key, extract_importance_score
+
+
+def _article(news_id: str, title: str, source: str = 'REUTERS', hours_ago: int = 1,
+             related_metals: str = 'Copper') -> NewsArticle:
+    """テスト用記事を作成"""
+    publish_time = datetime.now().replace(microsecond=0) - timedelta(hours=hours_ago)
+    return NewsArticle(
+        news_id=news_id, title=title,
+        body="LME copper prices rose as Chinese smelter output slowed and warehouse inventory fell again.",
+        publish_time=publish_time, acquire_time=publish_time, source=source,
+        related_metals=related_metals
+    )
+
+
+def _canonical_flags(db_manager) -> dict:
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT news_id, is_canonical FROM news_table")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def _list_ids(db_manager) -> list:
+    db_manager.invalidate_result_cache()
+    return sorted(n['news_id'] for n in db_manager.search_news(NewsSearchFilter()))
+
+
+def test_dedup_key_and_canonical_flag():
+    """重複グループ内の最新記事のみ代表記事とし、グループが変わる更新では元のグループも再計算する"""
+    print("=== 代表記事フラグテスト ===")
+    db_manager = create_sqlite_db_manager()
+
+    # 大文字小文字・空白の違いは同じ重複判定キー
+    assert compute_dedup_key('Copper  Rallies ', 'reuters') == compute_dedup_key('copper rallies', 'REUTERS')
+    assert compute_dedup_key('Copper rallies', 'REUTERS') != compute_dedup_key('Copper rallies', 'BLOOMBERG')
+
+    assert db_manager.insert_news_article(_article('a', 'Copper rallies', hours_ago=3))
+    assert db_manager.insert_news_article(_article('b', 'COPPER RALLIES', hours_ago=1))
+    assert _canonical_flags(db_manager) == {'a': 0, 'b': 1}
+    assert _list_ids(db_manager) == ['b']
+    assert db_manager.get_duplicate_stats()['duplicate_groups'] == 1
+
+    # 古い記事の再取得では代表記事は変わらない
+    assert db_manager.insert_news_article(_article('a', 'Copper rallies', hours_ago=3))
+    assert _canonical_flags(db_manager) == {'a': 0, 'b': 1}
+
+    # タイトル変更で別グループになった場合、元のグループに残った記事が代表記事になる
+    assert db_manager.insert_news_article(_article('b', 'Copper rallies on supply fears', hours_ago=1))
+    assert _canonical_flags(db_manager) == {'a': 1, 'b': 1}
+    assert _list_ids(db_manager) == ['a', 'b']
+    assert db_manager.get_duplicate_stats()['duplicate_groups'] == 0
+
+    # ソース変更で既存のグループに合流した場合も同様
+    assert db_manager.insert_news_article(_article('c', 'Copper rallies', source='BLOOMBERG', hours_ago=2))
+    assert db_manager.insert_news_article(_article('c', 'Copper rallies', source='REUTERS', hours_ago=2))
+    assert _canonical_flags(db_manager) == {'a': 0, 'b': 1, 'c': 1}
+    assert _list_ids(db_manager) == ['b', 'c']
+
+    db_manager.close()
+    print("✓ 代表記事フラグテスト成功")
+
+
+def test_daily_rollup_and_stats_cache():
+    """日別集計は挿入・削除で増減し、統計キャッシュにはコミット前の値が残らない"""
+    print("=== 日別集計テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=50, config_overrides={"ui_settings": {"stats_cache_seconds": 300}})
+    before = db_manager.get_dashboard_stats(30)
+    assert before['total_news'] == 50
+
+    today_article = _article('today_1', 'Zinc market tightens', hours_ago=0)
+    manual_article = _article('manual_1', 'Nickel memo', source='手動登録', hours_ago=0)
+    manual_article.is_manual = True
+    assert db_manager.insert_news_article(today_article)
+    assert db_manager.insert_news_article(manual_article)
+    # 更新では件数は変わらない
+    assert db_manager.insert_news_article(_article('today_1', 'Zinc market tightens further', hours_ago=0))
+
+    stats = db_manager.get_dashboard_stats(30)
+    assert stats['total_news'] == 52
+    assert stats['today_news'] >= before['today_news'] + 2
+    assert stats['manual_news'] == before['manual_news'] + 1
+
+    assert db_manager.delete_news_by_id('manual_1')
+    assert db_manager.get_dashboard_stats(30)['manual_news'] == before['manual_news']
+
+    # 集計テーブルの増分は全件集計と一致
+    incremental = db_manager.get_dashboard_stats(30)
+    assert db_manager.rebuild_aggregates()
+    assert db_manager.get_dashboard_stats(30) == incremental
+
+    # 書き込みトランザクション中に集計した値（コミット前）はコミット後に使われない
+    with db_manager.get_connection() as conn:
+        db_manager._apply_rollup_delta(conn.cursor(), datetime.now(), False, 5)
+        db_manager._mark_data_changed(conn)
+        assert db_manager.get_dashboard_stats(30)['total_news'] == 51
+    assert db_manager.get_dashboard_stats(30)['total_news'] == 56
+
+    db_manager.close()
+    print("✓ 日別集計テスト成功")
+
+
+def _lookup_counts(db_manager) -> tuple:
+    sources = {s['source']: s['count'] for s in db_manager.get_sources_with_counts()}
+    metals = {m['metal']: m['count'] for m in db_manager.get_related_metals_with_counts()}
+    return sources, metals
+
+
+def test_source_and_metal_lookup_counts():
+    """ソース別・金属別件数は挿入・更新・削除の差分で維持され、全件集計と一致する"""
+    print("=== ソース別・金属別件数テスト ===")
+    db_manager = create_sqlite_db_manager()
+
+    assert db_manager.insert_news_article(_article('n1', 'Copper rallies', related_metals='Copper, Zinc'))
+    assert db_manager.insert_news_article(_article('n2', 'Zinc slides', source='BLOOMBERG', related_metals='Zinc'))
+    manual_article = _article('manual_1', 'Nickel memo', source='手動登録', related_metals='Nickel')
+    manual_article.is_manual = True
+    assert db_manager.insert_news_article(manual_article)
+    assert _lookup_counts(db_manager) == (
+        {'REUTERS': 1, 'BLOOMBERG': 1, '手動登録': 1},
+        {'Copper': 1, 'Zinc': 2, 'Nickel': 1}
+    )
+
+    # 更新ではソース・金属の変更分のみ付け替え（件数が0になった項目は表示しない）
+    assert db_manager.insert_news_article(_article('n1', 'Copper rallies', source='BLOOMBERG', related_metals='Aluminium'))
+    assert _lookup_counts(db_manager) == (
+        {'BLOOMBERG': 2, '手動登録': 1},
+        {'Aluminium': 1, 'Zinc': 1, 'Nickel': 1}
+    )
+
+    assert db_manager.delete_news_by_id('manual_1')
+    incremental = _lookup_counts(db_manager)
+    assert incremental == ({'BLOOMBERG': 2}, {'Aluminium': 1, 'Zinc': 1})
+
+    assert db_manager.rebuild_aggregates()
+    assert _lookup_counts(db_manager) == incremental
+
+    # ソース名の一括変更は集計テーブルにも反映
+    assert db_manager.update_source_name('BLOOMBERG', 'Bloomberg') == 2
+    assert _lookup_counts(db_manager)[0] == {'Bloomberg': 2}
+
+    db_manager.close()
+    print("✓ ソース別・金属別件数テスト成功")
+
+
+def test_importance_score_column_and_backfill():
+    """旧形式の重要度タグはバッチ単位でimportance_scoreへ移行し、絞り込みはカラムで行う"""
+    print("=== 重要度スコア移行テスト ===")
+    assert extract_importance_score('copper, LME [重要度:8/10]') == (8, 'copper, LME')
+    assert extract_importance_score('[重要度:15/10]') == (10, None)
+    assert extract_importance_score('copper, LME') == (None, 'copper, LME')
+
+    db_manager = create_sqlite_db_manager(article_count=30)
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE news_table SET keywords = 'copper [重要度:' || (rowid % 10 + 1) || '/10]' WHERE rowid % 2 = 0")
+        # 形式が不正なタグは移行対象外（走査は停滞しない）
+        cursor.execute("UPDATE news_table SET keywords = 'zinc [重要度:高/10]' WHERE rowid = 1")
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE rowid % 2 = 0 AND rowid % 10 + 1 >= 8")
+        expected_high = cursor.fetchone()[0]
+
+    assert db_manager.backfill_importance_scores(batch_size=4) == 15
+    assert db_manager.backfill_importance_scores(batch_size=4) == 0
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE keywords LIKE '%重要度:%'")
+        assert cursor.fetchone()[0] == 1
+        cursor.execute("SELECT keywords FROM news_table WHERE rowid = 2")
+        assert cursor.fetchone()[0] == 'copper'
+
+    search_filter = NewsSearchFilter()
+    search_filter.min_importance_score = 8
+    db_manager.invalidate_result_cache()
+    assert 0 < db_manager.get_news_count(search_filter) <= expected_high
+    assert all(n['importance_score'] >= 8 for n in db_manager.search_news(search_filter))
+
+    # 分析結果の更新はカラムに保存
+    news_id = db_manager.search_news(NewsSearchFilter())[0]['news_id']
+    assert db_manager.update_news_analysis(news_id, {'importance_score': 9})
+    assert db_manager.get_news_by_id(news_id)['importance_score'] == 9
+
+    db_manager.close()
+    print("✓ 重要度スコア移行テスト成功")
+
+
+def test_chunked_duplicate_delete():
+    """重複記事はチャンクごとにコミットして削除し、各グループの最古（または最新）の1件を残す"""
+    print("=== 重複記事の分割削除テスト ===")
+    db_manager = create_sqlite_db_manager()
+    articles = [
+        _article(f'g{group:02d}_{copy}', f'Duplicate story {group}', hours_ago=copy + 1)
+        for group in range(20) for copy in range(3)
+    ]
+    seed_articles(db_manager, articles + [_article('unique', 'Unique story')])
+    assert db_manager.get_duplicate_stats()['redundant_items'] == 40
+    assert db_manager.remove_duplicate_news(dry_run=True) == 40
+    assert db_manager.get_news_count(NewsSearchFilter()) == 21
+
+    commits = []
+    original_get_connection = db_manager.get_connection
+    def counting_get_connection():
+        commits.append(True)
+        return original_get_connection()
+    db_manager.get_connection = counting_get_connection
+
+    assert db_manager.remove_duplicate_news(keep_latest=False, chunk_size=7) == 40
+    db_manager.get_connection = original_get_connection
+    # 削除6チャンク（最後のチャンクが7件未満で終了）+ フラグ・集計の再構築1回
+    assert len(commits) == 7, len(commits)
+
+    db_manager.invalidate_result_cache()
+    remaining = sorted(n['news_id'] for n in db_manager.search_news(NewsSearchFilter(), full_columns=True))
+    assert remaining == sorted([f'g{group:02d}_2' for group in range(20)] + ['unique'])
+    assert set(_canonical_flags(db_manager).values()) == {1}
+    assert db_manager.get_duplicate_stats()['duplicate_groups'] == 0
+    assert db_manager.get_dashboard_stats(30)['total_news'] == 21
+    assert db_manager.remove_duplicate_news() == 0
+
+    db_manager.close()
+    print("✓ 重複記事の分割削除テスト成功")
+
+
+def test_list_projection():
+    """一覧は表示用の列と本文抜粋のみ返し、本文全体・翻訳は詳細取得時のみ読み出す"""
+    print("=== 一覧表示用カラムテスト ===")
+    db_manager = create_sqlite_db_manager(config_overrides={"ui_settings": {"snippet_length": 40}})
+    long_body = "Copper inventories in LME warehouses fell for a fifth straight week. " * 40
+    article = _article('long_1', 'Copper stocks fall')
+    article.body = long_body
+    article.translation = "LME倉庫の銅在庫は5週連続で減少した。" * 40
+    assert db_manager.insert_news_article(article)
+    assert db_manager.insert_news_article(_article('url_only', 'Link only', hours_ago=2))
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute("UPDATE news_table SET body = 'https://example.com/' || news_id WHERE news_id = 'url_only'")
+
+    db_manager.invalidate_result_cache()
+    page = db_manager.search_news_page(NewsSearchFilter())
+    assert [n['news_id'] for n in page['news']] == ['long_1']
+    news = page['news'][0]
+    assert 'body' not in news and 'translation' not in news
+    assert news['snippet'] == long_body[:40]
+    assert news['body_length'] == len(long_body)
+    assert len(json.dumps(page, default=str, ensure_ascii=False)) < len(long_body)
+
+    # 全カラム取得・詳細取得では本文全体を返す
+    full = db_manager.search_news(NewsSearchFilter(), full_columns=True)
+    assert full[0]['body'] == long_body and full[0]['translation'] == article.translation
+    assert db_manager.get_news_by_id('long_1')['body'] == long_body
+
+    db_manager.close()
+    print("✓ 一覧表示用カラムテスト成功")
+
+
+if __name__ == "__main__":
+    test_dedup_key_and_canonical_flag()
+    test_daily_rollup_and_stats_cache()
+    test_source_and_metal_lookup_counts()
+    test_importance_score_column_and_backfill()
+    test_chunked_duplicate_delete()
+    test_list_projection()
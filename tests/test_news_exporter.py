@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+検索結果のストリーミングエクスポートのテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import os
+import csv
+import gzip
+import json
+import tempfile
+import threading
+
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import NewsSearchFilter
+from news_exporter import NewsExporter, NewsExportCancelled, EXPORT_COLUMNS, PYARROW_AVAILABLE
+
+
+def _create_exporter(db_manager, batch_size: int = 100) -> NewsExporter:
+    return NewsExporter(db_manager, {"export": {
+        "export_directory": tempfile.mkdtemp(prefix="lme_export_test_"),
+        "export_batch_size": batch_size,
+        "progress_interval_seconds": 0
+    }})
+
+
+def test_export_csv_and_ndjson():
+    """検索条件に一致する全件がバッチ単位で出力され、進捗が通知される"""
+    print("=== エクスポートテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=1000)
+    exporter = _create_exporter(db_manager)
+
+    # 全件（CSV）
+    search_filter = NewsSearchFilter()
+    search_filter.sort_by = 'time_asc'
+    progress = []
+    output_path = exporter.build_output_path('csv')
+    result = exporter.export(search_filter, output_path,
+                             progress_callback=lambda exported, total: progress.append((exported, total)))
+    total = db_manager.get_news_count(NewsSearchFilter())
+    assert result['rows'] == result['total_rows'] == total, result
+    assert result['format'] == 'csv'
+    assert len(progress) >= total // 100
+    assert progress[-1] == (total, total)
+    assert not os.path.exists(output_path + '.tmp')
+
+    with open(output_path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == total
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert rows[0]['publish_time'] <= rows[-1]['publish_time']
+
+    # 絞り込み（gzip NDJSON、既読状態は書き込みバッファの未反映分も含む）
+    news_id = rows[0]['news_id']
+    db_manager.queue_read_state(news_id, True)
+    search_filter = NewsSearchFilter()
+    search_filter.is_read = True
+    output_path = os.path.join(exporter.export_directory, 'read.ndjson.gz')
+    result = exporter.export(search_filter, output_path)
+    assert result['format'] == 'ndjson'
+    with gzip.open(output_path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['news_id'] for record in records] == [news_id]
+    assert records[0]['is_read'] is True
+
+    db_manager.close()
+    print("✓ エクスポートテスト成功")
+
+
+def test_export_cancel_and_parquet():
+    """キャンセル時は出力途中のファイルを残さない（Parquetはpyarrow導入時のみ）"""
+    print("=== エクスポートキャンセルテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=500)
+    exporter = _create_exporter(db_manager, batch_size=50)
+
+    cancel_event = threading.Event()
+    output_path = exporter.build_output_path('csv')
+
+    def cancel_after_first_batch(exported, total):
+        cancel_event.set()
+
+    try:
+        exporter.export(NewsSearchFilter(), output_path, progress_callback=cancel_after_first_batch,
+                        cancel_event=cancel_event)
+        assert False, "キャンセルされませんでした"
+    except NewsExportCancelled:
+        pass
+    assert os.listdir(exporter.export_directory) == []
+
+    if PYARROW_AVAILABLE:
+        import pyarrow.parquet as pq
+        output_path = exporter.build_output_path('parquet')
+        result = exporter.export(NewsSearchFilter(), output_path)
+        table = pq.read_table(output_path)
+        assert table.num_rows == result['rows'] == db_manager.get_news_count(NewsSearchFilter())
+    else:
+        print("pyarrow未インストールのためParquet出力はスキップ")
+
+    db_manager.close()
+    print("✓ エクスポートキャンセルテスト成功")
+
+
+if __name__ == "__main__":
+    test_export_csv_and_ndjson()
+    test_export_cancel_and_parquet()
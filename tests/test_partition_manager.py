@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+月次パーティション管理のテスト（発行SQLを記録する疑似接続を使用、外部サービス不要）
+SQLiteはパーティションをサポートしないため、PostgreSQLの処理手順をSQLの発行順で確認する
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+# 親ディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from partition_manager import NewsPartitionManager, UNPARTITIONED_TABLE
+
+
+class RecordingCursor:
+    """発行したSQLを記録し、用意した結果を返す疑似カーソル"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.db_manager.statements.append((self.db_manager.transactions, " ".join(sql.split()), params))
+        self.rowcount = 10 if sql.strip().startswith("INSERT") else 0
+
+    def fetchone(self):
+        return self.db_manager.min_max
+
+    def fetchall(self):
+        last_sql = self.db_manager.statements[-1][1]
+        if "pg_inherits" in last_sql:
+            return [(name,) for name in self.db_manager.partitions]
+        return []
+
+
+class RecordingDbManager:
+    """トランザクション（get_connection）ごとにSQLを記録する疑似データベース管理クラス"""
+
+    db_type = "postgresql"
+
+    def __init__(self, min_max=(None, None), partitions=()):
+        self.min_max = min_max
+        self.partitions = list(partitions)
+        self.statements = []
+        self.transactions = 0
+        self.rebuilds = []
+
+    @contextmanager
+    def get_connection(self):
+        self.transactions += 1
+        yield type("RecordingConnection", (), {"cursor": lambda _: RecordingCursor(self)})()
+
+    def rebuild_aggregates(self, cursor=None):
+        self.rebuilds.append(self.transactions)
+        return True
+
+
+def test_copy_rows_month_by_month():
+    """変換時のデータ移し替えは1か月分ずつ別トランザクションで行い、最後に旧テーブルを削除する"""
+    print("=== パーティション移し替えテスト ===")
+    db_manager = RecordingDbManager(min_max=(datetime(2024, 1, 15), datetime(2024, 3, 2)))
+    manager = NewsPartitionManager(db_manager, {"partitioning": {"enable_partitioning": True}})
+
+    assert manager._copy_unpartitioned_rows()
+    inserts = [(tx, params) for tx, sql, params in db_manager.statements if sql.startswith("INSERT INTO news_table")]
+    assert [params for _, params in inserts] == [
+        (datetime(2024, 1, 1), datetime(2024, 2, 1)),
+        (datetime(2024, 2, 1), datetime(2024, 3, 1)),
+        (datetime(2024, 3, 1), datetime(2024, 4, 1)),
+    ]
+    assert len({tx for tx, _ in inserts}) == 3
+    assert all("ON CONFLICT DO NOTHING" in sql for _, sql, _ in db_manager.statements if sql.startswith("INSERT"))
+    assert db_manager.statements[-1][1] == f"DROP TABLE {UNPARTITIONED_TABLE}"
+    assert db_manager.statements[-1][0] > max(tx for tx, _ in inserts)
+    print("✓ パーティション移し替えテスト成功")
+
+
+def test_retention_rebuilds_aggregates_and_defers_to_archive_purge():
+    """切り離したら同じトランザクションで集計テーブルを再構築し、自動アーカイブ有効時は切り離さない"""
+    print("=== パーティション保持期間テスト ===")
+    partitions = ["news_table_p202001", "news_table_p202002", f"news_table_p{datetime.now():%Y%m}"]
+    config = {"partitioning": {"enable_partitioning": True, "hot_retention_days": 30},
+              "backup": {"backup_retention_days": 3650}}
+
+    db_manager = RecordingDbManager(partitions=partitions)
+    manager = NewsPartitionManager(db_manager, config)
+    assert manager.retention_days == 30
+    assert manager.apply_retention() == 2
+    detached = [sql for _, sql, _ in db_manager.statements if "DETACH PARTITION" in sql]
+    assert detached == ["ALTER TABLE news_table DETACH PARTITION news_table_p202001",
+                        "ALTER TABLE news_table DETACH PARTITION news_table_p202002"]
+    assert db_manager.rebuilds == [db_manager.transactions]
+
+    # 自動アーカイブ（ファイル出力・削除）が有効な場合は切り離さない
+    config["backup"]["enable_auto_backup"] = True
+    db_manager = RecordingDbManager(partitions=partitions)
+    assert NewsPartitionManager(db_manager, config).apply_retention() == 0
+    assert db_manager.statements == [] and db_manager.rebuilds == []
+    print("✓ パーティション保持期間テスト成功")
+
+
+if __name__ == "__main__":
+    test_copy_rows_month_by_month()
+    test_retention_rebuilds_aggregates_and_defers_to_archive_purge()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+一覧・検索のパフォーマンステスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import time
+import statistics
+
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import NewsSearchFilter
+
+ARTICLE_COUNT = 5000
+LATENCY_BUDGET_MS = 200
+
+
+def _measure(db_manager, search_filter: NewsSearchFilter, repeat: int = 10) -> float:
+    """キャッシュを無効化しながら一覧ページ取得の中央値（ミリ秒）を計測"""
+    latencies = []
+    for _ in range(repeat):
+        db_manager.invalidate_result_cache()
+        start = time.perf_counter()
+        db_manager.search_news_page(search_filter)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def test_list_and_search_latency():
+    """一覧・キーワード検索・フィルター検索が予算内で応答する"""
+    print(f"=== 一覧・検索パフォーマンステスト（{ARTICLE_COUNT}件）===")
+    db_manager = create_sqlite_db_manager(article_count=ARTICLE_COUNT)
+
+    cases = {}
+
+    search_filter = NewsSearchFilter()
+    search_filter.limit = 50
+    cases['一覧（先頭ページ）'] = search_filter
+
+    search_filter = NewsSearchFilter()
+    search_filter.limit = 50
+    search_filter.offset = 1000
+    cases['一覧（深いページ）'] = search_filter
+
+    search_filter = NewsSearchFilter()
+    search_filter.limit = 50
+    search_filter.keyword = 'smelter'
+    cases['キーワード検索（全文検索）'] = search_filter
+
+    search_filter = NewsSearchFilter()
+    search_filter.limit = 50
+    search_filter.related_metals = ['Copper']
+    search_filter.is_manual = False
+    cases['金属・種別フィルター'] = search_filter
+
+    for label, search_filter in cases.items():
+        median_ms = _measure(db_manager, search_filter)
+        print(f"  {label}: {median_ms:.1f}ms")
+        assert median_ms < LATENCY_BUDGET_MS, f"{label}: {median_ms:.1f}ms"
+
+    db_manager.close()
+    print("✓ 一覧・検索パフォーマンステスト成功")
+
+
+def test_result_cache_hit():
+    """同一条件の再検索は結果キャッシュから返る"""
+    print("=== 結果キャッシュテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=500)
+
+    search_filter = NewsSearchFilter()
+    search_filter.keyword = 'copper'
+    first = db_manager.search_news_page(search_filter)
+    second = db_manager.search_news_page(search_filter)
+
+    assert first == second
+    assert db_manager.get_cache_stats()['hits'] >= 1
+
+    db_manager.close()
+    print("✓ 結果キャッシュテスト成功")
+
+
+if __name__ == "__main__":
+    test_list_and_search_latency()
+    test_result_cache_hit()
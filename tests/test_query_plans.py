@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+一覧クエリのプラン回帰テスト（SQLiteフィクスチャ使用、外部サービス不要）
+100万件での計測は scripts/benchmark_query_plans.py を使用
+"""
+
+import os
+import sys
+
+from perf_fixtures import create_sqlite_db_manager
+from database_spec import SpecDatabaseManager
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from benchmark_query_plans import run_benchmark, compare_with_baseline
+
+ARTICLE_COUNT = 5000
+
+
+def test_workload_uses_indexes():
+    """キーワード検索以外のワークロードはソート・全件走査なしでインデックス順に先頭ページを取得する"""
+    print(f"=== 一覧クエリのプランテスト（{ARTICLE_COUNT}件）===")
+    db_manager = create_sqlite_db_manager(article_count=ARTICLE_COUNT)
+    assert db_manager.update_statistics()
+
+    results = run_benchmark(db_manager, repeat=1)
+    for name, case in results['cases'].items():
+        print(f"  {name}: {case['indexes']}")
+        # 全文検索の一致行はソートが必要（対象件数が全文検索で絞られる）
+        if name.startswith('keyword/'):
+            continue
+        assert not case['sort'], f"{name}: {case['plan']}"
+        assert not case['full_scan'], f"{name}: {case['plan']}"
+        assert case['indexes'], f"{name}: {case['plan']}"
+
+    # インデックスを削除するとベースラインとの比較で退行として検出される
+    # （キャッシュ済みのEXPLAIN文はスキーマ変更後も再準備されないため接続し直す）
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute("DROP INDEX idx_news_canonical_rating_time")
+    db_manager.close()
+    db_manager = SpecDatabaseManager(db_manager.config)
+    regressed = run_benchmark(db_manager, repeat=1)
+    regressions = compare_with_baseline(regressed, results, min_delta_ms=1000)
+    assert any(message.startswith('all/smart:') for message in regressions), regressions
+    assert not any(message.startswith('all/time_desc:') for message in regressions), regressions
+
+    db_manager.close()
+    print("✓ 一覧クエリのプランテスト成功")
+
+
+if __name__ == "__main__":
+    test_workload_uses_indexes()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+検索条件のSQLテンプレート化のテスト（外部サービス不要）
+"""
+
+from datetime import datetime, timedelta
+
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import NewsSearchFilter, compile_filter_template
+
+
+def _filter(**kwargs) -> NewsSearchFilter:
+    """テスト用検索フィルター"""
+    search_filter = NewsSearchFilter()
+    for key, value in kwargs.items():
+        setattr(search_filter, key, value)
+    return search_filter
+
+
+def test_same_shape_same_sql():
+    """値が違っても条件の形が同じならSQLは同一で、値はすべてパラメータになる"""
+    print("=== SQLテンプレートテスト ===")
+    for db_type in ("postgresql", "sqlserver", "sqlite"):
+        first = _filter(keyword='copper', source='REUTERS', related_metals=['Copper'], sort_by='relevance')
+        second = _filter(keyword='aluminium smelter', source='BLOOMBERG', related_metals=['Zinc'], sort_by='relevance')
+
+        first_where, first_params = first.to_sql_where_clause(db_type)
+        second_where, second_params = second.to_sql_where_clause(db_type)
+        assert first_where == second_where, db_type
+        assert first.to_sql_order_clause(db_type) == second.to_sql_order_clause(db_type), db_type
+
+        # キーワードはSQL文に埋め込まれない
+        sql = first_where + first.to_sql_order_clause(db_type)
+        assert 'copper' not in sql and 'REUTERS' not in sql, sql
+        assert first_params != second_params
+        assert first.to_sql_order_params(db_type) == ['%copper%', '%copper%']
+
+    # 条件の形が違えば別のSQL
+    assert _filter(rating=3).to_sql_where_clause('postgresql')[0] != _filter().to_sql_where_clause('postgresql')[0]
+
+    compile_filter_template.cache_clear()
+    for keyword in ('a1', 'b2', 'c3'):
+        _filter(keyword=keyword).to_sql_where_clause('sqlserver')
+    info = compile_filter_template.cache_info()
+    assert info.misses == 1 and info.hits == 2, info
+    print("✓ SQLテンプレートテスト成功")
+
+
+def test_relevance_and_unknown_sort_fall_back_to_smart():
+    """キーワードなしの関連性ソート・未知のソートはスマートソート（無限再帰しない）"""
+    print("=== ソートのフォールバックテスト ===")
+    smart = _filter(sort_by='smart').to_sql_order_clause('sqlserver')
+    assert _filter(sort_by='relevance').to_sql_order_clause('sqlserver') == smart
+    assert _filter(sort_by='unknown').to_sql_order_clause('postgresql') == _filter().to_sql_order_clause('postgresql')
+    assert _filter(sort_by='relevance').to_sql_order_params('sqlserver') == []
+    print("✓ ソートのフォールバックテスト成功")
+
+
+def test_templates_execute_on_sqlite():
+    """テンプレート化した一覧クエリが実行でき、形ごとにSQLが再利用される"""
+    print("=== テンプレート実行テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=300)
+
+    for keyword in ('copper', 'zinc', 'nickel'):
+        page = db_manager.search_news_page(_filter(
+            keyword=keyword, sort_by='relevance', start_date=datetime.now() - timedelta(days=30), limit=20
+        ))
+        assert page['news'], keyword
+        assert all(keyword in (n['title'] + n['snippet']).lower() for n in page['news'])
+
+    stats = db_manager.get_cache_stats()['query_templates']
+    assert stats['list_misses'] == 1 and stats['list_hits'] == 2, stats
+
+    db_manager.close()
+    print("✓ テンプレート実行テスト成功")
+
+
+if __name__ == "__main__":
+    test_same_shape_same_sql()
+    test_relevance_and_unknown_sort_fall_back_to_smart()
+    test_templates_execute_on_sqlite()
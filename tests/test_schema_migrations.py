@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+スキーマのバージョン管理テスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import database_spec
+from perf_fixtures import create_sqlite_db_manager
+from migration_manager import LATEST_VERSION, MIGRATIONS
+
+
+def _index_names(db_manager):
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'news_table'")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def test_versions_recorded_and_quick_check():
+    """新規作成時は全バージョンを記録し、2回目以降はバージョン確認のみで終了する"""
+    print("=== スキーマバージョン記録テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=100)
+    migration_manager = db_manager.migration_manager
+
+    applied = migration_manager.get_applied_migrations()
+    assert [row['version'] for row in applied] == [version for version, _, _ in MIGRATIONS]
+    assert migration_manager.get_current_version() == LATEST_VERSION
+    assert {name for name, _ in db_manager._get_schema()["online_indexes"]} <= _index_names(db_manager)
+
+    # 最新バージョンではDDLを再実行しない
+    base_schema_calls = []
+    db_manager.apply_base_schema = lambda: base_schema_calls.append(True)
+    assert db_manager.create_tables()
+    assert base_schema_calls == []
+    assert migration_manager.get_applied_migrations() == applied
+
+    db_manager.close()
+    print("✓ スキーマバージョン記録テスト成功")
+
+
+def test_legacy_database_upgrade():
+    """バージョン管理導入前のデータベースは未適用分を実行し、補完はバッチ単位でコミットする"""
+    print("=== 既存データベースのアップグレードテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=300, config_overrides={
+        "schema_migrations": {"backfill_batch_size": 40, "backfill_pause_seconds": 0}
+    })
+
+    # 導入前の状態を再現（バージョン表なし・一覧用インデックスなし・旧インデックスあり・補完前の行）
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE schema_migrations")
+        for name, _ in db_manager._get_schema()["online_indexes"]:
+            cursor.execute(f"DROP INDEX {name}")
+        cursor.execute("CREATE INDEX idx_news_canonical_publish_time ON news_table(publish_time DESC) WHERE is_canonical = 1")
+        cursor.execute("UPDATE news_table SET dedup_key = NULL WHERE rowid % 3 = 0")
+        cursor.execute("UPDATE news_table SET keywords = 'copper [重要度:7/10]' WHERE rowid % 5 = 0")
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE dedup_key IS NULL")
+        legacy_rows = cursor.fetchone()[0]
+    assert db_manager.migration_manager.get_current_version() == 0
+
+    # 補完がバッチごとにコミットされることを確認（コミット回数を記録）
+    commits = []
+    original_get_connection = db_manager.get_connection
+    def counting_get_connection():
+        commits.append(True)
+        return original_get_connection()
+    db_manager.get_connection = counting_get_connection
+
+    assert db_manager.create_tables()
+    db_manager.get_connection = original_get_connection
+    assert len(commits) >= legacy_rows // 40, (len(commits), legacy_rows)
+
+    assert db_manager.migration_manager.get_current_version() == LATEST_VERSION
+    indexes = _index_names(db_manager)
+    assert {name for name, _ in db_manager._get_schema()["online_indexes"]} <= indexes
+    assert 'idx_news_canonical_publish_time' not in indexes
+
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE dedup_key IS NULL")
+        assert cursor.fetchone()[0] == 0
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE keywords LIKE '%重要度:%'")
+        assert cursor.fetchone()[0] == 0
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE importance_score = 7")
+        assert cursor.fetchone()[0] > 0
+
+    db_manager.close()
+    print(f"✓ 既存データベースのアップグレードテスト成功（補完対象{legacy_rows}件）")
+
+
+def test_failed_backfill_is_retried():
+    """補完の途中でエラーになった場合はv3を記録せず、次回起動時に残りを補完する"""
+    print("=== 補完失敗時の再実行テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=200, config_overrides={
+        "schema_migrations": {"backfill_batch_size": 20, "backfill_pause_seconds": 0}
+    })
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM schema_migrations WHERE version >= 3")
+        cursor.execute("UPDATE news_table SET dedup_key = NULL")
+
+    # 2バッチ目で失敗させる
+    original_compute = database_spec.compute_dedup_key
+    calls = []
+    def failing_compute(title, source):
+        calls.append(True)
+        if len(calls) > 20:
+            raise RuntimeError("接続断")
+        return original_compute(title, source)
+    database_spec.compute_dedup_key = failing_compute
+    try:
+        assert not db_manager.create_tables()
+    finally:
+        database_spec.compute_dedup_key = original_compute
+    assert db_manager.migration_manager.get_current_version() == 2
+
+    # 次回起動時に残りを補完してv3以降を記録
+    assert db_manager.create_tables()
+    assert db_manager.migration_manager.get_current_version() == LATEST_VERSION
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM news_table WHERE dedup_key IS NULL")
+        assert cursor.fetchone()[0] == 0
+
+    db_manager.close()
+    print("✓ 補完失敗時の再実行テスト成功")
+
+
+if __name__ == "__main__":
+    test_versions_recorded_and_quick_check()
+    test_legacy_database_upgrade()
+    test_failed_backfill_is_retried()
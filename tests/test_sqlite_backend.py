@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SQLiteバックエンドの動作テスト（外部サービス不要）
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import NewsArticle, NewsSearchFilter
+
+
+def _article(news_id: str, title: str, body: str, source: str = 'REUTERS', is_manual: bool = False,
+             hours_ago: int = 1) -> NewsArticle:
+    """テスト用記事を作成"""
+    publish_time = datetime.now().replace(microsecond=0) - timedelta(hours=hours_ago)
+    return NewsArticle(
+        news_id=news_id, title=title, body=body, publish_time=publish_time,
+        acquire_time=publish_time, source=source, is_manual=is_manual,
+        related_metals='Copper, Zinc'
+    )
+
+
+def test_insert_and_search():
+    """挿入・全文検索・フィルター・件数"""
+    print("=== SQLite 挿入・検索テスト ===")
+    db_manager = create_sqlite_db_manager()
+
+    body = "LME copper prices rose sharply on strong Chinese demand and falling inventory."
+    assert db_manager.insert_news_article(_article('n1', 'Copper rallies', body))
+    assert db_manager.insert_news_article(_article('n2', '銅相場が急伸', '中国の需要回復を背景にLME銅相場が急伸した。在庫の減少も続いており、需給の引き締まりが意識されている。', hours_ago=2))
+    assert db_manager.insert_news_article(_article('n3', 'Aluminium flat', 'Aluminium traded flat in a quiet session with little news from major producers today.', source='BLOOMBERG', hours_ago=3))
+
+    # 再挿入は更新扱い（件数は増えない）
+    assert db_manager.insert_news_article(_article('n1', 'Copper rallies further', body))
+
+    search_filter = NewsSearchFilter()
+    page = db_manager.search_news_page(search_filter)
+    assert page['total_count'] == 3, page['total_count']
+    assert page['news'][0]['news_id'] == 'n1'
+    assert isinstance(page['news'][0]['publish_time'], datetime)
+    assert page['news'][0]['is_manual'] is False
+    assert 'snippet' in page['news'][0] and 'body' not in page['news'][0]
+
+    # 全文検索（大文字小文字を区別しない部分一致）
+    search_filter = NewsSearchFilter()
+    search_filter.keyword = 'CHINESE'
+    assert [n['news_id'] for n in db_manager.search_news(search_filter)] == ['n1']
+
+    search_filter.keyword = '需要回復'
+    assert [n['news_id'] for n in db_manager.search_news(search_filter)] == ['n2']
+
+    # trigramで検索できない短いキーワードはLIKE検索
+    search_filter.keyword = '銅'
+    assert [n['news_id'] for n in db_manager.search_news(search_filter)] == ['n2']
+
+    search_filter = NewsSearchFilter()
+    search_filter.source = 'bloom'
+    assert db_manager.get_news_count(search_filter) == 1
+
+    # 集計テーブル
+    stats = db_manager.get_dashboard_stats(30)
+    assert stats['total_news'] == 3, stats
+    assert {s['source']: s['count'] for s in db_manager.get_sources_with_counts()} == {'REUTERS': 2, 'BLOOMBERG': 1}
+    assert {m['metal'] for m in db_manager.get_related_metals_with_counts()} == {'Copper', 'Zinc'}
+
+    db_manager.close()
+    print("✓ 挿入・検索テスト成功")
+
+
+def test_updates_and_duplicates():
+    """既読・レーティング・削除・重複除去"""
+    print("=== SQLite 更新・重複テスト ===")
+    db_manager = create_sqlite_db_manager()
+
+    body = "Zinc smelter shutdown in Europe tightens the refined zinc market considerably this week."
+    assert db_manager.insert_news_article(_article('d1', 'Zinc smelter shuts', body, hours_ago=5))
+    assert db_manager.insert_news_article(_article('d2', 'Zinc Smelter Shuts', body, hours_ago=1))
+    assert db_manager.insert_news_article(_article('manual_1', '手動メモ', '短い', source='手動登録', is_manual=True))
+
+    # 重複は代表記事（最新）のみ表示
+    ids = {n['news_id'] for n in db_manager.search_news(NewsSearchFilter())}
+    assert ids == {'manual_1', 'd2'}, ids
+    assert db_manager.get_duplicate_stats()['redundant_items'] == 1
+
+    assert db_manager.mark_news_as_read('d2')
+    assert isinstance(db_manager.get_news_by_id('d2')['read_at'], datetime)
+    assert db_manager.update_news_rating('d2', 3)
+    assert db_manager.update_news_analysis('d2', {'summary': '要約', 'importance_score': 9})
+
+    high = db_manager.get_changes_since(0, min_importance_score=8)['changes']
+    assert [n['news_id'] for n in high] == ['d2']
+
+    assert db_manager.remove_duplicate_news(dry_run=True) == 1
+    assert db_manager.remove_duplicate_news() == 1
+    assert db_manager.get_news_by_id('d1') is None
+
+    assert db_manager.delete_news_by_id('manual_1')
+    assert db_manager.get_dashboard_stats(30)['total_news'] == 1
+
+    db_manager.close()
+    print("✓ 更新・重複テスト成功")
+
+
+def test_concurrent_readers_and_writer():
+    """書き込み中も読み取り接続プールから並行して検索できる"""
+    print("=== SQLite 並行読み書きテスト ===")
+    db_manager = create_sqlite_db_manager(article_count=200)
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(20):
+                search_filter = NewsSearchFilter()
+                search_filter.keyword = 'copper'
+                db_manager.invalidate_result_cache()
+                db_manager.search_news_page(search_filter)
+        except Exception as e:
+            errors.append(e)
+
+    def writer():
+        try:
+            for i in range(20):
+                db_manager.insert_news_article(_article(f'w{i}', f'Writer copper news {i}',
+                                                        'Copper writer body text long enough to pass the minimum body length filter.'))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    assert db_manager.get_news_count() == 220
+    db_manager.close()
+    print("✓ 並行読み書きテスト成功")
+
+
+if __name__ == "__main__":
+    test_insert_and_search()
+    test_updates_and_duplicates()
+    test_concurrent_readers_and_writer()
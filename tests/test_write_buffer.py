@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+既読状態・レーティング更新の書き込みバッファのテスト（SQLiteフィクスチャ使用、外部サービス不要）
+"""
+
+import threading
+import time
+
+from perf_fixtures import create_sqlite_db_manager
+from models_spec import NewsSearchFilter
+
+
+def _raw_state(db_manager, news_id: str):
+    """バッファを経由しないデータベース上の値"""
+    with db_manager.get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT rating, is_read, read_at FROM news_table WHERE news_id = ?", (news_id,))
+        return tuple(cursor.fetchone())
+
+
+def _time_filter() -> NewsSearchFilter:
+    search_filter = NewsSearchFilter()
+    search_filter.sort_by = 'time_desc'
+    search_filter.limit = 20
+    return search_filter
+
+
+def test_coalesced_updates_and_overlay():
+    """同じ記事への連続した更新が1回の一括更新にまとめられ、反映前も読み取りに反映される"""
+    print("=== 書き込みバッファ統合テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=200, config_overrides={
+        'ui_settings': {'state_flush_interval_ms': 60000}
+    })
+    news_ids = [news['news_id'] for news in db_manager.search_news_page(_time_filter())['news'][:5]]
+
+    for i in range(50):
+        assert db_manager.queue_news_rating(news_ids[i % 5], i % 3 + 1)
+        assert db_manager.queue_read_state(news_ids[i % 5], i % 2 == 0)
+    assert not db_manager.queue_news_rating(news_ids[0], 5)
+
+    # 反映前: データベースは未更新、読み取りはバッファの値
+    assert _raw_state(db_manager, news_ids[0])[:2] == (None, 0)
+    expected = {news_ids[i % 5]: (i % 3 + 1, i % 2 == 0) for i in range(45, 50)}
+    for news in db_manager.search_news_page(_time_filter())['news']:
+        if news['news_id'] in expected:
+            assert (news['rating'], bool(news['is_read'])) == expected[news['news_id']], news
+    detail = db_manager.get_news_by_id(news_ids[0])
+    assert (detail['rating'], detail['is_read']) == expected[news_ids[0]]
+
+    stats = db_manager.state_buffer.get_stats()
+    assert stats['pending'] == 5 and stats['coalesced'] == 95, stats
+
+    # 既読状態で絞り込む検索は先に反映してから実行
+    unread_filter = _time_filter()
+    unread_filter.is_read = False
+    unread_filter.limit = 1000
+    unread_ids = {news['news_id'] for news in db_manager.search_news(unread_filter)}
+    assert unread_ids.isdisjoint(news_id for news_id, (_, is_read) in expected.items() if is_read)
+
+    stats = db_manager.state_buffer.get_stats()
+    assert stats['pending'] == 0 and stats['flushes'] == 1 and stats['flushed_rows'] == 5, stats
+    for news_id, (rating, is_read) in expected.items():
+        raw = _raw_state(db_manager, news_id)
+        assert raw[0] == rating and bool(raw[1]) == is_read, raw
+        assert (raw[2] is not None) == is_read
+
+    db_manager.close()
+    print("✓ 書き込みバッファ統合テスト成功")
+
+
+def test_timed_flush_and_retry():
+    """一定間隔で反映され、反映失敗時は新しい更新を優先して再試行する"""
+    print("=== 書き込みバッファ反映・再試行テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=50, config_overrides={
+        'ui_settings': {'state_flush_interval_ms': 50}
+    })
+    news_id = db_manager.search_news_page(_time_filter())['news'][0]['news_id']
+
+    db_manager.queue_news_rating(news_id, 2)
+    deadline = time.monotonic() + 5
+    while db_manager.state_buffer.has_pending() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _raw_state(db_manager, news_id)[0] == 2
+
+    # 1回目の反映を失敗させ、その間に新しい値を登録
+    buffer = db_manager.state_buffer
+    original_flush = buffer.flush_func
+
+    def failing_flush(updates):
+        buffer.flush_func = original_flush
+        buffer.put(news_id, rating=1)
+        raise RuntimeError("接続断")
+
+    buffer.flush_func = failing_flush
+    db_manager.queue_news_rating(news_id, 3)
+    db_manager.queue_read_state(news_id, True)
+    assert buffer.flush() == 0
+    assert buffer.get_pending(news_id)['rating'] == 1
+    assert buffer.get_pending(news_id)['is_read'] is True
+
+    db_manager.close()
+    assert _raw_state(db_manager, news_id)[:2] == (1, 1)
+    assert buffer.get_stats()['errors'] == 1
+    print("✓ 書き込みバッファ反映・再試行テスト成功")
+
+
+def test_inflight_updates_stay_visible():
+    """反映中（コミット前）の更新も読み取りに上書きされ、反映中に登録した更新が優先される"""
+    print("=== 書き込みバッファ反映中テスト ===")
+    db_manager = create_sqlite_db_manager(article_count=50, config_overrides={
+        'ui_settings': {'state_flush_interval_ms': 60000}
+    })
+    news_ids = [news['news_id'] for news in db_manager.search_news_page(_time_filter())['news'][:2]]
+    buffer = db_manager.state_buffer
+    original_flush = buffer.flush_func
+    flush_started = threading.Event()
+    release_flush = threading.Event()
+
+    def slow_flush(updates):
+        flush_started.set()
+        release_flush.wait(5)
+        return original_flush(updates)
+
+    buffer.flush_func = slow_flush
+    db_manager.queue_news_rating(news_ids[0], 3)
+    db_manager.queue_news_rating(news_ids[1], 2)
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert flush_started.wait(5)
+
+    # 反映中: データベースは未更新、読み取りは反映中の値
+    buffer.put(news_ids[1], rating=1)
+    assert _raw_state(db_manager, news_ids[0])[0] is None
+    assert buffer.has_pending()
+    assert buffer.get_pending(news_ids[0]) == {'rating': 3}
+    assert db_manager.get_news_by_id(news_ids[0])['rating'] == 3
+    ratings = {news['news_id']: news['rating'] for news in db_manager.search_news_page(_time_filter())['news']}
+    assert ratings[news_ids[0]] == 3 and ratings[news_ids[1]] == 1
+    assert buffer.get_stats()['inflight'] == 2
+
+    release_flush.set()
+    flusher.join(5)
+    assert buffer.get_stats()['inflight'] == 0
+    assert buffer.get_pending(news_ids[0]) is None
+    assert buffer.get_pending(news_ids[1]) == {'rating': 1}
+    assert _raw_state(db_manager, news_ids[0])[0] == 3
+
+    buffer.flush_func = original_flush
+    db_manager.close()
+    assert _raw_state(db_manager, news_ids[1])[0] == 1
+    print("✓ 書き込みバッファ反映中テスト成功")
+
+
+if __name__ == "__main__":
+    test_coalesced_updates_and_overlay()
+    test_timed_flush_and_retry()
+    test_inflight_updates_stay_visible()
@@ -1,5 +1,12 @@
 // LME News Watcher - JavaScript Application
 
+// タブごとのデータベース処理のグループ（タブを離れるときに実行中の処理をキャンセル）
+const TAB_DATABASE_GROUPS = {
+    latest: ['news_list', 'news_detail'],
+    archive: ['news_list', 'news_detail'],
+    stats: ['stats']
+};
+
 class NewsWatcher {
     constructor() {
         this.currentPage = 1;
@@ -7,6 +14,8 @@ class NewsWatcher {
         this.currentTab = 'latest';
         this.autoRefreshInterval = null;
         this.isAutoRefreshEnabled = false;
+        this.changeSeq = null;  // 変更フィードの位置（自動更新時の変更有無判定）
+        this.exportId = null;  // 実行中のエクスポート
         this.highImportanceNotifications = [];
         this.notificationCount = 0;
         
@@ -46,6 +55,7 @@ class NewsWatcher {
             this.currentPage = 1;  // 新しい検索時はページをリセット
             this.searchArchive();
         });
+        document.getElementById('exportBtn').addEventListener('click', () => this.toggleExport());
         
         // 手動登録
         document.getElementById('manualNewsForm').addEventListener('submit', (e) => this.submitManualNews(e));
@@ -113,8 +123,14 @@ class NewsWatcher {
             targetTabContent.classList.add('active');
         }
         
+        const previousTab = this.currentTab;
         this.currentTab = tabName;
         
+        // 前のタブで実行中のデータベース処理をキャンセル（結果は不要、フィルター読み込みなど他の処理は継続）
+        (TAB_DATABASE_GROUPS[previousTab] || []).forEach(group => {
+            eel.cancel_database_requests(group)();
+        });
+        
         // レイアウト安定化のため少し遅延させてから処理
         setTimeout(() => {
             this.handleTabSwitch(tabName);
@@ -143,6 +159,8 @@ class NewsWatcher {
         this.showLoading();
         try {
             const response = await eel.get_latest_news(this.newsPerPage, (this.currentPage - 1) * this.newsPerPage)();
+            // 後続リクエストで置き換えられた古い取得結果は無視
+            if (response.cancelled) return;
             this.displayNewsList(response.news, 'newsList');
             this.updatePagination(response.total_count, this.currentPage);
             this.updateStatus('正常', 'success');
@@ -220,6 +238,7 @@ class NewsWatcher {
             };
             
             const response = await eel.search_news(searchParams)();
+            if (response.cancelled) return;
             this.displayNewsList(response.news, 'newsList');
             this.updatePagination(response.total_count, this.currentPage);
             this.updateStatus('検索完了', 'success');
@@ -251,6 +270,7 @@ class NewsWatcher {
             };
             
             const response = await eel.search_archive(searchParams)();
+            if (response.cancelled) return;
             this.displayNewsList(response.news, 'archiveList');
             this.updatePagination(response.total_count, this.currentPage);  // ← 追加: ページネーション更新
             this.updateStatus('アーカイブ検索完了', 'success');
@@ -260,6 +280,57 @@ class NewsWatcher {
         }
     }
     
+    async toggleExport() {
+        // 実行中ならキャンセル
+        if (this.exportId) {
+            await eel.cancel_news_export(this.exportId)();
+            return;
+        }
+        
+        const searchParams = {
+            start_date: document.getElementById('startDate').value,
+            end_date: document.getElementById('endDate').value,
+            keyword: document.getElementById('archiveKeyword').value,
+            sort_by: document.getElementById('archiveSortFilter').value
+        };
+        const exportFormat = document.getElementById('exportFormatSelect').value;
+        
+        try {
+            const response = await eel.start_news_export(searchParams, exportFormat)();
+            if (!response.success) {
+                this.showError('エクスポートに失敗しました: ' + response.error);
+                return;
+            }
+            this.exportId = response.export_id;
+            document.getElementById('exportBtn').textContent = 'キャンセル';
+            this.updateStatus('エクスポート中...', 'warning');
+        } catch (error) {
+            this.showError('エクスポートに失敗しました: ' + error.message);
+        }
+    }
+    
+    receiveExportProgress(progress) {
+        if (progress.export_id !== this.exportId) return;
+        
+        if (progress.status === 'running') {
+            const percent = progress.total ? Math.floor(progress.exported * 100 / progress.total) : 0;
+            this.updateStatus(`エクスポート中 ${progress.exported.toLocaleString()} / ${progress.total.toLocaleString()}件 (${percent}%)`, 'warning');
+            return;
+        }
+        
+        this.exportId = null;
+        document.getElementById('exportBtn').textContent = 'エクスポート';
+        if (progress.status === 'completed') {
+            this.showSuccess(`エクスポート完了: ${progress.exported.toLocaleString()}件 → ${progress.path}`);
+            this.updateStatus('エクスポート完了', 'success');
+        } else if (progress.status === 'cancelled') {
+            this.updateStatus('エクスポートをキャンセルしました', 'success');
+        } else {
+            this.showError('エクスポートに失敗しました: ' + progress.error);
+            this.updateStatus('エクスポートエラー', 'error');
+        }
+    }
+    
     displayNewsList(news, containerId) {
         const container = document.getElementById(containerId);
         
@@ -328,7 +399,9 @@ class NewsWatcher {
         const publishTime = new Date(news.publish_time).toLocaleString('ja-JP');
         const acquireTime = new Date(news.acquire_time).toLocaleString('ja-JP');
         const isManual = news.is_manual;
-        const preview = news.body ? news.body.substring(0, 200) + '...' : '';
+        // 一覧は本文抜粋（snippet）のみ取得し、本文全体は詳細表示時に読み込む
+        const bodyText = news.snippet !== undefined ? news.snippet : news.body;
+        const preview = bodyText ? bodyText.substring(0, 200) + '...' : '';
         const metals = news.related_metals ? news.related_metals.split(',').map(m => m.trim()) : [];
         
         // AI分析結果の表示
@@ -337,9 +410,9 @@ class NewsWatcher {
         const keywords = news.keywords || '';
         const isRead = news.is_read || false;
         
-        // 重要度スコアの抽出（keywordsフィールドから）
-        let importanceScore = null;
-        if (keywords) {
+        // 重要度スコア（importance_scoreカラム、未移行データはkeywordsフィールドから抽出）
+        let importanceScore = (news.importance_score !== undefined && news.importance_score !== null) ? news.importance_score : null;
+        if (importanceScore === null && keywords) {
             const importanceMatch = keywords.match(/\[重要度:(\d+)\/10\]/);
             if (importanceMatch) {
                 importanceScore = parseInt(importanceMatch[1]);
@@ -644,8 +717,11 @@ class NewsWatcher {
         this.stopAutoRefresh();
         this.isAutoRefreshEnabled = true;
         
-        this.autoRefreshInterval = setInterval(() => {
-            if (this.currentTab === 'latest') {
+        this.changeSeq = null;
+        this.hasNewsChanges();  // 現在位置を取得
+        this.autoRefreshInterval = setInterval(async () => {
+            // 前回以降に記事の追加・更新があった場合のみ再読み込み
+            if (this.currentTab === 'latest' && await this.hasNewsChanges()) {
                 this.loadLatestNews();
             }
         }, intervalSeconds * 1000);
@@ -653,6 +729,21 @@ class NewsWatcher {
         this.updateStatus(`自動更新中 (${intervalSeconds}秒間隔)`, 'success');
     }
     
+    async hasNewsChanges() {
+        try {
+            const response = await eel.get_news_changes(this.changeSeq)();
+            if (!response.success) {
+                return !response.cancelled;
+            }
+            const changed = this.changeSeq !== null && response.changed_count > 0;
+            this.changeSeq = response.latest_seq;
+            return changed;
+        } catch (error) {
+            console.error('変更確認エラー:', error);
+            return true;
+        }
+    }
+    
     stopAutoRefresh() {
         if (this.autoRefreshInterval) {
             clearInterval(this.autoRefreshInterval);
@@ -1131,10 +1222,13 @@ class NewsWatcher {
                         <p><strong>本日のコスト:</strong> $${(stats.daily_cost || 0).toFixed(4)}</p>
                         <p><strong>残り予算:</strong> $${(stats.remaining_daily_budget || 0).toFixed(4)}</p>
                         <p><strong>API呼び出し数:</strong> ${stats.api_calls_made || 0}</p>
+                        <p><strong>記事数/リクエスト:</strong> ${stats.articles_per_request || 0}</p>
+                        <p><strong>トークン数/記事（概算）:</strong> ${stats.tokens_per_article || 0}</p>
                         <p><strong>キャッシュヒット数:</strong> ${stats.cache_hits || 0}</p>
                         ${stats.rate_limit_status ? `
-                            <p><strong>今分のリクエスト:</strong> ${stats.rate_limit_status.requests_this_minute || 0}/15</p>
-                            <p><strong>今日のリクエスト:</strong> ${stats.rate_limit_status.requests_today || 0}/1500</p>
+                            <p><strong>今分のリクエスト:</strong> ${stats.rate_limit_status.requests_this_minute || 0}/${stats.rate_limit_status.max_requests_per_minute || 15}</p>
+                            ${stats.rate_limit_status.max_tokens_per_minute ? `<p><strong>今分のトークン:</strong> ${(stats.rate_limit_status.tokens_this_minute || 0).toLocaleString()}/${stats.rate_limit_status.max_tokens_per_minute.toLocaleString()}</p>` : ''}
+                            <p><strong>今日のリクエスト:</strong> ${stats.rate_limit_status.requests_today || 0}/${stats.rate_limit_status.max_requests_per_day || 1500}</p>
                         ` : ''}
                     </div>
                 `;
@@ -1412,6 +1506,7 @@ class NewsWatcher {
         // Eelでエクスポーズされた関数として登録（Python側から呼び出し可能にする）
         window.eel.expose(this.receiveHighImportanceNotification.bind(this), 'notify_high_importance_news');
         window.eel.expose(this.receiveDatabaseUpdateNotification.bind(this), 'notify_database_update');
+        window.eel.expose(this.receiveExportProgress.bind(this), 'notify_export_progress');
     }
     
     receiveHighImportanceNotification(notificationData) {
@@ -1431,8 +1526,10 @@ class NewsWatcher {
     receiveDatabaseUpdateNotification(updateData) {
         console.log('データベース更新通知受信:', updateData);
         
-        // パッシブモードのデータベース更新トーストを表示
-        this.showDatabaseUpdateToast(updateData);
+        // パッシブモードのデータベース更新トーストを表示（新着がある場合のみ）
+        if (updateData.new_count > 0) {
+            this.showDatabaseUpdateToast(updateData);
+        }
         
         // 現在表示中のタブが最新ニュースの場合、自動更新
         if (this.currentTab === 'latest') {
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+既読状態・レーティング更新の書き込みバッファ
+同じ記事への連続した更新をまとめ、一定間隔で1回の一括更新としてデータベースに反映する
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class NewsStateWriteBuffer:
+    """
+    記事状態（rating / is_read / read_at）の書き込みバッファ（スレッドセーフ）
+
+    未反映の更新は記事IDごとに最新値へ統合され、読み取り時はoverlayで
+    データベースの値に上書きして返すため、反映前でも一覧・詳細の表示は一貫する
+    反映中（コミット前）の更新も反映完了まで読み取りに上書きする
+    """
+
+    def __init__(self, flush_func: Callable[[Dict[str, Dict[str, Any]]], int],
+                 flush_interval_ms: int = 500, max_pending: int = 500):
+        """
+        初期化
+
+        Args:
+            flush_func: 未反映の更新（記事ID → 変更カラム）を一括反映する関数（更新件数を返す）
+            flush_interval_ms: 最初の更新から反映までの待ち時間（ミリ秒、0以下でバッファ無効）
+            max_pending: 未反映の記事数がこの件数に達したら即時反映
+        """
+        self.flush_func = flush_func
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+        self.logger = logging.getLogger(__name__)
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # 反映中でコミット前の更新（反映完了まで読み取りに上書き、未反映の更新が優先）
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # 反映処理は同時に1つだけ実行（反映順序を保証）
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        self._stats = {'updates': 0, 'coalesced': 0, 'flushes': 0, 'flushed_rows': 0, 'errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_interval > 0 and not self._closed
+
+    def put(self, news_id: str, **fields):
+        """更新を登録（同じ記事の未反映の更新とはカラムごとに後勝ちで統合）"""
+        with self._lock:
+            self._stats['updates'] += 1
+            pending = self._pending.get(news_id)
+            if pending is None:
+                self._pending[news_id] = dict(fields)
+            else:
+                self._stats['coalesced'] += 1
+                pending.update(fields)
+            flush_now = len(self._pending) >= self.max_pending
+            if not flush_now:
+                self._schedule_locked()
+
+        if flush_now:
+            self.flush()
+
+    def _schedule_locked(self):
+        """反映タイマーを開始（ロック取得済みで呼び出し、実行中のタイマーがあれば何もしない）"""
+        if self._timer is None and not self._closed:
+            self._timer = threading.Timer(self.flush_interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        未反映の更新をデータベースに反映
+
+        Returns:
+            int: 反映した記事数（失敗時は0、更新はバッファに戻して次回再試行）
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = self._pending
+                self._pending = {}
+                self._inflight = batch
+
+            try:
+                updated = self.flush_func(batch)
+            except Exception as e:
+                self.logger.error(f"記事状態の一括更新エラー（{len(batch)}件を再試行）: {e}")
+                with self._lock:
+                    self._inflight = {}
+                    self._stats['errors'] += 1
+                    # 反映中に登録された新しい更新を優先して戻す
+                    for news_id, fields in batch.items():
+                        merged = dict(fields)
+                        merged.update(self._pending.get(news_id, {}))
+                        self._pending[news_id] = merged
+                    self._schedule_locked()
+                return 0
+
+            with self._lock:
+                self._inflight = {}
+                self._stats['flushes'] += 1
+                self._stats['flushed_rows'] += len(batch)
+            self.logger.debug(f"記事状態を一括更新: {len(batch)}件（反映{updated}件）")
+            return len(batch)
+
+    def has_pending(self) -> bool:
+        """未反映または反映中の更新があるか"""
+        with self._lock:
+            return bool(self._pending or self._inflight)
+
+    def _lookup_locked(self, news_id: str) -> Optional[Dict[str, Any]]:
+        """反映中の更新に未反映の更新を重ねた値（ロック取得済みで呼び出し）"""
+        inflight = self._inflight.get(news_id)
+        pending = self._pending.get(news_id)
+        if inflight is None:
+            return pending
+        if pending is None:
+            return inflight
+        merged = dict(inflight)
+        merged.update(pending)
+        return merged
+
+    def get_pending(self, news_id: str) -> Optional[Dict[str, Any]]:
+        """記事の未反映（反映中を含む）の更新（なければNone）"""
+        with self._lock:
+            pending = self._lookup_locked(news_id)
+            return dict(pending) if pending else None
+
+    def overlay(self, rows: List[Dict]) -> List[Dict]:
+        """読み取り結果の行に未反映（反映中を含む）の更新を上書き（行に含まれるカラムのみ）"""
+        with self._lock:
+            if not self._pending and not self._inflight:
+                return rows
+            for row in rows:
+                pending = self._lookup_locked(row.get('news_id'))
+                if pending:
+                    for column, value in pending.items():
+                        if column in row:
+                            row[column] = value
+        return rows
+
+    def close(self):
+        """タイマーを停止して未反映の更新をすべて反映（終了時）"""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['inflight'] = len(self._inflight)
+        return stats